@@ -0,0 +1 @@
+"""Benchmarks for simple-agent-poc."""
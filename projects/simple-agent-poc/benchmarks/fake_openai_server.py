@@ -0,0 +1,90 @@
+"""Local fake OpenAI-compatible chat completions server."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self, cast
+
+
+def _chunk(delta: dict[str, Any], finish_reason: str | None = None) -> str:
+    payload = {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "fake",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    @property
+    def fake(self) -> _Server:
+        return cast(_Server, self.server)
+
+    def setup(self) -> None:
+        super().setup()
+        with self.fake.lock:
+            self.fake.connections += 1
+        # Stand-in for the TCP/TLS handshake cost of a real provider.
+        time.sleep(self.fake.connect_delay_seconds)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        self.rfile.read(length)
+        body = (
+            _chunk({"role": "assistant", "content": "Hello"})
+            + _chunk({}, "stop")
+            + "data: [DONE]\n\n"
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, connect_delay_seconds: float) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.connect_delay_seconds = connect_delay_seconds
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class FakeOpenAIServer:
+    """Serve a canned streamed chat completion on a local port.
+
+    Every new connection waits ``connect_delay_seconds`` before it is served,
+    so reused keep-alive connections show up as lower time to first token.
+    """
+
+    def __init__(self, *, connect_delay_seconds: float = 0.0) -> None:
+        self._server = _Server(connect_delay_seconds)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    @property
+    def connections(self) -> int:
+        """Return how many TCP connections clients have opened so far."""
+        return self._server.connections
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
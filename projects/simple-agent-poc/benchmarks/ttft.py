@@ -0,0 +1,78 @@
+"""Compare time to first token with and without the shared HTTP pool.
+
+Run from the project root:
+
+    uv run python -m benchmarks.ttft --requests 200 --connect-delay-ms 20
+
+The fake server delays every new connection by ``--connect-delay-ms`` to
+stand in for TCP and TLS setup against a remote provider.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import litellm
+
+from benchmarks.fake_openai_server import FakeOpenAIServer
+from simple_agent_poc.adapters.llm.http_pool import install_shared_http_pool
+from simple_agent_poc.adapters.llm.litellm_client import LiteLLMClientFactory
+from simple_agent_poc.core.agent_definition import AgentDefinition
+
+_AGENT = AgentDefinition(
+    agent_id="default",
+    model="openai/gpt-4.1-mini",
+    system_prompt="You are a benchmark.",
+)
+
+
+def _measure(requests: int) -> list[float]:
+    client = LiteLLMClientFactory()(_AGENT)
+    samples: list[float] = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        stream = client.complete_stream([{"role": "user", "content": "Hi"}])
+        next(stream)
+        samples.append((time.perf_counter() - start) * 1000)
+        for _chunk in stream:
+            pass
+    return samples
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+def _report(label: str, samples: list[float], connections: int) -> None:
+    print(
+        f"{label:<12} p50={_percentile(samples, 50):7.2f} ms"
+        f"  p99={_percentile(samples, 99):7.2f} ms"
+        f"  connections={connections}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--connect-delay-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    delay = args.connect_delay_ms / 1000
+    with FakeOpenAIServer(connect_delay_seconds=delay) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        litellm.client_session = None
+        litellm.aclient_session = None
+        cold = _measure(args.requests)
+        _report("no pool", cold, server.connections)
+
+    with FakeOpenAIServer(connect_delay_seconds=delay) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        install_shared_http_pool()
+        warm = _measure(args.requests)
+        _report("shared pool", warm, server.connections)
+
+
+if __name__ == "__main__":
+    main()
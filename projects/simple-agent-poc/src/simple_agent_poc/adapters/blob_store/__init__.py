@@ -0,0 +1 @@
+"""Blob store adapter package."""
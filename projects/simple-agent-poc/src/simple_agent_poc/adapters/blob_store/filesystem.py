@@ -0,0 +1,57 @@
+"""Content-addressed blob store on the local filesystem."""
+
+import contextlib
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from simple_agent_poc.application.ports import BlobStore
+
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+class FileBlobStore(BlobStore):
+    """Store each blob once, as ``<root>/<aa>/<sha256>``.
+
+    ``aa`` is the first two hex digits of the SHA-256 digest. Storing the
+    same content again returns the same reference without rewriting the
+    file. Files are written to a temporary name first and renamed into
+    place, so a reader never sees a partial blob. Blobs are never deleted.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def put(self, data: bytes, /) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(temporary, path)
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(temporary)
+                raise
+        return f"sha256:{digest}"
+
+    def get(self, ref: str, /) -> bytes | None:
+        algorithm, _, digest = ref.partition(":")
+        if algorithm != "sha256" or not _SHA256_HEX.fullmatch(digest):
+            return None
+        try:
+            return self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _path(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest
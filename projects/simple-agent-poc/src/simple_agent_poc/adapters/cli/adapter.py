@@ -16,6 +16,7 @@ from simple_agent_poc.application.dto import (
     SessionPaused,
     StreamComplete,
     ToolCallEvent,
+    ToolProgressEvent,
     ToolResultEvent,
 )
 from simple_agent_poc.application.use_cases import RunAgentUseCase
@@ -30,6 +31,7 @@ class StreamingRenderer(Protocol):
         stream: Generator[
             ContentDelta
             | ToolCallEvent
+            | ToolProgressEvent
             | ToolResultEvent
             | SessionPaused
             | StreamComplete,
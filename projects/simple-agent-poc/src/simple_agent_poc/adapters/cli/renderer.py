@@ -11,6 +11,7 @@ from simple_agent_poc.application.dto import (
     SessionPaused,
     StreamComplete,
     ToolCallEvent,
+    ToolProgressEvent,
     ToolResultEvent,
 )
 from simple_agent_poc.core.types import AgentError
@@ -135,7 +136,12 @@ def show_exit_message() -> None:
 
 def show_streaming_response(
     stream: Generator[
-        ContentDelta | ToolCallEvent | ToolResultEvent | SessionPaused | StreamComplete,
+        ContentDelta
+        | ToolCallEvent
+        | ToolProgressEvent
+        | ToolResultEvent
+        | SessionPaused
+        | StreamComplete,
         dict[str, str] | None,
     ],
 ) -> StreamComplete:
@@ -154,6 +160,7 @@ def show_streaming_response(
         event: (
             ContentDelta
             | ToolCallEvent
+            | ToolProgressEvent
             | ToolResultEvent
             | SessionPaused
             | StreamComplete
@@ -193,6 +200,9 @@ def show_streaming_response(
                         sys.stdout.write(f"\n     → {result_text}")
                         sys.stdout.flush()
                     continue
+            elif isinstance(event, ToolProgressEvent):
+                # The result that follows carries the same output.
+                continue
             elif isinstance(event, ToolResultEvent):
                 if not started:
                     indicator.stop()
@@ -0,0 +1,101 @@
+"""Concurrency slots shared by blocking threads and asyncio callers."""
+
+import asyncio
+import threading
+from collections import deque
+
+__all__ = ["FifoSlots"]
+
+
+class _Waiter:
+    """A queued caller waiting for a slot."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.loop = loop
+        self.event = threading.Event()
+        self.future: asyncio.Future[None] | None = (
+            loop.create_future() if loop is not None else None
+        )
+
+    def grant(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if self.future is not None and not self.future.done():
+            self.future.set_result(None)
+
+
+class FifoSlots:
+    """At most ``limit`` holders at a time, admitted in arrival order.
+
+    A released slot is handed directly to the longest waiting caller, whether
+    it blocks in a thread or awaits on an event loop. ``None`` disables the
+    limit: every caller is admitted and ``release`` does nothing.
+    """
+
+    def __init__(self, limit: int | None) -> None:
+        self._limit = limit
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queue: deque[_Waiter] = deque()
+
+    @property
+    def active(self) -> int:
+        """Return the number of slots currently held."""
+        return self._active
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Block for a slot; False means none was free within *timeout*."""
+        waiter = _Waiter()
+        if self._try_enter(waiter) or waiter.event.wait(timeout):
+            return True
+        # False from _cancel means the slot was granted while timing out.
+        return not self._cancel(waiter)
+
+    async def aacquire(self, timeout: float | None = None) -> bool:
+        """Await a slot; False means none was free within *timeout*."""
+        waiter = _Waiter(asyncio.get_running_loop())
+        if self._try_enter(waiter):
+            return True
+        assert waiter.future is not None
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except TimeoutError:
+            return not self._cancel(waiter)
+        except asyncio.CancelledError:
+            if not self._cancel(waiter):
+                self.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiter if there is one."""
+        if self._limit is None:
+            return
+        with self._lock:
+            if self._queue:
+                self._queue.popleft().grant()
+            else:
+                self._active -= 1
+
+    def _try_enter(self, waiter: _Waiter) -> bool:
+        if self._limit is None:
+            return True
+        with self._lock:
+            if self._active < self._limit and not self._queue:
+                self._active += 1
+                return True
+            self._queue.append(waiter)
+            return False
+
+    def _cancel(self, waiter: _Waiter) -> bool:
+        """Drop a waiter that gave up; False means it was granted meanwhile."""
+        with self._lock:
+            try:
+                self._queue.remove(waiter)
+            except ValueError:
+                return False
+            return True
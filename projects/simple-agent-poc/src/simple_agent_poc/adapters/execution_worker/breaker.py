@@ -0,0 +1,125 @@
+"""Circuit breaker for execution-worker calls."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Literal
+
+from simple_agent_poc.observability import log_event
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class Permit:
+    """Issued by ``CircuitBreaker.allow`` for one admitted call.
+
+    Pass it back to ``record`` with the call's outcome.
+    """
+
+    __slots__ = ()
+
+
+class CircuitBreaker:
+    """Fail fast while the execution-worker is unreachable.
+
+    The circuit opens after ``failure_threshold`` consecutive failed calls.
+    While it is open, ``allow`` refuses every call and a background thread
+    runs ``probe`` every ``probe_interval_seconds``. The first successful
+    probe half-opens the circuit: one trial call is let through, and its
+    outcome closes the circuit again or re-opens it. Outcomes of calls
+    admitted before the circuit opened are ignored once it is no longer
+    closed.
+
+    Every state change is logged as an ``execution_worker.circuit`` event.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], bool],
+        *,
+        failure_threshold: int = 5,
+        probe_interval_seconds: float = 5.0,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.probe_interval_seconds = probe_interval_seconds
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._state: CircuitState = "closed"
+        self._failures = 0
+        self._trial: Permit | None = None
+        self._stop = threading.Event()
+        self._prober: threading.Thread | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def allow(self) -> Permit | None:
+        """Return a permit if a call may be sent now, else None.
+
+        A half-open circuit admits one trial call at a time.
+        """
+        with self._lock:
+            if self._state == "closed":
+                return Permit()
+            if self._state == "half_open" and self._trial is None:
+                self._trial = Permit()
+                return self._trial
+            return None
+
+    def record(self, permit: Permit, *, success: bool) -> None:
+        """Record the outcome of the call ``allow`` issued *permit* for."""
+        with self._lock:
+            if permit is self._trial:
+                self._trial = None
+                self._failures = 0 if success else self._failures + 1
+                self._transition("closed" if success else "open")
+                return
+            if self._state != "closed":
+                # Admitted before the circuit opened; the trial decides.
+                return
+            if success:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._transition("open")
+
+    def close(self) -> None:
+        """Stop the background probe."""
+        self._stop.set()
+        prober = self._prober
+        if prober is not None:
+            prober.join(self.probe_interval_seconds + 1.0)
+
+    def _transition(self, state: CircuitState) -> None:
+        # Called with the lock held.
+        previous, self._state = self._state, state
+        log_event(
+            "execution_worker.circuit",
+            state=state,
+            previous_state=previous,
+            consecutive_failures=self._failures,
+        )
+        if state == "open" and not self._stop.is_set():
+            self._prober = threading.Thread(
+                target=self._probe_until_healthy,
+                name="execution-worker-probe",
+                daemon=True,
+            )
+            self._prober.start()
+
+    def _probe_until_healthy(self) -> None:
+        while not self._stop.wait(self.probe_interval_seconds):
+            try:
+                healthy = self._probe()
+            except Exception:  # noqa: BLE001 - a failing probe only means "not yet"
+                healthy = False
+            if healthy:
+                with self._lock:
+                    if self._state == "open":
+                        self._transition("half_open")
+                return
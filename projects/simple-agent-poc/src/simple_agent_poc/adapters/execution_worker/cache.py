@@ -0,0 +1,117 @@
+"""In-process cache of successful execution-worker results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from simple_agent_poc.adapters.execution_worker.client import (
+    JavaScriptExecution,
+    WorkerExecutionResult,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutionCacheStats:
+    """Counters and current size of an execution result cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+
+
+def execution_cache_key(execution: JavaScriptExecution) -> str:
+    """Hash the code, input and timeout that determine an execution's result."""
+    material = json.dumps(
+        [execution.code, execution.input_data, execution.timeout_ms],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ExecutionResultCache:
+    """Keep successful results of repeated JavaScript executions.
+
+    Entries are shared by every session of the process. At most
+    ``max_entries`` are kept, evicting the least recently used, and each
+    expires ``ttl_seconds`` after it was stored. Failed executions are never
+    stored, so an error from the worker is always retried.
+
+    Only deterministic code benefits: a snippet that reads the clock or
+    ``Math.random`` returns its first result until the entry expires.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[WorkerExecutionResult, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, execution: JavaScriptExecution) -> WorkerExecutionResult | None:
+        """Return the cached result of *execution*, counting a hit or miss."""
+        key = execution_cache_key(execution)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() >= entry[1]:
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(
+        self, execution: JavaScriptExecution, result: WorkerExecutionResult
+    ) -> None:
+        """Store *result* if the execution succeeded."""
+        if result.status != "success":
+            return
+        key = execution_cache_key(execution)
+        with self._lock:
+            self._entries[key] = (result, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> ExecutionCacheStats:
+        with self._lock:
+            return ExecutionCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._entries),
+            )
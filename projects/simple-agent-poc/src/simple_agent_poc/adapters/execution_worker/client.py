@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
+import contextvars
 import json
-from collections.abc import Callable
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from http.client import HTTPException
 from typing import Any, Literal, Protocol, Self, TypedDict, cast
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.request import Request
+
+from simple_agent_poc.adapters.execution_worker.breaker import (
+    CircuitBreaker,
+    CircuitState,
+    Permit,
+)
+from simple_agent_poc.adapters.execution_worker.pool import ConnectionPool
+from simple_agent_poc.observability.metrics import record_event
+from simple_agent_poc.observability.tracing import current_traceparent
 
 WorkerErrorCategory = Literal[
     "validation",
@@ -26,14 +40,51 @@ class ExecuteRequestPayload(TypedDict, total=False):
     timeoutMs: int
 
 
+OutputStream = Literal["stdout", "stderr"]
+
+# Receives the output of a streamed execution, one chunk at a time.
+OutputListener = Callable[[OutputStream, str], None]
+
+# Capabilities the worker lists under ``capabilities`` in ``GET /healthz`` when
+# it serves ``POST /execute/batch`` and ``POST /execute/stream``.
+BATCH_CAPABILITY = "execute_batch"
+STREAM_CAPABILITY = "execute_stream"
+
+# Statuses of an optional endpoint meaning the worker does not serve it after all.
+_UNSUPPORTED_ENDPOINT_STATUSES = frozenset([404, 405, 501])
+
+
 @dataclass(frozen=True)
 class ExecutionWorkerConfig:
     base_url: str
     timeout_seconds: float = 5.0
+    max_connections: int = 10
+    idle_timeout_seconds: float = 30.0
+    breaker_failure_threshold: int = 5
+    breaker_probe_interval_seconds: float = 5.0
+    capabilities_ttl_seconds: float = 300.0
 
     def execute_url(self) -> str:
         return f"{self.base_url.rstrip('/')}/execute"
 
+    def batch_url(self) -> str:
+        return f"{self.base_url.rstrip('/')}/execute/batch"
+
+    def stream_url(self) -> str:
+        return f"{self.base_url.rstrip('/')}/execute/stream"
+
+    def health_url(self) -> str:
+        return f"{self.base_url.rstrip('/')}/healthz"
+
+
+@dataclass(frozen=True)
+class JavaScriptExecution:
+    """One execution of an ``execute_javascript_batch`` call."""
+
+    code: str
+    input_data: Any = None
+    timeout_ms: int | None = None
+
 
 @dataclass(frozen=True)
 class WorkerError:
@@ -54,6 +105,8 @@ class WorkerExecutionResult:
     duration_ms: int | None = None
     applied_timeout_ms: int | None = None
     error: WorkerError | None = None
+    # Set while the client's circuit breaker is open or half-open.
+    circuit_state: CircuitState | None = None
 
 
 class _Response(Protocol):
@@ -66,21 +119,97 @@ class _Response(Protocol):
     def __exit__(self, exc_type: object, exc: object, traceback: object) -> None: ...
 
 
+class _StreamResponse(_Response, Protocol):
+    def readline(self) -> bytes: ...
+
+
 _UrlOpen = Callable[..., _Response]
+_StreamOpen = Callable[..., _StreamResponse]
 _JSON_PARSE_ERRORS = (UnicodeDecodeError, json.JSONDecodeError)
+_TRANSPORT_ERRORS = (TimeoutError, URLError, OSError, HTTPException)
 
 
 class ExecutionWorkerClient:
-    """Call execution-worker and preserve its error contract."""
+    """Call execution-worker and preserve its error contract.
+
+    Requests go through a keep-alive ``ConnectionPool`` sized by *config*
+    unless an ``opener`` with the ``urlopen`` signature is injected.
+
+    ``execute_javascript_batch`` sends several executions in one round trip
+    to ``POST /execute/batch`` when the worker advertises the
+    ``execute_batch`` capability, and falls back to concurrent single calls
+    otherwise.
+
+    ``execute_javascript`` with an ``on_output`` listener reads the NDJSON
+    response of ``POST /execute/stream`` line by line when the worker
+    advertises the ``execute_stream`` capability, passing output to the
+    listener as it arrives. Output lines are not kept; the final result is the
+    same as from ``POST /execute``.
+
+    Capabilities come from ``GET /healthz``, fetched by
+    ``refresh_capabilities``, by a background thread once they are older than
+    ``capabilities_ttl_seconds``, and by the breaker's probe; calls never wait
+    for them. While they are unknown, the optional endpoints are tried and an
+    endpoint answering 404, 405 or 501 is not used again until the next
+    refresh.
+
+    A ``CircuitBreaker`` counts ``upstream_unavailable`` results, including
+    transport timeouts. Once it opens, calls fail fast with the
+    ``CIRCUIT_OPEN`` code instead of waiting for the timeout, until a
+    background ``GET /healthz`` probe answers 200, or 404, 405 or 501 from a
+    worker that does not serve it; the next call is then sent as a trial. A
+    call that raises anything else is recorded as a failure before the
+    exception propagates.
+    """
 
     def __init__(
         self,
         config: ExecutionWorkerConfig,
         *,
-        opener: _UrlOpen = urlopen,
+        opener: _UrlOpen | None = None,
     ) -> None:
         self._config = config
+        self._pool: ConnectionPool | None = None
+        if opener is None:
+            self._pool = ConnectionPool(
+                max_connections=config.max_connections,
+                idle_timeout_seconds=config.idle_timeout_seconds,
+            )
+            opener = self._pool
         self._opener = opener
+        # None while the worker's capabilities are unknown.
+        self._capabilities: frozenset[str] | None = None
+        # Optional endpoints the worker turned out not to serve.
+        self._unsupported: set[str] = set()
+        self._capabilities_expire_at = 0.0
+        self._capabilities_lock = threading.Lock()
+        self._refresher: threading.Thread | None = None
+        self._breaker = CircuitBreaker(
+            self._probe_health,
+            failure_threshold=config.breaker_failure_threshold,
+            probe_interval_seconds=config.breaker_probe_interval_seconds,
+        )
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        return self._breaker.state
+
+    def refresh_capabilities(self) -> None:
+        """Ask the worker which optional endpoints it serves.
+
+        A failed or unhealthy reply leaves the capabilities as they were.
+        """
+        try:
+            status, body = self._request(self._config.health_url(), None)
+        except _TRANSPORT_ERRORS:
+            status, body = 0, b""
+        self._store_capabilities(status, body)
+
+    def close(self) -> None:
+        """Stop the health probe and close the client's idle connections."""
+        self._breaker.close()
+        if self._pool is not None:
+            self._pool.close()
 
     def execute_javascript(
         self,
@@ -88,39 +217,277 @@ class ExecutionWorkerClient:
         code: str,
         input_data: Any = None,
         timeout_ms: int | None = None,
+        on_output: OutputListener | None = None,
     ) -> WorkerExecutionResult:
-        payload: ExecuteRequestPayload = {
-            "language": "javascript",
-            "code": code,
+        """Run *code* on the worker.
+
+        With *on_output*, output is streamed to it while the code runs, if
+        the worker can stream.
+        """
+        permit = self._breaker.allow()
+        if permit is None:
+            return self._circuit_open()
+        payload = _execute_payload(
+            JavaScriptExecution(code=code, input_data=input_data, timeout_ms=timeout_ms)
+        )
+        try:
+            result = None
+            if on_output is not None and self._supports(STREAM_CAPABILITY):
+                result = self._execute_streaming(payload, on_output)
+            if result is None:
+                status, body = self._request(self._config.execute_url(), payload)
+                result = self._map_response(status, body)
+        except _TRANSPORT_ERRORS as error:
+            result = self._upstream_unavailable(str(error) or type(error).__name__)
+        except BaseException:
+            # Record the failure so a half-open trial is never left in flight.
+            self._breaker.record(permit, success=False)
+            raise
+        return self._settle(permit, [result])[0]
+
+    def execute_javascript_batch(
+        self, executions: Sequence[JavaScriptExecution]
+    ) -> list[WorkerExecutionResult]:
+        """Run *executions* and return one result per execution, in order."""
+        if len(executions) < 2:
+            return [self._execute_one(execution) for execution in executions]
+        if self._breaker.state == "open":
+            return [self._circuit_open() for _ in executions]
+        if self._supports(BATCH_CAPABILITY):
+            results = self._execute_batch(executions)
+            if results is not None:
+                return results
+        return self._execute_each(executions)
+
+    def _execute_one(self, execution: JavaScriptExecution) -> WorkerExecutionResult:
+        return self.execute_javascript(
+            code=execution.code,
+            input_data=execution.input_data,
+            timeout_ms=execution.timeout_ms,
+        )
+
+    def _supports(self, capability: str) -> bool:
+        """Return whether to try *capability*'s endpoint, without waiting."""
+        if time.monotonic() >= self._capabilities_expire_at:
+            self._refresh_in_background()
+        if capability in self._unsupported:
+            return False
+        capabilities = self._capabilities
+        return capabilities is None or capability in capabilities
+
+    def _drop_capability(self, capability: str) -> None:
+        self._unsupported.add(capability)
+
+    def _refresh_in_background(self) -> None:
+        with self._capabilities_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            # Ask at most once per TTL, even when the worker does not answer.
+            self._capabilities_expire_at = (
+                time.monotonic() + self._config.capabilities_ttl_seconds
+            )
+            self._refresher = threading.Thread(
+                target=self.refresh_capabilities,
+                name="execution-worker-capabilities",
+                daemon=True,
+            )
+            self._refresher.start()
+
+    def _store_capabilities(self, status: int, body: bytes) -> None:
+        health = _parse_json_object(body) if status == 200 else None
+        capabilities = health.get("capabilities") if health else None
+        with self._capabilities_lock:
+            self._capabilities_expire_at = (
+                time.monotonic() + self._config.capabilities_ttl_seconds
+            )
+            if not isinstance(capabilities, list):
+                return
+            self._capabilities = frozenset(str(name) for name in capabilities)
+            self._unsupported.clear()
+
+    def _execute_streaming(
+        self, payload: ExecuteRequestPayload, on_output: OutputListener
+    ) -> WorkerExecutionResult | None:
+        """Stream one execution; None when the worker turns out not to serve it."""
+        request = self._build_request(self._config.stream_url(), payload)
+        # The pool hands out unread responses through ``open_stream``; a
+        # ``urlopen``-style opener returns them unread anyway.
+        open_stream = cast(
+            _StreamOpen, getattr(self._opener, "open_stream", self._opener)
+        )
+        try:
+            with open_stream(request, timeout=self._config.timeout_seconds) as response:
+                if response.status == 200:
+                    return self._read_stream(response, on_output)
+                status, body = response.status, response.read()
+        except HTTPError as error:
+            status, body = error.code, error.read()
+        if status in _UNSUPPORTED_ENDPOINT_STATUSES:
+            self._drop_capability(STREAM_CAPABILITY)
+            return None
+        # Requests rejected before the code runs get a plain JSON response.
+        return self._map_response(status, body)
+
+    def _read_stream(
+        self, response: _StreamResponse, on_output: OutputListener
+    ) -> WorkerExecutionResult:
+        # Read to the end, past the result line, so a pooled connection can
+        # be reused.
+        result: WorkerExecutionResult | None = None
+        for line in iter(response.readline, b""):
+            if not line.strip():
+                continue
+            message = _parse_json_object(line)
+            if message is None:
+                return self._upstream_unavailable(
+                    "execution-worker returned an invalid stream line"
+                )
+            kind = message.get("type")
+            if kind == "output":
+                stream = message.get("stream")
+                data = message.get("data")
+                if isinstance(data, str) and data:
+                    on_output("stderr" if stream == "stderr" else "stdout", data)
+            elif kind == "result" and result is None:
+                result = self._map_result_item(message)
+        if result is None:
+            return self._upstream_unavailable(
+                "execution-worker stream ended without a result"
+            )
+        return result
+
+    def _execute_batch(
+        self, executions: Sequence[JavaScriptExecution]
+    ) -> list[WorkerExecutionResult] | None:
+        """Send one batch request; None when the worker turns out not to serve it."""
+        permit = self._breaker.allow()
+        if permit is None:
+            return [self._circuit_open() for _ in executions]
+        payload = {
+            "requests": [_execute_payload(execution) for execution in executions]
         }
-        if input_data is not None:
-            payload["input"] = input_data
-        if timeout_ms is not None:
-            payload["timeoutMs"] = timeout_ms
-
-        request = Request(
-            self._config.execute_url(),
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"content-type": "application/json"},
-            method="POST",
+        try:
+            status, body = self._request(self._config.batch_url(), payload)
+        except _TRANSPORT_ERRORS as error:
+            unavailable = self._upstream_unavailable(str(error) or type(error).__name__)
+            return self._settle(permit, [unavailable] * len(executions))
+        except BaseException:
+            self._breaker.record(permit, success=False)
+            raise
+        if status in _UNSUPPORTED_ENDPOINT_STATUSES:
+            # The worker answered, so it is reachable.
+            self._breaker.record(permit, success=True)
+            self._drop_capability(BATCH_CAPABILITY)
+            return None
+
+        parsed = _parse_json_object(body)
+        items = parsed.get("results") if parsed is not None and status == 200 else None
+        if isinstance(items, list) and len(items) == len(executions):
+            return self._settle(permit, [self._map_result_item(item) for item in items])
+        # A rejected batch (e.g. 413 or 429) applies to every execution in it.
+        return self._settle(
+            permit, [self._map_response(status, body)] * len(executions)
+        )
+
+    def _settle(
+        self, permit: Permit, results: list[WorkerExecutionResult]
+    ) -> list[WorkerExecutionResult]:
+        """Feed the outcome of one request to the breaker.
+
+        The request failed when every result is ``upstream_unavailable``.
+        While the circuit is not closed, results carry its state.
+        """
+        self._breaker.record(
+            permit, success=not all(_is_unavailable(result) for result in results)
+        )
+        state = self._breaker.state
+        if state == "closed":
+            return results
+        return [replace(result, circuit_state=state) for result in results]
+
+    def _circuit_open(self) -> WorkerExecutionResult:
+        record_event("execution_worker.rejected", {})
+        return WorkerExecutionResult(
+            status="error",
+            error=WorkerError(
+                category="upstream_unavailable",
+                code="CIRCUIT_OPEN",
+                message=(
+                    "execution-worker is unavailable; calls fail fast until "
+                    "its health check passes"
+                ),
+            ),
+            circuit_state=self._breaker.state,
         )
 
+    def _probe_health(self) -> bool:
+        status, body = self._request(self._config.health_url(), None)
+        # A worker coming back may have been replaced by another version.
+        self._store_capabilities(status, body)
+        # A worker without the endpoint is reachable; a real call is the trial.
+        return status == 200 or status in _UNSUPPORTED_ENDPOINT_STATUSES
+
+    def _map_result_item(self, item: object) -> WorkerExecutionResult:
+        """Map a result embedded in a batch or stream response."""
+        if not isinstance(item, dict):
+            return self._upstream_unavailable(
+                "execution-worker returned an invalid result item"
+            )
+        item_data = cast(dict[str, Any], item)
+        http_status = _optional_int(item_data.get("httpStatus")) or 200
+        return self._map_parsed(http_status, item_data)
+
+    def _execute_each(
+        self, executions: Sequence[JavaScriptExecution]
+    ) -> list[WorkerExecutionResult]:
+        workers = min(len(executions), self._config.max_connections)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="execution-worker"
+        ) as pool:
+            # Each call runs in a copy of this context so it keeps the
+            # caller's traceparent.
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run, self._execute_one, execution
+                )
+                for execution in executions
+            ]
+            return [future.result() for future in futures]
+
+    def _request(self, url: str, payload: object | None) -> tuple[int, bytes]:
+        """POST *payload* as JSON to *url*, or GET it when *payload* is None."""
+        request = self._build_request(url, payload)
         try:
             with self._opener(
                 request,
                 timeout=self._config.timeout_seconds,
             ) as response:
-                return self._map_response(response.status, response.read())
+                return response.status, response.read()
         except HTTPError as error:
-            return self._map_response(error.code, error.read())
-        except (TimeoutError, URLError, OSError) as error:
-            return self._upstream_unavailable(str(error))
+            return error.code, error.read()
+
+    @staticmethod
+    def _build_request(url: str, payload: object | None) -> Request:
+        headers = {"content-type": "application/json"} if payload is not None else {}
+        traceparent = current_traceparent()
+        if traceparent is not None:
+            headers["traceparent"] = traceparent
+        return Request(
+            url,
+            data=json.dumps(payload).encode("utf-8") if payload is not None else None,
+            headers=headers,
+            method="POST" if payload is not None else "GET",
+        )
 
     def _map_response(self, http_status: int, body: bytes) -> WorkerExecutionResult:
         parsed = _parse_json_object(body)
         if parsed is None:
             return self._upstream_unavailable("execution-worker returned invalid JSON")
+        return self._map_parsed(http_status, parsed)
 
+    def _map_parsed(
+        self, http_status: int, parsed: dict[str, Any]
+    ) -> WorkerExecutionResult:
         if http_status == 200 and parsed.get("status") == "success":
             return WorkerExecutionResult(
                 status="success",
@@ -159,6 +526,22 @@ class ExecutionWorkerClient:
         )
 
 
+def _is_unavailable(result: WorkerExecutionResult) -> bool:
+    return result.error is not None and result.error.category == "upstream_unavailable"
+
+
+def _execute_payload(execution: JavaScriptExecution) -> ExecuteRequestPayload:
+    payload: ExecuteRequestPayload = {
+        "language": "javascript",
+        "code": execution.code,
+    }
+    if execution.input_data is not None:
+        payload["input"] = execution.input_data
+    if execution.timeout_ms is not None:
+        payload["timeoutMs"] = execution.timeout_ms
+    return payload
+
+
 def _parse_json_object(body: bytes) -> dict[str, Any] | None:
     try:
         parsed = json.loads(body.decode("utf-8"))
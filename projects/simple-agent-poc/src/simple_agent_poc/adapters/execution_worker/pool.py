@@ -0,0 +1,232 @@
+"""Keep-alive ``http.client`` connection pool for execution-worker requests."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from http.client import (
+    HTTPConnection,
+    HTTPResponse,
+    HTTPSConnection,
+    RemoteDisconnected,
+)
+from typing import Self
+from urllib.parse import urlsplit
+from urllib.request import Request
+
+from simple_agent_poc.observability.metrics import record_event
+
+# Errors of a reused connection that the server closed while it sat idle.
+_STALE_CONNECTION_ERRORS = (RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+_Origin = tuple[str, str, int | None]
+
+
+class PooledResponse:
+    """A fully read response, shaped like the one ``urlopen`` returns."""
+
+    def __init__(self, status: int, body: bytes) -> None:
+        self.status = status
+        self._body = body
+
+    def read(self) -> bytes:
+        return self._body
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        return None
+
+
+class StreamingResponse:
+    """An unread response whose connection returns to the pool on exit.
+
+    The connection is reused only if the body was read to its end.
+    """
+
+    def __init__(self, response: HTTPResponse, release: Callable[[bool], None]) -> None:
+        self.status = response.status
+        self._response = response
+        self._release: Callable[[bool], None] | None = release
+
+    def read(self) -> bytes:
+        return self._response.read()
+
+    def readline(self) -> bytes:
+        return self._response.readline()
+
+    def close(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release(self._response.isclosed() and not self._response.will_close)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """Reuse persistent HTTP/1.1 connections, called like ``urlopen``.
+
+    At most ``max_connections`` connections are open at once; a request that
+    finds none free waits for one, up to its timeout. Idle connections older
+    than ``idle_timeout_seconds`` are closed instead of reused. Responses are
+    read in full before the connection is returned, except from
+    ``open_stream``, and every status code is returned as a response instead
+    of being raised as ``HTTPError``.
+
+    Each request reports whether it reused a connection and how long it
+    waited for one as an ``execution_worker.connection`` metrics event.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 10,
+        idle_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        self.max_connections = max_connections
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._clock = clock
+        self._available = threading.Condition()
+        self._idle: dict[_Origin, list[tuple[HTTPConnection, float]]] = {}
+        self._open = 0
+
+    def __call__(self, request: Request, *, timeout: float) -> PooledResponse:
+        origin, connection, response = self._send(request, timeout)
+        try:
+            data = response.read()
+        except BaseException:
+            self._release(origin, connection, reusable=False)
+            raise
+        self._release(origin, connection, reusable=not response.will_close)
+        return PooledResponse(response.status, data)
+
+    def open_stream(self, request: Request, *, timeout: float) -> StreamingResponse:
+        """Send *request* and return its response before the body is read."""
+        origin, connection, response = self._send(request, timeout)
+        return StreamingResponse(
+            response,
+            lambda reusable: self._release(origin, connection, reusable=reusable),
+        )
+
+    def _send(
+        self, request: Request, timeout: float
+    ) -> tuple[_Origin, HTTPConnection, HTTPResponse]:
+        parts = urlsplit(request.full_url)
+        origin: _Origin = (parts.scheme, parts.hostname or "", parts.port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = dict(request.header_items())
+        body = request.data
+        if body is not None and not isinstance(body, bytes):
+            raise TypeError("ConnectionPool only sends bytes request bodies")
+
+        for attempt in range(2):
+            connection, reused = self._acquire(origin, timeout)
+            try:
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                connection.request(
+                    request.get_method(), target, body=body, headers=headers
+                )
+                response = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                self._release(origin, connection, reusable=False)
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                self._release(origin, connection, reusable=False)
+                raise
+            return origin, connection, response
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._available:
+            for idle in self._idle.values():
+                for connection, _last_used in idle:
+                    connection.close()
+                    self._open -= 1
+            self._idle.clear()
+            self._available.notify_all()
+
+    def _acquire(self, origin: _Origin, timeout: float) -> tuple[HTTPConnection, bool]:
+        started = self._clock()
+        deadline = started + timeout
+        with self._available:
+            while True:
+                now = self._clock()
+                connection = self._take_idle(origin, now)
+                if connection is not None:
+                    reused = True
+                    break
+                if self._open < self.max_connections or self._close_oldest_idle():
+                    self._open += 1
+                    reused = False
+                    connection = None
+                    break
+                if now >= deadline:
+                    raise TimeoutError(
+                        "no execution-worker connection became free in time"
+                    )
+                self._available.wait(deadline - now)
+        record_event(
+            "execution_worker.connection",
+            {"reused": reused, "wait_ms": (self._clock() - started) * 1000},
+        )
+        if connection is None:
+            connection = self._connect(origin)
+        return connection, reused
+
+    def _take_idle(self, origin: _Origin, now: float) -> HTTPConnection | None:
+        idle = self._idle.get(origin, [])
+        while idle:
+            # Most recently used first: it is the least likely to be stale.
+            connection, last_used = idle.pop()
+            if now - last_used <= self.idle_timeout_seconds:
+                return connection
+            connection.close()
+            self._open -= 1
+        return None
+
+    def _close_oldest_idle(self) -> bool:
+        """Free a slot held by an idle connection to another origin."""
+        candidates = [(idle[0][1], idle) for idle in self._idle.values() if idle]
+        if not candidates:
+            return False
+        _last_used, idle = min(candidates, key=lambda item: item[0])
+        connection, _ = idle.pop(0)
+        connection.close()
+        self._open -= 1
+        return True
+
+    def _connect(self, origin: _Origin) -> HTTPConnection:
+        scheme, host, port = origin
+        try:
+            if scheme == "https":
+                return HTTPSConnection(host, port)
+            return HTTPConnection(host, port)
+        except BaseException:
+            self._release(origin, None, reusable=False)
+            raise
+
+    def _release(
+        self, origin: _Origin, connection: HTTPConnection | None, *, reusable: bool
+    ) -> None:
+        with self._available:
+            if connection is not None and reusable:
+                self._idle.setdefault(origin, []).append((connection, self._clock()))
+            else:
+                if connection is not None:
+                    connection.close()
+                self._open -= 1
+            self._available.notify()
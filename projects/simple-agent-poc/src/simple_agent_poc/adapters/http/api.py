@@ -1,15 +1,18 @@
 """HTTP API adapter."""
 
 import json
-from collections.abc import Callable
+import time
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
 from dataclasses import asdict
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, Header, HTTPException
 from pydantic import BaseModel, ConfigDict, field_validator
-from starlette.responses import HTMLResponse, StreamingResponse
+from starlette.responses import HTMLResponse, Response, StreamingResponse
 
 from simple_agent_poc.adapters.http.test_page import TEST_PAGE_HTML
+from simple_agent_poc.adapters.llm.http_pool import aclose_shared_http_pool
 from simple_agent_poc.application.dto import (
     ContentDelta,
     ContinueRequest,
@@ -17,6 +20,7 @@ from simple_agent_poc.application.dto import (
     SessionPaused,
     StreamComplete,
     ToolCallEvent,
+    ToolProgressEvent,
     ToolResultEvent,
 )
 from simple_agent_poc.application.use_cases import RunAgentUseCase
@@ -28,9 +32,20 @@ from simple_agent_poc.core.types import (
 )
 from simple_agent_poc.entrypoints.bootstrap import (
     create_agent_definition_registry,
+    create_default_tool_executor,
     create_run_agent_use_case_factory,
 )
 from simple_agent_poc.observability import log_event, summarize_payload
+from simple_agent_poc.observability.metrics import render_metrics
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# The last outcome frame seen decides how a stream ended.
+_FRAME_OUTCOMES = {
+    "event: complete": "completed",
+    "event: paused": "paused",
+    "event: error": "error",
+}
 
 
 class ChatRequest(BaseModel):
@@ -100,20 +115,60 @@ def resolve_session_id(
     )
 
 
+async def _observed_stream(
+    endpoint: str, frames: AsyncGenerator[str]
+) -> AsyncGenerator[str]:
+    """Emit ``http.stream.start`` / ``http.stream.end`` around an SSE stream.
+
+    The outcome is ``disconnected`` when the client goes away before an
+    outcome frame was sent.
+    """
+    started = time.perf_counter()
+    outcome = "disconnected"
+    log_event("http.stream.start", endpoint=endpoint)
+    try:
+        async for frame in frames:
+            outcome = _FRAME_OUTCOMES.get(frame.split("\n", 1)[0], outcome)
+            yield frame
+    finally:
+        await frames.aclose()
+        log_event(
+            "http.stream.end",
+            endpoint=endpoint,
+            outcome=outcome,
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+        )
+
+
 def create_app(
     *,
     use_case_factory: Callable[[], RunAgentUseCase] | None = None,
     agent_definitions: AgentDefinitionRegistry | None = None,
 ) -> FastAPI:
-    app = FastAPI(title="simple-agent-poc")
-    factory = use_case_factory or create_run_agent_use_case_factory()
+    tool_executor = None
+    if use_case_factory is None:
+        tool_executor = create_default_tool_executor()
+        use_case_factory = create_run_agent_use_case_factory(
+            tool_executor=tool_executor
+        )
+    factory = use_case_factory
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+        yield
+        # The shared LLM HTTP pool's async connections belong to this event loop.
+        await aclose_shared_http_pool()
+        if tool_executor is not None:
+            tool_executor.close()
+
+    app = FastAPI(title="simple-agent-poc", lifespan=lifespan)
     definitions = agent_definitions or create_agent_definition_registry()
 
-    def get_run_agent_use_case() -> RunAgentUseCase:
+    async def get_run_agent_use_case() -> RunAgentUseCase:
         return factory()
 
     @app.post("/api/chat")
-    def chat(
+    async def chat(
         request: ChatRequest,
         run_agent: Annotated[RunAgentUseCase, Depends(get_run_agent_use_case)],
         *,
@@ -127,9 +182,9 @@ def create_app(
             body_session_id=request.session_id,
         )
 
-        def event_stream():
+        async def event_stream():
             try:
-                for event in run_agent.execute_stream(
+                async for event in run_agent.aexecute_stream(
                     RunAgentRequest(
                         message=request.message,
                         session_id=session_id,
@@ -140,6 +195,8 @@ def create_app(
                         yield f"event: delta\ndata: {json.dumps({'content': event.delta}, ensure_ascii=False)}\n\n"
                     elif isinstance(event, ToolCallEvent):
                         yield f"event: tool_call\ndata: {json.dumps(asdict(event), ensure_ascii=False)}\n\n"
+                    elif isinstance(event, ToolProgressEvent):
+                        yield f"event: tool_progress\ndata: {json.dumps(asdict(event), ensure_ascii=False)}\n\n"
                     elif isinstance(event, ToolResultEvent):
                         yield f"event: tool_result\ndata: {json.dumps(asdict(event), ensure_ascii=False)}\n\n"
                     elif isinstance(event, SessionPaused):
@@ -159,26 +216,31 @@ def create_app(
                 log_event("http.request.error", error=summarize_payload(str(error)))
                 yield f"event: error\ndata: {json.dumps({'detail': str(error)}, ensure_ascii=False)}\n\n"
 
-        return StreamingResponse(event_stream(), media_type="text/event-stream")
+        return StreamingResponse(
+            _observed_stream("/api/chat", event_stream()),
+            media_type="text/event-stream",
+        )
 
     @app.post("/api/chat/continue")
-    def chat_continue(
+    async def chat_continue(
         request: ResumeRequest,
         run_agent: Annotated[RunAgentUseCase, Depends(get_run_agent_use_case)],
     ):
-        def event_stream():
-            generator = run_agent.continue_stream(
+        async def event_stream():
+            generator = run_agent.acontinue_stream(
                 ContinueRequest(
                     session_id=request.session_id,
                     answers=request.answers,
                 )
             )
             try:
-                for event in generator:
+                async for event in generator:
                     if isinstance(event, ContentDelta):
                         yield f"event: delta\ndata: {json.dumps({'content': event.delta}, ensure_ascii=False)}\n\n"
                     elif isinstance(event, ToolCallEvent):
                         yield f"event: tool_call\ndata: {json.dumps(asdict(event), ensure_ascii=False)}\n\n"
+                    elif isinstance(event, ToolProgressEvent):
+                        yield f"event: tool_progress\ndata: {json.dumps(asdict(event), ensure_ascii=False)}\n\n"
                     elif isinstance(event, ToolResultEvent):
                         yield f"event: tool_result\ndata: {json.dumps(asdict(event), ensure_ascii=False)}\n\n"
                     elif isinstance(event, SessionPaused):
@@ -197,14 +259,21 @@ def create_app(
             except Exception as error:  # noqa: BLE001
                 yield f"event: error\ndata: {json.dumps({'detail': str(error)}, ensure_ascii=False)}\n\n"
             finally:
-                generator.close()
+                await generator.aclose()
 
-        return StreamingResponse(event_stream(), media_type="text/event-stream")
+        return StreamingResponse(
+            _observed_stream("/api/chat/continue", event_stream()),
+            media_type="text/event-stream",
+        )
 
     @app.get("/api/agents")
     def list_agents() -> dict[str, list[dict[str, str]]]:
         return {"agents": definitions.list_agents()}
 
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
     @app.get("/", response_class=HTMLResponse)
     def test_page() -> HTMLResponse:
         return HTMLResponse(TEST_PAGE_HTML)
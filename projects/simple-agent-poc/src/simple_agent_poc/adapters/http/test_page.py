@@ -293,6 +293,9 @@ async function sendStreamMessage(message) {
         const d = JSON.parse(event.data);
         appendLine("conv-log", "line-tool", "  Tool: " + d.name + "(" + d.arguments + ")");
         appendJson("tool-log", "line-tool", d);
+      } else if (event.type === "tool_progress") {
+        const d = JSON.parse(event.data);
+        appendLog("tool-log", d.stream === "stderr" ? "line-error" : "line-tool", d.data);
       } else if (event.type === "tool_result") {
         const d = JSON.parse(event.data);
         appendLine("conv-log", "line-tool", "  Result: " + truncate(d.result, 200));
@@ -477,6 +480,9 @@ async function continueStream(sessionId, answers) {
         const d = JSON.parse(event.data);
         appendLine("conv-log", "line-tool", "  Tool: " + d.name + "(" + d.arguments + ")");
         appendJson("tool-log", "line-tool", d);
+      } else if (event.type === "tool_progress") {
+        const d = JSON.parse(event.data);
+        appendLog("tool-log", d.stream === "stderr" ? "line-error" : "line-tool", d.data);
       } else if (event.type === "tool_result") {
         const d = JSON.parse(event.data);
         appendLine("conv-log", "line-tool", "  Result: " + truncate(d.result, 200));
@@ -0,0 +1,165 @@
+"""Shared keep-alive HTTP connection pools for LiteLLM requests."""
+
+import threading
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+
+import httpx
+import litellm
+
+_DONE_MARKER = b"[DONE]"
+_TAIL_BYTES = 32
+_MAX_DRAIN_BYTES = 64 * 1024
+_REQUEST_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_install_lock = threading.Lock()
+# The pools installed into LiteLLM, until they are closed.
+_installed: tuple[httpx.Client, httpx.AsyncClient] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class HTTPPoolLimits:
+    """Connection limits of the shared LLM HTTP pools."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+
+    def to_httpx(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+
+def _ends_with_done(tail: bytes) -> bool:
+    return tail.rstrip().endswith(_DONE_MARKER)
+
+
+class _DrainingStream(httpx.SyncByteStream):
+    """Finish reading a completed SSE body before closing it.
+
+    OpenAI-compatible SDK streams stop at ``data: [DONE]`` and close the
+    response before reading the end of the body, which makes httpx drop the
+    connection instead of returning it to the pool. When the body has
+    already reached ``[DONE]``, the few remaining bytes are read on close so
+    the connection can be reused. Abandoned streams are closed as-is.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream) -> None:
+        self._stream = stream
+        self._chunks: Iterator[bytes] | None = None
+        self._tail = b""
+
+    def __iter__(self) -> Iterator[bytes]:
+        self._chunks = iter(self._stream)
+        for chunk in self._chunks:
+            self._tail = (self._tail + chunk)[-_TAIL_BYTES:]
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            if self._chunks is not None and _ends_with_done(self._tail):
+                drained = 0
+                for chunk in self._chunks:
+                    drained += len(chunk)
+                    if drained > _MAX_DRAIN_BYTES:
+                        break
+        finally:
+            self._stream.close()
+
+
+class _AsyncDrainingStream(httpx.AsyncByteStream):
+    """Async variant of ``_DrainingStream``."""
+
+    def __init__(self, stream: httpx.AsyncByteStream) -> None:
+        self._stream = stream
+        self._chunks: AsyncIterator[bytes] | None = None
+        self._tail = b""
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self._chunks = aiter(self._stream)
+        async for chunk in self._chunks:
+            self._tail = (self._tail + chunk)[-_TAIL_BYTES:]
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            if self._chunks is not None and _ends_with_done(self._tail):
+                drained = 0
+                async for chunk in self._chunks:
+                    drained += len(chunk)
+                    if drained > _MAX_DRAIN_BYTES:
+                        break
+        finally:
+            await self._stream.aclose()
+
+
+class KeepAliveTransport(httpx.HTTPTransport):
+    """HTTP transport that keeps finished SSE connections reusable."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = super().handle_request(request)
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        response.stream = _DrainingStream(response.stream)
+        return response
+
+
+class AsyncKeepAliveTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport that keeps finished SSE connections reusable."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await super().handle_async_request(request)
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _AsyncDrainingStream(response.stream)
+        return response
+
+
+def install_shared_http_pool(limits: HTTPPoolLimits | None = None) -> None:
+    """Route LiteLLM's OpenAI-compatible requests through shared pools.
+
+    LiteLLM builds its provider SDK clients around ``litellm.client_session``
+    and ``litellm.aclient_session`` when they are set, so every client and
+    every run in the process reuses the same warm connections. The async
+    pool belongs to the event loop that first uses it (the API server's).
+
+    Only the first call installs the pools; later calls keep them, along
+    with their limits, until ``aclose_shared_http_pool`` closes them.
+    """
+    global _installed
+    with _install_lock:
+        if _installed is not None:
+            return
+        pool_limits = (limits or HTTPPoolLimits()).to_httpx()
+        client = httpx.Client(
+            transport=KeepAliveTransport(limits=pool_limits),
+            timeout=_REQUEST_TIMEOUT,
+        )
+        aclient = httpx.AsyncClient(
+            transport=AsyncKeepAliveTransport(limits=pool_limits),
+            timeout=_REQUEST_TIMEOUT,
+        )
+        litellm.client_session = client
+        litellm.aclient_session = aclient
+        _installed = (client, aclient)
+
+
+async def aclose_shared_http_pool() -> None:
+    """Close the pools ``install_shared_http_pool`` installed, if any.
+
+    Call it on the event loop that used the async pool. LiteLLM falls back
+    to its own clients until the pools are installed again.
+    """
+    global _installed
+    with _install_lock:
+        installed, _installed = _installed, None
+        if installed is None:
+            return
+        client, aclient = installed
+        if litellm.client_session is client:
+            litellm.client_session = None
+        if litellm.aclient_session is aclient:
+            litellm.aclient_session = None
+    client.close()
+    await aclient.aclose()
@@ -1,10 +1,23 @@
 """LLM client implementation."""
 
+import asyncio
+import hashlib
+import json
+import math
+import threading
 import time
 import warnings
-from collections.abc import Iterator
+from abc import ABC, abstractmethod
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from contextlib import suppress
 
-from litellm import completion, responses
+from litellm import acompletion, aresponses, completion, responses
 from litellm.exceptions import (
     AuthenticationError as LiteLLMAuthError,
 )
@@ -12,9 +25,18 @@ from litellm.exceptions import (
     RateLimitError as LiteLLMRateLimitError,
 )
 
-from simple_agent_poc.application.ports import LLMClient
+from simple_agent_poc.adapters.llm.rate_limit import RateLimiter
+from simple_agent_poc.adapters.llm.retry import (
+    RetryPolicy,
+    can_fall_back,
+    is_retryable,
+    retry_after_seconds,
+)
+from simple_agent_poc.application.compaction import estimate_tokens
+from simple_agent_poc.application.ports import AsyncLLMClient, LLMClient
 from simple_agent_poc.core.agent_definition import AgentDefinition
 from simple_agent_poc.core.types import (
+    AgentError,
     AuthenticationError,
     LLMError,
     LLMStreamChunk,
@@ -150,12 +172,367 @@ def _parse_tool_calls_from_responses_output(output) -> list[ToolCall]:
     return result
 
 
-class LiteLLMCompletionClient(LLMClient):
-    """LLM client using litellm.completion()."""
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _with_cache_breakpoints(messages: list[Message]) -> list[dict]:
+    """Mark the system prompt and the stable history prefix as cacheable.
+
+    Breakpoints go on the last leading system message, on the last message
+    with text (the prefix the next round will repeat) and on the user
+    message that started the current turn. Marked contents become a single
+    text block carrying ``cache_control``; other messages are unchanged.
+    """
+    result: list[dict] = [dict(msg) for msg in messages]
+    breakpoints: set[int] = set()
+    system_end = 0
+    while system_end < len(result) and result[system_end]["role"] == "system":
+        system_end += 1
+    if system_end:
+        breakpoints.add(system_end - 1)
+    for idx in range(len(result) - 1, system_end - 1, -1):
+        if result[idx].get("content"):
+            breakpoints.add(idx)
+            break
+    for idx in range(len(result) - 1, system_end - 1, -1):
+        if result[idx]["role"] == "user" and result[idx].get("content"):
+            breakpoints.add(idx)
+            break
+    for idx in breakpoints:
+        result[idx]["content"] = [
+            {
+                "type": "text",
+                "text": result[idx]["content"],
+                "cache_control": _CACHE_CONTROL,
+            }
+        ]
+    return result
+
+
+def _tools_with_cache_breakpoint(tools: list[ToolDefinition]) -> list[dict]:
+    """Mark the end of the tool list so the whole list is cacheable."""
+    result: list[dict] = [dict(tool) for tool in tools]
+    result[-1]["cache_control"] = _CACHE_CONTROL
+    return result
+
+
+def _prompt_cache_key(
+    messages: list[Message], tools: list[ToolDefinition] | None
+) -> str:
+    """Derive a stable cache-routing key from the system prompt and tools."""
+    digest = hashlib.sha256()
+    for msg in messages:
+        if msg["role"] != "system":
+            break
+        digest.update(msg["content"].encode())
+    digest.update(json.dumps(tools or [], sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+
+def _int_or_none(value: object) -> int | None:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _completion_cached_tokens(usage) -> int | None:
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = _int_or_none(getattr(details, "cached_tokens", None))
+    if cached is None:
+        cached = _int_or_none(getattr(usage, "cache_read_input_tokens", None))
+    return cached
+
+
+def _responses_cached_tokens(usage) -> int | None:
+    details = getattr(usage, "input_tokens_details", None)
+    return _int_or_none(getattr(details, "cached_tokens", None))
+
+
+def _cache_hit_ratio(usage: Usage | None) -> float | None:
+    if not usage or "cached_tokens" not in usage or not usage["prompt_tokens"]:
+        return None
+    return round(usage["cached_tokens"] / usage["prompt_tokens"], 4)
+
+
+def _to_agent_error(error: Exception) -> AgentError:
+    """Log a failed LLM request and map it to a domain error."""
+    log_event(
+        "llm.stream.error",
+        error=summarize_payload(str(error)),
+    )
+    if isinstance(error, LiteLLMAuthError):
+        return AuthenticationError(
+            message=str(error),
+            display_message="Authentication failed: Invalid API key. Please check your API_KEY setting.",
+        )
+    if isinstance(error, LiteLLMRateLimitError):
+        return RateLimitError(
+            message=str(error),
+            display_message="Rate limit exceeded. Please wait a moment before trying again.",
+        )
+    error_msg = str(error).lower()
+    if "authentication" in error_msg or "api key" in error_msg or "401" in error_msg:
+        return AuthenticationError(
+            message=str(error),
+            display_message="Authentication failed: Invalid API key. Please check your API_KEY setting.",
+        )
+    return LLMError(
+        message=str(error),
+        display_message=f"An error occurred while communicating with the LLM: {error}",
+    )
+
+
+class _CompletionStreamParser:
+    """Translate ``litellm.completion`` stream chunks into ``LLMStreamChunk``."""
+
+    def __init__(self) -> None:
+        self.last_usage: Usage | None = None
+        self.tool_call_count = 0
+        self._seen_call_ids: set[str] = set()
+
+    def parse(self, chunk) -> list[LLMStreamChunk]:
+        result: list[LLMStreamChunk] = []
+        chunk_data: LLMStreamChunk = {"content_delta": None}
+        if chunk.choices:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                chunk_data["content_delta"] = delta.content
+            if hasattr(delta, "tool_calls") and delta.tool_calls:
+                tc_deltas = _parse_tool_call_delta(delta.tool_calls)
+                for td in tc_deltas:
+                    tc_chunk: LLMStreamChunk = {
+                        "content_delta": None,
+                        "tool_call_delta": td,
+                    }
+                    call_id = td.get("id")
+                    if call_id and call_id not in self._seen_call_ids:
+                        self._seen_call_ids.add(call_id)
+                        self.tool_call_count += 1
+                    result.append(tc_chunk)
+        if hasattr(chunk, "usage") and chunk.usage is not None:
+            usage: Usage = {
+                "prompt_tokens": chunk.usage.prompt_tokens,
+                "completion_tokens": chunk.usage.completion_tokens,
+                "total_tokens": chunk.usage.total_tokens,
+            }
+            cached_tokens = _completion_cached_tokens(chunk.usage)
+            if cached_tokens is not None:
+                usage["cached_tokens"] = cached_tokens
+            chunk_data["usage"] = usage
+            self.last_usage = usage
+        if chunk_data["content_delta"] is not None or "usage" in chunk_data:
+            result.append(chunk_data)
+        return result
+
+
+class _ResponsesStreamParser:
+    """Translate ``litellm.responses`` stream events into ``LLMStreamChunk``."""
+
+    def __init__(self) -> None:
+        self.last_usage: Usage | None = None
+        self.tool_call_count = 0
+        self._call_ids_by_output_index: dict[int, str] = {}
+
+    def parse(self, event) -> list[LLMStreamChunk]:
+        event_type = getattr(event, "type", None)
+
+        if event_type == "response.output_item.added":
+            item = getattr(event, "item", None)
+            if item is None or _item_type(item) != "function_call":
+                return []
+            output_index = getattr(event, "output_index", 0)
+            call_id = _item_attr(item, "call_id", None)
+            if call_id:
+                self._call_ids_by_output_index[output_index] = call_id
+                self.tool_call_count += 1
+            td: ToolCallDelta = {
+                "index": output_index,
+                "id": call_id,
+                "type": "function",
+                "function": {
+                    "name": _item_attr(item, "name", None),
+                    "arguments": _item_attr(item, "arguments", None),
+                },
+            }
+            return [{"content_delta": None, "tool_call_delta": td}]
+
+        if event_type == "response.function_call_arguments.delta":
+            output_index = getattr(event, "output_index", 0)
+            td: ToolCallDelta = {
+                "index": output_index,
+                "id": self._call_ids_by_output_index.get(output_index),
+                "type": "function",
+                "function": {
+                    "name": None,
+                    "arguments": getattr(event, "delta", None),
+                },
+            }
+            return [{"content_delta": None, "tool_call_delta": td}]
+
+        chunk_data: LLMStreamChunk = {"content_delta": None}
+        if hasattr(event, "delta") and event.delta:
+            chunk_data["content_delta"] = event.delta
+        if hasattr(event, "response") and hasattr(event.response, "usage"):
+            usage_obj = event.response.usage
+            if usage_obj is not None:
+                usage: Usage = {
+                    "prompt_tokens": usage_obj.input_tokens,
+                    "completion_tokens": usage_obj.output_tokens,
+                    "total_tokens": usage_obj.total_tokens,
+                }
+                cached_tokens = _responses_cached_tokens(usage_obj)
+                if cached_tokens is not None:
+                    usage["cached_tokens"] = cached_tokens
+                chunk_data["usage"] = usage
+                self.last_usage = usage
+        if chunk_data["content_delta"] is not None or "usage" in chunk_data:
+            return [chunk_data]
+        return []
+
+
+_NO_RETRY = RetryPolicy(max_attempts=1)
+_UNLIMITED = RateLimiter()
+
+
+def _total_tokens(usage: Usage | None) -> int | None:
+    return usage["total_tokens"] if usage else None
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of non-empty ``values``."""
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
 
-    def __init__(self, model: str, *, temperature: float | None = None) -> None:
+
+class _StreamTimings:
+    """Latency of one stream, measured where output chunks are yielded.
+
+    Time to first token counts from the start of the call, so it includes
+    rate-limit waits and retries. Gaps are measured between provider chunks
+    that produced content or tool-call output, and include time the caller
+    spent handling the previous chunk.
+    """
+
+    def __init__(self, start_time: float) -> None:
+        self.start_time = start_time
+        self.chunk_count = 0
+        self._first_time: float | None = None
+        self._last_time: float | None = None
+        self._gaps: list[float] = []
+
+    def record(self, parsed: list[LLMStreamChunk]) -> None:
+        """Record the arrival of a provider chunk and the output it produced.
+
+        Usage-only chunks carry no output and are not counted.
+        """
+        chunk_count = sum(
+            1
+            for chunk in parsed
+            if chunk.get("content_delta") or "tool_call_delta" in chunk
+        )
+        if not chunk_count:
+            return
+        now = time.perf_counter()
+        if self._last_time is None:
+            self._first_time = now
+        else:
+            self._gaps.append(now - self._last_time)
+        self._last_time = now
+        self.chunk_count += chunk_count
+
+    def fields(self, usage: Usage | None) -> dict[str, object]:
+        """Return the latency fields of the ``llm.stream.end`` event."""
+        if self._first_time is None or self._last_time is None:
+            return {
+                "ttft_ms": None,
+                "chunk_count": 0,
+                "max_gap_ms": None,
+                "p95_gap_ms": None,
+                "output_tokens_per_second": None,
+            }
+        generation = self._last_time - self._first_time
+        completion_tokens = usage["completion_tokens"] if usage else None
+        return {
+            "ttft_ms": _ms(self._first_time - self.start_time),
+            "chunk_count": self.chunk_count,
+            "max_gap_ms": _ms(max(self._gaps)) if self._gaps else None,
+            "p95_gap_ms": _ms(_percentile(self._gaps, 0.95)) if self._gaps else None,
+            "output_tokens_per_second": (
+                round(completion_tokens / generation, 1)
+                if completion_tokens and generation > 0
+                else None
+            ),
+        }
+
+
+def _ms(seconds: float) -> int:
+    return int(seconds * 1000)
+
+
+def _first_chunks(chunks: Iterator, parser) -> list[LLMStreamChunk]:
+    """Read raw chunks until the first one that produces output."""
+    for chunk in chunks:
+        parsed = parser.parse(chunk)
+        if parsed:
+            return parsed
+    return []
+
+
+def _close_response(response: object) -> None:
+    """Close a stream that will not be read to the end, if it can be closed."""
+    close = getattr(response, "close", None)
+    if callable(close):
+        with suppress(Exception):
+            close()
+
+
+async def _aclose_response(response: object) -> None:
+    aclose = getattr(response, "aclose", None)
+    if callable(aclose):
+        with suppress(Exception):
+            await aclose()
+        return
+    _close_response(response)
+
+
+async def _afirst_chunks(chunks: AsyncIterator, parser) -> list[LLMStreamChunk]:
+    """Read raw chunks until the first one that produces output."""
+    async for chunk in chunks:
+        parsed = parser.parse(chunk)
+        if parsed:
+            return parsed
+    return []
+
+
+class _LiteLLMClient(LLMClient, AsyncLLMClient, ABC):
+    """Shared streaming, retry and fallback logic of the LiteLLM clients.
+
+    Failures before the first chunk is yielded are retried with the
+    ``retry_policy`` and then moved on to ``fallback_models`` in order.
+    Once output has been yielded, errors propagate unchanged. Every attempt
+    first waits for a permit from ``rate_limiter``, held until the stream
+    ends.
+    """
+
+    api_type: str
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        temperature: float | None = None,
+        prompt_caching: bool = False,
+        fallback_models: Sequence[str] = (),
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
         self.model = model
         self.temperature = temperature
+        self.prompt_caching = prompt_caching
+        self.fallback_models = tuple(fallback_models)
+        self.retry_policy = retry_policy or _NO_RETRY
+        self.rate_limiter = rate_limiter or _UNLIMITED
 
     def complete_stream(
         self,
@@ -163,258 +540,329 @@ class LiteLLMCompletionClient(LLMClient):
         *,
         tools: list[ToolDefinition] | None = None,
     ) -> Iterator[LLMStreamChunk]:
-        log_event(
-            "llm.stream.start",
-            model=self.model,
-            api_type="completion",
-            stream=True,
-            message_count=len(messages),
-        )
-        start_time = time.perf_counter()
-        completion_params: dict[str, object] = {}
-        if self.temperature is not None:
-            completion_params["temperature"] = self.temperature
-        if tools:
-            completion_params["tools"] = tools
-
+        start_time = self._log_start(messages)
+        models = (self.model, *self.fallback_models)
+        estimated_tokens = estimate_tokens(messages)
+        index, attempt = 0, 1
+        while True:
+            permit = self.rate_limiter.acquire(models[index], tokens=estimated_tokens)
+            parser = self._new_parser()
+            response: object = None
+            try:
+                response = self._call(
+                    self._request_params(models[index], messages, tools)
+                )
+                chunks = iter(response)
+                first = _first_chunks(chunks, parser)
+            except Exception as error:  # noqa: BLE001
+                permit.release()
+                _close_response(response)
+                delay = self._attempt_failed(
+                    error, models[index], attempt, has_fallback=index + 1 < len(models)
+                )
+                if delay is None:
+                    index, attempt = index + 1, 1
+                else:
+                    time.sleep(delay)
+                    attempt += 1
+                continue
+            except BaseException:
+                # Closed or interrupted before the first chunk.
+                permit.release()
+                _close_response(response)
+                raise
+            break
+        self._attempt_succeeded(models[index], attempt)
+
+        timings = _StreamTimings(start_time)
+        timings.record(first)
         try:
-            response = completion(
-                model=self.model,
-                messages=messages,
-                stream=True,
-                stream_options={"include_usage": True},
-                **completion_params,
-            )
-        except LiteLLMAuthError as error:
-            log_event(
-                "llm.stream.error",
-                error=summarize_payload(str(error)),
-            )
-            raise AuthenticationError(
-                message=str(error),
-                display_message="Authentication failed: Invalid API key. Please check your API_KEY setting.",
-            ) from error
-        except LiteLLMRateLimitError as error:
-            log_event(
-                "llm.stream.error",
-                error=summarize_payload(str(error)),
-            )
-            raise RateLimitError(
-                message=str(error),
-                display_message="Rate limit exceeded. Please wait a moment before trying again.",
-            ) from error
-        except Exception as error:
-            log_event(
-                "llm.stream.error",
-                error=summarize_payload(str(error)),
+            yield from first
+            for chunk in chunks:
+                parsed = parser.parse(chunk)
+                timings.record(parsed)
+                yield from parsed
+        finally:
+            permit.release(used_tokens=_total_tokens(parser.last_usage))
+        self._log_end(parser, timings, models[index])
+
+    async def acomplete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools: list[ToolDefinition] | None = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        start_time = self._log_start(messages)
+        models = (self.model, *self.fallback_models)
+        estimated_tokens = estimate_tokens(messages)
+        index, attempt = 0, 1
+        while True:
+            permit = await self.rate_limiter.aacquire(
+                models[index], tokens=estimated_tokens
             )
-            error_msg = str(error).lower()
-            if (
-                "authentication" in error_msg
-                or "api key" in error_msg
-                or "401" in error_msg
-            ):
-                raise AuthenticationError(
-                    message=str(error),
-                    display_message="Authentication failed: Invalid API key. Please check your API_KEY setting.",
-                ) from error
-            raise LLMError(
-                message=str(error),
-                display_message=f"An error occurred while communicating with the LLM: {error}",
-            ) from error
-
-        last_usage: Usage | None = None
-        tool_call_count = 0
-        seen_call_ids: set[str] = set()
-        for chunk in response:
-            chunk_data: LLMStreamChunk = {"content_delta": None}
-            if chunk.choices:
-                delta = chunk.choices[0].delta
-                if delta.content:
-                    chunk_data["content_delta"] = delta.content
-                if hasattr(delta, "tool_calls") and delta.tool_calls:
-                    tc_deltas = _parse_tool_call_delta(delta.tool_calls)
-                    for td in tc_deltas:
-                        tc_chunk: LLMStreamChunk = {
-                            "content_delta": None,
-                            "tool_call_delta": td,
-                        }
-                        call_id = td.get("id")
-                        if call_id and call_id not in seen_call_ids:
-                            seen_call_ids.add(call_id)
-                            tool_call_count += 1
-                        yield tc_chunk
-            if hasattr(chunk, "usage") and chunk.usage is not None:
-                chunk_data["usage"] = {
-                    "prompt_tokens": chunk.usage.prompt_tokens,
-                    "completion_tokens": chunk.usage.completion_tokens,
-                    "total_tokens": chunk.usage.total_tokens,
-                }
-                last_usage = chunk_data["usage"]
-            if chunk_data["content_delta"] is not None or "usage" in chunk_data:
+            parser = self._new_parser()
+            response: object = None
+            try:
+                response = await self._acall(
+                    self._request_params(models[index], messages, tools)
+                )
+                chunks = aiter(response)
+                first = await _afirst_chunks(chunks, parser)
+            except Exception as error:  # noqa: BLE001
+                permit.release()
+                await _aclose_response(response)
+                delay = self._attempt_failed(
+                    error, models[index], attempt, has_fallback=index + 1 < len(models)
+                )
+                if delay is None:
+                    index, attempt = index + 1, 1
+                else:
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                continue
+            except BaseException:
+                # Cancelled, e.g. by a client disconnect, before the first chunk.
+                permit.release()
+                await _aclose_response(response)
+                raise
+            break
+        self._attempt_succeeded(models[index], attempt)
+
+        timings = _StreamTimings(start_time)
+        timings.record(first)
+        try:
+            for chunk_data in first:
                 yield chunk_data
+            async for chunk in chunks:
+                parsed = parser.parse(chunk)
+                timings.record(parsed)
+                for chunk_data in parsed:
+                    yield chunk_data
+        finally:
+            permit.release(used_tokens=_total_tokens(parser.last_usage))
+        self._log_end(parser, timings, models[index])
+
+    def _attempt_failed(
+        self,
+        error: Exception,
+        model: str,
+        attempt: int,
+        *,
+        has_fallback: bool,
+    ) -> float | None:
+        """Log a failed attempt and decide what to do next.
+
+        Returns the delay before retrying ``model``, or None to move on to
+        the next fallback model. Raises the domain error when giving up.
+        """
+        retry_after = retry_after_seconds(error)
+        delay = (
+            self.retry_policy.delay_seconds(attempt, retry_after=retry_after)
+            if is_retryable(error)
+            else None
+        )
+        if delay is not None:
+            outcome = "retry"
+        elif has_fallback and can_fall_back(error):
+            outcome = "fallback"
+        else:
+            outcome = "error"
+        log_event(
+            "llm.attempt",
+            model=model,
+            api_type=self.api_type,
+            attempt=attempt,
+            outcome=outcome,
+            error_type=type(error).__name__,
+            error=summarize_payload(str(error)),
+            retry_after_seconds=retry_after,
+            delay_ms=int(delay * 1000) if delay is not None else None,
+        )
+        if outcome == "error":
+            raise _to_agent_error(error) from error
+        return delay
 
-        elapsed = time.perf_counter() - start_time
+    def _attempt_succeeded(self, model: str, attempt: int) -> None:
         log_event(
-            "llm.stream.end",
-            model=self.model,
-            api_type="completion",
-            stream=True,
-            usage=last_usage,
-            elapsed_ms=int(elapsed * 1000),
-            tool_call_count=tool_call_count,
+            "llm.attempt",
+            model=model,
+            api_type=self.api_type,
+            attempt=attempt,
+            outcome="ok",
+            fallback=model != self.model,
         )
 
+    @abstractmethod
+    def _new_parser(self) -> _CompletionStreamParser | _ResponsesStreamParser: ...
 
-class LiteLLMResponsesClient(LLMClient):
-    """LLM client using litellm.responses()."""
+    @abstractmethod
+    def _call(self, params: dict[str, object]) -> Iterable: ...
 
-    def __init__(self, model: str, *, temperature: float | None = None) -> None:
-        self.model = model
-        self.temperature = temperature
+    @abstractmethod
+    async def _acall(self, params: dict[str, object]) -> AsyncIterable: ...
 
-    def complete_stream(
+    @abstractmethod
+    def _request_params(
         self,
+        model: str,
         messages: list[Message],
-        *,
-        tools: list[ToolDefinition] | None = None,
-    ) -> Iterator[LLMStreamChunk]:
+        tools: list[ToolDefinition] | None,
+    ) -> dict[str, object]: ...
+
+    def _log_start(self, messages: list[Message]) -> float:
         log_event(
             "llm.stream.start",
             model=self.model,
-            api_type="responses",
+            api_type=self.api_type,
             stream=True,
             message_count=len(messages),
         )
-        start_time = time.perf_counter()
-        response_params: dict[str, object] = {}
+        return time.perf_counter()
+
+    def _log_end(
+        self,
+        parser: _CompletionStreamParser | _ResponsesStreamParser,
+        timings: _StreamTimings,
+        model: str,
+    ) -> None:
+        elapsed = time.perf_counter() - timings.start_time
+        log_event(
+            "llm.stream.end",
+            model=model,
+            api_type=self.api_type,
+            stream=True,
+            usage=parser.last_usage,
+            cached_tokens=(parser.last_usage or {}).get("cached_tokens"),
+            cache_hit_ratio=_cache_hit_ratio(parser.last_usage),
+            elapsed_ms=_ms(elapsed),
+            **timings.fields(parser.last_usage),
+            tool_call_count=parser.tool_call_count,
+        )
+
+
+class LiteLLMCompletionClient(_LiteLLMClient):
+    """LLM client using litellm.completion().
+
+    With ``prompt_caching`` enabled, requests carry ``cache_control``
+    breakpoints on the system prompt, the tool list and the history prefix.
+    """
+
+    api_type = "completion"
+
+    def _new_parser(self) -> _CompletionStreamParser:
+        return _CompletionStreamParser()
+
+    def _call(self, params: dict[str, object]) -> Iterable:
+        return completion(**params)
+
+    async def _acall(self, params: dict[str, object]) -> AsyncIterable:
+        return await acompletion(**params)
+
+    def _request_params(
+        self,
+        model: str,
+        messages: list[Message],
+        tools: list[ToolDefinition] | None,
+    ) -> dict[str, object]:
+        completion_params: dict[str, object] = {
+            "model": model,
+            "messages": (
+                _with_cache_breakpoints(messages) if self.prompt_caching else messages
+            ),
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
         if self.temperature is not None:
-            response_params["temperature"] = self.temperature
+            completion_params["temperature"] = self.temperature
         if tools:
-            response_params["tools"] = _transform_tools_for_responses(tools)
-
-        try:
-            response = responses(
-                input=_transform_messages_for_responses(messages),
-                model=self.model,
-                stream=True,
-                **response_params,
-            )
-        except LiteLLMAuthError as error:
-            log_event(
-                "llm.stream.error",
-                error=summarize_payload(str(error)),
+            completion_params["tools"] = (
+                _tools_with_cache_breakpoint(tools) if self.prompt_caching else tools
             )
-            raise AuthenticationError(
-                message=str(error),
-                display_message="Authentication failed: Invalid API key. Please check your API_KEY setting.",
-            ) from error
-        except LiteLLMRateLimitError as error:
-            log_event(
-                "llm.stream.error",
-                error=summarize_payload(str(error)),
-            )
-            raise RateLimitError(
-                message=str(error),
-                display_message="Rate limit exceeded. Please wait a moment before trying again.",
-            ) from error
-        except Exception as error:
-            log_event(
-                "llm.stream.error",
-                error=summarize_payload(str(error)),
-            )
-            error_msg = str(error).lower()
-            if (
-                "authentication" in error_msg
-                or "api key" in error_msg
-                or "401" in error_msg
-            ):
-                raise AuthenticationError(
-                    message=str(error),
-                    display_message="Authentication failed: Invalid API key. Please check your API_KEY setting.",
-                ) from error
-            raise LLMError(
-                message=str(error),
-                display_message=f"An error occurred while communicating with the LLM: {error}",
-            ) from error
-
-        call_ids_by_output_index: dict[int, str] = {}
-        last_usage: Usage | None = None
-        tool_call_count = 0
-        for event in response:
-            event_type = getattr(event, "type", None)
-
-            if event_type == "response.output_item.added":
-                item = getattr(event, "item", None)
-                if item is not None and _item_type(item) == "function_call":
-                    output_index = getattr(event, "output_index", 0)
-                    call_id = _item_attr(item, "call_id", None)
-                    if call_id:
-                        call_ids_by_output_index[output_index] = call_id
-                        tool_call_count += 1
-                    td: ToolCallDelta = {
-                        "index": output_index,
-                        "id": call_id,
-                        "type": "function",
-                        "function": {
-                            "name": _item_attr(item, "name", None),
-                            "arguments": _item_attr(item, "arguments", None),
-                        },
-                    }
-                    yield {"content_delta": None, "tool_call_delta": td}
-                continue
+        return completion_params
 
-            if event_type == "response.function_call_arguments.delta":
-                output_index = getattr(event, "output_index", 0)
-                td: ToolCallDelta = {
-                    "index": output_index,
-                    "id": call_ids_by_output_index.get(output_index),
-                    "type": "function",
-                    "function": {
-                        "name": None,
-                        "arguments": getattr(event, "delta", None),
-                    },
-                }
-                yield {"content_delta": None, "tool_call_delta": td}
-                continue
 
-            chunk_data: LLMStreamChunk = {"content_delta": None}
-            if hasattr(event, "delta") and event.delta:
-                chunk_data["content_delta"] = event.delta
-            if hasattr(event, "response") and hasattr(event.response, "usage"):
-                usage_obj = event.response.usage
-                if usage_obj is not None:
-                    chunk_data["usage"] = {
-                        "prompt_tokens": usage_obj.input_tokens,
-                        "completion_tokens": usage_obj.output_tokens,
-                        "total_tokens": usage_obj.total_tokens,
-                    }
-                    last_usage = chunk_data["usage"]
-            if chunk_data["content_delta"] is not None or "usage" in chunk_data:
-                yield chunk_data
+class LiteLLMResponsesClient(_LiteLLMClient):
+    """LLM client using litellm.responses().
 
-        elapsed = time.perf_counter() - start_time
-        log_event(
-            "llm.stream.end",
-            model=self.model,
-            api_type="responses",
-            stream=True,
-            usage=last_usage,
-            elapsed_ms=int(elapsed * 1000),
-            tool_call_count=tool_call_count,
-        )
+    With ``prompt_caching`` enabled, requests carry a ``prompt_cache_key``
+    derived from the system prompt and tools so they share a cache route.
+    """
+
+    api_type = "responses"
+
+    def _new_parser(self) -> _ResponsesStreamParser:
+        return _ResponsesStreamParser()
+
+    def _call(self, params: dict[str, object]) -> Iterable:
+        return responses(**params)
+
+    async def _acall(self, params: dict[str, object]) -> AsyncIterable:
+        return await aresponses(**params)
+
+    def _request_params(
+        self,
+        model: str,
+        messages: list[Message],
+        tools: list[ToolDefinition] | None,
+    ) -> dict[str, object]:
+        response_params: dict[str, object] = {
+            "input": _transform_messages_for_responses(messages),
+            "model": model,
+            "stream": True,
+        }
+        if self.temperature is not None:
+            response_params["temperature"] = self.temperature
+        if tools:
+            response_params["tools"] = _transform_tools_for_responses(tools)
+        if self.prompt_caching:
+            response_params["prompt_cache_key"] = _prompt_cache_key(messages, tools)
+        return response_params
 
 
 class LiteLLMClientFactory:
-    """Create LiteLLM clients from agent definitions."""
+    """Create LiteLLM clients from agent definitions.
+
+    Clients are cached per agent definition and reused across runs; they
+    hold no per-run state.
+    """
+
+    def __init__(
+        self,
+        *,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._clients: dict[tuple[object, ...], _LiteLLMClient] = {}
+        self._lock = threading.Lock()
 
     def __call__(self, agent_definition: AgentDefinition) -> LLMClient:
-        if agent_definition.api_type == "responses":
-            return LiteLLMResponsesClient(
-                model=agent_definition.model,
-                temperature=agent_definition.temperature,
-            )
-        return LiteLLMCompletionClient(
+        key = (
+            agent_definition.api_type,
+            agent_definition.model,
+            agent_definition.temperature,
+            agent_definition.prompt_caching,
+            tuple(agent_definition.fallback_models),
+        )
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create(agent_definition)
+                self._clients[key] = client
+            return client
+
+    def _create(self, agent_definition: AgentDefinition) -> _LiteLLMClient:
+        client_class = (
+            LiteLLMResponsesClient
+            if agent_definition.api_type == "responses"
+            else LiteLLMCompletionClient
+        )
+        return client_class(
             model=agent_definition.model,
             temperature=agent_definition.temperature,
+            prompt_caching=agent_definition.prompt_caching,
+            fallback_models=agent_definition.fallback_models,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.rate_limiter,
         )
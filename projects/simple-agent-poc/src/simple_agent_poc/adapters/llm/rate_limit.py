@@ -0,0 +1,249 @@
+"""Client-side rate limiting for LLM requests, keyed by model."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import NoReturn
+
+from simple_agent_poc.adapters.concurrency import FifoSlots
+from simple_agent_poc.core.types import RateLimitError
+from simple_agent_poc.observability import log_event
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimits:
+    """Limits applied to each model separately.
+
+    ``None`` disables a limit. Callers that cannot get a stream slot and
+    their request/token budget within ``max_wait_seconds`` are rejected.
+    """
+
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_concurrent_streams: int | None = None
+    max_wait_seconds: float = 30.0
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether any limit is configured."""
+        return (
+            self.requests_per_minute is not None
+            or self.tokens_per_minute is not None
+            or self.max_concurrent_streams is not None
+        )
+
+
+class _TokenBucket:
+    """Token bucket that lets reservations drive the balance negative.
+
+    A negative balance is the backlog of earlier reservations, so each new
+    caller waits behind everyone who reserved before it.
+    """
+
+    def __init__(self, per_minute: int, now: float) -> None:
+        self._capacity = float(per_minute)
+        self._rate = per_minute / 60
+        self._tokens = float(per_minute)
+        self._updated = now
+
+    def wait_seconds(self, amount: float, now: float) -> float:
+        self._refill(now)
+        return max(amount - self._tokens, 0.0) / self._rate
+
+    def take(self, amount: float) -> None:
+        self._tokens -= amount
+
+    def adjust(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self._tokens = min(self._capacity, self._tokens - amount)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+
+class RateLimitPermit:
+    """A granted stream slot; release it when the stream ends."""
+
+    def __init__(self, limiter: _ModelLimiter | None, reserved_tokens: int) -> None:
+        self._limiter = limiter
+        self._reserved_tokens = reserved_tokens
+        self._released = False
+
+    def release(self, *, used_tokens: int | None = None) -> None:
+        """Free the stream slot and settle the token estimate with usage."""
+        if self._released or self._limiter is None:
+            return
+        self._released = True
+        correction = (
+            used_tokens - self._reserved_tokens if used_tokens is not None else 0
+        )
+        self._limiter.release(correction)
+
+
+class _ModelLimiter:
+    """Request, token and concurrency limits of one model."""
+
+    def __init__(
+        self,
+        model: str,
+        limits: RateLimits,
+        clock: Callable[[], float],
+    ) -> None:
+        now = clock()
+        self._model = model
+        self._limits = limits
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = (
+            _TokenBucket(limits.requests_per_minute, now)
+            if limits.requests_per_minute is not None
+            else None
+        )
+        self._tokens = (
+            _TokenBucket(limits.tokens_per_minute, now)
+            if limits.tokens_per_minute is not None
+            else None
+        )
+        self._slots = FifoSlots(limits.max_concurrent_streams)
+        self._waiting = 0
+
+    def acquire(self, tokens: int) -> RateLimitPermit:
+        started = self._clock()
+        queue_depth = self._enter_queue()
+        try:
+            if not self._slots.acquire(self._limits.max_wait_seconds):
+                self._reject(queue_depth, "max_concurrent_streams")
+            permit = RateLimitPermit(self, tokens)
+            try:
+                delay = self._reserve(tokens, started, queue_depth)
+                if delay:
+                    time.sleep(delay)
+            except BaseException:
+                permit.release()
+                raise
+        finally:
+            self._leave_queue()
+        self._log_acquired(started, queue_depth)
+        return permit
+
+    async def aacquire(self, tokens: int) -> RateLimitPermit:
+        started = self._clock()
+        queue_depth = self._enter_queue()
+        try:
+            if not await self._slots.aacquire(self._limits.max_wait_seconds):
+                self._reject(queue_depth, "max_concurrent_streams")
+            permit = RateLimitPermit(self, tokens)
+            try:
+                delay = self._reserve(tokens, started, queue_depth)
+                if delay:
+                    await asyncio.sleep(delay)
+            except BaseException:
+                permit.release()
+                raise
+        finally:
+            self._leave_queue()
+        self._log_acquired(started, queue_depth)
+        return permit
+
+    def release(self, token_correction: int) -> None:
+        if token_correction and self._tokens is not None:
+            with self._lock:
+                self._tokens.adjust(token_correction, self._clock())
+        self._slots.release()
+
+    def _reserve(self, tokens: int, started: float, queue_depth: int) -> float:
+        with self._lock:
+            now = self._clock()
+            delay = 0.0
+            if self._requests is not None:
+                delay = self._requests.wait_seconds(1, now)
+            if self._tokens is not None:
+                delay = max(delay, self._tokens.wait_seconds(tokens, now))
+            if now - started + delay <= self._limits.max_wait_seconds:
+                if self._requests is not None:
+                    self._requests.take(1)
+                if self._tokens is not None:
+                    self._tokens.take(tokens)
+                return delay
+        self._reject(queue_depth, "rate")
+
+    def _enter_queue(self) -> int:
+        with self._lock:
+            self._waiting += 1
+            return self._waiting - 1
+
+    def _leave_queue(self) -> None:
+        with self._lock:
+            self._waiting -= 1
+
+    def _reject(self, queue_depth: int, reason: str) -> NoReturn:
+        log_event(
+            "llm.rate_limit.rejected",
+            model=self._model,
+            reason=reason,
+            queue_depth=queue_depth,
+            max_wait_seconds=self._limits.max_wait_seconds,
+        )
+        raise RateLimitError(
+            message=(
+                f"Client-side rate limit for {self._model} could not be met"
+                f" within {self._limits.max_wait_seconds}s ({reason})"
+            ),
+            display_message="Rate limit exceeded. Please wait a moment before trying again.",
+        )
+
+    def _log_acquired(self, started: float, queue_depth: int) -> None:
+        log_event(
+            "llm.rate_limit.acquired",
+            model=self._model,
+            wait_ms=int((self._clock() - started) * 1000),
+            queue_depth=queue_depth,
+            active_streams=self._slots.active,
+        )
+
+
+_NOOP_PERMIT = RateLimitPermit(None, 0)
+
+
+class RateLimiter:
+    """Process-wide limiter that queues LLM requests per model.
+
+    Callers are served in arrival order: stream slots are handed to the
+    longest waiting caller, and request/token budgets are reserved ahead
+    so later callers wait behind earlier ones instead of racing them.
+    """
+
+    def __init__(
+        self,
+        limits: RateLimits | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limits = limits or RateLimits()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._models: dict[str, _ModelLimiter] = {}
+
+    def acquire(self, model: str, *, tokens: int = 0) -> RateLimitPermit:
+        """Block until ``model`` may serve a request of about ``tokens``."""
+        if not self.limits.enabled:
+            return _NOOP_PERMIT
+        return self._limiter(model).acquire(tokens)
+
+    async def aacquire(self, model: str, *, tokens: int = 0) -> RateLimitPermit:
+        """Wait until ``model`` may serve a request of about ``tokens``."""
+        if not self.limits.enabled:
+            return _NOOP_PERMIT
+        return await self._limiter(model).aacquire(tokens)
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        with self._lock:
+            limiter = self._models.get(model)
+            if limiter is None:
+                limiter = _ModelLimiter(model, self.limits, self._clock)
+                self._models[model] = limiter
+            return limiter
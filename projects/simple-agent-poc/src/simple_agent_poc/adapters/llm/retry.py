@@ -0,0 +1,103 @@
+"""Retry policy for LLM requests that fail before streaming starts."""
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from litellm.exceptions import (
+    APIConnectionError,
+    BadGatewayError,
+    ContextWindowExceededError,
+    InternalServerError,
+    NotFoundError,
+    RateLimitError,
+    ServiceUnavailableError,
+    Timeout,
+)
+
+_RETRYABLE_ERRORS = (
+    APIConnectionError,
+    BadGatewayError,
+    InternalServerError,
+    RateLimitError,
+    ServiceUnavailableError,
+    Timeout,
+)
+_RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """How often and how long to wait before retrying one model.
+
+    Delays use exponential backoff with full jitter. A ``Retry-After``
+    hint from the provider replaces the computed delay; when the hint is
+    longer than ``max_delay_seconds`` the model is given up on instead.
+    """
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+
+    def delay_seconds(
+        self,
+        attempt: int,
+        *,
+        retry_after: float | None = None,
+        rng: random.Random | None = None,
+    ) -> float | None:
+        """Return the wait before retry number ``attempt``, or None to stop."""
+        if attempt >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay_seconds else None
+        ceiling = min(
+            self.max_delay_seconds,
+            self.base_delay_seconds * 2 ** (attempt - 1),
+        )
+        return (rng or random).uniform(0, ceiling)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return whether ``error`` is a transient provider or network failure."""
+    if isinstance(error, _RETRYABLE_ERRORS):
+        return True
+    return getattr(error, "status_code", None) in _RETRYABLE_STATUS_CODES
+
+
+def can_fall_back(error: Exception) -> bool:
+    """Return whether another model may succeed where this one failed.
+
+    Transient failures, unknown models and context-window overflows are
+    worth a fallback; authentication and malformed requests are not.
+    """
+    return is_retryable(error) or isinstance(
+        error, NotFoundError | ContextWindowExceededError
+    )
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Read a ``Retry-After`` hint from the provider response, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except ValueError:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
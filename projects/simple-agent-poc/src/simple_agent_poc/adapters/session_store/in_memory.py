@@ -1,19 +1,248 @@
 """In-memory session store."""
 
-from simple_agent_poc.application.ports import SessionStore
-from simple_agent_poc.core.session import ConversationSession
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
 
+from simple_agent_poc.application.ports import AsyncSessionStore, SessionStore
+from simple_agent_poc.core.session import ConversationSession, SessionChanges
+from simple_agent_poc.core.types import Message, SessionNotFoundError
+from simple_agent_poc.observability import log_event
 
-class InMemorySessionStore(SessionStore):
-    """Store sessions in process memory."""
 
-    def __init__(self) -> None:
-        self._sessions: dict[str, ConversationSession] = {}
+@dataclass(frozen=True, slots=True)
+class SessionStoreStats:
+    """Counters and current size of an in-memory session store."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    sessions: int
+    approx_bytes: int
+
+
+@dataclass(slots=True)
+class _Entry:
+    # Sizes of the stored messages, so saves only account for the delta.
+    message_sizes: list[int]
+    size: int
+    last_access: float
+
+
+def _message_size(message: Message) -> int:
+    """Estimate the memory held by one message from its text fields."""
+    size = len(message.get("content") or "")
+    for tool_call in message.get("tool_calls") or ():
+        function = tool_call["function"]
+        size += len(function["name"]) + len(function["arguments"])
+    return size
+
+
+class InMemorySessionStore(SessionStore, AsyncSessionStore):
+    """Store sessions in process memory.
+
+    Without limits the store keeps every session. With ``max_sessions`` or
+    ``max_bytes`` it evicts least recently used sessions after each save,
+    and with ``idle_ttl_seconds`` it expires sessions that were not read or
+    saved for that long. Paused sessions are never evicted for space; they
+    expire only after ``paused_ttl_seconds``.
+
+    ``save_changes`` for a session dropped while a run still held it raises
+    ``SessionNotFoundError``; the run then stores its full session again.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int | None = None,
+        max_bytes: int | None = None,
+        idle_ttl_seconds: float | None = None,
+        paused_ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._sessions: OrderedDict[str, ConversationSession] = OrderedDict()
+        self._entries: dict[str, _Entry] = {}
+        self._max_sessions = max_sessions
+        self._max_bytes = max_bytes
+        self._idle_ttl_seconds = idle_ttl_seconds
+        self._paused_ttl_seconds = paused_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
     def get(self, session_id: str) -> ConversationSession | None:
         """Return a stored session if present."""
-        return self._sessions.get(session_id)
+        with self._lock:
+            now = self._clock()
+            session = self._sessions.get(session_id)
+            if session is not None and self._is_expired(session_id, now):
+                self._remove(session_id, reason="ttl")
+                session = None
+            if session is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries[session_id].last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
 
     def save(self, session: ConversationSession) -> None:
         """Store the latest session snapshot."""
+        with self._lock:
+            sizes = [_message_size(message) for message in session.messages]
+            self._store(session, sizes, sum(sizes))
+
+    def save_changes(self, changes: SessionChanges) -> None:
+        """Apply session changes to the stored session."""
+        with self._lock:
+            session = self._sessions.get(changes.session_id)
+            if session is None:
+                if changes.saved_message_count:
+                    raise SessionNotFoundError(
+                        f"Cannot apply changes to unknown session: {changes.session_id}"
+                    )
+                session = ConversationSession(
+                    session_id=changes.session_id,
+                    agent_id=changes.agent_id,
+                )
+                sizes: list[int] = []
+                size = 0
+            else:
+                # The caller may hold this very session object and have
+                # changed its messages already, so sizes come from the entry.
+                entry = self._entries[changes.session_id]
+                sizes, size = entry.message_sizes, entry.size
+            size -= sum(sizes[changes.saved_message_count :])
+            del sizes[changes.saved_message_count :]
+            del session.messages[changes.saved_message_count :]
+            for message in changes.new_messages:
+                session.messages.append(message)
+                sizes.append(_message_size(message))
+                size += sizes[-1]
+            for idx, message in changes.updated_messages.items():
+                session.messages[idx] = message
+                size -= sizes[idx]
+                sizes[idx] = _message_size(message)
+                size += sizes[idx]
+            session.is_paused = changes.is_paused
+            session.pending_tool_call = changes.pending_tool_call
+            session.pending_round = changes.pending_round
+            session.mark_saved()
+            self._store(session, sizes, size)
+
+    async def aget(self, session_id: str) -> ConversationSession | None:
+        """Return a stored session if present."""
+        return self.get(session_id)
+
+    async def asave(self, session: ConversationSession) -> None:
+        """Store the latest session snapshot."""
+        self.save(session)
+
+    async def asave_changes(self, changes: SessionChanges) -> None:
+        """Apply session changes to the stored session."""
+        self.save_changes(changes)
+
+    def stats(self) -> SessionStoreStats:
+        """Return hit/miss/eviction counters and the current store size."""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> SessionStoreStats:
+        return SessionStoreStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            sessions=len(self._sessions),
+            approx_bytes=self._bytes,
+        )
+
+    def _store(
+        self, session: ConversationSession, message_sizes: list[int], size: int
+    ) -> None:
+        now = self._clock()
+        previous = self._entries.pop(session.session_id, None)
+        if previous is not None:
+            self._bytes -= previous.size
         self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        self._entries[session.session_id] = _Entry(message_sizes, size, now)
+        self._bytes += size
+        self._expire(now)
+        self._evict(keep=session.session_id)
+
+    def _is_expired(self, session_id: str, now: float) -> bool:
+        if self._sessions[session_id].is_paused:
+            ttl = self._paused_ttl_seconds
+        else:
+            ttl = self._idle_ttl_seconds
+        last_access = self._entries[session_id].last_access
+        return ttl is not None and now - last_access >= ttl
+
+    def _expire(self, now: float) -> None:
+        ttls = [
+            ttl
+            for ttl in (self._idle_ttl_seconds, self._paused_ttl_seconds)
+            if ttl is not None
+        ]
+        if not ttls:
+            return
+        min_ttl = min(ttls)
+        expired: list[str] = []
+        for session_id in self._sessions:
+            if now - self._entries[session_id].last_access < min_ttl:
+                break
+            if self._is_expired(session_id, now):
+                expired.append(session_id)
+        for session_id in expired:
+            self._remove(session_id, reason="ttl")
+
+    def _over_budget(self) -> str | None:
+        if self._max_sessions is not None and len(self._sessions) > self._max_sessions:
+            return "max_sessions"
+        if self._max_bytes is not None and self._bytes > self._max_bytes:
+            return "max_bytes"
+        return None
+
+    def _evict(self, *, keep: str) -> None:
+        reason = self._over_budget()
+        if reason is None:
+            return
+        candidates = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if session_id != keep and not session.is_paused
+        ]
+        for session_id in candidates:
+            self._remove(session_id, reason=reason)
+            reason = self._over_budget()
+            if reason is None:
+                return
+
+    def _remove(self, session_id: str, *, reason: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._bytes -= self._entries.pop(session_id).size
+        if reason == "ttl":
+            self._expirations += 1
+        else:
+            self._evictions += 1
+        stats = self._stats()
+        log_event(
+            "session_store.evicted",
+            evicted_session_id=session_id,
+            reason=reason,
+            paused=session.is_paused,
+            hits=stats.hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            expirations=stats.expirations,
+            sessions=stats.sessions,
+            approx_bytes=stats.approx_bytes,
+        )
@@ -0,0 +1,226 @@
+"""SQLite session store."""
+
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+from simple_agent_poc.application.ports import AsyncSessionStore, SessionStore
+from simple_agent_poc.core.session import ConversationSession, SessionChanges
+from simple_agent_poc.core.types import SessionNotFoundError, ToolCall
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    agent_id TEXT NOT NULL,
+    is_paused INTEGER NOT NULL DEFAULT 0,
+    pending_tool_call TEXT,
+    pending_round INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS session_messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+def _dumps(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class SQLiteSessionStore(SessionStore, AsyncSessionStore):
+    """Store sessions in a SQLite database shared between processes.
+
+    The database runs in WAL mode so readers in other workers do not block
+    the writer. ``save_changes()`` is append-only: it inserts the messages
+    added since the last save and patches only rows rewritten in place. It
+    raises ``SessionNotFoundError`` when the session row it builds on was
+    deleted, so the run stores its full session again.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        pool_size: int = 4,
+        timeout_seconds: float = 5.0,
+    ) -> None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be positive")
+        self._path = Path(path)
+        self._timeout_seconds = timeout_seconds
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._pool_size = pool_size
+        self._opened = 0
+        self._opened_lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._timeout_seconds,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Generator[sqlite3.Connection]:
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            with self._opened_lock:
+                can_open = self._opened < self._pool_size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    connection = self._connect()
+                except BaseException:
+                    with self._opened_lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    connection = self._pool.get(timeout=self._timeout_seconds)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No SQLite session store connection became free within"
+                        f" {self._timeout_seconds}s"
+                    ) from None
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def get(self, session_id: str) -> ConversationSession | None:
+        """Return a stored session if present."""
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT agent_id, is_paused, pending_tool_call, pending_round,"
+                " message_count FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            agent_id, is_paused, pending_tool_call, pending_round, count = row
+            rows = connection.execute(
+                "SELECT message FROM session_messages"
+                " WHERE session_id = ? AND seq < ? ORDER BY seq",
+                (session_id, count),
+            ).fetchall()
+        pending: ToolCall | None = (
+            json.loads(pending_tool_call) if pending_tool_call else None
+        )
+        session = ConversationSession(
+            session_id=session_id,
+            agent_id=agent_id,
+            messages=[json.loads(message) for (message,) in rows],
+            is_paused=bool(is_paused),
+            pending_tool_call=pending,
+            pending_round=pending_round,
+        )
+        session.mark_saved()
+        return session
+
+    def save(self, session: ConversationSession) -> None:
+        """Replace the stored session with a full snapshot."""
+        self.save_changes(
+            SessionChanges(
+                session_id=session.session_id,
+                agent_id=session.agent_id,
+                saved_message_count=0,
+                new_messages=session.messages,
+                updated_messages={},
+                state_changed=True,
+                is_paused=session.is_paused,
+                pending_tool_call=session.pending_tool_call,
+                pending_round=session.pending_round,
+            )
+        )
+
+    def save_changes(self, changes: SessionChanges) -> None:
+        """Insert new messages and patch rewritten messages and session state."""
+        session_id = changes.session_id
+        message_rows = [
+            (session_id, changes.saved_message_count + offset, _dumps(message))
+            for offset, message in enumerate(changes.new_messages)
+        ]
+        message_rows.extend(
+            (session_id, idx, _dumps(message))
+            for idx, message in changes.updated_messages.items()
+        )
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if changes.saved_message_count and (
+                    connection.execute(
+                        "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+                    ).fetchone()
+                    is None
+                ):
+                    raise SessionNotFoundError(
+                        f"Cannot apply changes to unknown session: {session_id}"
+                    )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO session_messages"
+                    " (session_id, seq, message) VALUES (?, ?, ?)",
+                    message_rows,
+                )
+                connection.execute(
+                    "DELETE FROM session_messages WHERE session_id = ? AND seq >= ?",
+                    (session_id, changes.message_count),
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, agent_id,"
+                    " is_paused, pending_tool_call, pending_round, message_count)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        session_id,
+                        changes.agent_id,
+                        int(changes.is_paused),
+                        _dumps(changes.pending_tool_call)
+                        if changes.pending_tool_call is not None
+                        else None,
+                        changes.pending_round,
+                        changes.message_count,
+                    ),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    async def aget(self, session_id: str) -> ConversationSession | None:
+        """Return a stored session if present."""
+        return await asyncio.to_thread(self.get, session_id)
+
+    async def asave(self, session: ConversationSession) -> None:
+        """Replace the stored session with a full snapshot."""
+        await asyncio.to_thread(self.save, session)
+
+    async def asave_changes(self, changes: SessionChanges) -> None:
+        """Insert new messages and patch rewritten messages and session state."""
+        await asyncio.to_thread(self.save_changes, changes)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        while True:
+            try:
+                connection = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+            with self._opened_lock:
+                self._opened -= 1
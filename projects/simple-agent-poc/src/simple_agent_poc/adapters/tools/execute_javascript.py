@@ -1,10 +1,19 @@
 """execute_javascript — runs JavaScript through execution-worker."""
 
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import Any, Protocol
 
-from simple_agent_poc.adapters.execution_worker.client import WorkerExecutionResult
+from simple_agent_poc.adapters.execution_worker.cache import ExecutionResultCache
+from simple_agent_poc.adapters.execution_worker.client import (
+    JavaScriptExecution,
+    OutputListener,
+    WorkerExecutionResult,
+)
+from simple_agent_poc.application.tool_context import (
+    ToolCallContext,
+    current_tool_calls,
+)
 from simple_agent_poc.core.types import ToolDefinition
 
 TOOL_DEFINITION: ToolDefinition = {
@@ -40,22 +49,116 @@ class _ExecutionWorkerClient(Protocol):
         code: str,
         input_data: Any = None,
         timeout_ms: int | None = None,
+        on_output: OutputListener | None = None,
     ) -> WorkerExecutionResult: ...
 
 
-def create_execute(client: _ExecutionWorkerClient) -> Callable[[dict[str, Any]], str]:
+class _ExecutionWorkerBatchClient(Protocol):
+    def execute_javascript_batch(
+        self, executions: Sequence[JavaScriptExecution]
+    ) -> list[WorkerExecutionResult]: ...
+
+
+def create_execute(
+    client: _ExecutionWorkerClient,
+    *,
+    cache: ExecutionResultCache | None = None,
+) -> Callable[[dict[str, Any]], str]:
+    """Run one call; with *cache*, repeated successful executions are reused.
+
+    When the calling use case listens for partial output, stdout and stderr
+    are streamed to it while the code runs.
+    """
+
     def execute(arguments: dict[str, Any]) -> str:
-        timeout_ms = arguments.get("timeout_ms")
-        result = client.execute_javascript(
-            code=str(arguments.get("code", "")),
-            input_data=arguments.get("input"),
-            timeout_ms=timeout_ms if isinstance(timeout_ms, int) else None,
-        )
+        execution = _execution(arguments)
+        contexts = current_tool_calls()
+        context = contexts[0] if len(contexts) == 1 else None
+        result = _cached_result(cache, execution, context)
+        if result is None:
+            streaming: dict[str, Any] = {}
+            if context is not None and context.on_output is not None:
+                streaming["on_output"] = context.output
+            result = client.execute_javascript(
+                code=execution.code,
+                input_data=execution.input_data,
+                timeout_ms=execution.timeout_ms,
+                **streaming,
+            )
+            _store_result(cache, execution, context, result)
         return json.dumps(_serialize_result(result), ensure_ascii=False)
 
     return execute
 
 
+def create_execute_batch(
+    client: _ExecutionWorkerBatchClient,
+    *,
+    cache: ExecutionResultCache | None = None,
+) -> Callable[[list[dict[str, Any]]], list[str]]:
+    """Run the calls of one round through a single batch request.
+
+    With *cache*, only the executions that miss it are sent to the worker.
+    """
+
+    def execute_batch(arguments: list[dict[str, Any]]) -> list[str]:
+        executions = [_execution(a) for a in arguments]
+        contexts: Sequence[ToolCallContext | None] = current_tool_calls()
+        if len(contexts) != len(executions):
+            contexts = [None] * len(executions)
+        results = [
+            _cached_result(cache, execution, context)
+            for execution, context in zip(executions, contexts, strict=True)
+        ]
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            fetched = client.execute_javascript_batch(
+                [executions[index] for index in missing]
+            )
+            for index, result in zip(missing, fetched, strict=True):
+                results[index] = result
+                _store_result(cache, executions[index], contexts[index], result)
+        return [
+            json.dumps(_serialize_result(result), ensure_ascii=False)
+            for result in results
+        ]
+
+    return execute_batch
+
+
+def _cached_result(
+    cache: ExecutionResultCache | None,
+    execution: JavaScriptExecution,
+    context: ToolCallContext | None,
+) -> WorkerExecutionResult | None:
+    """Look *execution* up unless the calling agent opted out of caching."""
+    if cache is None or (context is not None and not context.cache_results):
+        return None
+    result = cache.get(execution)
+    if context is not None:
+        context.report(cache="hit" if result is not None else "miss")
+    return result
+
+
+def _store_result(
+    cache: ExecutionResultCache | None,
+    execution: JavaScriptExecution,
+    context: ToolCallContext | None,
+    result: WorkerExecutionResult,
+) -> None:
+    if cache is not None and (context is None or context.cache_results):
+        cache.put(execution, result)
+
+
+def _execution(arguments: dict[str, Any]) -> JavaScriptExecution:
+    timeout_ms = arguments.get("timeout_ms")
+    return JavaScriptExecution(
+        code=str(arguments.get("code", "")),
+        input_data=arguments.get("input"),
+        timeout_ms=timeout_ms if isinstance(timeout_ms, int) else None,
+    )
+
+
 def _serialize_result(result) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "status": result.status,
@@ -74,4 +177,6 @@ def _serialize_result(result) -> dict[str, Any]:
             "details": result.error.details,
             "limit": result.error.limit,
         }
+    if result.circuit_state is not None:
+        payload["circuit_state"] = result.circuit_state
     return payload
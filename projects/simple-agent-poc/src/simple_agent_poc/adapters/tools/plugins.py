@@ -0,0 +1,73 @@
+"""Tool plugins installed as ``simple_agent_poc.tools`` entry points.
+
+An entry point's name is the tool name, and it points at a module or object
+shaped like a built-in tool module::
+
+    [project.entry-points."simple_agent_poc.tools"]
+    get_weather = "weather_tool.tool"
+
+The target defines ``TOOL_DEFINITION`` and ``execute`` (sync or ``async
+def``), and optionally ``execute_batch``, ``TIMEOUT_SECONDS`` and
+``MAX_CONCURRENCY``. It may also be a ``ToolPlugin``. Plugins are registered
+without being imported; the registry imports one the first time an agent
+that lists it runs.
+"""
+
+from collections.abc import Iterable
+from functools import partial
+from importlib.metadata import EntryPoint, entry_points
+
+from simple_agent_poc.adapters.tools.registry import (
+    BuiltinToolRegistry,
+    ToolLimits,
+    ToolPlugin,
+)
+from simple_agent_poc.observability import log_event
+
+ENTRY_POINT_GROUP = "simple_agent_poc.tools"
+
+
+def register_tool_plugins(
+    registry: BuiltinToolRegistry,
+    *,
+    plugins: Iterable[EntryPoint] | None = None,
+) -> list[str]:
+    """Register every installed tool plugin lazily and return their names.
+
+    A plugin named like a tool the registry already has is skipped, so
+    built-in tools cannot be replaced.
+    """
+    names: list[str] = []
+    for entry_point in (
+        entry_points(group=ENTRY_POINT_GROUP) if plugins is None else plugins
+    ):
+        if registry.has_tool(entry_point.name):
+            log_event(
+                "tool.plugin.skipped",
+                tool_name=entry_point.name,
+                target=entry_point.value,
+            )
+            continue
+        registry.register_lazy(entry_point.name, partial(load_tool_plugin, entry_point))
+        names.append(entry_point.name)
+    return names
+
+
+def load_tool_plugin(entry_point: EntryPoint) -> ToolPlugin:
+    """Import *entry_point* and read the tool it provides."""
+    target = entry_point.load()
+    if isinstance(target, ToolPlugin):
+        return target
+    definition = getattr(target, "TOOL_DEFINITION", None)
+    execute = getattr(target, "execute", None)
+    if definition is None or not callable(execute):
+        raise TypeError(f"{entry_point.value} must define TOOL_DEFINITION and execute")
+    return ToolPlugin(
+        definition=definition,
+        execute=execute,
+        execute_batch=getattr(target, "execute_batch", None),
+        limits=ToolLimits(
+            timeout_seconds=getattr(target, "TIMEOUT_SECONDS", None),
+            max_concurrency=getattr(target, "MAX_CONCURRENCY", None),
+        ),
+    )
@@ -1,40 +1,382 @@
 """Built-in tool registry — resolves tool names to definitions and executors."""
 
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import inspect
 import json
-from collections.abc import Callable
-from typing import Any
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, cast
 
-from simple_agent_poc.application.ports import ToolExecutor
+from simple_agent_poc.adapters.concurrency import FifoSlots
+from simple_agent_poc.application.ports import (
+    AsyncToolExecutor,
+    BatchToolExecutor,
+    ToolExecutor,
+)
+from simple_agent_poc.application.tool_context import current_tool_calls
 from simple_agent_poc.core.types import LLMError, ToolCall, ToolDefinition
+from simple_agent_poc.observability import log_event
+
+_SyncExecuteFn = Callable[[dict[str, Any]], str]
+_AsyncExecuteFn = Callable[[dict[str, Any]], Awaitable[str]]
+_ExecuteFn = _SyncExecuteFn | _AsyncExecuteFn
+_ExecuteBatchFn = Callable[[list[dict[str, Any]]], list[str]]
+
+
+@dataclass(frozen=True, slots=True)
+class ToolLimits:
+    """Execution limits of one tool, enforced by the registry.
+
+    ``timeout_seconds`` bounds a call, including the time it waits for one
+    of the ``max_concurrency`` slots. ``None`` disables a limit.
+    """
+
+    timeout_seconds: float | None = None
+    max_concurrency: int | None = None
+
+    def override(self, other: ToolLimits | None) -> ToolLimits:
+        """Return these limits with the ones set in *other* taking precedence."""
+        if other is None:
+            return self
+        return ToolLimits(
+            timeout_seconds=(
+                other.timeout_seconds
+                if other.timeout_seconds is not None
+                else self.timeout_seconds
+            ),
+            max_concurrency=(
+                other.max_concurrency
+                if other.max_concurrency is not None
+                else self.max_concurrency
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ToolPlugin:
+    """A tool provided by a plugin, as its loader returns it."""
+
+    definition: ToolDefinition
+    execute: _ExecuteFn
+    execute_batch: _ExecuteBatchFn | None = None
+    limits: ToolLimits = field(default_factory=ToolLimits)
+
+
+@dataclass(slots=True)
+class _Tool:
+    """A registered tool; exactly one of ``execute`` and ``aexecute`` is set."""
 
-_ExecuteFn = Callable[[dict[str, Any]], str]
+    definition: ToolDefinition
+    execute: _SyncExecuteFn | None
+    aexecute: _AsyncExecuteFn | None
+    execute_batch: _ExecuteBatchFn | None
+    limits: ToolLimits
+    slots: FifoSlots | None
 
+    @property
+    def name(self) -> str:
+        return self.definition["function"]["name"]
 
-class BuiltinToolRegistry(ToolExecutor):
-    """Registry for built-in tools with definition + execute pairing."""
+    @property
+    def is_async(self) -> bool:
+        return self.aexecute is not None
 
-    def __init__(self) -> None:
-        self._definitions: dict[str, ToolDefinition] = {}
-        self._executors: dict[str, _ExecuteFn] = {}
+    def run(self, arguments: dict[str, Any]) -> str:
+        """Call the synchronous executor."""
+        assert self.execute is not None
+        return self.execute(arguments)
+
+    @property
+    def limited(self) -> bool:
+        return self.limits.timeout_seconds is not None or self.slots is not None
+
+
+class BuiltinToolRegistry(ToolExecutor, AsyncToolExecutor, BatchToolExecutor):
+    """Registry for built-in tools with definition + execute pairing.
+
+    A tool registered with ``execute_batch`` can run several calls of one
+    round in a single executor call, e.g. one execution-worker round trip.
+
+    Executors may be ``async def`` functions; those are awaited on the
+    caller's event loop instead of occupying a worker thread. Tools added
+    with ``register_lazy`` are loaded the first time one of their calls or
+    definitions is needed.
+
+    Each tool's ``ToolLimits`` are enforced here, overridden by the
+    ``limits`` given to the registry. A call that runs out of time returns an
+    error result to the LLM; a synchronous executor cannot be interrupted, so
+    it keeps its concurrency slot until it actually returns.
+
+    Limited synchronous calls run on one thread pool of at most
+    ``max_threads`` workers, and ``execute`` runs ``async def`` executors on
+    one event loop thread; both are shared by every call of the registry.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: Mapping[str, ToolLimits] | None = None,
+        max_threads: int | None = None,
+    ) -> None:
+        self._tools: dict[str, _Tool] = {}
+        self._loaders: dict[str, Callable[[], ToolPlugin]] = {}
+        self._limit_overrides = dict(limits or {})
+        self._load_lock = threading.Lock()
+        self._threads = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="tool"
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop the registry's event loop and drop calls not started yet."""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
 
     def register(
         self,
         definition: ToolDefinition,
         execute: _ExecuteFn,
+        *,
+        execute_batch: _ExecuteBatchFn | None = None,
+        limits: ToolLimits | None = None,
     ) -> None:
         name = definition["function"]["name"]
-        self._definitions[name] = definition
-        self._executors[name] = execute
+        effective = (limits or ToolLimits()).override(self._limit_overrides.get(name))
+        is_async = inspect.iscoroutinefunction(execute)
+        self._tools[name] = _Tool(
+            definition=definition,
+            execute=None if is_async else cast(_SyncExecuteFn, execute),
+            aexecute=cast(_AsyncExecuteFn, execute) if is_async else None,
+            execute_batch=execute_batch,
+            limits=effective,
+            slots=(
+                FifoSlots(effective.max_concurrency)
+                if effective.max_concurrency is not None
+                else None
+            ),
+        )
+        self._loaders.pop(name, None)
+
+    def register_lazy(self, name: str, load: Callable[[], ToolPlugin]) -> None:
+        """Register *name* without loading it; *load* runs on first use."""
+        self._loaders[name] = load
+
+    def has_tool(self, name: str, /) -> bool:
+        return name in self._tools or name in self._loaders
 
     def execute(self, tool_call: ToolCall, /) -> str:
+        tool = self._require(tool_call["function"]["name"])
+        arguments = json.loads(tool_call["function"]["arguments"])
+        if tool.is_async:
+            # The caller may be running an event loop of its own.
+            return self._run_on_loop(tool, arguments).result()
+        return self._call(
+            tool,
+            lambda: tool.run(arguments),
+            lambda: self._timed_out(tool),
+        )
+
+    async def aexecute(self, tool_call: ToolCall, /) -> str:
         name = tool_call["function"]["name"]
-        if name not in self._executors:
-            raise LLMError(f"Unknown tool: {name}")
-        executor = self._executors[name]
+        tool = self._tools.get(name)
+        if tool is None:
+            # Loading a plugin imports it; keep that off the event loop.
+            tool = await asyncio.to_thread(self._require, name)
+        if not tool.is_async and not tool.limited:
+            # Synchronous executors are kept off the event loop.
+            return await asyncio.to_thread(self.execute, tool_call)
         arguments = json.loads(tool_call["function"]["arguments"])
-        return executor(arguments)
+        return await self._acall(tool, arguments)
 
-    def get_definitions(self, tool_names: list[str], /) -> list[ToolDefinition]:
-        return [
-            self._definitions[name] for name in tool_names if name in self._definitions
+    def supports_batch(self, tool_name: str, /) -> bool:
+        tool = self._resolve(tool_name)
+        return tool is not None and tool.execute_batch is not None
+
+    def execute_batch(self, tool_calls: list[ToolCall], /) -> list[str]:
+        names = {tool_call["function"]["name"] for tool_call in tool_calls}
+        if len(names) != 1:
+            raise LLMError("A tool batch must contain calls of exactly one tool")
+        (name,) = names
+        tool = self._require(name)
+        execute_batch = tool.execute_batch
+        if execute_batch is None:
+            raise LLMError(f"Tool does not support batches: {name}")
+        arguments = [
+            json.loads(tool_call["function"]["arguments"]) for tool_call in tool_calls
         ]
+        # A batch takes one concurrency slot and shares one timeout.
+        return self._call(
+            tool,
+            lambda: execute_batch(arguments),
+            lambda: [self._timed_out(tool)] * len(arguments),
+        )
+
+    def get_definitions(self, tool_names: list[str], /) -> list[ToolDefinition]:
+        tools = (self._resolve(name) for name in tool_names)
+        return [tool.definition for tool in tools if tool is not None]
+
+    def _require(self, name: str) -> _Tool:
+        tool = self._resolve(name)
+        if tool is None:
+            raise LLMError(f"Unknown tool: {name}")
+        return tool
+
+    def _resolve(self, name: str) -> _Tool | None:
+        tool = self._tools.get(name)
+        if tool is not None or name not in self._loaders:
+            return tool
+        with self._load_lock:
+            load = self._loaders.get(name)
+            if load is not None:
+                self._load(name, load)
+        return self._tools.get(name)
+
+    def _load(self, name: str, load: Callable[[], ToolPlugin]) -> None:
+        started = time.perf_counter()
+        try:
+            plugin = load()
+            loaded_name = plugin.definition["function"]["name"]
+            if loaded_name != name:
+                raise ValueError(f"plugin defines tool {loaded_name!r}")
+        except Exception as exc:
+            log_event("tool.plugin.error", tool_name=name, error=str(exc))
+            raise LLMError(f"Failed to load tool plugin {name}: {exc}") from exc
+        self.register(
+            plugin.definition,
+            plugin.execute,
+            execute_batch=plugin.execute_batch,
+            limits=plugin.limits,
+        )
+        log_event(
+            "tool.plugin.load",
+            tool_name=name,
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+        )
+
+    def _call[T](
+        self, tool: _Tool, call: Callable[[], T], timed_out: Callable[[], T]
+    ) -> T:
+        """Run a synchronous executor call within the tool's limits."""
+        timeout = tool.limits.timeout_seconds
+        started = time.monotonic()
+        slots = tool.slots
+        if slots is not None and not slots.acquire(timeout):
+            return timed_out()
+        release = slots.release if slots is not None else None
+        if timeout is None:
+            try:
+                return call()
+            finally:
+                if release is not None:
+                    release()
+        future = self._submit(call, on_done=release)
+        remaining = max(timeout - (time.monotonic() - started), 0.0)
+        done, _ = concurrent.futures.wait([future], remaining)
+        if not done:
+            # A call still waiting for a thread is dropped; one running keeps it.
+            future.cancel()
+            return timed_out()
+        return future.result()
+
+    async def _acall(self, tool: _Tool, arguments: dict[str, Any]) -> str:
+        """Run one call on the event loop within the tool's limits."""
+        slots = tool.slots
+        try:
+            async with asyncio.timeout(tool.limits.timeout_seconds) as scope:
+                if slots is not None:
+                    await slots.aacquire()
+                if tool.aexecute is not None:
+                    try:
+                        return await tool.aexecute(arguments)
+                    finally:
+                        if slots is not None:
+                            slots.release()
+                future = self._submit(
+                    lambda: tool.run(arguments),
+                    on_done=slots.release if slots is not None else None,
+                )
+                return await asyncio.wrap_future(future)
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            return self._timed_out(tool)
+
+    def _submit[T](
+        self, call: Callable[[], T], *, on_done: Callable[[], None] | None = None
+    ) -> concurrent.futures.Future[T]:
+        """Run *call* on the registry's thread pool in the caller's context.
+
+        *on_done* runs when the call returns or is cancelled, even if nobody
+        waits for it any more, so a timed-out call keeps its concurrency slot
+        until then.
+        """
+        context = contextvars.copy_context()
+        future = self._threads.submit(lambda: context.run(call))
+        if on_done is not None:
+            future.add_done_callback(lambda _: on_done())
+        return future
+
+    def _run_on_loop(
+        self, tool: _Tool, arguments: dict[str, Any]
+    ) -> concurrent.futures.Future[str]:
+        """Start an ``async def`` call on the registry's event loop thread."""
+        loop = self._event_loop()
+        context = contextvars.copy_context()
+        future: concurrent.futures.Future[str] = concurrent.futures.Future()
+
+        def start() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            task = loop.create_task(self._acall(tool, arguments), context=context)
+            task.add_done_callback(partial(_copy_outcome, future))
+
+        loop.call_soon_threadsafe(start)
+        return future
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="tool-loop", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def _timed_out(self, tool: _Tool) -> str:
+        timeout = tool.limits.timeout_seconds
+        log_event("tool.call.timeout", tool_name=tool.name, timeout_seconds=timeout)
+        for context in current_tool_calls():
+            context.report(timed_out=True)
+        return json.dumps(
+            {
+                "status": "error",
+                "error": {
+                    "category": "timeout",
+                    "message": f"{tool.name} did not finish within {timeout:g}s",
+                },
+            },
+            ensure_ascii=False,
+        )
+
+
+def _copy_outcome(
+    future: concurrent.futures.Future[str], task: asyncio.Task[str]
+) -> None:
+    if task.cancelled():
+        future.set_exception(concurrent.futures.CancelledError())
+    elif (error := task.exception()) is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(task.result())
@@ -0,0 +1,132 @@
+"""Context-window budgeting for LLM requests."""
+
+from dataclasses import dataclass
+
+from simple_agent_poc.application.tool_output import output_preview
+from simple_agent_poc.core.types import Message
+
+_CHARS_PER_TOKEN = 4
+_MESSAGE_OVERHEAD_TOKENS = 4
+_OMITTED_NOTE = "[{count} earlier messages were omitted to fit the context budget.]"
+_SUMMARY_NOTE = "Summary of the earlier conversation:\n{summary}"
+
+
+def estimate_tokens(messages: list[Message]) -> int:
+    """Estimate prompt tokens from message text length.
+
+    This is a provider-independent heuristic (about four characters per
+    token plus a small per-message overhead), good enough for budgeting.
+    """
+    chars = 0
+    for message in messages:
+        chars += len(message["content"] or "")
+        for tool_call in message.get("tool_calls") or ():
+            function = tool_call["function"]
+            chars += len(function["name"]) + len(function["arguments"])
+    return chars // _CHARS_PER_TOKEN + _MESSAGE_OVERHEAD_TOKENS * len(messages)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactionResult:
+    """Messages to send to the LLM after fitting them to a token budget.
+
+    ``dropped_messages`` are the older turns that were replaced by the note
+    at ``note_index``; callers may swap that note for a summary.
+    """
+
+    messages: list[Message]
+    tokens_before: int
+    tokens_after: int
+    truncated_tool_results: int = 0
+    dropped_messages: tuple[Message, ...] = ()
+    note_index: int | None = None
+
+    @property
+    def compacted(self) -> bool:
+        """Return whether any message was truncated or dropped."""
+        return bool(self.truncated_tool_results or self.dropped_messages)
+
+    def with_summary(self, summary: str) -> CompactionResult:
+        """Return a copy whose omitted-turns note is replaced by ``summary``."""
+        if self.note_index is None:
+            return self
+        messages = list(self.messages)
+        messages[self.note_index] = {
+            "role": "system",
+            "content": _SUMMARY_NOTE.format(summary=summary),
+        }
+        return CompactionResult(
+            messages=messages,
+            tokens_before=self.tokens_before,
+            tokens_after=estimate_tokens(messages),
+            truncated_tool_results=self.truncated_tool_results,
+            dropped_messages=self.dropped_messages,
+            note_index=self.note_index,
+        )
+
+
+def compact_messages(
+    messages: list[Message],
+    *,
+    token_budget: int | None,
+    keep_recent_turns: int,
+    tool_result_max_chars: int,
+) -> CompactionResult:
+    """Fit ``messages`` into ``token_budget`` estimated tokens.
+
+    Leading system messages and the last ``keep_recent_turns`` turns (a turn
+    starts at a user message) are always kept. When over budget, oversized
+    tool results are truncated first, then the oldest turns are dropped one
+    by one and replaced with a single note. The input list is not modified.
+    """
+    tokens_before = estimate_tokens(messages)
+    if token_budget is None or tokens_before <= token_budget:
+        return CompactionResult(messages, tokens_before, tokens_before)
+
+    truncated = 0
+    compacted: list[Message] = []
+    for message in messages:
+        if (
+            message["role"] == "tool"
+            and len(message["content"]) > tool_result_max_chars
+        ):
+            message = message.copy()
+            message["content"] = output_preview(
+                message["content"], tool_result_max_chars
+            )
+            truncated += 1
+        compacted.append(message)
+    tokens = estimate_tokens(compacted)
+    if tokens <= token_budget:
+        return CompactionResult(compacted, tokens_before, tokens, truncated)
+
+    prefix_end = 0
+    while prefix_end < len(compacted) and compacted[prefix_end]["role"] == "system":
+        prefix_end += 1
+    turn_starts = [
+        idx
+        for idx in range(prefix_end, len(compacted))
+        if compacted[idx]["role"] == "user"
+    ]
+    # Cutting at turn_starts[i] drops every turn before the i-th one.
+    cut_points = turn_starts[1 : max(len(turn_starts) - keep_recent_turns + 1, 1)]
+
+    prefix = compacted[:prefix_end]
+    note: Message = {"role": "system", "content": ""}
+    cut = prefix_end
+    for cut in cut_points:
+        note["content"] = _OMITTED_NOTE.format(count=cut - prefix_end)
+        candidate = [*prefix, note, *compacted[cut:]]
+        tokens = estimate_tokens(candidate)
+        if tokens <= token_budget:
+            break
+    if cut == prefix_end:
+        return CompactionResult(compacted, tokens_before, tokens, truncated)
+    return CompactionResult(
+        messages=[*prefix, note, *compacted[cut:]],
+        tokens_before=tokens_before,
+        tokens_after=tokens,
+        truncated_tool_results=truncated,
+        dropped_messages=tuple(compacted[prefix_end:cut]),
+        note_index=prefix_end,
+    )
@@ -49,6 +49,16 @@ class ToolResultEvent:
     result: str
 
 
+@dataclass(frozen=True, slots=True)
+class ToolProgressEvent:
+    """Partial output of a tool call that is still running."""
+
+    call_id: str
+    name: str
+    stream: str
+    data: str
+
+
 @dataclass(frozen=True, slots=True)
 class ContinueRequest:
     """Request DTO for resuming a paused session."""
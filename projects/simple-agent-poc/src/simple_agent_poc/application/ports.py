@@ -1,10 +1,10 @@
 """Application ports."""
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from typing import Protocol
 
 from simple_agent_poc.core.agent_definition import AgentDefinition
-from simple_agent_poc.core.session import ConversationSession
+from simple_agent_poc.core.session import ConversationSession, SessionChanges
 from simple_agent_poc.core.types import (
     LLMStreamChunk,
     Message,
@@ -23,6 +23,36 @@ class ToolExecutor(Protocol):
         """Return tool definitions for the given tool names."""
 
 
+class AsyncToolExecutor(Protocol):
+    """Execute built-in tools by name without blocking the event loop."""
+
+    async def aexecute(self, tool_call: ToolCall, /) -> str:
+        """Execute a tool call and return the result string."""
+
+    def get_definitions(self, tool_names: list[str], /) -> list[ToolDefinition]:
+        """Return tool definitions for the given tool names."""
+
+
+class BatchToolExecutor(Protocol):
+    """Execute several calls of one tool in a single executor call."""
+
+    def supports_batch(self, tool_name: str, /) -> bool:
+        """Return whether calls of *tool_name* can be executed as a batch."""
+
+    def execute_batch(self, tool_calls: list[ToolCall], /) -> list[str]:
+        """Execute calls of one tool and return their results in order."""
+
+
+class BlobStore(Protocol):
+    """Content-addressed storage for tool outputs too large to keep inline."""
+
+    def put(self, data: bytes, /) -> str:
+        """Store *data* and return its reference, e.g. ``sha256:<hex>``."""
+
+    def get(self, ref: str, /) -> bytes | None:
+        """Return the blob stored under *ref*, or None if there is none."""
+
+
 class LLMClient(Protocol):
     """Interface for LLM clients."""
 
@@ -35,10 +65,24 @@ class LLMClient(Protocol):
         """Receive message history and yield streaming chunks."""
 
 
+class AsyncLLMClient(Protocol):
+    """Interface for LLM clients with native asyncio streaming."""
+
+    def acomplete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools: list[ToolDefinition] | None = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Receive message history and asynchronously yield streaming chunks."""
+
+
 class LLMClientFactory(Protocol):
     """Factory for agent-specific LLM clients."""
 
-    def __call__(self, agent_definition: AgentDefinition, /) -> LLMClient:
+    def __call__(
+        self, agent_definition: AgentDefinition, /
+    ) -> LLMClient | AsyncLLMClient:
         """Create an LLM client for the selected agent."""
 
 
@@ -50,3 +94,23 @@ class SessionStore(Protocol):
 
     def save(self, session: ConversationSession) -> None:
         """Persist the latest session state."""
+
+    def save_changes(self, changes: SessionChanges) -> None:
+        """Append new messages and patch changed messages and pause state.
+
+        Raise ``SessionNotFoundError`` when the messages the changes build on
+        are no longer stored; the caller then saves the full session.
+        """
+
+
+class AsyncSessionStore(Protocol):
+    """Non-blocking persistence boundary for conversation sessions."""
+
+    async def aget(self, session_id: str) -> ConversationSession | None:
+        """Return a stored session if it exists."""
+
+    async def asave(self, session: ConversationSession) -> None:
+        """Persist the latest session state."""
+
+    async def asave_changes(self, changes: SessionChanges) -> None:
+        """Append new messages and patch changed messages and pause state."""
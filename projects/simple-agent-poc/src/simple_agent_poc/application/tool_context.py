@@ -0,0 +1,57 @@
+"""Per-call context that tool executors can read and report back through.
+
+The use case makes the contexts of the calls being executed active in a
+``contextvars`` variable, so they reach executors running in worker threads.
+A single call sees one context; a batch sees one per call, in batch order.
+"""
+
+import contextvars
+from collections.abc import Callable, Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+__all__ = ["ToolCallContext", "current_tool_calls", "use_tool_calls"]
+
+
+@dataclass(slots=True)
+class ToolCallContext:
+    """Run settings visible to a tool executor for one call.
+
+    ``report`` adds fields to the call's ``tool.call.end`` event. When
+    ``on_output`` is set, the caller streams partial output of the call, and
+    executors that produce output incrementally pass it to ``output``; the
+    listener may be called from any thread.
+    """
+
+    agent_id: str
+    cache_results: bool = True
+    fields: dict[str, object] = field(default_factory=dict)
+    on_output: Callable[[str, str], None] | None = None
+
+    def report(self, **fields: object) -> None:
+        self.fields.update(fields)
+
+    def output(self, stream: str, data: str) -> None:
+        """Pass a chunk of *stream* (``stdout`` or ``stderr``) to the caller."""
+        if self.on_output is not None:
+            self.on_output(stream, data)
+
+
+_current_calls: contextvars.ContextVar[tuple[ToolCallContext, ...]] = (
+    contextvars.ContextVar("current_tool_calls", default=())
+)
+
+
+def current_tool_calls() -> tuple[ToolCallContext, ...]:
+    """Return the contexts of the calls being executed, if any."""
+    return _current_calls.get()
+
+
+@contextmanager
+def use_tool_calls(contexts: Sequence[ToolCallContext]) -> Generator[None]:
+    """Make *contexts* active for the block."""
+    token = _current_calls.set(tuple(contexts))
+    try:
+        yield
+    finally:
+        _current_calls.reset(token)
@@ -0,0 +1,50 @@
+"""Per-tool caps on the size of tool results kept in a conversation.
+
+A result over its tool's cap is replaced by a preview of its head and tail.
+When a blob store is configured, the full result is stored there first and
+the preview names its reference.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+__all__ = ["ToolOutputLimits", "output_preview"]
+
+_SPILLED_MARKER = (
+    "\n\n[... {omitted} characters omitted; full output stored as {ref} ...]\n\n"
+)
+_TRUNCATED_MARKER = "\n\n[... {omitted} characters omitted ...]\n\n"
+
+
+@dataclass(frozen=True, slots=True)
+class ToolOutputLimits:
+    """Maximum characters of a tool result kept in the session.
+
+    ``per_tool`` overrides ``max_chars`` for the named tools. None means no
+    cap.
+    """
+
+    max_chars: int | None = None
+    per_tool: Mapping[str, int] = field(default_factory=dict)
+
+    def for_tool(self, tool_name: str) -> int | None:
+        return self.per_tool.get(tool_name, self.max_chars)
+
+
+def output_preview(content: str, max_chars: int, *, ref: str | None = None) -> str:
+    """Keep the head and tail of *content*, *max_chars* in total.
+
+    The marker between them names *ref* when the full content was stored.
+    *content* is returned unchanged when the preview would not be shorter.
+    """
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    omitted = len(content) - head - tail
+    marker = (
+        _SPILLED_MARKER.format(omitted=omitted, ref=ref)
+        if ref is not None
+        else _TRUNCATED_MARKER.format(omitted=omitted)
+    )
+    if len(content) <= max_chars + len(marker):
+        return content
+    return content[:head] + marker + content[len(content) - tail :]
@@ -1,11 +1,25 @@
 """Application use cases."""
 
+import asyncio
+import contextvars
+import inspect
 import json
 import time
-from collections.abc import Generator
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterator,
+)
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from itertools import takewhile
+from typing import cast
 from uuid import uuid4
 
+from simple_agent_poc.application.compaction import compact_messages
 from simple_agent_poc.application.dto import (
     ContentDelta,
     ContinueRequest,
@@ -13,20 +27,32 @@ from simple_agent_poc.application.dto import (
     SessionPaused,
     StreamComplete,
     ToolCallEvent,
+    ToolProgressEvent,
     ToolResultEvent,
 )
 from simple_agent_poc.application.ports import (
+    AsyncLLMClient,
+    BatchToolExecutor,
+    BlobStore,
+    LLMClient,
     LLMClientFactory,
     SessionStore,
     ToolExecutor,
 )
+from simple_agent_poc.application.tool_context import (
+    ToolCallContext,
+    use_tool_calls,
+)
+from simple_agent_poc.application.tool_output import ToolOutputLimits, output_preview
 from simple_agent_poc.core.agent_definition import (
     AgentDefinition,
     AgentDefinitionRegistry,
 )
 from simple_agent_poc.core.session import ConversationSession
 from simple_agent_poc.core.types import (
+    AgentError,
     LLMError,
+    LLMStreamChunk,
     Message,
     SessionNotFoundError,
     SessionNotPausedError,
@@ -41,6 +67,7 @@ from simple_agent_poc.observability import (
     log_event,
     summarize_payload,
 )
+from simple_agent_poc.observability.tracing import Span, start_span, use_span
 
 
 def _accumulate_tool_call_chunks(
@@ -136,31 +163,24 @@ def _tools_without_ask_user(
     return filtered or None
 
 
-def _ask_user_tool_results(session: ConversationSession) -> list[str]:
-    ask_user_call_ids: set[str] = set()
-    for msg in session.messages:
-        tool_calls = msg.get("tool_calls", [])
-        for tc in tool_calls:
-            if tc["function"]["name"] == "ask_user":
-                ask_user_call_ids.add(tc["id"])
-
-    return [
-        msg["content"]
-        for msg in session.messages
-        if msg.get("role") == "tool"
-        and msg.get("tool_call_id") in ask_user_call_ids
-        and msg["content"]
-    ]
+def _calls_before_ask_user(
+    tool_calls: list[ToolCall], *, resumed: bool
+) -> list[ToolCall]:
+    """Return the leading calls that may start before the next ask_user answer."""
+    if resumed:
+        return tool_calls
+    return list(takewhile(lambda tc: tc["function"]["name"] != "ask_user", tool_calls))
 
 
 def _messages_for_llm(
     session: ConversationSession,
     *,
     ask_user_answered: bool,
+    history: list[Message] | None = None,
 ) -> list[Message]:
-    messages = list(session.messages)
+    messages = list(session.messages if history is None else history)
     if ask_user_answered:
-        tool_results = "\n\n".join(_ask_user_tool_results(session))
+        tool_results = "\n\n".join(session.ask_user_results())
         content = _ASK_USER_ANSWERED_REMINDER
         if tool_results:
             content = f"{content}\n\n{tool_results}"
@@ -168,6 +188,26 @@ def _messages_for_llm(
     return messages
 
 
+_SUMMARY_PROMPT = (
+    "Summarize the conversation transcript below for use as context in a later "
+    "turn. Keep facts, decisions, user preferences, tool results that are still "
+    "relevant, and open questions. Reply with the summary only."
+)
+
+
+def _transcript(messages: tuple[Message, ...]) -> str:
+    lines: list[str] = []
+    for msg in messages:
+        if msg["content"]:
+            lines.append(f"{msg['role']}: {msg['content']}")
+        for tc in msg.get("tool_calls") or ():
+            function = tc["function"]
+            lines.append(
+                f"{msg['role']} called {function['name']}({function['arguments']})"
+            )
+    return "\n".join(lines)
+
+
 def _replace_all_ask_user_placeholders(
     session: ConversationSession,
     answers: dict[str, str],
@@ -199,8 +239,370 @@ def _replace_all_ask_user_placeholders(
     return results
 
 
+def _tool_call_event(tool_call: ToolCall) -> ToolCallEvent:
+    return ToolCallEvent(
+        call_id=tool_call["id"],
+        name=tool_call["function"]["name"],
+        arguments=tool_call["function"]["arguments"],
+    )
+
+
+def _tool_result_event(tool_call: ToolCall, result: str) -> ToolResultEvent:
+    return ToolResultEvent(
+        call_id=tool_call["id"],
+        name=tool_call["function"]["name"],
+        result=result,
+    )
+
+
+async def _stream_llm(
+    llm_client: LLMClient | AsyncLLMClient,
+    messages: list[Message],
+    *,
+    tools: list[ToolDefinition] | None,
+    blocking: bool,
+    span: Span,
+) -> AsyncIterator[LLMStreamChunk]:
+    """Stream chunks through ``acomplete_stream`` when available.
+
+    Sync-only clients are iterated directly when *blocking* and otherwise
+    pulled chunk by chunk in a worker thread so the event loop stays free.
+    Async-only clients are streamed natively on either path.
+    *span* ends when the stream is exhausted or fails.
+    """
+    try:
+        async for chunk in _llm_chunks(
+            llm_client, messages, tools=tools, blocking=blocking
+        ):
+            if "usage" in chunk:
+                usage = chunk["usage"]
+                span.set_attributes(
+                    prompt_tokens=usage.get("prompt_tokens"),
+                    completion_tokens=usage.get("completion_tokens"),
+                )
+            yield chunk
+    except Exception as exc:
+        span.fail(exc)
+        raise
+    finally:
+        span.end()
+
+
+async def _llm_chunks(
+    llm_client: LLMClient | AsyncLLMClient,
+    messages: list[Message],
+    *,
+    tools: list[ToolDefinition] | None,
+    blocking: bool,
+) -> AsyncIterator[LLMStreamChunk]:
+    complete_stream = getattr(llm_client, "complete_stream", None)
+    acomplete_stream = getattr(llm_client, "acomplete_stream", None)
+    if acomplete_stream is not None and (
+        complete_stream is None
+        or (not blocking and inspect.isasyncgenfunction(acomplete_stream))
+    ):
+        async for chunk in acomplete_stream(messages, tools=tools):
+            yield chunk
+        return
+    if complete_stream is None:
+        raise TypeError(
+            f"{type(llm_client).__name__} implements neither complete_stream "
+            "nor acomplete_stream"
+        )
+
+    chunks = iter(complete_stream(messages, tools=tools))
+    if blocking:
+        for chunk in chunks:
+            yield chunk
+        return
+    while (chunk := await asyncio.to_thread(_next_chunk, chunks)) is not None:
+        yield chunk
+
+
+def _next_chunk(chunks: Iterator[LLMStreamChunk]) -> LLMStreamChunk | None:
+    return next(chunks, None)
+
+
+_StreamEvent = (
+    ContentDelta
+    | ToolCallEvent
+    | ToolProgressEvent
+    | ToolResultEvent
+    | SessionPaused
+    | StreamComplete
+)
+
+
+@dataclass(slots=True)
+class _RunStart:
+    """State prepared before the first ReAct round of a run."""
+
+    run_id: str
+    session: ConversationSession
+    agent_definition: AgentDefinition
+    first_round: int = 0
+    resumed: bool = False
+    resumed_results: list[tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _RoundTiming:
+    """Time one ReAct round spent waiting on the LLM and on tools.
+
+    Only time the run is blocked counts: awaiting the next LLM chunk, and
+    awaiting tool results. Time spent in the caller between events, such
+    as waiting for an ``ask_user`` answer, is excluded.
+    """
+
+    round: int
+    llm_seconds: float = 0.0
+    tool_seconds: float = 0.0
+
+    async def llm_chunks(
+        self, chunks: AsyncIterator[LLMStreamChunk]
+    ) -> AsyncIterator[LLMStreamChunk]:
+        while True:
+            started = time.perf_counter()
+            chunk = await anext(chunks, None)
+            self.llm_seconds += time.perf_counter() - started
+            if chunk is None:
+                return
+            yield chunk
+
+    async def tool_events(
+        self, events: AsyncIterator[ToolProgressEvent | str]
+    ) -> AsyncIterator[ToolProgressEvent | str]:
+        while True:
+            started = time.perf_counter()
+            try:
+                event = await anext(events, None)
+            finally:
+                self.tool_seconds += time.perf_counter() - started
+            if event is None:
+                return
+            yield event
+
+    def fields(self) -> dict[str, int]:
+        return {
+            "llm_ms": int(self.llm_seconds * 1000),
+            "tool_ms": int(self.tool_seconds * 1000),
+        }
+
+
+def _timing_fields(timings: list[_RoundTiming]) -> dict[str, object]:
+    """Return run totals and per-round LLM and tool time for log events."""
+    return {
+        "llm_ms": int(sum(t.llm_seconds for t in timings) * 1000),
+        "tool_ms": int(sum(t.tool_seconds for t in timings) * 1000),
+        "rounds": [{"round": t.round, **t.fields()} for t in timings],
+    }
+
+
+class _ToolOutput:
+    """Partial output reported by the tool calls of one ReAct round.
+
+    Executors may report from worker threads; chunks are queued per call on
+    the event loop of the run.
+    """
+
+    def __init__(self, tool_calls: list[ToolCall]) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queues: dict[int, asyncio.Queue[ToolProgressEvent]] = {
+            id(tc): asyncio.Queue() for tc in tool_calls
+        }
+
+    def listener(self, tool_call: ToolCall) -> Callable[[str, str], None]:
+        queue = self._queues[id(tool_call)]
+
+        def on_output(stream: str, data: str) -> None:
+            event = ToolProgressEvent(
+                call_id=tool_call["id"],
+                name=tool_call["function"]["name"],
+                stream=stream,
+                data=data,
+            )
+            self._loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        return on_output
+
+    def queue(self, tool_call: ToolCall) -> asyncio.Queue[ToolProgressEvent]:
+        return self._queues[id(tool_call)]
+
+
+class _ToolBatch:
+    """Non-interactive tool calls of one ReAct round.
+
+    When more than one call may run at a time, every call is started up front
+    and bounded by a semaphore; results are still consumed in call order.
+    Output a call reports before it finishes is yielded by ``events`` once
+    the consumer reaches that call, so it never precedes the call's
+    ``ToolCallEvent``.
+    """
+
+    def __init__(
+        self,
+        tool_calls: list[ToolCall],
+        run: Callable[[ToolCall, bool], Awaitable[str]],
+        *,
+        max_parallel: int,
+        output: _ToolOutput,
+    ) -> None:
+        self.tool_calls = tool_calls
+        self._run = run
+        self._output = output
+        self._tasks: dict[int, asyncio.Task[str]] = {}
+        if max_parallel > 1 and len(tool_calls) > 1:
+            semaphore = asyncio.Semaphore(max_parallel)
+
+            async def bounded(tool_call: ToolCall) -> str:
+                async with semaphore:
+                    return await run(tool_call, True)
+
+            self._tasks = {
+                id(tc): asyncio.create_task(bounded(tc)) for tc in tool_calls
+            }
+
+    async def events(
+        self, tool_call: ToolCall
+    ) -> AsyncIterator[ToolProgressEvent | str]:
+        """Yield the output of *tool_call* while it runs, then its result.
+
+        The call is run now if it was not started up front.
+        """
+        task = self._tasks.get(id(tool_call))
+        if task is None:
+            task = asyncio.ensure_future(self._run(tool_call, False))
+        queue = self._output.queue(tool_call)
+        try:
+            while not task.done():
+                chunk = asyncio.ensure_future(queue.get())
+                try:
+                    await asyncio.wait(
+                        {task, chunk}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    received = chunk.done()
+                    if not received:
+                        chunk.cancel()
+                if received:
+                    yield chunk.result()
+            while not queue.empty():
+                yield queue.get_nowait()
+            yield task.result()
+        finally:
+            if not task.done():
+                task.cancel()
+
+    def cancel(self) -> None:
+        """Cancel calls that are still pending, e.g. after an earlier failure."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+
+class _BatchedToolCalls:
+    """Calls of one tool that the executor runs together as a batch.
+
+    The first call to be awaited starts the batch; every call then waits for
+    its own result, so per-call events and spans are kept.
+    """
+
+    def __init__(
+        self,
+        tool_calls: list[ToolCall],
+        run: Callable[[list[ToolCall]], Awaitable[list[str]]],
+    ) -> None:
+        self.tool_calls = tool_calls
+        self._run = run
+        self._positions = {id(tc): index for index, tc in enumerate(tool_calls)}
+        self._task: asyncio.Task[list[str]] | None = None
+
+    async def result(self, tool_call: ToolCall) -> str:
+        if self._task is None:
+            self._task = asyncio.create_task(_await(self._run(self.tool_calls)))
+        results = await self._task
+        if len(results) != len(self.tool_calls):
+            raise LLMError(
+                f"Tool batch returned {len(results)} results "
+                f"for {len(self.tool_calls)} calls"
+            )
+        return results[self._positions[id(tool_call)]]
+
+
+def _group_batchable_calls(
+    tool_calls: list[ToolCall],
+    supports_batch: Callable[[str], bool],
+    *,
+    max_size: int,
+) -> list[list[ToolCall]]:
+    """Group calls of batch-capable tools into batches of 2 to *max_size*."""
+    by_name: dict[str, list[ToolCall]] = {}
+    for tc in tool_calls:
+        name = tc["function"]["name"]
+        if supports_batch(name):
+            by_name.setdefault(name, []).append(tc)
+    return [
+        chunk
+        for calls in by_name.values()
+        for start in range(0, len(calls), max_size)
+        if len(chunk := calls[start : start + max_size]) > 1
+    ]
+
+
+async def _await[T](awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+def _drive_blocking(
+    stream: AsyncGenerator[_StreamEvent, dict[str, str] | None],
+) -> Generator[_StreamEvent, dict[str, str] | None]:
+    """Expose an async event stream as a blocking generator.
+
+    The stream runs on a private event loop owned by this generator. Every
+    step shares one ``contextvars`` context so log context bound by the run
+    survives between steps, and values passed to ``send()`` are forwarded to
+    the async stream. Must not be called from a thread running an event loop.
+    """
+    loop = asyncio.new_event_loop()
+    context = contextvars.copy_context()
+
+    def step[T](awaitable: Awaitable[T]) -> T:
+        return loop.run_until_complete(
+            loop.create_task(_await(awaitable), context=context)
+        )
+
+    try:
+        sent: dict[str, str] | None = None
+        while True:
+            try:
+                event = step(stream.asend(sent))
+            except StopAsyncIteration:
+                return
+            sent = yield event
+    finally:
+        try:
+            step(stream.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+
 class RunAgentUseCase:
-    """Reusable execution path for session-aware agent interactions."""
+    """Reusable execution path for session-aware agent interactions.
+
+    The ReAct loop is implemented once as an async generator. ``aexecute_stream``
+    and ``acontinue_stream`` run it on the caller's event loop and prefer the
+    async ports (``AsyncLLMClient``, ``AsyncToolExecutor``, ``AsyncSessionStore``)
+    when the injected adapters implement them, falling back to worker threads
+    for synchronous-only adapters. ``execute_stream`` and ``continue_stream``
+    drive the same loop as blocking generators and only use the sync ports.
+
+    With ``tool_output_limits``, a tool result over its tool's cap is
+    replaced by a preview before it reaches the session, the logs and the
+    LLM; with a ``blob_store``, the full result is stored there first.
+    """
 
     def __init__(
         self,
@@ -210,25 +612,63 @@ class RunAgentUseCase:
         agent_definitions: AgentDefinitionRegistry,
         tool_executor: ToolExecutor | None = None,
         is_api_context: bool = False,
+        tool_output_limits: ToolOutputLimits | None = None,
+        blob_store: BlobStore | None = None,
     ) -> None:
         self._llm_client_factory = llm_client_factory
         self._session_store = session_store
         self._agent_definitions = agent_definitions
         self._tool_executor = tool_executor
         self._is_api_context = is_api_context
+        self._tool_output_limits = tool_output_limits or ToolOutputLimits()
+        self._blob_store = blob_store
 
     def execute_stream(
         self, request: RunAgentRequest
-    ) -> Generator[
-        ContentDelta | ToolCallEvent | ToolResultEvent | SessionPaused | StreamComplete,
-        dict[str, str] | None,
-    ]:
+    ) -> Generator[_StreamEvent, dict[str, str] | None]:
         """Run the agent for a single user message with streaming ReAct loop.
 
         When the LLM calls the ask_user tool and is_api_context is False,
         the generator pauses via ``yield ToolCallEvent(...)``. The caller
         must inject the user's answer by calling ``generator.send(answer)``.
         """
+        return _drive_blocking(
+            self._stream(
+                lambda: self._start_execute(request, blocking=True),
+                blocking=True,
+            )
+        )
+
+    def aexecute_stream(
+        self, request: RunAgentRequest
+    ) -> AsyncGenerator[_StreamEvent, dict[str, str] | None]:
+        """Async variant of ``execute_stream`` for event-loop based adapters."""
+        return self._stream(
+            lambda: self._start_execute(request, blocking=False),
+            blocking=False,
+        )
+
+    def continue_stream(self, request: ContinueRequest) -> Generator[_StreamEvent]:
+        """Resume a paused session with the user's answers."""
+        return _drive_blocking(
+            self._stream(
+                lambda: self._start_continue(request, blocking=True),
+                blocking=True,
+            )
+        )
+
+    def acontinue_stream(
+        self, request: ContinueRequest
+    ) -> AsyncGenerator[_StreamEvent]:
+        """Async variant of ``continue_stream`` for event-loop based adapters."""
+        return self._stream(
+            lambda: self._start_continue(request, blocking=False),
+            blocking=False,
+        )
+
+    async def _start_execute(
+        self, request: RunAgentRequest, *, blocking: bool
+    ) -> _RunStart:
         if not request.message.strip():
             raise ValidationError("message must not be blank")
 
@@ -240,271 +680,27 @@ class RunAgentUseCase:
             agent_id=agent_definition.agent_id,
             mode=mode,
         )
-        session = self._load_session(
+        session = await self._load_session(
             request.session_id,
             agent_definition=agent_definition,
+            blocking=blocking,
         )
         bind_log_context(session_id=session.session_id)
         if session.agent_id != agent_definition.agent_id:
             raise ValidationError("agent_id cannot be changed for an existing session")
         session.append_user_message(request.message)
-
-        log_event(
-            "agent.run.start",
+        return _RunStart(
             run_id=run_id,
-            model=agent_definition.model,
-            api_type=agent_definition.api_type,
-            stream=True,
+            session=session,
+            agent_definition=agent_definition,
         )
 
-        llm_client = self._llm_client_factory(agent_definition)
-        tools = self._resolve_tools(agent_definition)
-        model = agent_definition.model
-        _start_time = time.perf_counter()
-        _accumulated_text = ""
-        ask_user_answered = False
-
-        try:
-            for round_idx in range(agent_definition.max_tool_rounds):
-                log_event("react.round.start", round=round_idx)
-                _accumulated_text = ""
-                accumulated_tool_calls: dict[int, ToolCall] = {}
-                usage_from_stream: Usage | None = None
-                round_tools = (
-                    _tools_without_ask_user(tools) if ask_user_answered else tools
-                )
-                message_count = len(
-                    _messages_for_llm(
-                        session,
-                        ask_user_answered=ask_user_answered,
-                    )
-                )
-
-                for chunk in llm_client.complete_stream(
-                    _messages_for_llm(
-                        session,
-                        ask_user_answered=ask_user_answered,
-                    ),
-                    tools=round_tools,
-                ):
-                    delta = chunk.get("content_delta")
-                    if delta:
-                        _accumulated_text += delta
-                        yield ContentDelta(delta=delta)
-
-                    td = chunk.get("tool_call_delta")
-                    if td is not None:
-                        _accumulate_tool_call_chunks(accumulated_tool_calls, td)
-
-                    if "usage" in chunk:
-                        usage_from_stream = chunk["usage"]
-
-                if accumulated_tool_calls:
-                    if self._tool_executor is None:
-                        raise LLMError(
-                            "Tool call requested but no tool executor configured",
-                            display_message="Tool call requested but no tool executor configured.",
-                        )
-                    tool_calls = [
-                        accumulated_tool_calls[i]
-                        for i in sorted(accumulated_tool_calls)
-                    ]
-
-                    ask_user_tc = next(
-                        (
-                            tc
-                            for tc in tool_calls
-                            if tc["function"]["name"] == "ask_user"
-                        ),
-                        None,
-                    )
-                    session.append_assistant_message(
-                        _accumulated_text, tool_calls=tool_calls
-                    )
-
-                    if ask_user_tc and self._is_api_context:
-                        ask_user_tcs = [
-                            tc
-                            for tc in tool_calls
-                            if tc["function"]["name"] == "ask_user"
-                        ]
-                        all_questions: list[dict] = []
-                        for tc in ask_user_tcs:
-                            ask_user_args = json.loads(tc["function"]["arguments"])
-                            all_questions.extend(ask_user_args.get("questions", []))
-
-                        _validate_questions(all_questions)
-
-                        for tc in tool_calls:
-                            yield ToolCallEvent(
-                                call_id=tc["id"],
-                                name=tc["function"]["name"],
-                                arguments=tc["function"]["arguments"],
-                            )
-                        for tc in tool_calls:
-                            if tc["function"]["name"] == "ask_user":
-                                continue
-                            log_event(
-                                "tool.call.start",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                            )
-                            try:
-                                result = self._tool_executor.execute(tc)
-                            except Exception as exc:
-                                log_event(
-                                    "tool.call.error",
-                                    tool_call_id=tc["id"],
-                                    tool_name=tc["function"]["name"],
-                                    round=round_idx,
-                                    error=summarize_payload(str(exc)),
-                                )
-                                raise
-                            log_event(
-                                "tool.call.end",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                                payload=summarize_payload(result),
-                            )
-                            session.append_tool_message(result, tool_call_id=tc["id"])
-                            yield ToolResultEvent(
-                                call_id=tc["id"],
-                                name=tc["function"]["name"],
-                                result=result,
-                            )
-                        log_event(
-                            "ask_user.pause",
-                            tool_call_id=ask_user_tc["id"],
-                            round=round_idx,
-                        )
-                        session.pause_for_ask_user(ask_user_tc, round_idx=round_idx)
-                        for tc in ask_user_tcs:
-                            session.append_tool_message("", tool_call_id=tc["id"])
-                        self._session_store.save(session)
-                        log_event("session.saved")
-                        yield SessionPaused(
-                            session_id=session.session_id,
-                            call_id=ask_user_tc["id"],
-                            questions=all_questions,
-                        )
-                        return
-
-                    for tc in tool_calls:
-                        if tc["function"]["name"] == "ask_user":
-                            event = ToolCallEvent(
-                                call_id=tc["id"],
-                                name=tc["function"]["name"],
-                                arguments=tc["function"]["arguments"],
-                            )
-                            user_answers = yield event
-                            ask_user_args = json.loads(tc["function"]["arguments"])
-                            questions = ask_user_args.get("questions", [])
-                            result = _build_ask_user_result(
-                                user_answers or {}, questions
-                            )
-                            ask_user_answered = True
-                            log_event(
-                                "ask_user.answered",
-                                tool_call_id=tc["id"],
-                                round=round_idx,
-                            )
-                        else:
-                            log_event(
-                                "tool.call.start",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                            )
-                            yield ToolCallEvent(
-                                call_id=tc["id"],
-                                name=tc["function"]["name"],
-                                arguments=tc["function"]["arguments"],
-                            )
-                            try:
-                                result = self._tool_executor.execute(tc)
-                            except Exception as exc:
-                                log_event(
-                                    "tool.call.error",
-                                    tool_call_id=tc["id"],
-                                    tool_name=tc["function"]["name"],
-                                    round=round_idx,
-                                    error=summarize_payload(str(exc)),
-                                )
-                                raise
-                            log_event(
-                                "tool.call.end",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                                payload=summarize_payload(result),
-                            )
-                        session.append_tool_message(result, tool_call_id=tc["id"])
-                        yield ToolResultEvent(
-                            call_id=tc["id"],
-                            name=tc["function"]["name"],
-                            result=result,
-                        )
-                    log_event(
-                        "react.round.end",
-                        round=round_idx,
-                        usage=usage_from_stream,
-                        message_count=message_count,
-                        stream=True,
-                    )
-                else:
-                    session.append_assistant_message(_accumulated_text)
-                    elapsed = time.perf_counter() - _start_time
-                    log_event(
-                        "react.round.end",
-                        round=round_idx,
-                        usage=usage_from_stream,
-                        message_count=message_count,
-                        stream=True,
-                    )
-                    log_event(
-                        "agent.run.end",
-                        run_id=run_id,
-                        usage=usage_from_stream,
-                        model=model,
-                        elapsed_ms=int(elapsed * 1000),
-                    )
-                    yield StreamComplete(
-                        session_id=session.session_id,
-                        usage=usage_from_stream,
-                        model=model,
-                        response_time=elapsed,
-                    )
-                    return
-
-            log_event("react.max_rounds_exceeded")
-            raise LLMError(
-                "Exceeded maximum tool call rounds",
-                display_message="Exceeded maximum tool call rounds.",
-            )
-        except Exception as exc:
-            log_event("agent.run.error", error=summarize_payload(str(exc)))
-            if _accumulated_text:
-                session.append_assistant_message(
-                    f"{_accumulated_text}\n\n[stream interrupted]"
-                )
-            else:
-                session.append_assistant_message("[stream interrupted]")
-            raise
-        finally:
-            self._session_store.save(session)
-            log_event("session.saved")
-
-    def continue_stream(
-        self, request: ContinueRequest
-    ) -> Generator[
-        ContentDelta | ToolCallEvent | ToolResultEvent | SessionPaused | StreamComplete
-    ]:
-        """Resume a paused session with the user's answers."""
+    async def _start_continue(
+        self, request: ContinueRequest, *, blocking: bool
+    ) -> _RunStart:
         run_id = uuid4().hex
 
-        session = self._session_store.get(request.session_id)
+        session = await self._get_session(request.session_id, blocking=blocking)
         if session is None:
             log_event("session.not_found", session_id=request.session_id)
             raise SessionNotFoundError(
@@ -531,15 +727,33 @@ class RunAgentUseCase:
 
         results = _replace_all_ask_user_placeholders(session, request.answers, tc)
         log_event("ask_user.answered", tool_call_id=tc["id"])
-        self._session_store.save(session)
+        await self._save_session(session, blocking=blocking)
         log_event("session.saved")
-        for call_id, result in results:
-            yield ToolResultEvent(call_id=call_id, name="ask_user", result=result)
 
-        resume_round = session.pending_round
-        session.resume_with_answer()
+        return _RunStart(
+            run_id=run_id,
+            session=session,
+            agent_definition=self._agent_definitions.get(session.agent_id),
+            first_round=session.pending_round + 1,
+            resumed=True,
+            resumed_results=results,
+        )
+
+    async def _stream(
+        self,
+        start: Callable[[], Awaitable[_RunStart]],
+        *,
+        blocking: bool,
+    ) -> AsyncGenerator[_StreamEvent, dict[str, str] | None]:
+        run = await start()
+        run_id = run.run_id
+        session = run.session
+        agent_definition = run.agent_definition
+        for call_id, result in run.resumed_results:
+            yield ToolResultEvent(call_id=call_id, name="ask_user", result=result)
+        if run.resumed:
+            session.resume_with_answer()
 
-        agent_definition = self._agent_definitions.get(session.agent_id)
         log_event(
             "agent.run.start",
             run_id=run_id,
@@ -553,30 +767,64 @@ class RunAgentUseCase:
         model = agent_definition.model
         _start_time = time.perf_counter()
         _accumulated_text = ""
-        ask_user_answered = True
+        ask_user_answered = run.resumed
+        summaries: dict[int, str] = {}
+        timings: list[_RoundTiming] = []
+        run_span = start_span(
+            "agent.run",
+            trace_id=run_id,
+            run_id=run_id,
+            session_id=session.session_id,
+            agent_id=agent_definition.agent_id,
+            model=model,
+            api_type=agent_definition.api_type,
+            resumed=run.resumed,
+        )
+        round_span = run_span
 
         try:
-            for round_idx in range(resume_round + 1, agent_definition.max_tool_rounds):
+            for round_idx in range(run.first_round, agent_definition.max_tool_rounds):
                 log_event("react.round.start", round=round_idx)
+                round_span = start_span("react.round", parent=run_span, round=round_idx)
+                timing = _RoundTiming(round_idx)
+                timings.append(timing)
                 _accumulated_text = ""
                 accumulated_tool_calls: dict[int, ToolCall] = {}
                 usage_from_stream: Usage | None = None
                 round_tools = (
                     _tools_without_ask_user(tools) if ask_user_answered else tools
                 )
-                message_count = len(
-                    _messages_for_llm(
-                        session,
-                        ask_user_answered=ask_user_answered,
-                    )
+                history = await self._compact_history(
+                    session,
+                    agent_definition,
+                    llm_client,
+                    summaries=summaries,
+                    round_idx=round_idx,
+                    blocking=blocking,
+                    span=round_span,
                 )
-
-                for chunk in llm_client.complete_stream(
-                    _messages_for_llm(
-                        session,
-                        ask_user_answered=ask_user_answered,
-                    ),
-                    tools=round_tools,
+                llm_messages = _messages_for_llm(
+                    session,
+                    ask_user_answered=ask_user_answered,
+                    history=history,
+                )
+                message_count = len(llm_messages)
+
+                async for chunk in timing.llm_chunks(
+                    _stream_llm(
+                        llm_client,
+                        llm_messages,
+                        tools=round_tools,
+                        blocking=blocking,
+                        span=start_span(
+                            "llm.stream",
+                            parent=round_span,
+                            model=model,
+                            api_type=agent_definition.api_type,
+                            round=round_idx,
+                            message_count=message_count,
+                        ),
+                    )
                 ):
                     delta = chunk.get("content_delta")
                     if delta:
@@ -591,7 +839,8 @@ class RunAgentUseCase:
                         usage_from_stream = chunk["usage"]
 
                 if accumulated_tool_calls:
-                    if self._tool_executor is None:
+                    tool_executor = self._tool_executor
+                    if tool_executor is None:
                         raise LLMError(
                             "Tool call requested but no tool executor configured",
                             display_message="Tool call requested but no tool executor configured.",
@@ -600,31 +849,21 @@ class RunAgentUseCase:
                         accumulated_tool_calls[i]
                         for i in sorted(accumulated_tool_calls)
                     ]
-                    for tc in tool_calls:
-                        yield ToolCallEvent(
-                            call_id=tc["id"],
-                            name=tc["function"]["name"],
-                            arguments=tc["function"]["arguments"],
-                        )
+                    # A resumed run announces every call up front; a fresh run
+                    # announces them as they are executed.
+                    if run.resumed:
+                        for tc in tool_calls:
+                            yield _tool_call_event(tc)
 
                     session.append_assistant_message(
                         _accumulated_text, tool_calls=tool_calls
                     )
 
-                    ask_user_tc = next(
-                        (
-                            tc
-                            for tc in tool_calls
-                            if tc["function"]["name"] == "ask_user"
-                        ),
-                        None,
-                    )
-                    if ask_user_tc and self._is_api_context:
-                        ask_user_tcs = [
-                            tc
-                            for tc in tool_calls
-                            if tc["function"]["name"] == "ask_user"
-                        ]
+                    ask_user_tcs = [
+                        tc for tc in tool_calls if tc["function"]["name"] == "ask_user"
+                    ]
+                    if ask_user_tcs and self._is_api_context:
+                        ask_user_tc = ask_user_tcs[0]
                         all_questions: list[dict] = []
                         for tc in ask_user_tcs:
                             ask_user_args = json.loads(tc["function"]["arguments"])
@@ -632,48 +871,45 @@ class RunAgentUseCase:
 
                         _validate_questions(all_questions)
 
-                        for tc in tool_calls:
-                            if tc["function"]["name"] == "ask_user":
-                                continue
-                            log_event(
-                                "tool.call.start",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                            )
-                            try:
-                                result = self._tool_executor.execute(tc)
-                            except Exception as exc:
-                                log_event(
-                                    "tool.call.error",
-                                    tool_call_id=tc["id"],
-                                    tool_name=tc["function"]["name"],
-                                    round=round_idx,
-                                    error=summarize_payload(str(exc)),
+                        if not run.resumed:
+                            for tc in tool_calls:
+                                yield _tool_call_event(tc)
+                        batch = self._start_tool_batch(
+                            tool_executor,
+                            [
+                                tc
+                                for tc in tool_calls
+                                if tc["function"]["name"] != "ask_user"
+                            ],
+                            round_idx=round_idx,
+                            agent_definition=agent_definition,
+                            blocking=blocking,
+                            span=round_span,
+                        )
+                        try:
+                            for tc in batch.tool_calls:
+                                result = ""
+                                async for event in timing.tool_events(batch.events(tc)):
+                                    if isinstance(event, ToolProgressEvent):
+                                        yield event
+                                    else:
+                                        result = event
+                                session.append_tool_message(
+                                    result, tool_call_id=tc["id"]
                                 )
-                                raise
-                            log_event(
-                                "tool.call.end",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                                payload=summarize_payload(result),
-                            )
-                            session.append_tool_message(result, tool_call_id=tc["id"])
-                            yield ToolResultEvent(
-                                call_id=tc["id"],
-                                name=tc["function"]["name"],
-                                result=result,
-                            )
+                                yield _tool_result_event(tc, result)
+                        finally:
+                            batch.cancel()
                         log_event(
                             "ask_user.pause",
                             tool_call_id=ask_user_tc["id"],
                             round=round_idx,
                         )
                         session.pause_for_ask_user(ask_user_tc, round_idx=round_idx)
+                        run_span.set_attributes(outcome="paused")
                         for tc in ask_user_tcs:
                             session.append_tool_message("", tool_call_id=tc["id"])
-                        self._session_store.save(session)
+                        await self._save_session(session, blocking=blocking)
                         log_event("session.saved")
                         yield SessionPaused(
                             session_id=session.session_id,
@@ -682,44 +918,60 @@ class RunAgentUseCase:
                         )
                         return
 
-                    for tc in tool_calls:
-                        log_event(
-                            "tool.call.start",
-                            tool_call_id=tc["id"],
-                            tool_name=tc["function"]["name"],
-                            round=round_idx,
-                        )
-                        try:
-                            result = self._tool_executor.execute(tc)
-                        except Exception as exc:
-                            log_event(
-                                "tool.call.error",
-                                tool_call_id=tc["id"],
-                                tool_name=tc["function"]["name"],
-                                round=round_idx,
-                                error=summarize_payload(str(exc)),
-                            )
-                            raise
-                        log_event(
-                            "tool.call.end",
-                            tool_call_id=tc["id"],
-                            tool_name=tc["function"]["name"],
-                            round=round_idx,
-                            payload=summarize_payload(result),
-                        )
-                        session.append_tool_message(result, tool_call_id=tc["id"])
-                        yield ToolResultEvent(
-                            call_id=tc["id"],
-                            name=tc["function"]["name"],
-                            result=result,
-                        )
+                    batch: _ToolBatch | None = None
+                    try:
+                        for index, tc in enumerate(tool_calls):
+                            if tc["function"]["name"] == "ask_user" and not run.resumed:
+                                if batch is not None:
+                                    batch.cancel()
+                                    batch = None
+                                user_answers = yield _tool_call_event(tc)
+                                ask_user_args = json.loads(tc["function"]["arguments"])
+                                questions = ask_user_args.get("questions", [])
+                                result = _build_ask_user_result(
+                                    user_answers or {}, questions
+                                )
+                                ask_user_answered = True
+                                log_event(
+                                    "ask_user.answered",
+                                    tool_call_id=tc["id"],
+                                    round=round_idx,
+                                )
+                            else:
+                                if batch is None:
+                                    # Calls after an ask_user wait for its answer.
+                                    batch = self._start_tool_batch(
+                                        tool_executor,
+                                        _calls_before_ask_user(
+                                            tool_calls[index:], resumed=run.resumed
+                                        ),
+                                        round_idx=round_idx,
+                                        agent_definition=agent_definition,
+                                        blocking=blocking,
+                                        span=round_span,
+                                    )
+                                if not run.resumed:
+                                    yield _tool_call_event(tc)
+                                result = ""
+                                async for event in timing.tool_events(batch.events(tc)):
+                                    if isinstance(event, ToolProgressEvent):
+                                        yield event
+                                    else:
+                                        result = event
+                            session.append_tool_message(result, tool_call_id=tc["id"])
+                            yield _tool_result_event(tc, result)
+                    finally:
+                        if batch is not None:
+                            batch.cancel()
                     log_event(
                         "react.round.end",
                         round=round_idx,
                         usage=usage_from_stream,
                         message_count=message_count,
                         stream=True,
+                        **timing.fields(),
                     )
+                    round_span.end()
                 else:
                     session.append_assistant_message(_accumulated_text)
                     elapsed = time.perf_counter() - _start_time
@@ -729,13 +981,17 @@ class RunAgentUseCase:
                         usage=usage_from_stream,
                         message_count=message_count,
                         stream=True,
+                        **timing.fields(),
                     )
+                    round_span.end()
+                    run_span.set_attributes(outcome="completed")
                     log_event(
                         "agent.run.end",
                         run_id=run_id,
                         usage=usage_from_stream,
                         model=model,
                         elapsed_ms=int(elapsed * 1000),
+                        **_timing_fields(timings),
                     )
                     yield StreamComplete(
                         session_id=session.session_id,
@@ -751,7 +1007,16 @@ class RunAgentUseCase:
                 display_message="Exceeded maximum tool call rounds.",
             )
         except Exception as exc:
-            log_event("agent.run.error", error=summarize_payload(str(exc)))
+            log_event(
+                "agent.run.error",
+                error=summarize_payload(str(exc)),
+                error_type=type(exc).__name__,
+                **_timing_fields(timings),
+            )
+            if round_span is not run_span:
+                round_span.fail(exc)
+            run_span.fail(exc)
+            run_span.set_attributes(outcome="error")
             if _accumulated_text:
                 session.append_assistant_message(
                     f"{_accumulated_text}\n\n[stream interrupted]"
@@ -760,14 +1025,290 @@ class RunAgentUseCase:
                 session.append_assistant_message("[stream interrupted]")
             raise
         finally:
-            self._session_store.save(session)
+            round_span.end()
+            run_span.end()
+            await self._save_session(session, blocking=blocking)
             log_event("session.saved")
 
-    def _load_session(
+    async def _compact_history(
+        self,
+        session: ConversationSession,
+        agent_definition: AgentDefinition,
+        llm_client: LLMClient | AsyncLLMClient,
+        *,
+        summaries: dict[int, str],
+        round_idx: int,
+        blocking: bool,
+        span: Span,
+    ) -> list[Message]:
+        result = compact_messages(
+            session.messages,
+            token_budget=agent_definition.context_token_budget,
+            keep_recent_turns=agent_definition.context_keep_recent_turns,
+            tool_result_max_chars=agent_definition.context_tool_result_max_chars,
+        )
+        if not result.compacted:
+            return session.messages
+        summarized = False
+        if result.dropped_messages and agent_definition.context_summarize:
+            dropped_count = len(result.dropped_messages)
+            summary = summaries.get(dropped_count)
+            if summary is None:
+                try:
+                    summary = await self._summarize(
+                        llm_client,
+                        result.dropped_messages,
+                        blocking=blocking,
+                        span=start_span(
+                            "llm.stream",
+                            parent=span,
+                            round=round_idx,
+                            purpose="summary",
+                        ),
+                    )
+                except AgentError as exc:
+                    log_event(
+                        "context.summary.error",
+                        round=round_idx,
+                        error=summarize_payload(str(exc)),
+                    )
+                else:
+                    summaries[dropped_count] = summary
+            if summary:
+                result = result.with_summary(summary)
+                summarized = True
+        log_event(
+            "context.compacted",
+            round=round_idx,
+            token_budget=agent_definition.context_token_budget,
+            tokens_before=result.tokens_before,
+            tokens_after=result.tokens_after,
+            tokens_saved=result.tokens_before - result.tokens_after,
+            truncated_tool_results=result.truncated_tool_results,
+            dropped_messages=len(result.dropped_messages),
+            summarized=summarized,
+        )
+        return result.messages
+
+    async def _summarize(
+        self,
+        llm_client: LLMClient | AsyncLLMClient,
+        messages: tuple[Message, ...],
+        *,
+        blocking: bool,
+        span: Span,
+    ) -> str:
+        prompt: list[Message] = [
+            {"role": "system", "content": _SUMMARY_PROMPT},
+            {"role": "user", "content": _transcript(messages)},
+        ]
+        parts: list[str] = []
+        async for chunk in _stream_llm(
+            llm_client, prompt, tools=None, blocking=blocking, span=span
+        ):
+            delta = chunk.get("content_delta")
+            if delta:
+                parts.append(delta)
+        return "".join(parts).strip()
+
+    def _start_tool_batch(
+        self,
+        tool_executor: ToolExecutor,
+        tool_calls: list[ToolCall],
+        *,
+        round_idx: int,
+        agent_definition: AgentDefinition,
+        blocking: bool,
+        span: Span,
+    ) -> _ToolBatch:
+        max_parallel = agent_definition.max_parallel_tool_calls
+        output = _ToolOutput(tool_calls)
+        contexts = {
+            id(tc): ToolCallContext(
+                agent_id=agent_definition.agent_id,
+                cache_results=agent_definition.tool_result_cache,
+                on_output=output.listener(tc),
+            )
+            for tc in tool_calls
+        }
+        # Several calls of a batch-capable tool go to the executor together,
+        # but only in rounds that may run calls in parallel anyway.
+        batches: dict[int, _BatchedToolCalls] = {}
+        supports_batch = getattr(tool_executor, "supports_batch", None)
+        execute_batch = getattr(tool_executor, "execute_batch", None)
+        if max_parallel > 1 and callable(supports_batch) and callable(execute_batch):
+            batch_executor = cast(BatchToolExecutor, tool_executor)
+
+            async def run_batch(batch_calls: list[ToolCall]) -> list[str]:
+                with use_tool_calls([contexts[id(tc)] for tc in batch_calls]):
+                    return await asyncio.to_thread(
+                        batch_executor.execute_batch, batch_calls
+                    )
+
+            for calls in _group_batchable_calls(
+                tool_calls, batch_executor.supports_batch, max_size=max_parallel
+            ):
+                batch = _BatchedToolCalls(calls, run_batch)
+                batches.update((id(tc), batch) for tc in calls)
+        return _ToolBatch(
+            tool_calls,
+            lambda tool_call, concurrent: self._execute_tool(
+                tool_executor,
+                tool_call,
+                round_idx=round_idx,
+                blocking=blocking,
+                concurrent=concurrent,
+                span=span,
+                context=contexts[id(tool_call)],
+                batch=batches.get(id(tool_call)),
+            ),
+            max_parallel=max_parallel,
+            output=output,
+        )
+
+    async def _execute_tool(
+        self,
+        tool_executor: ToolExecutor,
+        tool_call: ToolCall,
+        *,
+        round_idx: int,
+        blocking: bool,
+        concurrent: bool = False,
+        span: Span,
+        context: ToolCallContext,
+        batch: _BatchedToolCalls | None = None,
+    ) -> str:
+        log_event(
+            "tool.call.start",
+            tool_call_id=tool_call["id"],
+            tool_name=tool_call["function"]["name"],
+            round=round_idx,
+        )
+        started = time.perf_counter()
+        tool_span = start_span(
+            "tool.call",
+            parent=span,
+            tool_call_id=tool_call["id"],
+            tool_name=tool_call["function"]["name"],
+            round=round_idx,
+            batch_size=len(batch.tool_calls) if batch is not None else None,
+        )
+        try:
+            # The active span and call context reach executors run in worker
+            # threads; the span is forwarded to the services they call.
+            with use_span(tool_span), use_tool_calls([context]):
+                aexecute = getattr(tool_executor, "aexecute", None)
+                if batch is not None:
+                    result = await batch.result(tool_call)
+                elif blocking and not concurrent:
+                    result = tool_executor.execute(tool_call)
+                elif blocking:
+                    result = await asyncio.to_thread(tool_executor.execute, tool_call)
+                elif inspect.iscoroutinefunction(aexecute):
+                    result = await aexecute(tool_call)
+                else:
+                    result = await asyncio.to_thread(tool_executor.execute, tool_call)
+        except Exception as exc:
+            log_event(
+                "tool.call.error",
+                tool_call_id=tool_call["id"],
+                tool_name=tool_call["function"]["name"],
+                round=round_idx,
+                error=summarize_payload(str(exc)),
+                elapsed_ms=int((time.perf_counter() - started) * 1000),
+            )
+            raise
+        result, output_fields = await self._cap_tool_output(
+            result, tool_call, blocking=blocking
+        )
+        log_event(
+            "tool.call.end",
+            tool_call_id=tool_call["id"],
+            tool_name=tool_call["function"]["name"],
+            round=round_idx,
+            payload=summarize_payload(result),
+            elapsed_ms=int((time.perf_counter() - started) * 1000),
+            **context.fields,
+            **output_fields,
+        )
+        return result
+
+    async def _cap_tool_output(
+        self, result: str, tool_call: ToolCall, *, blocking: bool
+    ) -> tuple[str, dict[str, object]]:
+        """Return *result*, or its preview if it is over the tool's cap.
+
+        The second item holds the ``tool.call.end`` fields describing the cap.
+        A result that cannot be stored is still cut to its preview.
+        """
+        tool_name = tool_call["function"]["name"]
+        max_chars = self._tool_output_limits.for_tool(tool_name)
+        if max_chars is None or len(result) <= max_chars:
+            return result, {}
+        ref: str | None = None
+        store = self._blob_store
+        if store is not None:
+            data = result.encode("utf-8")
+            try:
+                if blocking:
+                    ref = store.put(data)
+                else:
+                    ref = await asyncio.to_thread(store.put, data)
+            except OSError as exc:
+                log_event(
+                    "tool.output.spill.error",
+                    tool_call_id=tool_call["id"],
+                    tool_name=tool_name,
+                    error=summarize_payload(str(exc)),
+                )
+        return output_preview(result, max_chars, ref=ref), {
+            "output_chars": len(result),
+            "output_ref": ref,
+        }
+
+    async def _get_session(
+        self, session_id: str, *, blocking: bool
+    ) -> ConversationSession | None:
+        aget = getattr(self._session_store, "aget", None)
+        if blocking:
+            return self._session_store.get(session_id)
+        if inspect.iscoroutinefunction(aget):
+            return await aget(session_id)
+        return await asyncio.to_thread(self._session_store.get, session_id)
+
+    async def _save_session(
+        self, session: ConversationSession, *, blocking: bool
+    ) -> None:
+        changes = session.changes()
+        if changes.is_empty:
+            return
+        try:
+            asave_changes = getattr(self._session_store, "asave_changes", None)
+            if blocking:
+                self._session_store.save_changes(changes)
+            elif inspect.iscoroutinefunction(asave_changes):
+                await asave_changes(changes)
+            else:
+                await asyncio.to_thread(self._session_store.save_changes, changes)
+        except SessionNotFoundError:
+            # The store dropped the session while this run held it, e.g. an
+            # in-memory store evicting it for space; store it whole again.
+            log_event("session.resaved", session_id=session.session_id)
+            asave = getattr(self._session_store, "asave", None)
+            if blocking:
+                self._session_store.save(session)
+            elif inspect.iscoroutinefunction(asave):
+                await asave(session)
+            else:
+                await asyncio.to_thread(self._session_store.save, session)
+        session.mark_saved()
+
+    async def _load_session(
         self,
         session_id: str | None,
         *,
         agent_definition: AgentDefinition,
+        blocking: bool,
     ) -> ConversationSession:
         if session_id is None:
             new_id = uuid4().hex
@@ -781,7 +1322,7 @@ class RunAgentUseCase:
             log_event("session.created", session_id=new_id)
             return session
 
-        session = self._session_store.get(session_id)
+        session = await self._get_session(session_id, blocking=blocking)
         if session is None:
             log_event("session.not_found", session_id=session_id)
             raise SessionNotFoundError(
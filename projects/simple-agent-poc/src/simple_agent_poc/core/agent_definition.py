@@ -18,6 +18,14 @@ _AGENT_FIELDS = frozenset(
         "tools",
         "api_type",
         "max_tool_rounds",
+        "max_parallel_tool_calls",
+        "context_token_budget",
+        "context_keep_recent_turns",
+        "context_tool_result_max_chars",
+        "context_summarize",
+        "prompt_caching",
+        "tool_result_cache",
+        "fallback_models",
     }
 )
 _REQUIRED_AGENT_FIELDS = frozenset({"model", "system_prompt"})
@@ -34,6 +42,14 @@ class AgentDefinition:
     tools: list[str] = field(default_factory=list)
     api_type: Literal["completion", "responses"] = "completion"
     max_tool_rounds: int = 5
+    max_parallel_tool_calls: int = 4
+    context_token_budget: int | None = None
+    context_keep_recent_turns: int = 2
+    context_tool_result_max_chars: int = 8000
+    context_summarize: bool = False
+    prompt_caching: bool = False
+    tool_result_cache: bool = True
+    fallback_models: list[str] = field(default_factory=list)
 
     def format_system_prompt(self, *, current_datetime: str) -> str:
         """Format the system prompt with runtime context."""
@@ -136,6 +152,52 @@ def _build_agent_definition(
         maximum=20,
         default=5,
     )
+    max_parallel_tool_calls = _optional_int_min_max(
+        definition.get("max_parallel_tool_calls"),
+        f"agents.{agent_id}.max_parallel_tool_calls",
+        minimum=1,
+        maximum=16,
+        default=4,
+    )
+    context_token_budget = _optional_int_min_max_or_none(
+        definition.get("context_token_budget"),
+        f"agents.{agent_id}.context_token_budget",
+        minimum=1000,
+        maximum=2_000_000,
+    )
+    context_keep_recent_turns = _optional_int_min_max(
+        definition.get("context_keep_recent_turns"),
+        f"agents.{agent_id}.context_keep_recent_turns",
+        minimum=1,
+        maximum=50,
+        default=2,
+    )
+    context_tool_result_max_chars = _optional_int_min_max(
+        definition.get("context_tool_result_max_chars"),
+        f"agents.{agent_id}.context_tool_result_max_chars",
+        minimum=100,
+        maximum=1_000_000,
+        default=8000,
+    )
+    context_summarize = _optional_bool(
+        definition.get("context_summarize"),
+        f"agents.{agent_id}.context_summarize",
+        default=False,
+    )
+    prompt_caching = _optional_bool(
+        definition.get("prompt_caching"),
+        f"agents.{agent_id}.prompt_caching",
+        default=False,
+    )
+    tool_result_cache = _optional_bool(
+        definition.get("tool_result_cache"),
+        f"agents.{agent_id}.tool_result_cache",
+        default=True,
+    )
+    fallback_models = _optional_models(
+        definition.get("fallback_models"),
+        f"agents.{agent_id}.fallback_models",
+    )
 
     return AgentDefinition(
         agent_id=agent_id,
@@ -145,6 +207,14 @@ def _build_agent_definition(
         tools=tools,
         api_type=api_type,
         max_tool_rounds=max_tool_rounds,
+        max_parallel_tool_calls=max_parallel_tool_calls,
+        context_token_budget=context_token_budget,
+        context_keep_recent_turns=context_keep_recent_turns,
+        context_tool_result_max_chars=context_tool_result_max_chars,
+        context_summarize=context_summarize,
+        prompt_caching=prompt_caching,
+        tool_result_cache=tool_result_cache,
+        fallback_models=fallback_models,
     )
 
 
@@ -191,6 +261,16 @@ def _optional_tools(value: object, path: str) -> list[str]:
     return cast(list[str], value)
 
 
+def _optional_models(value: object, path: str) -> list[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValidationError(f"{path} must be a list")
+    if not all(isinstance(item, str) and item.strip() for item in value):
+        raise ValidationError(f"{path} items must be non-blank strings")
+    return cast(list[str], value)
+
+
 def _optional_api_type(
     value: object,
     path: str,
@@ -217,3 +297,25 @@ def _optional_int_min_max(
     if value < minimum or value > maximum:
         raise ValidationError(f"{path} must be between {minimum} and {maximum}")
     return value
+
+
+def _optional_int_min_max_or_none(
+    value: object,
+    path: str,
+    *,
+    minimum: int,
+    maximum: int,
+) -> int | None:
+    if value is None:
+        return None
+    return _optional_int_min_max(
+        value, path, minimum=minimum, maximum=maximum, default=minimum
+    )
+
+
+def _optional_bool(value: object, path: str, *, default: bool) -> bool:
+    if value is None:
+        return default
+    if not isinstance(value, bool):
+        raise ValidationError(f"{path} must be a boolean")
+    return value
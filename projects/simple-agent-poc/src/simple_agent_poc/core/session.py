@@ -5,9 +5,43 @@ from dataclasses import dataclass, field
 from simple_agent_poc.core.types import Message, ToolCall
 
 
+@dataclass(frozen=True, slots=True)
+class SessionChanges:
+    """Session changes not yet persisted to a session store.
+
+    ``new_messages`` start at index ``saved_message_count`` of the session
+    messages. ``updated_messages`` maps indexes below that to messages that
+    were rewritten in place.
+    """
+
+    session_id: str
+    agent_id: str
+    saved_message_count: int
+    new_messages: list[Message]
+    updated_messages: dict[int, Message]
+    state_changed: bool
+    is_paused: bool
+    pending_tool_call: ToolCall | None
+    pending_round: int
+
+    @property
+    def message_count(self) -> int:
+        """Return the message count after applying these changes."""
+        return self.saved_message_count + len(self.new_messages)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return whether there is nothing to persist."""
+        return not (self.new_messages or self.updated_messages or self.state_changed)
+
+
 @dataclass(slots=True)
 class ConversationSession:
-    """Conversation history identified by a session id."""
+    """Conversation history identified by a session id.
+
+    The session tracks which messages and pause-state fields changed since
+    the last ``mark_saved()`` so stores can persist only the delta.
+    """
 
     session_id: str
     agent_id: str = "default"
@@ -15,6 +49,20 @@ class ConversationSession:
     is_paused: bool = False
     pending_tool_call: ToolCall | None = None
     pending_round: int = 0
+    _saved_message_count: int = field(default=0, init=False, repr=False, compare=False)
+    _updated_indexes: set[int] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    _state_dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    _indexed_message_count: int = field(
+        default=0, init=False, repr=False, compare=False
+    )
+    _ask_user_call_ids: set[str] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    _ask_user_result_indexes: list[int] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def start(
@@ -64,9 +112,11 @@ class ConversationSession:
         ``ask_user`` pauses with the real user answer on resume.
         Falls back to appending if no placeholder exists.
         """
-        for msg in self.messages:
+        for idx, msg in enumerate(self.messages):
             if msg.get("role") == "tool" and msg.get("tool_call_id") == tool_call_id:
                 msg["content"] = content
+                if idx < self._saved_message_count:
+                    self._updated_indexes.add(idx)
                 return
         self.append_tool_message(content, tool_call_id=tool_call_id)
 
@@ -75,9 +125,71 @@ class ConversationSession:
         self.is_paused = True
         self.pending_tool_call = tool_call
         self.pending_round = round_idx
+        self._state_dirty = True
 
     def resume_with_answer(self) -> None:
         """Clear paused state after receiving user answer."""
         self.is_paused = False
         self.pending_tool_call = None
         self.pending_round = 0
+        self._state_dirty = True
+
+    def ask_user_results(self) -> list[str]:
+        """Return the non-empty ``ask_user`` tool results in message order.
+
+        The ``ask_user`` call ids and result positions are indexed
+        incrementally, so each call only scans messages appended since the
+        previous one.
+        """
+        self._index_new_messages()
+        return [
+            content
+            for idx in self._ask_user_result_indexes
+            if (content := self.messages[idx]["content"])
+        ]
+
+    def _index_new_messages(self) -> None:
+        if self._indexed_message_count > len(self.messages):
+            self._indexed_message_count = 0
+            self._ask_user_call_ids.clear()
+            self._ask_user_result_indexes.clear()
+        for idx in range(self._indexed_message_count, len(self.messages)):
+            msg = self.messages[idx]
+            for tc in msg.get("tool_calls") or ():
+                if tc["function"]["name"] == "ask_user":
+                    self._ask_user_call_ids.add(tc["id"])
+            if (
+                msg["role"] == "tool"
+                and msg.get("tool_call_id") in self._ask_user_call_ids
+            ):
+                self._ask_user_result_indexes.append(idx)
+        self._indexed_message_count = len(self.messages)
+
+    def changes(self) -> SessionChanges:
+        """Return the changes made since the last ``mark_saved()``.
+
+        Messages appended after the last save are detected by position, so
+        direct appends to ``messages`` are included as well.
+        """
+        saved_count = min(self._saved_message_count, len(self.messages))
+        return SessionChanges(
+            session_id=self.session_id,
+            agent_id=self.agent_id,
+            saved_message_count=saved_count,
+            new_messages=self.messages[saved_count:],
+            updated_messages={
+                idx: self.messages[idx]
+                for idx in sorted(self._updated_indexes)
+                if idx < saved_count
+            },
+            state_changed=self._state_dirty,
+            is_paused=self.is_paused,
+            pending_tool_call=self.pending_tool_call,
+            pending_round=self.pending_round,
+        )
+
+    def mark_saved(self) -> None:
+        """Record that the current state has been persisted."""
+        self._saved_message_count = len(self.messages)
+        self._updated_indexes.clear()
+        self._state_dirty = False
@@ -60,6 +60,7 @@ class Usage(TypedDict):
     prompt_tokens: int
     completion_tokens: int
     total_tokens: int
+    cached_tokens: NotRequired[int]
 
 
 class ToolFunctionDef(TypedDict):
@@ -2,17 +2,26 @@
 
 import logging
 import os
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from simple_agent_poc.adapters.blob_store.filesystem import FileBlobStore
+from simple_agent_poc.adapters.execution_worker.cache import ExecutionResultCache
 from simple_agent_poc.adapters.execution_worker.client import (
     ExecutionWorkerClient,
     ExecutionWorkerConfig,
 )
+from simple_agent_poc.adapters.llm.http_pool import (
+    HTTPPoolLimits,
+    install_shared_http_pool,
+)
 from simple_agent_poc.adapters.llm.litellm_client import LiteLLMClientFactory
+from simple_agent_poc.adapters.llm.rate_limit import RateLimiter, RateLimits
+from simple_agent_poc.adapters.llm.retry import RetryPolicy
 from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.session_store.sqlite import SQLiteSessionStore
 from simple_agent_poc.adapters.tools.ask_user import (
     TOOL_DEFINITION as ASK_USER_TOOL_DEF,
 )
@@ -27,27 +36,60 @@ from simple_agent_poc.adapters.tools.execute_javascript import (
 from simple_agent_poc.adapters.tools.execute_javascript import (
     create_execute as create_execute_javascript,
 )
+from simple_agent_poc.adapters.tools.execute_javascript import (
+    create_execute_batch as create_execute_javascript_batch,
+)
 from simple_agent_poc.adapters.tools.get_current_time import (
     TOOL_DEFINITION as TIME_TOOL_DEF,
 )
 from simple_agent_poc.adapters.tools.get_current_time import (
     execute as time_execute,
 )
-from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
-from simple_agent_poc.application.ports import SessionStore, ToolExecutor
+from simple_agent_poc.adapters.tools.plugins import register_tool_plugins
+from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry, ToolLimits
+from simple_agent_poc.application.ports import (
+    BlobStore,
+    LLMClientFactory,
+    SessionStore,
+    ToolExecutor,
+)
+from simple_agent_poc.application.tool_output import ToolOutputLimits
 from simple_agent_poc.application.use_cases import RunAgentUseCase
 from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
 from simple_agent_poc.observability import configure_logging
+from simple_agent_poc.observability.tracing import configure_tracing
 
 logging.getLogger("litellm").setLevel(logging.CRITICAL)
 logging.getLogger("litellm").addHandler(logging.NullHandler())
 
 load_dotenv()
 configure_logging()
+configure_tracing()
 
 DEFAULT_AGENT_ID = "default"
 DEFAULT_AGENTS_FILE = Path("agents.yaml")
 DEFAULT_EXECUTION_WORKER_TIMEOUT_SECONDS = 5.0
+DEFAULT_EXECUTION_WORKER_MAX_CONNECTIONS = 10
+DEFAULT_EXECUTION_WORKER_IDLE_TIMEOUT_SECONDS = 30.0
+DEFAULT_EXECUTION_WORKER_CACHE_TTL_SECONDS = 300.0
+DEFAULT_EXECUTION_WORKER_BREAKER_THRESHOLD = 5
+DEFAULT_EXECUTION_WORKER_BREAKER_PROBE_SECONDS = 5.0
+DEFAULT_EXECUTION_WORKER_CAPABILITIES_TTL_SECONDS = 300.0
+DEFAULT_TOOL_OUTPUT_MAX_CHARS = 20_000
+MIN_TOOL_OUTPUT_MAX_CHARS = 100
+DEFAULT_SESSION_STORE_SQLITE_PATH = Path("sessions.sqlite3")
+DEFAULT_SESSION_STORE_SQLITE_POOL_SIZE = 4
+DEFAULT_SESSION_STORE_MAX_SESSIONS = 1000
+DEFAULT_SESSION_STORE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SESSION_STORE_IDLE_TTL_SECONDS = 60.0 * 60
+DEFAULT_SESSION_STORE_PAUSED_TTL_SECONDS = 24.0 * 60 * 60
+DEFAULT_LLM_RETRY_MAX_ATTEMPTS = 3
+DEFAULT_LLM_RETRY_BASE_DELAY_SECONDS = 0.5
+DEFAULT_LLM_RETRY_MAX_DELAY_SECONDS = 8.0
+DEFAULT_LLM_RATE_LIMIT_MAX_WAIT_SECONDS = 30.0
+DEFAULT_LLM_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
 
 
 def create_agent_definition_registry() -> AgentDefinitionRegistry:
@@ -81,22 +123,296 @@ def resolve_execution_worker_config(
     return ExecutionWorkerConfig(
         base_url=base_url,
         timeout_seconds=timeout_seconds,
+        max_connections=_positive_int_env(
+            source,
+            "EXECUTION_WORKER_MAX_CONNECTIONS",
+            DEFAULT_EXECUTION_WORKER_MAX_CONNECTIONS,
+        ),
+        idle_timeout_seconds=_positive_float_env(
+            source,
+            "EXECUTION_WORKER_IDLE_TIMEOUT_SECONDS",
+            DEFAULT_EXECUTION_WORKER_IDLE_TIMEOUT_SECONDS,
+        ),
+        breaker_failure_threshold=_positive_int_env(
+            source,
+            "EXECUTION_WORKER_BREAKER_THRESHOLD",
+            DEFAULT_EXECUTION_WORKER_BREAKER_THRESHOLD,
+        ),
+        breaker_probe_interval_seconds=_positive_float_env(
+            source,
+            "EXECUTION_WORKER_BREAKER_PROBE_SECONDS",
+            DEFAULT_EXECUTION_WORKER_BREAKER_PROBE_SECONDS,
+        ),
+        capabilities_ttl_seconds=_positive_float_env(
+            source,
+            "EXECUTION_WORKER_CAPABILITIES_TTL_SECONDS",
+            DEFAULT_EXECUTION_WORKER_CAPABILITIES_TTL_SECONDS,
+        ),
+    )
+
+
+def resolve_execution_result_cache(
+    env: dict[str, str] | None = None,
+) -> ExecutionResultCache | None:
+    """Create the execute_javascript result cache when it is enabled."""
+    source = env or os.environ
+    max_entries = _optional_positive_int_env(source, "EXECUTION_WORKER_CACHE_SIZE")
+    if max_entries is None:
+        return None
+    return ExecutionResultCache(
+        max_entries=max_entries,
+        ttl_seconds=_positive_float_env(
+            source,
+            "EXECUTION_WORKER_CACHE_TTL_SECONDS",
+            DEFAULT_EXECUTION_WORKER_CACHE_TTL_SECONDS,
+        ),
+    )
+
+
+def resolve_tool_output_limits(env: dict[str, str] | None = None) -> ToolOutputLimits:
+    """Read the default and per-tool caps on tool result size.
+
+    Without ``TOOL_OUTPUT_MAX_CHARS``, results are capped at
+    ``DEFAULT_TOOL_OUTPUT_MAX_CHARS`` only when ``TOOL_OUTPUT_BLOB_DIR`` keeps
+    the full results, so nothing is cut and lost by default. Caps below
+    ``MIN_TOOL_OUTPUT_MAX_CHARS`` are rejected, since the preview marker
+    alone would be longer than the text it replaces.
+    """
+    source = env or os.environ
+    max_chars: int | None = None
+    if value := source.get("TOOL_OUTPUT_MAX_CHARS", "").strip():
+        max_chars = _parse_tool_output_cap(value, "TOOL_OUTPUT_MAX_CHARS")
+    elif source.get("TOOL_OUTPUT_BLOB_DIR", "").strip():
+        max_chars = DEFAULT_TOOL_OUTPUT_MAX_CHARS
+    return ToolOutputLimits(
+        max_chars=max_chars,
+        per_tool={
+            tool_name: _parse_tool_output_cap(value, "TOOL_OUTPUT_LIMITS")
+            for tool_name, value in _tool_pairs_env(
+                source, "TOOL_OUTPUT_LIMITS"
+            ).items()
+        },
+    )
+
+
+def _parse_tool_output_cap(value: str, name: str) -> int:
+    number = _parse_positive_int(value, name)
+    if number < MIN_TOOL_OUTPUT_MAX_CHARS:
+        raise ValueError(f"{name} must be at least {MIN_TOOL_OUTPUT_MAX_CHARS}")
+    return number
+
+
+def resolve_tool_limits(env: dict[str, str] | None = None) -> dict[str, ToolLimits]:
+    """Read per-tool timeouts and concurrency limits, keyed by tool name."""
+    source = env or os.environ
+    timeouts = {
+        tool_name: _parse_positive_float(value, "TOOL_TIMEOUTS")
+        for tool_name, value in _tool_pairs_env(source, "TOOL_TIMEOUTS").items()
+    }
+    concurrency = {
+        tool_name: _parse_positive_int(value, "TOOL_MAX_CONCURRENCY")
+        for tool_name, value in _tool_pairs_env(source, "TOOL_MAX_CONCURRENCY").items()
+    }
+    return {
+        tool_name: ToolLimits(
+            timeout_seconds=timeouts.get(tool_name),
+            max_concurrency=concurrency.get(tool_name),
+        )
+        for tool_name in timeouts.keys() | concurrency.keys()
+    }
+
+
+def create_blob_store(env: dict[str, str] | None = None) -> BlobStore | None:
+    """Create the store that keeps tool results over their cap, if configured."""
+    source = env or os.environ
+    root = source.get("TOOL_OUTPUT_BLOB_DIR", "").strip()
+    if not root:
+        return None
+    return FileBlobStore(root)
+
+
+def _tool_pairs_env(source: Mapping[str, str], name: str) -> dict[str, str]:
+    """Split *name*'s ``tool=value`` pairs into raw values by tool name."""
+    pairs: dict[str, str] = {}
+    for item in source.get(name, "").split(","):
+        if not item.strip():
+            continue
+        tool_name, _, value = item.partition("=")
+        if not tool_name.strip() or not value.strip():
+            raise ValueError(f"{name} entries must be tool=value pairs")
+        pairs[tool_name.strip()] = value.strip()
+    return pairs
+
+
+def _positive_int_env(source: Mapping[str, str], name: str, default: int) -> int:
+    value = source.get(name, "").strip()
+    if not value:
+        return default
+    return _parse_positive_int(value, name)
+
+
+def _parse_positive_int(value: str, name: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as error:
+        raise ValueError(f"{name} must be an integer") from error
+    if number <= 0:
+        raise ValueError(f"{name} must be positive")
+    return number
+
+
+def _optional_positive_int_env(source: Mapping[str, str], name: str) -> int | None:
+    if not source.get(name, "").strip():
+        return None
+    return _positive_int_env(source, name, 0)
+
+
+def _positive_float_env(source: Mapping[str, str], name: str, default: float) -> float:
+    value = source.get(name, "").strip()
+    if not value:
+        return default
+    return _parse_positive_float(value, name)
+
+
+def _parse_positive_float(value: str, name: str) -> float:
+    try:
+        number = float(value)
+    except ValueError as error:
+        raise ValueError(f"{name} must be a number") from error
+    if number <= 0:
+        raise ValueError(f"{name} must be positive")
+    return number
+
+
+def create_session_store(env: dict[str, str] | None = None) -> SessionStore:
+    """Create the session store selected by ``SESSION_STORE``."""
+    source = env or os.environ
+    backend = source.get("SESSION_STORE", "").strip().lower() or "memory"
+    if backend == "memory":
+        return InMemorySessionStore(
+            max_sessions=_positive_int_env(
+                source, "SESSION_STORE_MAX_SESSIONS", DEFAULT_SESSION_STORE_MAX_SESSIONS
+            ),
+            max_bytes=_positive_int_env(
+                source, "SESSION_STORE_MAX_BYTES", DEFAULT_SESSION_STORE_MAX_BYTES
+            ),
+            idle_ttl_seconds=_positive_float_env(
+                source,
+                "SESSION_STORE_IDLE_TTL_SECONDS",
+                DEFAULT_SESSION_STORE_IDLE_TTL_SECONDS,
+            ),
+            paused_ttl_seconds=_positive_float_env(
+                source,
+                "SESSION_STORE_PAUSED_TTL_SECONDS",
+                DEFAULT_SESSION_STORE_PAUSED_TTL_SECONDS,
+            ),
+        )
+    if backend != "sqlite":
+        raise ValueError("SESSION_STORE must be one of: memory, sqlite")
+
+    path = Path(
+        source.get("SESSION_STORE_SQLITE_PATH", "").strip()
+        or DEFAULT_SESSION_STORE_SQLITE_PATH
+    )
+    pool_size = _positive_int_env(
+        source, "SESSION_STORE_SQLITE_POOL_SIZE", DEFAULT_SESSION_STORE_SQLITE_POOL_SIZE
+    )
+    return SQLiteSessionStore(path, pool_size=pool_size)
+
+
+def resolve_llm_retry_policy(env: dict[str, str] | None = None) -> RetryPolicy:
+    """Resolve how LLM requests are retried before streaming starts."""
+    source = env or os.environ
+    return RetryPolicy(
+        max_attempts=_positive_int_env(
+            source, "LLM_RETRY_MAX_ATTEMPTS", DEFAULT_LLM_RETRY_MAX_ATTEMPTS
+        ),
+        base_delay_seconds=_positive_float_env(
+            source,
+            "LLM_RETRY_BASE_DELAY_SECONDS",
+            DEFAULT_LLM_RETRY_BASE_DELAY_SECONDS,
+        ),
+        max_delay_seconds=_positive_float_env(
+            source,
+            "LLM_RETRY_MAX_DELAY_SECONDS",
+            DEFAULT_LLM_RETRY_MAX_DELAY_SECONDS,
+        ),
+    )
+
+
+def resolve_llm_rate_limits(env: dict[str, str] | None = None) -> RateLimits:
+    """Resolve the per-model client-side LLM rate limits."""
+    source = env or os.environ
+    return RateLimits(
+        requests_per_minute=_optional_positive_int_env(source, "LLM_RATE_LIMIT_RPM"),
+        tokens_per_minute=_optional_positive_int_env(source, "LLM_RATE_LIMIT_TPM"),
+        max_concurrent_streams=_optional_positive_int_env(
+            source, "LLM_MAX_CONCURRENT_STREAMS"
+        ),
+        max_wait_seconds=_positive_float_env(
+            source,
+            "LLM_RATE_LIMIT_MAX_WAIT_SECONDS",
+            DEFAULT_LLM_RATE_LIMIT_MAX_WAIT_SECONDS,
+        ),
+    )
+
+
+def resolve_llm_http_pool_limits(
+    env: dict[str, str] | None = None,
+) -> HTTPPoolLimits:
+    """Resolve the connection limits of the shared LLM HTTP pool."""
+    source = env or os.environ
+    return HTTPPoolLimits(
+        max_connections=_positive_int_env(
+            source, "LLM_HTTP_MAX_CONNECTIONS", DEFAULT_LLM_HTTP_MAX_CONNECTIONS
+        ),
+        max_keepalive_connections=_positive_int_env(
+            source,
+            "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        keepalive_expiry_seconds=_positive_float_env(
+            source,
+            "LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+            DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def create_llm_client_factory() -> LiteLLMClientFactory:
+    """Create an LLM client factory with the configured retries and limits.
+
+    Also installs the shared keep-alive HTTP pool used by LiteLLM, unless it
+    is installed already; the API server closes it at shutdown.
+    """
+    install_shared_http_pool(resolve_llm_http_pool_limits())
+    return LiteLLMClientFactory(
+        retry_policy=resolve_llm_retry_policy(),
+        rate_limiter=RateLimiter(resolve_llm_rate_limits()),
     )
 
 
 def create_default_tool_executor() -> BuiltinToolRegistry:
-    """Create a tool registry with built-in tools."""
-    registry = BuiltinToolRegistry()
+    """Create a tool registry with built-in tools and installed tool plugins.
+
+    Plugins are only imported once an agent that lists them runs.
+    """
+    registry = BuiltinToolRegistry(limits=resolve_tool_limits())
     registry.register(TIME_TOOL_DEF, time_execute)
     registry.register(CONCAT_TOOL_DEF, concat_execute)
     registry.register(ASK_USER_TOOL_DEF, ask_user_execute)
     execution_worker_config = resolve_execution_worker_config()
     if execution_worker_config is not None:
         execution_worker_client = ExecutionWorkerClient(execution_worker_config)
+        cache = resolve_execution_result_cache()
         registry.register(
             EXECUTE_JAVASCRIPT_TOOL_DEF,
-            create_execute_javascript(execution_worker_client),
+            create_execute_javascript(execution_worker_client, cache=cache),
+            execute_batch=create_execute_javascript_batch(
+                execution_worker_client, cache=cache
+            ),
         )
+    register_tool_plugins(registry)
     return registry
 
 
@@ -105,26 +421,39 @@ def create_run_agent_use_case(
     session_store: SessionStore | None = None,
     agent_definitions: AgentDefinitionRegistry | None = None,
     tool_executor: ToolExecutor | None = None,
+    llm_client_factory: LLMClientFactory | None = None,
     is_api_context: bool = False,
+    tool_output_limits: ToolOutputLimits | None = None,
+    blob_store: BlobStore | None = None,
 ) -> RunAgentUseCase:
     """Create the shared use case with production dependencies."""
     return RunAgentUseCase(
-        llm_client_factory=LiteLLMClientFactory(),
+        llm_client_factory=llm_client_factory or create_llm_client_factory(),
         session_store=session_store or InMemorySessionStore(),
         agent_definitions=agent_definitions or create_agent_definition_registry(),
         tool_executor=tool_executor or create_default_tool_executor(),
         is_api_context=is_api_context,
+        tool_output_limits=tool_output_limits or resolve_tool_output_limits(),
+        blob_store=blob_store or create_blob_store(),
     )
 
 
-def create_run_agent_use_case_factory() -> Callable[[], RunAgentUseCase]:
-    """Create a use case factory backed by a shared in-memory session store."""
-    session_store = InMemorySessionStore()
+def create_run_agent_use_case_factory(
+    *, tool_executor: ToolExecutor | None = None
+) -> Callable[[], RunAgentUseCase]:
+    """Create a use case factory backed by a shared session store."""
+    session_store = create_session_store()
     agent_definitions = create_agent_definition_registry()
-    tool_executor = create_default_tool_executor()
+    tool_executor = tool_executor or create_default_tool_executor()
+    llm_client_factory = create_llm_client_factory()
+    tool_output_limits = resolve_tool_output_limits()
+    blob_store = create_blob_store()
     return lambda: create_run_agent_use_case(
         session_store=session_store,
         agent_definitions=agent_definitions,
         tool_executor=tool_executor,
+        llm_client_factory=llm_client_factory,
         is_api_context=True,
+        tool_output_limits=tool_output_limits,
+        blob_store=blob_store,
     )
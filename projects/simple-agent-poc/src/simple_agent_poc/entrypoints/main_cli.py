@@ -4,14 +4,21 @@ import argparse
 from collections.abc import Sequence
 
 from simple_agent_poc.adapters.cli.adapter import CLIAdapter
+from simple_agent_poc.application.ports import ToolExecutor
 from simple_agent_poc.entrypoints import bootstrap
 
 
-def build_cli_adapter(*, agent_id: str = bootstrap.DEFAULT_AGENT_ID) -> CLIAdapter:
+def build_cli_adapter(
+    *,
+    agent_id: str = bootstrap.DEFAULT_AGENT_ID,
+    tool_executor: ToolExecutor | None = None,
+) -> CLIAdapter:
     """Create the CLI adapter with production dependencies."""
     agent_definitions = bootstrap.create_agent_definition_registry()
     return CLIAdapter(
-        bootstrap.create_run_agent_use_case(agent_definitions=agent_definitions),
+        bootstrap.create_run_agent_use_case(
+            agent_definitions=agent_definitions, tool_executor=tool_executor
+        ),
         agent_id=agent_id,
     )
 
@@ -22,8 +29,12 @@ def main(argv: Sequence[str] | None = None) -> None:
     parser.add_argument("--agent", default=bootstrap.DEFAULT_AGENT_ID)
     args = parser.parse_args(argv)
 
-    adapter = build_cli_adapter(agent_id=args.agent)
-    adapter.run()
+    tool_executor = bootstrap.create_default_tool_executor()
+    try:
+        adapter = build_cli_adapter(agent_id=args.agent, tool_executor=tool_executor)
+        adapter.run()
+    finally:
+        tool_executor.close()
 
 
 if __name__ == "__main__":
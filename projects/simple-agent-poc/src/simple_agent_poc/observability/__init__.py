@@ -12,22 +12,49 @@ SIMPLE_AGENT_LOG_PAYLOADS : str = "summary"
     Payload storage policy: ``summary``, ``metadata``, or ``full``.
 SIMPLE_AGENT_LOG_MAX_FIELD_CHARS : int = 500
     Maximum characters in payload ``preview`` under the "summary" policy.
+SIMPLE_AGENT_LOG_PAYLOAD_HASH : str = "sha256"
+    Payload hash: ``sha256``, ``fast`` (CRC-32), ``sampled``, or ``none``.
+SIMPLE_AGENT_LOG_QUEUE_SIZE : int = 10000
+    Records buffered for the background writer before records are dropped.
+SIMPLE_AGENT_LOG_MAX_BYTES : int = 52428800
+    Rotate the file before it grows past this size (0 disables).
+SIMPLE_AGENT_LOG_ROTATE_DAILY : str = "true"
+    Set to "false" to disable rotation at UTC midnight.
+SIMPLE_AGENT_LOG_BACKUP_COUNT : int = 7
+    Number of rotated files to keep.
+SIMPLE_AGENT_LOG_COMPRESSION : str = "gzip"
+    Compression of rotated files: ``gzip``, ``zstd``, or ``none``.
+SIMPLE_AGENT_LOG_EVENT_LEVELS : str = ""
+    Per-event levels, e.g. ``react.round.start=DEBUG,llm.stream.*=DEBUG``.
+SIMPLE_AGENT_LOG_SAMPLE_RATE : float = 1.0
+    Fraction of runs whose events are written; errors are always written.
 """
 
 from __future__ import annotations
 
+import atexit
 import contextvars
+import fnmatch
 import hashlib
 import json
 import logging
 import os
+import time
+import zlib
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import cast
+
+from simple_agent_poc.observability.metrics import record_event
+from simple_agent_poc.observability.rotation import COMPRESSIONS, RotationPolicy
+from simple_agent_poc.observability.writer import BackgroundWriter
 
 __all__ = [
     "bind_log_context",
     "configure_logging",
+    "flush_logging",
     "log_event",
+    "shutdown_logging",
     "summarize_payload",
 ]
 
@@ -38,7 +65,13 @@ __all__ = [
 _enabled: bool = True
 _payload_policy: str = "summary"
 _max_field_chars: int = 500
+_hash_mode: str = "sha256"
+_sample_rate: float = 1.0
+_level_overrides: tuple[tuple[str, int], ...] = ()
+_event_levels: dict[str, int] = {}
+_max_event_level: int = logging.INFO
 _initialized: bool = False
+_writer: BackgroundWriter | None = None
 
 # ---------------------------------------------------------------------------
 # Logger + handler
@@ -64,21 +97,114 @@ _mode: contextvars.ContextVar[str] = contextvars.ContextVar("mode", default="")
 # ---------------------------------------------------------------------------
 
 
+class _Digest:
+    """Payload hash computed when the log line is formatted.
+
+    Hashing a large string is deferred to the writer thread; ``str()``
+    returns the hex digest, which is how the JSONL formatter serialises it.
+    Only immutable data (the serialised payload) is held.
+    """
+
+    __slots__ = ("_algorithm", "_data", "_hexdigest")
+
+    def __init__(self, algorithm: str, data: str) -> None:
+        self._algorithm = algorithm
+        self._data = data
+        self._hexdigest: str | None = None
+
+    def __str__(self) -> str:
+        if self._hexdigest is None:
+            self._hexdigest = _HASHERS[self._algorithm](self._data)
+            self._data = ""
+        return self._hexdigest
+
+    def __repr__(self) -> str:
+        return f"_Digest({self._algorithm!r}, {str(self)!r})"
+
+
+def _sha256_hex(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _crc32_hex(raw: str) -> str:
+    return f"{zlib.crc32(raw.encode('utf-8', errors='replace')):08x}"
+
+
+def _sampled_sha256_hex(raw: str) -> str:
+    """SHA-256 over the length, head, tail and evenly spaced windows of *raw*."""
+    if len(raw) <= _SAMPLE_THRESHOLD_CHARS:
+        return _sha256_hex(raw)
+    digest = hashlib.sha256(f"{len(raw)}:".encode())
+    last = len(raw) - _SAMPLE_WINDOW_CHARS
+    step = last // (_SAMPLE_WINDOWS - 1)
+    for start in (*range(0, last, step)[: _SAMPLE_WINDOWS - 1], last):
+        window = raw[start : start + _SAMPLE_WINDOW_CHARS]
+        digest.update(window.encode("utf-8", errors="replace"))
+    return digest.hexdigest()
+
+
+# Hash mode -> (summary field, hash function).  ``none`` adds no field.
+_HASH_FIELDS = {
+    "sha256": "sha256",
+    "fast": "crc32",
+    "sampled": "sha256_sampled",
+}
+_HASHERS = {
+    "sha256": _sha256_hex,
+    "fast": _crc32_hex,
+    "sampled": _sampled_sha256_hex,
+}
+_HASH_MODES = (*_HASH_FIELDS, "none")
+
+_SAMPLE_THRESHOLD_CHARS = 64 * 1024
+_SAMPLE_WINDOW_CHARS = 1024
+_SAMPLE_WINDOWS = 16
+
+_encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def _serialize_prefix(value: object, limit: int) -> tuple[str, bool]:
+    """Serialise *value* as JSON, stopping once *limit* chars are produced.
+
+    Returns the text and whether it was cut short.  Only the part of the
+    value needed for the prefix is walked.
+    """
+    chunks: list[str] = []
+    size = 0
+    for chunk in _encoder.iterencode(value):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return "".join(chunks)[:limit], True
+    return "".join(chunks), False
+
+
 def summarize_payload(value: object) -> dict[str, object]:
     """Summarize *value* according to the active payload policy.
 
     Policies
     --------
     ``summary`` (default)
-        Include ``preview``, ``length``, ``sha256``, and ``type``.
+        Include ``preview``, ``length``, a hash, and ``type``.
     ``metadata``
-        Include ``length``, ``sha256``, and ``type`` only (no preview).
+        Include ``length``, a hash, and ``type`` only (no preview).
     ``full``
         Include the complete value under ``content``.
+
+    The hash field depends on the hash mode (``SIMPLE_AGENT_LOG_PAYLOAD_HASH``)
+    and is computed on the writer thread.  With the ``sampled`` and ``none``
+    modes, dicts and lists are serialised only up to the preview limit; a
+    longer value is reported with ``truncated`` and ``items`` instead of
+    ``length``.  When the event would not be written, only ``type`` is
+    returned.
     """
     if value is None:
         return {"type": "null", "length": 0}
 
+    type_name = "str" if isinstance(value, str) else type(value).__name__
+    if not (_enabled and _logger.isEnabledFor(_max_event_level)):
+        return {"type": type_name}
+
     # -- full ----------------------------------------------------------------
     if _payload_policy == "full":
         if isinstance(value, str):
@@ -97,29 +223,32 @@ def summarize_payload(value: object) -> dict[str, object]:
         return {"type": type(value).__name__, "length": length, "content": serialized}
 
     # -- compute common fields ------------------------------------------------
+    truncated = False
     if isinstance(value, str):
         raw = value
-        type_name = "str"
     elif isinstance(value, (dict, list)):
-        raw = json.dumps(value, ensure_ascii=False, default=str)
-        type_name = type(value).__name__
+        if _hash_mode in ("sha256", "fast"):
+            # The hash covers the whole payload, so serialise it all at C speed.
+            raw = json.dumps(value, ensure_ascii=False, default=str)
+        else:
+            raw, truncated = _serialize_prefix(value, _max_field_chars)
     else:
         raw = str(value)
-        type_name = type(value).__name__
 
-    digest = hashlib.sha256(raw.encode("utf-8", errors="replace")).hexdigest()
-    length = len(raw)
+    result: dict[str, object] = {"type": type_name}
+    if truncated:
+        result["truncated"] = True
+        result["items"] = len(cast("dict[object, object] | list[object]", value))
+    else:
+        result["length"] = len(raw)
+        if _hash_mode != "none":
+            result[_HASH_FIELDS[_hash_mode]] = _Digest(_hash_mode, raw)
 
     if _payload_policy == "metadata":
-        return {"type": type_name, "length": length, "sha256": digest}
+        return result
 
     # -- summary (default) ----------------------------------------------------
-    result: dict[str, object] = {
-        "type": type_name,
-        "length": length,
-        "sha256": digest,
-        "preview": raw[:_max_field_chars],
-    }
+    result["preview"] = raw[:_max_field_chars]
     return result
 
 
@@ -153,28 +282,46 @@ _LOG_RECORD_ATTRS = frozenset(
         "thread",
         "threadName",
         "taskName",
+        "_log_context",
     ]
 )
 
 
+def _format_timestamp(created: float) -> str:
+    return datetime.fromtimestamp(created, tz=UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _capture_context(record: logging.LogRecord) -> None:
+    """Attach the caller's context fields before the record changes threads."""
+    record._log_context = (  # type: ignore[attr-defined]
+        _run_id.get(),
+        _session_id.get(),
+        _agent_id.get(),
+        _mode.get(),
+    )
+
+
 class _JSONLFormatter(logging.Formatter):
     """Format a ``LogRecord`` as a single-line JSON object."""
 
     def format(self, record: logging.LogRecord) -> str:
         obj: dict[str, object] = {
-            "timestamp": datetime.fromtimestamp(record.created, tz=UTC).strftime(
-                "%Y-%m-%dT%H:%M:%S.%fZ"
-            ),
+            "timestamp": _format_timestamp(record.created),
             "level": record.levelname,
             "event": record.msg,
             "logger": record.name,
         }
 
-        # Context fields
-        obj["run_id"] = _run_id.get() or None
-        obj["session_id"] = _session_id.get() or None
-        obj["agent_id"] = _agent_id.get() or None
-        obj["mode"] = _mode.get() or None
+        # Context fields, captured on the caller's thread when queued
+        run_id, session_id, agent_id, mode = getattr(
+            record,
+            "_log_context",
+            (_run_id.get(), _session_id.get(), _agent_id.get(), _mode.get()),
+        )
+        obj["run_id"] = run_id or None
+        obj["session_id"] = session_id or None
+        obj["agent_id"] = agent_id or None
+        obj["mode"] = mode or None
 
         # Everything else that was passed via ``extra``
         for attr, val in record.__dict__.items():
@@ -186,6 +333,19 @@ class _JSONLFormatter(logging.Formatter):
         return json.dumps(obj, ensure_ascii=False, default=str) + "\n"
 
 
+def _format_dropped(dropped: dict[str, int]) -> str:
+    """Format the ``log.dropped`` line the writer adds after an overflow."""
+    obj = {
+        "timestamp": _format_timestamp(time.time()),
+        "level": "WARNING",
+        "event": "log.dropped",
+        "logger": _logger.name,
+        "dropped": dropped,
+        "dropped_total": sum(dropped.values()),
+    }
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+
 # ---------------------------------------------------------------------------
 # Setup
 # ---------------------------------------------------------------------------
@@ -196,8 +356,12 @@ def configure_logging() -> None:
 
     Must be called once during bootstrap (CLI and API).  Subsequent calls
     are no-ops so the function can safely appear in shared bootstrap code.
+    Events are written by a background thread; ``shutdown_logging`` runs
+    at exit so queued events are not lost.
     """
-    global _enabled, _payload_policy, _max_field_chars, _initialized
+    global _enabled, _payload_policy, _max_field_chars, _hash_mode
+    global _sample_rate, _level_overrides, _max_event_level
+    global _initialized, _writer
     if _initialized:
         return
     _initialized = True
@@ -210,6 +374,17 @@ def configure_logging() -> None:
         )
     except ValueError:
         _max_field_chars = 500
+    hash_mode = os.environ.get("SIMPLE_AGENT_LOG_PAYLOAD_HASH", "sha256").lower()
+    _hash_mode = hash_mode if hash_mode in _HASH_MODES else "sha256"
+    _level_overrides = _parse_event_levels(
+        os.environ.get("SIMPLE_AGENT_LOG_EVENT_LEVELS", "")
+    )
+    _event_levels.clear()
+    _max_event_level = max([logging.INFO, *(lvl for _, lvl in _level_overrides)])
+    try:
+        _sample_rate = float(os.environ.get("SIMPLE_AGENT_LOG_SAMPLE_RATE", "1.0"))
+    except ValueError:
+        _sample_rate = 1.0
 
     if not _enabled:
         return
@@ -217,14 +392,80 @@ def configure_logging() -> None:
     log_file = Path(os.environ.get("SIMPLE_AGENT_LOG_FILE", "logs/agent-debug.jsonl"))
     level_name = os.environ.get("SIMPLE_AGENT_LOG_LEVEL", "INFO").upper()
 
+    try:
+        queue_size = int(os.environ.get("SIMPLE_AGENT_LOG_QUEUE_SIZE", "10000"))
+    except ValueError:
+        queue_size = 10000
+
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    handler = logging.FileHandler(str(log_file), encoding="utf-8")
-    handler.setFormatter(_JSONLFormatter())
-    _logger.addHandler(handler)
+    formatter = _JSONLFormatter()
+    _writer = BackgroundWriter(
+        log_file,
+        queue_size=max(queue_size, 1),
+        format_record=formatter.format,
+        format_dropped=_format_dropped,
+        prepare=_capture_context,
+        rotation=_rotation_policy_from_env(),
+    )
+    _logger.addHandler(_writer.handler)
     _logger.setLevel(getattr(logging, level_name, logging.INFO))
 
 
+def _parse_event_levels(spec: str) -> tuple[tuple[str, int], ...]:
+    """Parse ``pattern=LEVEL`` pairs; malformed entries are ignored."""
+    overrides: list[tuple[str, int]] = []
+    for item in spec.split(","):
+        pattern, _, level_name = item.partition("=")
+        level = logging.getLevelNamesMapping().get(level_name.strip().upper())
+        if pattern.strip() and level is not None:
+            overrides.append((pattern.strip(), level))
+    return tuple(overrides)
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(int(os.environ.get(name, str(default))), 0)
+    except ValueError:
+        return default
+
+
+def _rotation_policy_from_env() -> RotationPolicy:
+    defaults = RotationPolicy()
+    compression = os.environ.get(
+        "SIMPLE_AGENT_LOG_COMPRESSION", defaults.compression
+    ).lower()
+    return RotationPolicy(
+        max_bytes=_int_env("SIMPLE_AGENT_LOG_MAX_BYTES", defaults.max_bytes),
+        daily=os.environ.get("SIMPLE_AGENT_LOG_ROTATE_DAILY", "true").lower()
+        != "false",
+        backup_count=_int_env("SIMPLE_AGENT_LOG_BACKUP_COUNT", defaults.backup_count),
+        compression=compression if compression in COMPRESSIONS else "gzip",
+    )
+
+
+def flush_logging() -> None:
+    """Block until every event logged so far has been written to the file."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def shutdown_logging() -> None:
+    """Write queued events, stop the background writer and close the file.
+
+    Registered with ``atexit``; events logged afterwards are not written.
+    """
+    global _writer
+    if _writer is None:
+        return
+    writer, _writer = _writer, None
+    _logger.removeHandler(writer.handler)
+    writer.stop()
+
+
+atexit.register(shutdown_logging)
+
+
 # ---------------------------------------------------------------------------
 # Context binding
 # ---------------------------------------------------------------------------
@@ -252,6 +493,42 @@ def bind_log_context(
         _mode.set(mode)
 
 
+# ---------------------------------------------------------------------------
+# Event levels and sampling
+# ---------------------------------------------------------------------------
+
+
+def _is_error_event(event: str) -> bool:
+    return event.endswith(".error")
+
+
+def _event_level(event: str) -> int:
+    """Return the level of *event*: the first matching override, else INFO.
+
+    Error events are not affected by overrides.
+    """
+    level = _event_levels.get(event)
+    if level is None:
+        level = logging.INFO
+        if not _is_error_event(event):
+            for pattern, override in _level_overrides:
+                if fnmatch.fnmatchcase(event, pattern):
+                    level = override
+                    break
+        _event_levels[event] = level
+    return level
+
+
+def _run_sampled(run_id: str) -> bool:
+    """Head-based sampling: the same *run_id* always gets the same decision.
+
+    CRC-32 is stable across processes, so the API and CLI agree on a run.
+    """
+    if _sample_rate >= 1.0 or not run_id:
+        return True
+    return zlib.crc32(run_id.encode("utf-8")) < _sample_rate * 2**32
+
+
 # ---------------------------------------------------------------------------
 # Event emission
 # ---------------------------------------------------------------------------
@@ -271,9 +548,29 @@ def log_event(event: str, **fields: object) -> None:
 
     Context fields (``run_id``, ``session_id``, ``agent_id``, ``mode``)
     are automatically included from the current ``contextvars`` state.
+    The line is serialised later on the writer thread, so field values must
+    not be mutated after the call.
+    The event also updates the in-process metrics (see ``metrics``), even
+    when JSONL logging is disabled, filtered by level, or sampled out.
+
+    The level is INFO unless ``SIMPLE_AGENT_LOG_EVENT_LEVELS`` overrides it.
+    Events of a run not selected by ``SIMPLE_AGENT_LOG_SAMPLE_RATE`` are
+    dropped unless they are errors (``*.error``) or WARNING and above;
+    events outside a run are never sampled.
     """
+    record_event(event, fields)
     if not _enabled:
         return
 
+    level = _event_level(event)
+    if not _logger.isEnabledFor(level):
+        return
+    if (
+        level < logging.WARNING
+        and not _is_error_event(event)
+        and not _run_sampled(str(fields.get("run_id") or _run_id.get()))
+    ):
+        return
+
     extra: dict[str, object] = dict(fields)
-    _logger.info(event, extra=extra)
+    _logger.log(level, event, extra=extra)
@@ -0,0 +1,420 @@
+"""In-process Prometheus metrics derived from ``log_event`` calls.
+
+Every event passed to ``log_event`` is also handed to ``record_event``,
+which updates counters, histograms and gauges for the events it knows.
+``render_metrics`` returns the registry in the Prometheus text exposition
+format (version 0.0.4), served by the HTTP API at ``/metrics``.
+
+Metrics are kept whether or not JSONL logging is enabled. Values are per
+process and reset on restart.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping, Sequence
+
+__all__ = [
+    "EventMetrics",
+    "record_event",
+    "render_metrics",
+]
+
+_LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+_TTFT_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0)
+_TOOL_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_STREAM_DURATION_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+_CONNECTION_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Error categories of the domain exceptions; anything else is "internal".
+_ERROR_CATEGORIES = {
+    "AuthenticationError": "authentication",
+    "RateLimitError": "rate_limit",
+    "LLMError": "llm",
+    "ValidationError": "validation",
+    "SessionNotFoundError": "session_not_found",
+    "SessionNotPausedError": "session_not_paused",
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    """A named metric family with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+    @abstractmethod
+    def _samples(self) -> list[str]: ...
+
+
+class _Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str]) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}"
+            for labels, v in items
+        ]
+
+
+class _Gauge(_Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = max(self._values.get(labels, 0.0) - 1.0, 0.0)
+
+
+class _Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            counts, totals = self._series.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+                    break
+            else:
+                counts[-1] += 1
+            totals[0] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(
+                (labels, list(counts), totals[0])
+                for labels, (counts, totals) in self._series.items()
+            )
+        lines: list[str] = []
+        bucket_names = (*self.labelnames, "le")
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    bucket_names, (*labels, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            series_labels = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{series_labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{series_labels} {cumulative}")
+        return lines
+
+
+def _label(fields: Mapping[str, object], key: str) -> str:
+    value = fields.get(key)
+    return "" if value is None else str(value)
+
+
+def _seconds(fields: Mapping[str, object], key: str) -> float | None:
+    value = fields.get(key)
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    return value / 1000
+
+
+class EventMetrics:
+    """Counters, histograms and gauges updated from log events."""
+
+    def __init__(self) -> None:
+        self.runs = _Counter("agent_runs_total", "Agent runs by outcome.", ["outcome"])
+        self.rounds = _Counter("agent_rounds_total", "Completed ReAct rounds.", [])
+        self.tool_calls = _Counter(
+            "agent_tool_calls_total",
+            "Tool calls by tool and outcome.",
+            ["tool", "outcome"],
+        )
+        self.tool_cache = _Counter(
+            "agent_tool_cache_lookups_total",
+            "Tool result cache lookups by tool and result.",
+            ["tool", "result"],
+        )
+        self.tool_outputs_capped = _Counter(
+            "agent_tool_outputs_capped_total",
+            "Tool results cut to a preview by tool and whether the output was stored.",
+            ["tool", "stored"],
+        )
+        self.errors = _Counter(
+            "agent_errors_total", "Failed agent runs by error category.", ["category"]
+        )
+        self.llm_latency = _Histogram(
+            "llm_request_duration_seconds",
+            "Duration of streaming LLM requests.",
+            ["model"],
+            _LLM_LATENCY_BUCKETS,
+        )
+        self.ttft = _Histogram(
+            "llm_time_to_first_token_seconds",
+            "Time from the start of an LLM request to its first output chunk.",
+            ["model"],
+            _TTFT_BUCKETS,
+        )
+        self.tool_latency = _Histogram(
+            "agent_tool_call_duration_seconds",
+            "Duration of tool calls.",
+            ["tool"],
+            _TOOL_LATENCY_BUCKETS,
+        )
+        self.stream_duration = _Histogram(
+            "http_sse_stream_duration_seconds",
+            "Duration of SSE responses by endpoint and outcome.",
+            ["endpoint", "outcome"],
+            _STREAM_DURATION_BUCKETS,
+        )
+        self.active_streams = _Gauge(
+            "http_sse_active_streams", "SSE responses currently open.", []
+        )
+        self.paused_sessions = _Gauge(
+            "agent_paused_sessions",
+            "Sessions paused by this process and waiting for ask_user answers.",
+            [],
+        )
+        self.dropped_logs = _Counter(
+            "log_records_dropped_total",
+            "JSONL log records dropped because the writer queue was full.",
+            ["level"],
+        )
+        self.worker_connections = _Counter(
+            "execution_worker_connections_total",
+            "execution-worker requests by whether they reused a pooled connection.",
+            ["reused"],
+        )
+        self.worker_connection_wait = _Histogram(
+            "execution_worker_connection_wait_seconds",
+            "Time execution-worker requests waited for a pooled connection.",
+            [],
+            _CONNECTION_WAIT_BUCKETS,
+        )
+        self.worker_circuit = _Gauge(
+            "execution_worker_circuit_state",
+            "1 for the current state of the execution-worker circuit breaker.",
+            ["state"],
+        )
+        self.worker_circuit_transitions = _Counter(
+            "execution_worker_circuit_transitions_total",
+            "execution-worker circuit breaker state changes by new state.",
+            ["state"],
+        )
+        self.worker_rejected = _Counter(
+            "execution_worker_calls_rejected_total",
+            "execution-worker calls failed fast by the open circuit breaker.",
+            [],
+        )
+        self._handlers: dict[str, Callable[[Mapping[str, object]], None]] = {
+            "agent.run.end": self._on_run_end,
+            "agent.run.error": self._on_run_error,
+            "react.round.end": self._on_round_end,
+            "tool.call.end": self._on_tool_end,
+            "tool.call.error": self._on_tool_error,
+            "llm.stream.end": self._on_llm_end,
+            "ask_user.pause": self._on_pause,
+            "ask_user.resume": self._on_resume,
+            "session_store.evicted": self._on_evicted,
+            "http.stream.start": self._on_stream_start,
+            "http.stream.end": self._on_stream_end,
+            "log.dropped": self._on_log_dropped,
+            "execution_worker.connection": self._on_worker_connection,
+            "execution_worker.circuit": self._on_worker_circuit,
+            "execution_worker.rejected": self._on_worker_rejected,
+        }
+
+    @property
+    def families(self) -> tuple[_Metric, ...]:
+        return (
+            self.runs,
+            self.rounds,
+            self.tool_calls,
+            self.errors,
+            self.llm_latency,
+            self.ttft,
+            self.tool_latency,
+            self.tool_cache,
+            self.tool_outputs_capped,
+            self.stream_duration,
+            self.active_streams,
+            self.paused_sessions,
+            self.dropped_logs,
+            self.worker_connections,
+            self.worker_connection_wait,
+            self.worker_circuit,
+            self.worker_circuit_transitions,
+            self.worker_rejected,
+        )
+
+    def record(self, event: str, fields: Mapping[str, object]) -> None:
+        """Update the metrics derived from *event*; unknown events are ignored."""
+        handler = self._handlers.get(event)
+        if handler is not None:
+            handler(fields)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for family in self.families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def _on_run_end(self, fields: Mapping[str, object]) -> None:
+        self.runs.inc("completed")
+
+    def _on_run_error(self, fields: Mapping[str, object]) -> None:
+        self.runs.inc("error")
+        self.errors.inc(_ERROR_CATEGORIES.get(_label(fields, "error_type"), "internal"))
+
+    def _on_round_end(self, fields: Mapping[str, object]) -> None:
+        self.rounds.inc()
+
+    def _on_tool_end(self, fields: Mapping[str, object]) -> None:
+        self._record_tool(fields, "ok")
+        cache = fields.get("cache")
+        if cache in ("hit", "miss"):
+            self.tool_cache.inc(_label(fields, "tool_name"), str(cache))
+        if "output_chars" in fields:
+            stored = "true" if fields.get("output_ref") else "false"
+            self.tool_outputs_capped.inc(_label(fields, "tool_name"), stored)
+
+    def _on_tool_error(self, fields: Mapping[str, object]) -> None:
+        self._record_tool(fields, "error")
+
+    def _record_tool(self, fields: Mapping[str, object], outcome: str) -> None:
+        tool = _label(fields, "tool_name")
+        self.tool_calls.inc(tool, outcome)
+        elapsed = _seconds(fields, "elapsed_ms")
+        if elapsed is not None:
+            self.tool_latency.observe(elapsed, tool)
+
+    def _on_llm_end(self, fields: Mapping[str, object]) -> None:
+        model = _label(fields, "model")
+        elapsed = _seconds(fields, "elapsed_ms")
+        if elapsed is not None:
+            self.llm_latency.observe(elapsed, model)
+        ttft = _seconds(fields, "ttft_ms")
+        if ttft is not None:
+            self.ttft.observe(ttft, model)
+
+    def _on_pause(self, fields: Mapping[str, object]) -> None:
+        self.runs.inc("paused")
+        self.paused_sessions.inc()
+
+    def _on_resume(self, fields: Mapping[str, object]) -> None:
+        self.paused_sessions.dec()
+
+    def _on_evicted(self, fields: Mapping[str, object]) -> None:
+        if fields.get("paused"):
+            self.paused_sessions.dec()
+
+    def _on_stream_start(self, fields: Mapping[str, object]) -> None:
+        self.active_streams.inc()
+
+    def _on_stream_end(self, fields: Mapping[str, object]) -> None:
+        self.active_streams.dec()
+        elapsed = _seconds(fields, "elapsed_ms")
+        if elapsed is not None:
+            self.stream_duration.observe(
+                elapsed, _label(fields, "endpoint"), _label(fields, "outcome")
+            )
+
+    def _on_log_dropped(self, fields: Mapping[str, object]) -> None:
+        dropped = fields.get("dropped")
+        if isinstance(dropped, dict):
+            for level, count in dropped.items():
+                self.dropped_logs.inc(str(level), amount=count)
+
+    def _on_worker_circuit(self, fields: Mapping[str, object]) -> None:
+        state = _label(fields, "state")
+        for known in ("closed", "open", "half_open"):
+            self.worker_circuit.set(1.0 if known == state else 0.0, known)
+        self.worker_circuit_transitions.inc(state)
+
+    def _on_worker_rejected(self, fields: Mapping[str, object]) -> None:
+        self.worker_rejected.inc()
+
+    def _on_worker_connection(self, fields: Mapping[str, object]) -> None:
+        self.worker_connections.inc("true" if fields.get("reused") else "false")
+        wait = _seconds(fields, "wait_ms")
+        if wait is not None:
+            self.worker_connection_wait.observe(wait)
+
+
+_metrics = EventMetrics()
+
+
+def record_event(event: str, fields: Mapping[str, object]) -> None:
+    """Update the process-wide metrics from a log event."""
+    _metrics.record(event, fields)
+
+
+def render_metrics() -> str:
+    """Return the process-wide metrics in the Prometheus text format."""
+    return _metrics.render()
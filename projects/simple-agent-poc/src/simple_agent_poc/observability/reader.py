@@ -0,0 +1,113 @@
+"""Stream JSONL log events across rotated and compressed files.
+
+Usage::
+
+    uv run python -m simple_agent_poc.observability.reader \\
+        logs/agent-debug.jsonl --event llm.stream.end --run-id <run_id>
+
+Prints one JSON object per line, oldest first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import IO
+
+from simple_agent_poc.observability.rotation import (
+    COMPRESSIONS,
+    open_log_text,
+    rotated_files,
+)
+
+__all__ = [
+    "iter_events",
+    "log_files",
+    "main",
+]
+
+
+def log_files(path: Path) -> list[Path]:
+    """Return the rotated files of *path*, oldest first, then *path* itself."""
+    files = rotated_files(path)
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def _open_any(file: Path) -> IO[str] | None:
+    """Open *file*, or its archive if it was compressed after listing."""
+    for suffix in ("", *(s for s in COMPRESSIONS.values() if s)):
+        try:
+            return open_log_text(file.with_name(file.name + suffix))
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def iter_events(
+    path: Path,
+    *,
+    events: Sequence[str] = (),
+    run_id: str | None = None,
+) -> Iterator[dict[str, object]]:
+    """Yield events from *path* and its rotated files in the order written.
+
+    Files are read one line at a time, so memory use does not depend on
+    their size. ``events`` keeps only events whose name equals or starts
+    with one of the given prefixes. Lines that are not valid JSON, such as
+    a line cut short by a crash, are skipped.
+    """
+    for file in log_files(path):
+        stream = _open_any(file)
+        if stream is None:
+            # Pruned between listing and opening.
+            continue
+        with stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if events and not str(event.get("event", "")).startswith(tuple(events)):
+                    continue
+                if run_id is not None and event.get("run_id") != run_id:
+                    continue
+                yield event
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print events from the JSONL log and its rotated files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=os.environ.get("SIMPLE_AGENT_LOG_FILE", "logs/agent-debug.jsonl"),
+    )
+    parser.add_argument(
+        "--event",
+        action="append",
+        default=[],
+        help="Only print events with this name or name prefix (repeatable).",
+    )
+    parser.add_argument("--run-id", help="Only print events of this run.")
+    args = parser.parse_args(argv)
+
+    try:
+        for event in iter_events(
+            Path(args.path), events=args.event, run_id=args.run_id
+        ):
+            sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+    except BrokenPipeError:
+        # Output piped into e.g. ``head``.
+        sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Size- and time-based rotation of the JSONL log file.
+
+A rotated file is renamed to ``<stem>.<UTC timestamp><suffix>``, e.g.
+``agent-debug.20260519T000000000000.jsonl``, so names sort in the order
+the files were closed. Compression runs on a separate thread, so the
+writer thread keeps draining its queue while a large file is compressed.
+Only the newest ``backup_count`` rotated files are kept.
+"""
+
+from __future__ import annotations
+
+import gzip
+import re
+import shutil
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import IO
+
+__all__ = [
+    "COMPRESSIONS",
+    "RotatingFile",
+    "RotationPolicy",
+    "open_log_text",
+    "rotated_files",
+]
+
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+_STAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+@dataclass(frozen=True, slots=True)
+class RotationPolicy:
+    """When to rotate the log file and what to keep.
+
+    ``max_bytes=0`` disables size-based rotation and ``daily=False``
+    disables rotation at UTC midnight.
+    """
+
+    max_bytes: int = 50 * 1024 * 1024
+    daily: bool = True
+    backup_count: int = 7
+    compression: str = "gzip"
+
+
+def _rotated_pattern(path: Path) -> re.Pattern[str]:
+    return re.compile(
+        rf"^{re.escape(path.stem)}\.(\d{{8}}T\d{{12}}){re.escape(path.suffix)}"
+        r"(\.gz|\.zst)?$"
+    )
+
+
+def _rotated_groups(path: Path) -> list[tuple[str, list[Path]]]:
+    """Group rotated siblings of *path* by timestamp, oldest first."""
+    pattern = _rotated_pattern(path)
+    groups: dict[str, list[Path]] = {}
+    if not path.parent.is_dir():
+        return []
+    for candidate in path.parent.iterdir():
+        match = pattern.match(candidate.name)
+        if match is not None:
+            groups.setdefault(match.group(1), []).append(candidate)
+    return sorted(groups.items())
+
+
+def rotated_files(path: Path) -> list[Path]:
+    """Return one readable file per rotation of *path*, oldest first.
+
+    While a file is being compressed both the plain file and the finished
+    archive may exist for a moment; the plain file is preferred because it
+    is always complete.
+    """
+    files: list[Path] = []
+    for _stamp, variants in _rotated_groups(path):
+        plain = [p for p in variants if p.suffix == path.suffix]
+        files.append(plain[0] if plain else min(variants))
+    return files
+
+
+def open_log_text(path: Path) -> IO[str]:
+    """Open a plain, gzip or zstd log file for reading text."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".zst":
+        from compression import zstd
+
+        return zstd.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _compress(source: Path, compression: str) -> None:
+    target = source.with_name(source.name + COMPRESSIONS[compression])
+    partial = target.with_name(target.name + ".tmp")
+    try:
+        with open(source, "rb") as src:
+            if compression == "zstd":
+                from compression import zstd
+
+                with zstd.open(partial, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                with gzip.open(partial, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+        partial.replace(target)
+        source.unlink()
+    except FileNotFoundError:
+        # Pruned by retention while being compressed.
+        pass
+    except Exception as error:  # noqa: BLE001
+        # Imported here: the observability package imports this module.
+        from simple_agent_poc.observability import log_event, summarize_payload
+
+        log_event(
+            "log.compress.error",
+            file=source.name,
+            error=summarize_payload(str(error)),
+        )
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _next_midnight(timestamp: float) -> float:
+    day = datetime.fromtimestamp(timestamp, tz=UTC).date()
+    midnight = datetime(day.year, day.month, day.day, tzinfo=UTC)
+    return (midnight + timedelta(days=1)).timestamp()
+
+
+class RotatingFile:
+    """Append-only text file that rotates according to a ``RotationPolicy``.
+
+    Not thread-safe: it is written by the single background writer thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        policy: RotationPolicy,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if policy.compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown log compression {policy.compression!r};"
+                f" expected one of {', '.join(COMPRESSIONS)}"
+            )
+        self.path = path
+        self.policy = policy
+        self._clock = clock
+        self._compressors: list[threading.Thread] = []
+        self._open()
+        if path.stat().st_size:
+            # Resume the day of the existing file so it rotates at its midnight.
+            self._rollover_at = _next_midnight(path.stat().st_mtime)
+
+    def write(self, text: str) -> None:
+        size = len(text.encode("utf-8"))
+        if self._should_rotate(size):
+            self.rotate()
+        self._stream.write(text)
+        self._stream.flush()
+        self._size += size
+
+    def rotate(self) -> None:
+        """Close the current file, rename it and start a new one."""
+        self._stream.close()
+        target = self._rotated_name()
+        self.path.replace(target)
+        self._open()
+        if self.policy.compression != "none":
+            compressor = threading.Thread(
+                target=_compress,
+                args=(target, self.policy.compression),
+                name="jsonl-log-compressor",
+                daemon=True,
+            )
+            compressor.start()
+            self._compressors = [t for t in self._compressors if t.is_alive()]
+            self._compressors.append(compressor)
+        self._prune()
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Close the file and wait for pending compression."""
+        self._stream.close()
+        deadline = time.monotonic() + timeout
+        for compressor in self._compressors:
+            compressor.join(max(deadline - time.monotonic(), 0.0))
+
+    def _open(self) -> None:
+        self._stream = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        self._size = self.path.stat().st_size
+        self._rollover_at = _next_midnight(self._clock())
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._size == 0:
+            return False
+        if self.policy.daily and self._clock() >= self._rollover_at:
+            return True
+        return bool(self.policy.max_bytes) and (
+            self._size + incoming > self.policy.max_bytes
+        )
+
+    def _rotated_name(self) -> Path:
+        moment = datetime.fromtimestamp(self._clock(), tz=UTC)
+        existing = {stamp for stamp, _ in _rotated_groups(self.path)}
+        while (stamp := moment.strftime(_STAMP_FORMAT)) in existing:
+            moment += timedelta(microseconds=1)
+        return self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+
+    def _prune(self) -> None:
+        groups = _rotated_groups(self.path)
+        excess = len(groups) - self.policy.backup_count
+        for _stamp, variants in groups[: max(excess, 0)]:
+            for variant in variants:
+                variant.unlink(missing_ok=True)
@@ -0,0 +1,417 @@
+"""Optional tracing spans exported in the OTLP/JSON format.
+
+Spans cover ``agent.run``, ``react.round``, ``llm.stream`` and ``tool.call``.
+The trace id of a run is its ``run_id``, so spans and JSONL log lines of one
+run share an id. Finished spans are batched on a background thread and
+exported either to a file, one OTLP ``ExportTraceServiceRequest`` JSON object
+per line, or to an OTLP/HTTP collector endpoint (``/v1/traces``).
+
+The active span is kept in a ``contextvars`` variable, so it follows the
+code into tasks and ``asyncio.to_thread`` workers. ``current_traceparent``
+returns it as a W3C ``traceparent`` header for outgoing requests.
+
+Environment variables
+---------------------
+SIMPLE_AGENT_TRACE_EXPORTER : str = "none"
+    ``none``, ``file``, or ``otlp``.
+SIMPLE_AGENT_TRACE_FILE : str = "logs/agent-traces.jsonl"
+    Output file of the ``file`` exporter.
+SIMPLE_AGENT_TRACE_OTLP_ENDPOINT : str = "http://localhost:4318/v1/traces"
+    Collector URL of the ``otlp`` exporter.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Protocol
+from urllib.request import Request, urlopen
+
+from simple_agent_poc.observability import log_event, summarize_payload
+
+__all__ = [
+    "FileSpanExporter",
+    "OTLPHTTPSpanExporter",
+    "Span",
+    "SpanExporter",
+    "configure_tracing",
+    "current_traceparent",
+    "flush_tracing",
+    "shutdown_tracing",
+    "start_span",
+    "use_span",
+]
+
+SERVICE_NAME = "simple-agent-poc"
+MAX_QUEUED_SPANS = 2048
+MAX_EXPORT_BATCH = 512
+
+# OTLP span kinds and status codes
+_KIND_INTERNAL = 1
+_KIND_CLIENT = 3
+_STATUS_UNSET = 0
+_STATUS_ERROR = 2
+
+_CLIENT_SPANS = frozenset(["llm.stream"])
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+
+class Span:
+    """A timed operation within a trace.
+
+    Spans created while tracing is disabled are non-recording: every method
+    is a no-op, so callers never need to check whether tracing is on.
+    """
+
+    __slots__ = (
+        "_ended",
+        "attributes",
+        "end_ns",
+        "events",
+        "name",
+        "parent_span_id",
+        "recording",
+        "span_id",
+        "start_ns",
+        "status_code",
+        "status_message",
+        "trace_id",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        trace_id: str,
+        parent_span_id: str = "",
+        attributes: dict[str, object] | None = None,
+        recording: bool = True,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: dict[str, object] = attributes or {}
+        self.events: list[tuple[str, int, dict[str, object]]] = []
+        self.status_code = _STATUS_UNSET
+        self.status_message = ""
+        self.recording = recording
+        self._ended = False
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` header value pointing at this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attributes(self, **attributes: object) -> None:
+        if self.recording and not self._ended:
+            self.attributes.update(
+                (key, value) for key, value in attributes.items() if value is not None
+            )
+
+    def fail(self, error: BaseException) -> None:
+        """Mark the span as failed and record *error* as an exception event."""
+        if not self.recording or self._ended:
+            return
+        self.status_code = _STATUS_ERROR
+        self.status_message = str(error)
+        self.events.append(
+            (
+                "exception",
+                time.time_ns(),
+                {
+                    "exception.type": type(error).__name__,
+                    "exception.message": str(error),
+                },
+            )
+        )
+
+    def end(self) -> None:
+        """Finish the span and queue it for export; later calls do nothing."""
+        if self._ended:
+            return
+        self._ended = True
+        if not self.recording:
+            return
+        self.end_ns = time.time_ns()
+        if _processor is not None:
+            _processor.submit(self)
+
+    def to_otlp(self) -> dict[str, object]:
+        """Return the span as an OTLP/JSON ``Span`` object."""
+        span: dict[str, object] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _KIND_CLIENT if self.name in _CLIENT_SPANS else _KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"] = {"code": self.status_code, "message": self.status_message}
+        if self.events:
+            span["events"] = [
+                {
+                    "name": name,
+                    "timeUnixNano": str(timestamp),
+                    "attributes": _otlp_attributes(attributes),
+                }
+                for name, timestamp, attributes in self.events
+            ]
+        return span
+
+
+def _otlp_value(value: object) -> dict[str, object]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # int64 is a string in the protobuf JSON mapping
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, object]) -> list[dict[str, object]]:
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+def _export_request(spans: Sequence[Span]) -> dict[str, object]:
+    """Wrap *spans* in an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "simple_agent_poc"},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+
+
+class FileSpanExporter:
+    """Append one ``ExportTraceServiceRequest`` JSON object per batch."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(_export_request(spans), ensure_ascii=False) + "\n"
+        with open(self.path, "a", encoding="utf-8") as stream:
+            stream.write(line)
+
+
+class OTLPHTTPSpanExporter:
+    """POST batches to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str, *, timeout_seconds: float = 5.0) -> None:
+        self.endpoint = endpoint
+        self.timeout_seconds = timeout_seconds
+
+    def export(self, spans: Sequence[Span]) -> None:
+        request = Request(
+            self.endpoint,
+            data=json.dumps(_export_request(spans)).encode("utf-8"),
+            headers={"content-type": "application/json"},
+            method="POST",
+        )
+        with urlopen(request, timeout=self.timeout_seconds) as response:
+            response.read()
+
+
+class _BatchProcessor:
+    """Export finished spans from a background thread.
+
+    Spans are dropped when the queue is full so a slow collector never
+    blocks a run.
+    """
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self.exporter = exporter
+        self._spans: queue.Queue[Span | None] = queue.Queue(maxsize=MAX_QUEUED_SPANS)
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._spans.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def flush(self) -> None:
+        self._spans.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._spans.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._spans.get()]
+            while len(batch) < MAX_EXPORT_BATCH:
+                try:
+                    batch.append(self._spans.get_nowait())
+                except queue.Empty:
+                    break
+            spans = [span for span in batch if span is not None]
+            try:
+                if spans:
+                    self.exporter.export(spans)
+            except (OSError, ValueError) as error:
+                log_event("trace.export.error", error=summarize_payload(str(error)))
+            finally:
+                for _item in batch:
+                    self._spans.task_done()
+            if None in batch:
+                return
+
+
+# ---------------------------------------------------------------------------
+# Module state
+# ---------------------------------------------------------------------------
+
+_processor: _BatchProcessor | None = None
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def configure_tracing(exporter: SpanExporter | None = None) -> None:
+    """Enable tracing with *exporter*, or with the one chosen by the environment.
+
+    Does nothing when no exporter is given and ``SIMPLE_AGENT_TRACE_EXPORTER``
+    is ``none``. Calling it again replaces the exporter.
+    """
+    global _processor
+    if exporter is None:
+        exporter = _exporter_from_env()
+    shutdown_tracing()
+    if exporter is not None:
+        _processor = _BatchProcessor(exporter)
+
+
+def _exporter_from_env() -> SpanExporter | None:
+    kind = os.environ.get("SIMPLE_AGENT_TRACE_EXPORTER", "none").lower()
+    if kind == "file":
+        return FileSpanExporter(
+            Path(os.environ.get("SIMPLE_AGENT_TRACE_FILE", "logs/agent-traces.jsonl"))
+        )
+    if kind == "otlp":
+        return OTLPHTTPSpanExporter(
+            os.environ.get(
+                "SIMPLE_AGENT_TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"
+            )
+        )
+    return None
+
+
+def flush_tracing() -> None:
+    """Block until every span ended so far has been exported."""
+    if _processor is not None:
+        _processor.flush()
+
+
+def shutdown_tracing() -> None:
+    """Export queued spans and stop the exporter thread."""
+    global _processor
+    if _processor is None:
+        return
+    processor, _processor = _processor, None
+    processor.stop()
+
+
+atexit.register(shutdown_tracing)
+
+
+# ---------------------------------------------------------------------------
+# Span API
+# ---------------------------------------------------------------------------
+
+
+def start_span(
+    name: str,
+    *,
+    parent: Span | None = None,
+    trace_id: str = "",
+    **attributes: object,
+) -> Span:
+    """Start a span under *parent*, or under the active span if omitted.
+
+    A span without a parent starts a new trace with *trace_id* (32 hex
+    characters) or a random id. The span is not made active; use
+    ``use_span`` for that. ``None`` attribute values are skipped.
+    """
+    if _processor is None:
+        return Span(name, trace_id="0" * 32, recording=False)
+    parent = parent if parent is not None else _current_span.get()
+    if parent is not None and parent.recording:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_span_id = trace_id or secrets.token_hex(16), ""
+    return Span(
+        name,
+        trace_id=trace_id,
+        parent_span_id=parent_span_id,
+        attributes={
+            key: value for key, value in attributes.items() if value is not None
+        },
+    )
+
+
+@contextmanager
+def use_span(span: Span) -> Generator[Span]:
+    """Make *span* active for the block, then end it.
+
+    An exception leaving the block marks the span as failed.
+    """
+    token = _current_span.set(span)
+    try:
+        yield span
+    except Exception as error:
+        span.fail(error)
+        raise
+    finally:
+        span.end()
+        _current_span.reset(token)
+
+
+def current_traceparent() -> str | None:
+    """Return the ``traceparent`` header of the active span, if recording."""
+    span = _current_span.get()
+    if span is None or not span.recording:
+        return None
+    return span.traceparent
@@ -0,0 +1,158 @@
+"""Background JSONL writer fed through a bounded queue.
+
+``QueueingHandler`` is attached to the observability logger. It only puts
+records on a queue, so ``log_event`` never formats JSON or touches the disk
+on the request path. ``BackgroundWriter`` drains the queue on its own
+thread, formats records in batches and flushes once per batch.
+
+When the queue fills up, DEBUG records are dropped first: they are only
+accepted while the queue is below ``DEBUG_HIGH_WATER`` of its capacity.
+Other records are dropped only when the queue is full. Dropped records are
+counted per level and reported in a ``log.dropped`` line with the next
+batch.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from simple_agent_poc.observability.metrics import record_event
+from simple_agent_poc.observability.rotation import RotatingFile, RotationPolicy
+
+__all__ = [
+    "BackgroundWriter",
+    "QueueingHandler",
+]
+
+DEBUG_HIGH_WATER = 0.8
+MAX_BATCH_RECORDS = 256
+
+_STOP = object()
+
+
+class QueueingHandler(logging.Handler):
+    """Hand records to a ``BackgroundWriter`` without blocking the caller."""
+
+    def __init__(
+        self,
+        records: queue.Queue[object],
+        *,
+        prepare: Callable[[logging.LogRecord], None] | None = None,
+    ) -> None:
+        super().__init__()
+        self._records = records
+        self._prepare = prepare
+        self._debug_limit = int(records.maxsize * DEBUG_HIGH_WATER)
+        self._drop_lock = threading.Lock()
+        self._dropped: dict[str, int] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._prepare is not None:
+            self._prepare(record)
+        if (
+            record.levelno <= logging.DEBUG
+            and self._records.qsize() >= self._debug_limit
+        ):
+            self._drop(record)
+            return
+        try:
+            self._records.put_nowait(record)
+        except queue.Full:
+            self._drop(record)
+
+    def take_dropped(self) -> dict[str, int]:
+        """Return and reset the number of dropped records per level."""
+        with self._drop_lock:
+            dropped, self._dropped = self._dropped, {}
+        return dropped
+
+    def _drop(self, record: logging.LogRecord) -> None:
+        with self._drop_lock:
+            self._dropped[record.levelname] = self._dropped.get(record.levelname, 0) + 1
+
+
+class BackgroundWriter:
+    """Append formatted records to a JSONL file from a worker thread.
+
+    The file is rotated on the same thread according to ``rotation``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        queue_size: int,
+        format_record: Callable[[logging.LogRecord], str],
+        format_dropped: Callable[[dict[str, int]], str],
+        prepare: Callable[[logging.LogRecord], None] | None = None,
+        rotation: RotationPolicy | None = None,
+    ) -> None:
+        self._records: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self._format_record = format_record
+        self._format_dropped = format_dropped
+        self._file = RotatingFile(path, rotation or RotationPolicy())
+        self.handler = QueueingHandler(self._records, prepare=prepare)
+        self._thread = threading.Thread(
+            target=self._run, name="jsonl-log-writer", daemon=True
+        )
+        self._stopped = False
+        self._thread.start()
+
+    def flush(self) -> None:
+        """Block until every record queued so far has been written."""
+        if not self._stopped:
+            self._records.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write the remaining records, then stop the thread and close the file."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._records.put(_STOP)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._file.close()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._records.get()]
+            while len(batch) < MAX_BATCH_RECORDS:
+                try:
+                    batch.append(self._records.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in batch
+            try:
+                self._write([item for item in batch if item is not _STOP])
+            finally:
+                for _item in batch:
+                    self._records.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[object]) -> None:
+        lines: list[str] = []
+        record: logging.LogRecord | None = None
+        for item in batch:
+            assert isinstance(item, logging.LogRecord)
+            record = item
+            try:
+                lines.append(self._format_record(record))
+            except Exception:  # noqa: BLE001
+                self.handler.handleError(record)
+        dropped = self.handler.take_dropped()
+        if dropped:
+            lines.append(self._format_dropped(dropped))
+            record_event("log.dropped", {"dropped": dropped})
+        if not lines:
+            return
+        try:
+            self._file.write("".join(lines))
+        except OSError:
+            self.handler.handleError(
+                record or logging.makeLogRecord({"msg": "log.dropped"})
+            )
@@ -1,7 +1,11 @@
 """Fixtures for simple-agent-poc tests."""
 
+from collections.abc import Generator
+from pathlib import Path
+
 import pytest
 
+import simple_agent_poc.observability as obs
 from simple_agent_poc.adapters.tools.concat import TOOL_DEFINITION as CONCAT_TOOL_DEF
 from simple_agent_poc.adapters.tools.concat import execute as concat_execute
 from simple_agent_poc.adapters.tools.get_current_time import (
@@ -15,6 +19,19 @@ from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
 from simple_agent_poc.core.types import ToolCall
 
 
+@pytest.fixture
+def jsonl_log(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Generator[Path]:
+    """Enable JSONL logging to a fresh file; shut the writer down afterwards."""
+    path = tmp_path / "agent-debug.jsonl"
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(path))
+    obs.shutdown_logging()
+    monkeypatch.setattr(obs, "_initialized", False)
+    obs.configure_logging()
+    yield path
+    obs.shutdown_logging()
+
+
 @pytest.fixture
 def default_agent_def():
     return AgentDefinitionRegistry.from_mapping(
@@ -278,3 +278,160 @@ agents:
                     }
                 }
             )
+
+    def test_max_parallel_tool_calls_defaults_to_four(self) -> None:
+        registry = AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "gpt-4.1-nano",
+                        "system_prompt": "Prompt",
+                    }
+                }
+            }
+        )
+
+        assert registry.get("default").max_parallel_tool_calls == 4
+
+    @pytest.mark.parametrize("value", [1, 16])
+    def test_allows_max_parallel_tool_calls_in_range(self, value: int) -> None:
+        registry = AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "gpt-4.1-nano",
+                        "system_prompt": "Prompt",
+                        "max_parallel_tool_calls": value,
+                    }
+                }
+            }
+        )
+
+        assert registry.get("default").max_parallel_tool_calls == value
+
+    @pytest.mark.parametrize("value", [0, 17, True, "2"])
+    def test_rejects_invalid_max_parallel_tool_calls(self, value: object) -> None:
+        with pytest.raises(ValidationError, match="max_parallel_tool_calls"):
+            AgentDefinitionRegistry.from_mapping(
+                {
+                    "agents": {
+                        "default": {
+                            "model": "gpt-4.1-nano",
+                            "system_prompt": "Prompt",
+                            "max_parallel_tool_calls": value,
+                        }
+                    }
+                }
+            )
+
+    def test_context_budget_defaults(self) -> None:
+        registry = AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "gpt-4.1-nano",
+                        "system_prompt": "Prompt",
+                    }
+                }
+            }
+        )
+
+        agent = registry.get("default")
+        assert agent.context_token_budget is None
+        assert agent.context_keep_recent_turns == 2
+        assert agent.context_tool_result_max_chars == 8000
+        assert agent.context_summarize is False
+        assert agent.prompt_caching is False
+        assert agent.tool_result_cache is True
+
+    def test_loads_context_budget_fields(self) -> None:
+        registry = AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "gpt-4.1-nano",
+                        "system_prompt": "Prompt",
+                        "context_token_budget": 50000,
+                        "context_keep_recent_turns": 3,
+                        "context_tool_result_max_chars": 2000,
+                        "context_summarize": True,
+                        "prompt_caching": True,
+                        "tool_result_cache": False,
+                    }
+                }
+            }
+        )
+
+        agent = registry.get("default")
+        assert agent.context_token_budget == 50000
+        assert agent.context_keep_recent_turns == 3
+        assert agent.context_tool_result_max_chars == 2000
+        assert agent.context_summarize is True
+        assert agent.prompt_caching is True
+        assert agent.tool_result_cache is False
+
+    @pytest.mark.parametrize(
+        ("field", "value", "message"),
+        [
+            ("context_token_budget", 999, "must be between 1000 and 2000000"),
+            ("context_token_budget", "big", "must be an integer"),
+            ("context_keep_recent_turns", 0, "must be between 1 and 50"),
+            ("context_tool_result_max_chars", 99, "must be between 100 and 1000000"),
+            ("context_summarize", "yes", "must be a boolean"),
+            ("prompt_caching", 1, "must be a boolean"),
+            ("tool_result_cache", "no", "must be a boolean"),
+        ],
+    )
+    def test_rejects_invalid_context_budget_fields(
+        self, field: str, value: object, message: str
+    ) -> None:
+        with pytest.raises(ValidationError, match=f"{field} {message}"):
+            AgentDefinitionRegistry.from_mapping(
+                {
+                    "agents": {
+                        "default": {
+                            "model": "gpt-4.1-nano",
+                            "system_prompt": "Prompt",
+                            field: value,
+                        }
+                    }
+                }
+            )
+
+    def test_loads_fallback_models(self) -> None:
+        registry = AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "gpt-4.1-mini",
+                        "system_prompt": "Prompt",
+                        "fallback_models": ["gpt-4.1-nano", "gpt-4o-mini"],
+                    }
+                }
+            }
+        )
+
+        agent = registry.get("default")
+        assert agent.fallback_models == ["gpt-4.1-nano", "gpt-4o-mini"]
+
+    @pytest.mark.parametrize(
+        ("value", "message"),
+        [
+            ("gpt-4.1-nano", "must be a list"),
+            ([" "], "items must be non-blank strings"),
+            ([1], "items must be non-blank strings"),
+        ],
+    )
+    def test_rejects_invalid_fallback_models(self, value: object, message: str) -> None:
+        with pytest.raises(ValidationError, match=f"fallback_models {message}"):
+            AgentDefinitionRegistry.from_mapping(
+                {
+                    "agents": {
+                        "default": {
+                            "model": "gpt-4.1-nano",
+                            "system_prompt": "Prompt",
+                            "fallback_models": value,
+                        }
+                    }
+                }
+            )
@@ -2,8 +2,10 @@
 
 from collections.abc import Iterator
 
+import pytest
 from fastapi.testclient import TestClient
 
+from simple_agent_poc.adapters.http import api
 from simple_agent_poc.adapters.http.api import create_app
 from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
 from simple_agent_poc.adapters.tools.ask_user import (
@@ -329,6 +331,37 @@ class TestAPI:
         agent_ids = {a["id"] for a in data["agents"]}
         assert "default" in agent_ids
 
+    def test_metrics_endpoint_reports_chat_stream(self) -> None:
+        llm_client = StubLLMClient(reply="Hello, user!")
+        app = create_app(
+            use_case_factory=lambda: RunAgentUseCase(
+                llm_client_factory=lambda _agent_definition: llm_client,
+                session_store=InMemorySessionStore(),
+                agent_definitions=build_registry(),
+            )
+        )
+        client = TestClient(app)
+
+        def sample(name: str) -> float:
+            for line in client.get("/metrics").text.splitlines():
+                if line.startswith(f"{name} "):
+                    return float(line.rsplit(" ", 1)[1])
+            return 0.0
+
+        completed = 'agent_runs_total{outcome="completed"}'
+        streams = (
+            "http_sse_stream_duration_seconds_count"
+            '{endpoint="/api/chat",outcome="completed"}'
+        )
+        before = (sample(completed), sample(streams))
+        client.post("/api/chat", json={"message": "Hello"})
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert (sample(completed), sample(streams)) == (before[0] + 1, before[1] + 1)
+        assert sample("http_sse_active_streams") == 0
+
     def test_test_page_endpoint(self) -> None:
         app = create_app()
         client = TestClient(app)
@@ -410,3 +443,22 @@ def build_registry_with_ask_user() -> AgentDefinitionRegistry:
             }
         }
     )
+
+
+def test_shutdown_closes_default_tool_executor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tool_executor = BuiltinToolRegistry()
+    closed: list[bool] = []
+    monkeypatch.setattr(tool_executor, "close", lambda: closed.append(True))
+    monkeypatch.setattr(api, "create_default_tool_executor", lambda: tool_executor)
+    monkeypatch.setattr(
+        api,
+        "create_run_agent_use_case_factory",
+        lambda *, tool_executor: unused_use_case_factory,
+    )
+
+    with TestClient(api.create_app(agent_definitions=build_registry())):
+        assert closed == []
+
+    assert closed == [True]
@@ -0,0 +1,267 @@
+"""Tests for context-window budgeting and history compaction."""
+
+from collections.abc import Iterator
+
+import pytest
+
+import simple_agent_poc.application.use_cases as use_cases_module
+from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.application.compaction import compact_messages, estimate_tokens
+from simple_agent_poc.application.dto import RunAgentRequest, StreamComplete
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
+from simple_agent_poc.core.types import LLMStreamChunk, Message, ToolDefinition
+
+
+def _turns(count: int, *, size: int = 400) -> list[Message]:
+    messages: list[Message] = [{"role": "system", "content": "System prompt"}]
+    for idx in range(count):
+        messages.append({"role": "user", "content": f"q{idx} " + "u" * size})
+        messages.append({"role": "assistant", "content": f"a{idx} " + "a" * size})
+    return messages
+
+
+class TestEstimateTokens:
+    """Tests for the token estimate heuristic."""
+
+    def test_counts_content_tool_calls_and_overhead(self) -> None:
+        messages: list[Message] = [
+            {"role": "user", "content": "x" * 40},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {"name": "tool", "arguments": "y" * 36},
+                    }
+                ],
+            },
+        ]
+
+        assert estimate_tokens(messages) == 80 // 4 + 2 * 4
+
+
+class TestCompactMessages:
+    """Tests for compact_messages()."""
+
+    def test_returns_messages_unchanged_without_budget(self) -> None:
+        messages = _turns(10)
+
+        result = compact_messages(
+            messages,
+            token_budget=None,
+            keep_recent_turns=2,
+            tool_result_max_chars=100,
+        )
+
+        assert result.messages is messages
+        assert result.compacted is False
+
+    def test_returns_messages_unchanged_within_budget(self) -> None:
+        messages = _turns(2)
+
+        result = compact_messages(
+            messages,
+            token_budget=10_000,
+            keep_recent_turns=2,
+            tool_result_max_chars=100,
+        )
+
+        assert result.messages is messages
+        assert result.tokens_before == result.tokens_after
+
+    def test_truncates_large_tool_results_first(self) -> None:
+        messages = _turns(1)
+        messages.append({"role": "tool", "content": "s" * 5000, "tool_call_id": "c"})
+
+        result = compact_messages(
+            messages,
+            token_budget=1000,
+            keep_recent_turns=1,
+            tool_result_max_chars=300,
+        )
+
+        tool_message = result.messages[-1]
+        assert result.truncated_tool_results == 1
+        assert result.dropped_messages == ()
+        assert tool_message["content"].startswith("s" * 200)
+        assert tool_message["content"].endswith("s" * 100)
+        assert "4700 characters omitted" in tool_message["content"]
+        assert messages[-1]["content"] == "s" * 5000
+        assert result.tokens_after <= 1000
+
+    def test_drops_oldest_turns_and_keeps_system_and_recent_turns(self) -> None:
+        messages = _turns(10)
+
+        result = compact_messages(
+            messages,
+            token_budget=600,
+            keep_recent_turns=2,
+            tool_result_max_chars=1000,
+        )
+
+        assert result.messages[0] == messages[0]
+        assert result.messages[1]["role"] == "system"
+        assert "earlier messages were omitted" in result.messages[1]["content"]
+        assert result.messages[2:] == messages[-4:]
+        assert len(result.dropped_messages) == 16
+        assert result.note_index == 1
+        assert result.tokens_after < result.tokens_before
+
+    def test_drops_only_as_many_turns_as_needed(self) -> None:
+        messages = _turns(10)
+
+        result = compact_messages(
+            messages,
+            token_budget=estimate_tokens(messages) - 10,
+            keep_recent_turns=2,
+            tool_result_max_chars=1000,
+        )
+
+        assert len(result.dropped_messages) == 2
+        assert result.messages[2:] == messages[3:]
+
+    def test_never_drops_recent_turns_even_over_budget(self) -> None:
+        messages = _turns(2)
+
+        result = compact_messages(
+            messages,
+            token_budget=10,
+            keep_recent_turns=2,
+            tool_result_max_chars=1000,
+        )
+
+        assert result.messages == messages
+        assert result.compacted is False
+        assert result.tokens_after > 10
+
+    def test_with_summary_replaces_note(self) -> None:
+        result = compact_messages(
+            _turns(10),
+            token_budget=600,
+            keep_recent_turns=2,
+            tool_result_max_chars=1000,
+        )
+
+        summarized = result.with_summary("They discussed q0-q7.")
+
+        assert summarized.messages[1] == {
+            "role": "system",
+            "content": "Summary of the earlier conversation:\nThey discussed q0-q7.",
+        }
+        assert summarized.dropped_messages == result.dropped_messages
+
+
+class _RecordingLLMClient:
+    def __init__(self, replies: list[str]) -> None:
+        self._replies = replies
+        self.calls: list[list[Message]] = []
+
+    def complete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools: list[ToolDefinition] | None = None,
+    ) -> Iterator[LLMStreamChunk]:
+        self.calls.append(list(messages))
+        yield LLMStreamChunk(content_delta=self._replies[len(self.calls) - 1])
+
+
+def _registry(**agent_fields: object) -> AgentDefinitionRegistry:
+    return AgentDefinitionRegistry.from_mapping(
+        {
+            "agents": {
+                "default": {
+                    "model": "test-model",
+                    "system_prompt": "System prompt",
+                    "context_token_budget": 1000,
+                    "context_keep_recent_turns": 1,
+                    **agent_fields,
+                }
+            }
+        }
+    )
+
+
+@pytest.fixture
+def logged_events(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        use_cases_module,
+        "log_event",
+        lambda event, **fields: events.append((event, fields)),
+    )
+    return events
+
+
+def _run_two_turns(use_case: RunAgentUseCase) -> str:
+    first = list(use_case.execute_stream(RunAgentRequest(message="x" * 4000)))
+    complete = first[-1]
+    assert isinstance(complete, StreamComplete)
+    list(
+        use_case.execute_stream(
+            RunAgentRequest(message="next", session_id=complete.session_id)
+        )
+    )
+    return complete.session_id
+
+
+class TestUseCaseCompaction:
+    """Tests for compaction inside the ReAct loop."""
+
+    def test_compacts_history_before_llm_call_and_logs_savings(
+        self, logged_events: list[tuple[str, dict]]
+    ) -> None:
+        llm_client = _RecordingLLMClient(["first", "second"])
+        store = InMemorySessionStore()
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=store,
+            agent_definitions=_registry(),
+        )
+
+        session_id = _run_two_turns(use_case)
+
+        sent = llm_client.calls[1]
+        assert sent[0] == {"role": "system", "content": "System prompt"}
+        assert "earlier messages were omitted" in sent[1]["content"]
+        assert sent[2:] == [{"role": "user", "content": "next"}]
+        compacted = [
+            fields for event, fields in logged_events if event == "context.compacted"
+        ]
+        assert len(compacted) == 1
+        assert compacted[0]["tokens_saved"] > 900
+        assert compacted[0]["dropped_messages"] == 2
+        assert compacted[0]["summarized"] is False
+        session = store.get(session_id)
+        assert session is not None
+        assert len(session.messages) == 5
+
+    def test_summarizes_dropped_turns_when_enabled(
+        self, logged_events: list[tuple[str, dict]]
+    ) -> None:
+        llm_client = _RecordingLLMClient(
+            ["first", "Earlier: a long question.", "second"]
+        )
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=InMemorySessionStore(),
+            agent_definitions=_registry(context_summarize=True),
+        )
+
+        _run_two_turns(use_case)
+
+        summary_prompt = llm_client.calls[1]
+        assert summary_prompt[0]["role"] == "system"
+        assert summary_prompt[1]["content"].startswith("user: " + "x" * 10)
+        sent = llm_client.calls[2]
+        assert sent[1] == {
+            "role": "system",
+            "content": "Summary of the earlier conversation:\nEarlier: a long question.",
+        }
+        compacted = [
+            fields for event, fields in logged_events if event == "context.compacted"
+        ]
+        assert compacted[0]["summarized"] is True
@@ -0,0 +1,308 @@
+"""Tests for the execution-worker circuit breaker."""
+
+import json
+import threading
+from urllib.error import URLError
+from urllib.request import Request
+
+import pytest
+
+from simple_agent_poc.adapters.execution_worker.breaker import CircuitBreaker
+from simple_agent_poc.adapters.execution_worker.client import (
+    ExecutionWorkerClient,
+    ExecutionWorkerConfig,
+    JavaScriptExecution,
+)
+from simple_agent_poc.adapters.tools.execute_javascript import create_execute
+from simple_agent_poc.observability import metrics
+
+
+class _Response:
+    def __init__(self, status: int, body: dict) -> None:
+        self.status = status
+        self._body = json.dumps(body).encode()
+
+    def read(self) -> bytes:
+        return self._body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+
+class FlakyWorker:
+    """Refuses connections while ``down`` is set; records every path."""
+
+    def __init__(self) -> None:
+        self.down = True
+        self.paths: list[str] = []
+        self.probed = threading.Event()
+        self.execute_body: dict = {"status": "success", "stdout": "", "result": 1}
+        self.healthz_status = 200
+
+    def __call__(self, request: Request, *, timeout: float):
+        path = request.full_url.removeprefix("http://worker.local")
+        self.paths.append(path)
+        if path == "/healthz":
+            self.probed.set()
+        if self.down:
+            raise URLError("connection refused")
+        if path == "/healthz":
+            return _Response(self.healthz_status, {"status": "ok"})
+        return _Response(200, self.execute_body)
+
+
+@pytest.fixture
+def worker_metrics(monkeypatch) -> metrics.EventMetrics:
+    fresh = metrics.EventMetrics()
+    monkeypatch.setattr(metrics, "_metrics", fresh)
+    return fresh
+
+
+def _client(worker: FlakyWorker, **config) -> ExecutionWorkerClient:
+    return ExecutionWorkerClient(
+        ExecutionWorkerConfig(base_url="http://worker.local", **config),
+        opener=worker,
+    )
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        permit = breaker.allow()
+        assert permit is not None
+        breaker.record(permit, success=False)
+    assert breaker.state == "open"
+
+
+def _half_open(breaker: CircuitBreaker) -> None:
+    assert breaker._prober is not None
+    breaker._prober.join(1)
+    assert breaker.state == "half_open"
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_only(self) -> None:
+        breaker = CircuitBreaker(lambda: False, failure_threshold=3)
+
+        for success in (False, False, True, False, False):
+            permit = breaker.allow()
+            assert permit is not None
+            breaker.record(permit, success=success)
+        assert breaker.state == "closed"
+
+        permit = breaker.allow()
+        assert permit is not None
+        breaker.record(permit, success=False)
+        assert breaker.state == "open"
+        assert breaker.allow() is None
+        breaker.close()
+
+    def test_probe_half_opens_and_admits_one_trial(self) -> None:
+        healthy = threading.Event()
+        breaker = CircuitBreaker(
+            healthy.is_set, failure_threshold=1, probe_interval_seconds=0.01
+        )
+        _open(breaker)
+
+        healthy.set()
+        _half_open(breaker)
+
+        trial = breaker.allow()
+        assert trial is not None
+        assert breaker.allow() is None
+        breaker.record(trial, success=True)
+        assert breaker.state == "closed"
+        breaker.close()
+
+    def test_failed_trial_reopens(self) -> None:
+        breaker = CircuitBreaker(
+            lambda: True, failure_threshold=1, probe_interval_seconds=0.01
+        )
+        _open(breaker)
+        _half_open(breaker)
+        trial = breaker.allow()
+        assert trial is not None
+
+        breaker.record(trial, success=False)
+
+        assert breaker.state == "open"
+        breaker.close()
+
+    def test_stale_outcomes_do_not_settle_the_trial(self) -> None:
+        breaker = CircuitBreaker(
+            lambda: True, failure_threshold=1, probe_interval_seconds=0.01
+        )
+        stale = [breaker.allow(), breaker.allow()]
+        _open(breaker)
+        _half_open(breaker)
+        trial = breaker.allow()
+        assert trial is not None
+
+        for permit, success in zip(stale, (True, False), strict=True):
+            assert permit is not None
+            breaker.record(permit, success=success)
+
+        assert breaker.state == "half_open"
+        assert breaker.allow() is None
+        breaker.record(trial, success=True)
+        assert breaker.state == "closed"
+        breaker.close()
+
+
+def test_client_fails_fast_while_open(worker_metrics) -> None:
+    worker = FlakyWorker()
+    client = _client(
+        worker, breaker_failure_threshold=2, breaker_probe_interval_seconds=60
+    )
+
+    first = client.execute_javascript(code="1")
+    second = client.execute_javascript(code="1")
+    rejected = client.execute_javascript(code="1")
+
+    assert worker.paths == ["/execute", "/execute"]
+    assert first.error is not None
+    assert first.error.code == "UPSTREAM_UNAVAILABLE"
+    assert first.circuit_state is None
+    assert second.circuit_state == "open"
+    assert rejected.error is not None
+    assert rejected.error.category == "upstream_unavailable"
+    assert rejected.error.code == "CIRCUIT_OPEN"
+    assert rejected.circuit_state == "open"
+    assert worker_metrics.worker_rejected.value() == 1
+    assert worker_metrics.worker_circuit.value("open") == 1
+    assert worker_metrics.worker_circuit.value("closed") == 0
+    client.close()
+
+
+def test_client_batch_fails_fast_while_open() -> None:
+    worker = FlakyWorker()
+    client = _client(
+        worker, breaker_failure_threshold=1, breaker_probe_interval_seconds=60
+    )
+    client.execute_javascript(code="1")
+
+    results = client.execute_javascript_batch([JavaScriptExecution("1")] * 3)
+
+    assert worker.paths == ["/execute"]
+    assert [r.error.code for r in results if r.error] == ["CIRCUIT_OPEN"] * 3
+    client.close()
+
+
+def test_client_recovers_after_successful_probe(worker_metrics) -> None:
+    worker = FlakyWorker()
+    client = _client(
+        worker, breaker_failure_threshold=1, breaker_probe_interval_seconds=0.01
+    )
+    client.execute_javascript(code="1")
+    assert worker.probed.wait(1)
+
+    worker.down = False
+    assert client._breaker._prober is not None
+    client._breaker._prober.join(1)
+    assert client.circuit_state == "half_open"
+    result = client.execute_javascript(code="1")
+
+    assert result.status == "success"
+    assert result.circuit_state is None
+    assert client.circuit_state == "closed"
+    assert worker_metrics.worker_circuit_transitions.value("half_open") == 1
+    assert worker_metrics.worker_circuit.value("closed") == 1
+    client.close()
+
+
+def test_client_without_healthz_recovers_through_a_trial_call() -> None:
+    worker = FlakyWorker()
+    worker.healthz_status = 404
+    client = _client(
+        worker, breaker_failure_threshold=1, breaker_probe_interval_seconds=0.01
+    )
+    client.execute_javascript(code="1")
+    assert worker.probed.wait(1)
+
+    worker.down = False
+    assert client._breaker._prober is not None
+    client._breaker._prober.join(1)
+    assert client.circuit_state == "half_open"
+    result = client.execute_javascript(code="1")
+
+    assert result.status == "success"
+    assert worker.paths[-1] == "/execute"
+    assert client.circuit_state == "closed"
+    client.close()
+
+
+def test_unhealthy_probe_keeps_the_circuit_open() -> None:
+    worker = FlakyWorker()
+    worker.healthz_status = 503
+    client = _client(
+        worker, breaker_failure_threshold=1, breaker_probe_interval_seconds=0.01
+    )
+    client.execute_javascript(code="1")
+    worker.down = False
+    # The second probe starts only once the first one has been answered.
+    for _ in range(2):
+        worker.probed.clear()
+        assert worker.probed.wait(1)
+
+    assert client.circuit_state == "open"
+    client.close()
+
+
+def test_trial_that_raises_is_recorded_and_reopens() -> None:
+    worker = FlakyWorker()
+    client = _client(
+        worker, breaker_failure_threshold=1, breaker_probe_interval_seconds=0.01
+    )
+    client.execute_javascript(code="1")
+    worker.down = False
+    assert client._breaker._prober is not None
+    client._breaker._prober.join(1)
+    assert client.circuit_state == "half_open"
+
+    def broken_opener(request: Request, *, timeout: float):
+        raise ValueError("unexpected response")
+
+    client._opener = broken_opener
+    with pytest.raises(ValueError, match="unexpected response"):
+        client.execute_javascript(code="1")
+
+    assert client.circuit_state == "open"
+    assert client._breaker._trial is None
+    client.close()
+
+
+def test_worker_execution_timeout_does_not_trip_the_breaker() -> None:
+    worker = FlakyWorker()
+    worker.down = False
+    worker.execute_body = {
+        "status": "error",
+        "error": {"code": "TIMEOUT", "message": "Execution timed out"},
+    }
+    client = _client(worker, breaker_failure_threshold=1)
+
+    for _ in range(3):
+        result = client.execute_javascript(code="while (true) {}")
+
+    assert result.error is not None
+    assert result.error.category == "timeout"
+    assert client.circuit_state == "closed"
+
+
+def test_tool_payload_reports_open_circuit() -> None:
+    worker = FlakyWorker()
+    client = _client(
+        worker, breaker_failure_threshold=1, breaker_probe_interval_seconds=60
+    )
+    execute = create_execute(client)
+
+    first = json.loads(execute({"code": "1"}))
+    rejected = json.loads(execute({"code": "1"}))
+
+    assert "circuit_state" not in json.loads(
+        create_execute(_client(FlakyWorker()))({"code": "1"})
+    )
+    assert first["circuit_state"] == "open"
+    assert rejected["error"]["code"] == "CIRCUIT_OPEN"
+    client.close()
@@ -0,0 +1,230 @@
+"""Tests for the execute_javascript result cache."""
+
+import json
+
+import pytest
+
+from simple_agent_poc.adapters.execution_worker.cache import ExecutionResultCache
+from simple_agent_poc.adapters.execution_worker.client import (
+    JavaScriptExecution,
+    WorkerError,
+    WorkerExecutionResult,
+)
+from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.tools.execute_javascript import (
+    TOOL_DEFINITION,
+    create_execute,
+    create_execute_batch,
+)
+from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
+from simple_agent_poc.application.dto import RunAgentRequest
+from simple_agent_poc.application.tool_context import ToolCallContext, use_tool_calls
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
+from simple_agent_poc.core.types import LLMStreamChunk
+from simple_agent_poc.entrypoints.bootstrap import resolve_execution_result_cache
+from simple_agent_poc.observability import metrics
+
+SUCCESS = WorkerExecutionResult(status="success", result=2)
+FAILURE = WorkerExecutionResult(
+    status="error",
+    error=WorkerError(category="timeout", code="TIMEOUT", message="timed out"),
+)
+
+
+class CountingClient:
+    def __init__(self, result: WorkerExecutionResult = SUCCESS) -> None:
+        self.result = result
+        self.calls: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def execute_javascript(
+        self, *, code, input_data=None, timeout_ms=None, on_output=None
+    ):
+        self.calls.append(code)
+        return self.result
+
+    def execute_javascript_batch(self, executions):
+        self.batches.append([execution.code for execution in executions])
+        return [self.result for _ in executions]
+
+
+class TestExecutionResultCache:
+    def test_returns_stored_success_until_ttl(self) -> None:
+        now = [0.0]
+        cache = ExecutionResultCache(ttl_seconds=10.0, clock=lambda: now[0])
+        execution = JavaScriptExecution("1 + 1", input_data={"a": 1})
+
+        assert cache.get(execution) is None
+        cache.put(execution, SUCCESS)
+        now[0] = 9.0
+        assert cache.get(JavaScriptExecution("1 + 1", input_data={"a": 1})) == SUCCESS
+        now[0] = 10.0
+        assert cache.get(execution) is None
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+        assert stats.entries == 0
+
+    def test_key_covers_code_input_and_timeout(self) -> None:
+        cache = ExecutionResultCache()
+        cache.put(JavaScriptExecution("x", input_data=1, timeout_ms=100), SUCCESS)
+
+        assert cache.get(JavaScriptExecution("x", input_data=1, timeout_ms=100))
+        assert cache.get(JavaScriptExecution("x", input_data=2, timeout_ms=100)) is None
+        assert cache.get(JavaScriptExecution("x", input_data=1)) is None
+        assert cache.get(JavaScriptExecution("y", input_data=1, timeout_ms=100)) is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = ExecutionResultCache(max_entries=2)
+        for code in ("a", "b"):
+            cache.put(JavaScriptExecution(code), SUCCESS)
+        cache.get(JavaScriptExecution("a"))
+        cache.put(JavaScriptExecution("c"), SUCCESS)
+
+        assert cache.get(JavaScriptExecution("b")) is None
+        assert cache.get(JavaScriptExecution("a")) is not None
+        assert cache.stats().evictions == 1
+
+    def test_does_not_store_failures(self) -> None:
+        cache = ExecutionResultCache()
+        cache.put(JavaScriptExecution("x"), FAILURE)
+
+        assert cache.get(JavaScriptExecution("x")) is None
+
+
+def test_execute_reuses_cached_result_and_reports_hit() -> None:
+    client = CountingClient()
+    execute = create_execute(client, cache=ExecutionResultCache())
+    first, second = ToolCallContext("default"), ToolCallContext("default")
+
+    with use_tool_calls([first]):
+        execute({"code": "1 + 1"})
+    with use_tool_calls([second]):
+        payload = json.loads(execute({"code": "1 + 1"}))
+
+    assert client.calls == ["1 + 1"]
+    assert payload["result"] == 2
+    assert first.fields == {"cache": "miss"}
+    assert second.fields == {"cache": "hit"}
+
+
+def test_execute_skips_cache_for_agents_that_opt_out() -> None:
+    client = CountingClient()
+    cache = ExecutionResultCache()
+    execute = create_execute(client, cache=cache)
+    context = ToolCallContext("default", cache_results=False)
+
+    with use_tool_calls([context]):
+        execute({"code": "1 + 1"})
+        execute({"code": "1 + 1"})
+
+    assert client.calls == ["1 + 1", "1 + 1"]
+    assert context.fields == {}
+    assert cache.stats().entries == 0
+
+
+def test_execute_retries_failed_executions() -> None:
+    client = CountingClient(FAILURE)
+    execute = create_execute(client, cache=ExecutionResultCache())
+
+    execute({"code": "loop()"})
+    execute({"code": "loop()"})
+
+    assert client.calls == ["loop()", "loop()"]
+
+
+def test_execute_batch_sends_only_cache_misses() -> None:
+    client = CountingClient()
+    cache = ExecutionResultCache()
+    cache.put(JavaScriptExecution("a"), SUCCESS)
+    execute_batch = create_execute_batch(client, cache=cache)
+    contexts = [ToolCallContext("default") for _ in range(3)]
+
+    with use_tool_calls(contexts):
+        results = execute_batch([{"code": "a"}, {"code": "b"}, {"code": "c"}])
+
+    assert client.batches == [["b", "c"]]
+    assert len(results) == 3
+    assert [c.fields["cache"] for c in contexts] == ["hit", "miss", "miss"]
+    assert cache.get(JavaScriptExecution("c")) is not None
+
+
+def test_resolve_execution_result_cache_is_opt_in() -> None:
+    assert resolve_execution_result_cache({"EXECUTION_WORKER_URL": "x"}) is None
+
+    cache = resolve_execution_result_cache(
+        {
+            "EXECUTION_WORKER_CACHE_SIZE": "32",
+            "EXECUTION_WORKER_CACHE_TTL_SECONDS": "60",
+        }
+    )
+
+    assert cache is not None
+    assert cache.max_entries == 32
+    assert cache.ttl_seconds == 60.0
+    with pytest.raises(ValueError, match="EXECUTION_WORKER_CACHE_SIZE"):
+        resolve_execution_result_cache({"EXECUTION_WORKER_CACHE_SIZE": "0"})
+
+
+class _RepeatingLLMClient:
+    """Asks for the same execute_javascript call twice, then answers."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete_stream(self, messages, *, tools=None):
+        self.calls += 1
+        if self.calls <= 2:
+            yield LLMStreamChunk(
+                content_delta=None,
+                tool_call_delta={
+                    "index": 0,
+                    "id": f"call_{self.calls}",
+                    "type": "function",
+                    "function": {
+                        "name": "execute_javascript",
+                        "arguments": '{"code": "1 + 1"}',
+                    },
+                },
+            )
+        else:
+            yield LLMStreamChunk(content_delta="Done.")
+
+
+@pytest.mark.parametrize(("opt_in", "expected_calls"), [(True, 1), (False, 2)])
+def test_run_reports_cache_lookups_per_agent(monkeypatch, opt_in, expected_calls):
+    recorded = metrics.EventMetrics()
+    monkeypatch.setattr(metrics, "_metrics", recorded)
+    client = CountingClient()
+    registry = BuiltinToolRegistry()
+    registry.register(
+        TOOL_DEFINITION, create_execute(client, cache=ExecutionResultCache())
+    )
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _: _RepeatingLLMClient(),
+        session_store=InMemorySessionStore(),
+        agent_definitions=AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "test-model",
+                        "system_prompt": "Prompt",
+                        "tools": ["execute_javascript"],
+                        "tool_result_cache": opt_in,
+                    }
+                }
+            }
+        ),
+        tool_executor=registry,
+    )
+
+    list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert len(client.calls) == expected_calls
+    assert recorded.tool_cache.value("execute_javascript", "hit") == (
+        1 if opt_in else 0
+    )
+    assert recorded.tool_cache.value("execute_javascript", "miss") == (
+        1 if opt_in else 0
+    )
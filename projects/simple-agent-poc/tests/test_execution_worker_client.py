@@ -7,8 +7,10 @@ from urllib.error import HTTPError, URLError
 from urllib.request import Request
 
 from simple_agent_poc.adapters.execution_worker.client import (
+    STREAM_CAPABILITY,
     ExecutionWorkerClient,
     ExecutionWorkerConfig,
+    JavaScriptExecution,
 )
 
 
@@ -27,6 +29,29 @@ class FakeResponse:
         return None
 
 
+class FakeStreamResponse:
+    """NDJSON response whose lines can only be read one at a time."""
+
+    status = 200
+
+    def __init__(self, lines: list[dict]) -> None:
+        self._body = io.BytesIO(
+            b"".join(json.dumps(line).encode("utf-8") + b"\n\n" for line in lines)
+        )
+
+    def readline(self) -> bytes:
+        return self._body.readline()
+
+    def read(self) -> bytes:
+        raise AssertionError("streamed responses must not be read whole")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+
 def make_client(response_or_error) -> ExecutionWorkerClient:
     def opener(request: Request, *, timeout: float):
         assert request.full_url == "http://worker.local/execute"
@@ -211,3 +236,292 @@ def test_execute_javascript_maps_network_failure_as_upstream_unavailable() -> No
     assert result.error is not None
     assert result.error.category == "upstream_unavailable"
     assert result.error.code == "UPSTREAM_UNAVAILABLE"
+
+
+class FakeWorker:
+    """Route opener requests by path and record them."""
+
+    def __init__(
+        self,
+        *,
+        capabilities: list[str],
+        batch_status: int = 200,
+        stream_status: int = 200,
+        stream_lines: list[dict] | None = None,
+        health_status: int = 200,
+    ) -> None:
+        self.capabilities = capabilities
+        self.health_status = health_status
+        self.batch_status = batch_status
+        self.stream_status = stream_status
+        self.stream_lines = stream_lines or []
+        self.requests: list[tuple[str, dict | None]] = []
+
+    def __call__(self, request: Request, *, timeout: float):
+        path = request.full_url.removeprefix("http://worker.local")
+        data = request.data
+        body = json.loads(data) if isinstance(data, (bytes, str)) else None
+        self.requests.append((path, body))
+        if path == "/healthz":
+            if self.health_status != 200:
+                raise make_http_error(self.health_status, "Unavailable", {})
+            return FakeResponse(
+                200, {"status": "ok", "capabilities": self.capabilities}
+            )
+        if path == "/execute/stream":
+            if self.stream_status != 200:
+                raise make_http_error(
+                    self.stream_status,
+                    "Error",
+                    {"status": "error", "error": {"code": "VALIDATION_ERROR"}},
+                )
+            return FakeStreamResponse(self.stream_lines)
+        assert body is not None
+        if path == "/execute/batch":
+            if self.batch_status != 200:
+                raise make_http_error(
+                    self.batch_status,
+                    "Error",
+                    {
+                        "status": "error",
+                        "error": {"code": "CONCURRENCY_LIMIT_EXCEEDED"},
+                    },
+                )
+            return FakeResponse(
+                200,
+                {
+                    "results": [
+                        {"status": "success", "stdout": "", "result": item["code"]}
+                        if item["code"]
+                        else {
+                            "status": "error",
+                            "httpStatus": 400,
+                            "error": {"code": "VALIDATION_ERROR"},
+                        }
+                        for item in body["requests"]
+                    ]
+                },
+            )
+        return FakeResponse(
+            200, {"status": "success", "stdout": "", "result": body["code"]}
+        )
+
+    def paths(self) -> list[str]:
+        return [path for path, _body in self.requests]
+
+
+def make_batch_client(worker: FakeWorker) -> ExecutionWorkerClient:
+    client = ExecutionWorkerClient(
+        ExecutionWorkerConfig(base_url="http://worker.local"), opener=worker
+    )
+    client.refresh_capabilities()
+    return client
+
+
+def test_execute_javascript_batch_uses_batch_endpoint_when_advertised() -> None:
+    worker = FakeWorker(capabilities=["execute_batch"])
+    client = make_batch_client(worker)
+
+    results = client.execute_javascript_batch(
+        [JavaScriptExecution(code="a", input_data={"x": 1}), JavaScriptExecution("")]
+    )
+    client.execute_javascript_batch(
+        [JavaScriptExecution("b"), JavaScriptExecution("c")]
+    )
+
+    assert worker.paths() == ["/healthz", "/execute/batch", "/execute/batch"]
+    assert worker.requests[1][1] == {
+        "requests": [
+            {"language": "javascript", "code": "a", "input": {"x": 1}},
+            {"language": "javascript", "code": ""},
+        ]
+    }
+    assert results[0].result == "a"
+    assert results[1].error is not None
+    assert results[1].error.category == "validation"
+    assert results[1].error.http_status == 400
+
+
+def test_execute_javascript_batch_falls_back_to_single_calls() -> None:
+    worker = FakeWorker(capabilities=[])
+    client = make_batch_client(worker)
+
+    results = client.execute_javascript_batch(
+        [JavaScriptExecution(code) for code in ("a", "b", "c")]
+    )
+
+    assert [result.result for result in results] == ["a", "b", "c"]
+    assert worker.paths().count("/healthz") == 1
+    assert sorted(worker.paths()[1:]) == ["/execute"] * 3
+
+
+def test_execute_javascript_batch_remembers_missing_batch_endpoint() -> None:
+    worker = FakeWorker(capabilities=["execute_batch"], batch_status=404)
+    client = make_batch_client(worker)
+
+    first = client.execute_javascript_batch([JavaScriptExecution("a")] * 2)
+    client.execute_javascript_batch([JavaScriptExecution("b")] * 2)
+
+    assert [result.result for result in first] == ["a", "a"]
+    assert worker.paths() == ["/healthz", "/execute/batch"] + ["/execute"] * 4
+
+
+def test_execute_javascript_batch_applies_rejected_batch_to_every_item() -> None:
+    worker = FakeWorker(capabilities=["execute_batch"], batch_status=429)
+    client = make_batch_client(worker)
+
+    results = client.execute_javascript_batch([JavaScriptExecution("a")] * 2)
+
+    assert [r.error.category for r in results if r.error] == ["concurrency_limit"] * 2
+
+
+STREAMED_RESULT = {
+    "type": "result",
+    "status": "success",
+    "stdout": "tick\ntock\n",
+    "result": 2,
+    "durationMs": 7,
+}
+
+
+def test_execute_javascript_streams_output_to_listener() -> None:
+    worker = FakeWorker(
+        capabilities=["execute_stream"],
+        stream_lines=[
+            {"type": "output", "stream": "stdout", "data": "tick\n"},
+            {"type": "output", "stream": "stderr", "data": "warn\n"},
+            {"type": "heartbeat"},
+            {"type": "output", "stream": "stdout", "data": "tock\n"},
+            STREAMED_RESULT,
+        ],
+    )
+    client = make_batch_client(worker)
+    chunks: list[tuple[str, str]] = []
+
+    result = client.execute_javascript(
+        code="1 + 1", on_output=lambda stream, data: chunks.append((stream, data))
+    )
+
+    assert worker.paths() == ["/healthz", "/execute/stream"]
+    assert worker.requests[1][1] == {"language": "javascript", "code": "1 + 1"}
+    assert chunks == [("stdout", "tick\n"), ("stderr", "warn\n"), ("stdout", "tock\n")]
+    assert result.status == "success"
+    assert (result.stdout, result.result, result.duration_ms) == ("tick\ntock\n", 2, 7)
+
+
+def test_execute_javascript_maps_streamed_error_result() -> None:
+    worker = FakeWorker(
+        capabilities=["execute_stream"],
+        stream_lines=[
+            {"type": "output", "stream": "stdout", "data": "partial"},
+            {
+                "type": "result",
+                "status": "error",
+                "stdout": "partial",
+                "error": {"code": "TIMEOUT", "message": "Execution timed out"},
+            },
+        ],
+    )
+
+    result = make_batch_client(worker).execute_javascript(
+        code="while (true) {}", on_output=lambda stream, data: None
+    )
+
+    assert result.error is not None
+    assert result.error.category == "timeout"
+    assert result.stdout == "partial"
+
+
+def test_execute_javascript_stream_without_result_is_upstream_unavailable() -> None:
+    worker = FakeWorker(
+        capabilities=["execute_stream"],
+        stream_lines=[{"type": "output", "stream": "stdout", "data": "tick"}],
+    )
+
+    result = make_batch_client(worker).execute_javascript(
+        code="1", on_output=lambda stream, data: None
+    )
+
+    assert result.error is not None
+    assert result.error.category == "upstream_unavailable"
+
+
+def test_execute_javascript_maps_rejected_stream_request() -> None:
+    worker = FakeWorker(capabilities=["execute_stream"], stream_status=400)
+
+    result = make_batch_client(worker).execute_javascript(
+        code="", on_output=lambda stream, data: None
+    )
+
+    assert result.error is not None
+    assert result.error.category == "validation"
+    assert worker.paths() == ["/healthz", "/execute/stream"]
+
+
+def test_execute_javascript_without_stream_capability_uses_execute() -> None:
+    worker = FakeWorker(capabilities=[])
+    client = make_batch_client(worker)
+    chunks: list[str] = []
+
+    result = client.execute_javascript(
+        code="a", on_output=lambda stream, data: chunks.append(data)
+    )
+    client.execute_javascript(code="b")
+
+    assert result.result == "a"
+    assert chunks == []
+    assert worker.paths() == ["/healthz", "/execute", "/execute"]
+
+
+def test_execute_javascript_remembers_missing_stream_endpoint() -> None:
+    worker = FakeWorker(capabilities=["execute_stream"], stream_status=404)
+    client = make_batch_client(worker)
+
+    first = client.execute_javascript(code="a", on_output=lambda stream, data: None)
+    client.execute_javascript(code="b", on_output=lambda stream, data: None)
+
+    assert first.result == "a"
+    assert worker.paths() == ["/healthz", "/execute/stream", "/execute", "/execute"]
+
+
+def test_unknown_capabilities_are_fetched_without_delaying_calls() -> None:
+    worker = FakeWorker(capabilities=["execute_stream"], stream_lines=[STREAMED_RESULT])
+    client = ExecutionWorkerClient(
+        ExecutionWorkerConfig(base_url="http://worker.local"), opener=worker
+    )
+
+    result = client.execute_javascript(code="a", on_output=lambda stream, data: None)
+    assert client._refresher is not None
+    client._refresher.join(1)
+
+    assert result.result == 2
+    assert sorted(worker.paths()) == ["/execute/stream", "/healthz"]
+    assert client._capabilities == {"execute_stream"}
+
+
+def test_unhealthy_capability_reply_is_not_kept_and_expires() -> None:
+    worker = FakeWorker(
+        capabilities=["execute_stream"],
+        stream_status=404,
+        stream_lines=[STREAMED_RESULT],
+        health_status=503,
+    )
+    client = make_batch_client(worker)
+
+    first = client.execute_javascript(code="a", on_output=lambda stream, data: None)
+    client.execute_javascript(code="b", on_output=lambda stream, data: None)
+
+    # Unknown capabilities: the endpoint is tried once, then avoided.
+    assert first.result == "a"
+    assert worker.paths() == ["/healthz", "/execute/stream", "/execute", "/execute"]
+
+    worker.health_status = 200
+    worker.stream_status = 200
+    client._capabilities_expire_at = 0.0
+    client._supports(STREAM_CAPABILITY)
+    assert client._refresher is not None
+    client._refresher.join(1)
+    streamed = client.execute_javascript(code="c", on_output=lambda stream, data: None)
+
+    assert worker.paths()[4:] == ["/healthz", "/execute/stream"]
+    assert streamed.result == 2
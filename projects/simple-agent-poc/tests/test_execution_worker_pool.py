@@ -0,0 +1,261 @@
+"""Tests for the execution-worker keep-alive connection pool."""
+
+import json
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import cast
+
+import pytest
+
+from simple_agent_poc.adapters.execution_worker.client import (
+    ExecutionWorkerClient,
+    ExecutionWorkerConfig,
+)
+from simple_agent_poc.adapters.execution_worker.pool import ConnectionPool
+from simple_agent_poc.observability import metrics
+
+
+class _Worker(ThreadingHTTPServer):
+    """Fake execution-worker that counts the TCP connections it accepts."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _WorkerHandler)
+        self.connections = 0
+        self.delay = threading.Event()
+        self.delay.set()
+        # "announce" sends ``Connection: close``; "silent" drops the socket
+        # after the response, as a worker that timed the connection out would.
+        self.close_mode = ""
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _WorkerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def worker(self) -> _Worker:
+        return cast(_Worker, self.server)
+
+    def setup(self) -> None:
+        super().setup()
+        self.worker.connections += 1
+
+    def do_GET(self) -> None:
+        body = json.dumps({"status": "ok", "capabilities": ["execute_stream"]})
+        self._send_json(200, body.encode())
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        if self.path == "/execute/stream":
+            self._stream(request["code"])
+            return
+        self.worker.delay.wait(5)
+        status = 400 if request["code"] == "bad" else 200
+        body = json.dumps(
+            {"status": "success", "stdout": "", "result": request["code"]}
+            if status == 200
+            else {"status": "error", "error": {"code": "VALIDATION_ERROR"}}
+        ).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        if self.worker.close_mode == "announce":
+            self.send_header("connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        if self.worker.close_mode == "silent":
+            self.close_connection = True
+
+    def _send_json(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, code: str) -> None:
+        """Send two output lines, holding the second until ``delay`` is set."""
+        self.send_response(200)
+        self.send_header("content-type", "application/x-ndjson")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+        lines = [
+            {"type": "output", "stream": "stdout", "data": "first"},
+            {"type": "output", "stream": "stdout", "data": "second"},
+            {"type": "result", "status": "success", "stdout": "", "result": code},
+        ]
+        for index, line in enumerate(lines):
+            if index == 1:
+                self.worker.delay.wait(5)
+            data = json.dumps(line).encode() + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+@pytest.fixture
+def worker() -> Generator[_Worker]:
+    server = _Worker()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def worker_metrics(monkeypatch) -> metrics.EventMetrics:
+    fresh = metrics.EventMetrics()
+    monkeypatch.setattr(metrics, "_metrics", fresh)
+    return fresh
+
+
+def _client(worker: _Worker, max_connections: int = 10) -> ExecutionWorkerClient:
+    return ExecutionWorkerClient(
+        ExecutionWorkerConfig(
+            base_url=worker.url, timeout_seconds=2.0, max_connections=max_connections
+        )
+    )
+
+
+def test_sequential_calls_reuse_one_connection(worker, worker_metrics):
+    client = _client(worker)
+
+    results = [client.execute_javascript(code=f"{idx}").result for idx in range(5)]
+
+    assert results == ["0", "1", "2", "3", "4"]
+    assert worker.connections == 1
+    assert worker_metrics.worker_connections.value("false") == 1
+    assert worker_metrics.worker_connections.value("true") == 4
+    assert worker_metrics.worker_connection_wait.count() == 5
+    client.close()
+
+
+def test_error_status_is_returned_and_connection_kept(worker):
+    client = _client(worker)
+
+    result = client.execute_javascript(code="bad")
+    client.execute_javascript(code="ok")
+
+    assert result.error is not None
+    assert result.error.category == "validation"
+    assert result.error.http_status == 400
+    assert worker.connections == 1
+
+
+def test_idle_connections_expire(worker):
+    now = [0.0]
+    pool = ConnectionPool(idle_timeout_seconds=10.0, clock=lambda: now[0])
+    client = ExecutionWorkerClient(
+        ExecutionWorkerConfig(base_url=worker.url), opener=pool
+    )
+
+    client.execute_javascript(code="a")
+    now[0] = 5.0
+    client.execute_javascript(code="b")
+    now[0] = 20.0
+    client.execute_javascript(code="c")
+
+    assert worker.connections == 2
+
+
+def test_connection_closed_by_server_is_not_reused(worker):
+    worker.close_mode = "announce"
+    client = _client(worker)
+
+    client.execute_javascript(code="a")
+    client.execute_javascript(code="b")
+
+    assert worker.connections == 2
+
+
+def test_stale_connection_is_retried_on_a_new_one(worker, worker_metrics):
+    worker.close_mode = "silent"
+    client = _client(worker)
+
+    first = client.execute_javascript(code="a")
+    second = client.execute_javascript(code="b")
+
+    assert (first.result, second.result) == ("a", "b")
+    assert worker.connections == 2
+    assert worker_metrics.worker_connections.value("true") == 1
+    assert worker_metrics.worker_connections.value("false") == 2
+
+
+def test_max_connections_makes_callers_wait(worker, worker_metrics):
+    client = _client(worker, max_connections=1)
+    worker.delay.clear()
+    results: list[str] = []
+
+    threads = [
+        threading.Thread(
+            target=lambda idx=idx: results.append(
+                client.execute_javascript(code=f"{idx}").result
+            )
+        )
+        for idx in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    threading.Timer(0.2, worker.delay.set).start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(results) == ["0", "1", "2"]
+    assert worker.connections == 1
+    assert worker_metrics.worker_connections.value("true") == 2
+    assert "execution_worker_connection_wait_seconds_bucket" in (
+        worker_metrics.render()
+    )
+
+
+def test_exhausted_pool_times_out_as_upstream_unavailable(worker):
+    pool = ConnectionPool(max_connections=1)
+    client = ExecutionWorkerClient(
+        ExecutionWorkerConfig(base_url=worker.url, timeout_seconds=0.2), opener=pool
+    )
+    worker.delay.clear()
+    blocker = threading.Thread(target=lambda: client.execute_javascript(code="slow"))
+    blocker.start()
+    try:
+        result = ExecutionWorkerClient(
+            ExecutionWorkerConfig(base_url=worker.url, timeout_seconds=0.1),
+            opener=pool,
+        ).execute_javascript(code="waiting")
+    finally:
+        worker.delay.set()
+        blocker.join(5)
+
+    assert result.error is not None
+    assert result.error.category == "upstream_unavailable"
+
+
+def test_streamed_output_arrives_before_the_response_ends(worker):
+    client = _client(worker)
+    client.refresh_capabilities()
+    worker.delay.clear()
+    chunks: list[str] = []
+
+    def on_output(stream: str, data: str) -> None:
+        chunks.append(data)
+        # The worker only sends the rest once the first chunk was seen.
+        worker.delay.set()
+
+    result = client.execute_javascript(code="streamed", on_output=on_output)
+    client.execute_javascript(code="next", on_output=on_output)
+
+    assert result.result == "streamed"
+    assert chunks == ["first", "second", "first", "second"]
+    assert worker.connections == 1
+    client.close()
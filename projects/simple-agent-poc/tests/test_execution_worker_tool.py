@@ -5,10 +5,18 @@ import json
 import pytest
 
 from simple_agent_poc.adapters.execution_worker.client import (
+    JavaScriptExecution,
     WorkerError,
     WorkerExecutionResult,
 )
-from simple_agent_poc.adapters.tools.execute_javascript import create_execute
+from simple_agent_poc.adapters.tools.execute_javascript import (
+    TOOL_DEFINITION,
+    create_execute,
+    create_execute_batch,
+)
+from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
+from simple_agent_poc.application.tool_context import ToolCallContext, use_tool_calls
+from simple_agent_poc.core.types import LLMError, ToolCall
 from simple_agent_poc.entrypoints.bootstrap import (
     create_default_tool_executor,
     resolve_execution_worker_config,
@@ -58,6 +66,24 @@ def test_execute_javascript_tool_serializes_success_result() -> None:
     ]
 
 
+def test_execute_javascript_tool_streams_output_to_the_call_context() -> None:
+    client = StubExecutionWorkerClient(
+        WorkerExecutionResult(status="success", stdout="tick\n")
+    )
+    chunks: list[tuple[str, str]] = []
+    context = ToolCallContext(
+        agent_id="default", on_output=lambda stream, data: chunks.append((stream, data))
+    )
+    execute = create_execute(client)
+
+    with use_tool_calls([context]):
+        payload = json.loads(execute({"code": "console.log('tick')"}))
+    client.calls[0]["on_output"]("stdout", "tick\n")
+
+    assert payload["stdout"] == "tick\n"
+    assert chunks == [("stdout", "tick\n")]
+
+
 def test_execute_javascript_tool_serializes_worker_error() -> None:
     client = StubExecutionWorkerClient(
         WorkerExecutionResult(
@@ -81,6 +107,69 @@ def test_execute_javascript_tool_serializes_worker_error() -> None:
     assert payload["error"]["details"] == ["code must be a string"]
 
 
+class StubBatchClient:
+    def __init__(self) -> None:
+        self.batches: list[list[JavaScriptExecution]] = []
+
+    def execute_javascript_batch(self, executions):
+        self.batches.append(list(executions))
+        return [
+            WorkerExecutionResult(status="success", result=execution.code)
+            for execution in executions
+        ]
+
+
+def test_execute_javascript_batch_tool_sends_one_batch() -> None:
+    client = StubBatchClient()
+    execute_batch = create_execute_batch(client)
+
+    payloads = execute_batch(
+        [{"code": "a", "input": 1, "timeout_ms": 50}, {"code": "b", "timeout_ms": "x"}]
+    )
+
+    assert [json.loads(p)["result"] for p in payloads] == ["a", "b"]
+    assert client.batches == [
+        [
+            JavaScriptExecution(code="a", input_data=1, timeout_ms=50),
+            JavaScriptExecution(code="b"),
+        ]
+    ]
+
+
+def test_registry_executes_batch_of_registered_tool() -> None:
+    client = StubBatchClient()
+    registry = BuiltinToolRegistry()
+    registry.register(
+        TOOL_DEFINITION,
+        create_execute(StubExecutionWorkerClient(WorkerExecutionResult("success"))),
+        execute_batch=create_execute_batch(client),
+    )
+    calls = [
+        ToolCall(
+            id=f"call_{code}",
+            type="function",
+            function={
+                "name": "execute_javascript",
+                "arguments": json.dumps({"code": code}),
+            },
+        )
+        for code in ("a", "b")
+    ]
+    mixed = ToolCall(
+        id="call_concat",
+        type="function",
+        function={"name": "concat", "arguments": "{}"},
+    )
+
+    results = registry.execute_batch(calls)
+
+    assert registry.supports_batch("execute_javascript")
+    assert not registry.supports_batch("concat")
+    assert [json.loads(r)["result"] for r in results] == ["a", "b"]
+    with pytest.raises(LLMError, match="exactly one tool"):
+        registry.execute_batch([calls[0], mixed])
+
+
 def test_resolve_execution_worker_config_returns_none_without_url() -> None:
     assert resolve_execution_worker_config({}) is None
 
@@ -98,6 +187,36 @@ def test_resolve_execution_worker_config_uses_url_and_timeout() -> None:
     assert config.timeout_seconds == 2.5
 
 
+def test_resolve_execution_worker_config_reads_pool_limits() -> None:
+    config = resolve_execution_worker_config(
+        {
+            "EXECUTION_WORKER_URL": "http://worker.local",
+            "EXECUTION_WORKER_MAX_CONNECTIONS": "4",
+            "EXECUTION_WORKER_IDLE_TIMEOUT_SECONDS": "2.5",
+        }
+    )
+
+    assert config is not None
+    assert config.max_connections == 4
+    assert config.idle_timeout_seconds == 2.5
+
+
+def test_resolve_execution_worker_config_reads_breaker_settings() -> None:
+    config = resolve_execution_worker_config(
+        {
+            "EXECUTION_WORKER_URL": "http://worker.local",
+            "EXECUTION_WORKER_BREAKER_THRESHOLD": "3",
+            "EXECUTION_WORKER_BREAKER_PROBE_SECONDS": "0.5",
+            "EXECUTION_WORKER_CAPABILITIES_TTL_SECONDS": "60",
+        }
+    )
+
+    assert config is not None
+    assert config.breaker_failure_threshold == 3
+    assert config.breaker_probe_interval_seconds == 0.5
+    assert config.capabilities_ttl_seconds == 60
+
+
 def test_resolve_execution_worker_config_rejects_invalid_timeout() -> None:
     with pytest.raises(ValueError, match="must be an integer"):
         resolve_execution_worker_config(
@@ -131,3 +250,4 @@ def test_create_default_tool_executor_registers_execute_javascript_when_configur
 
     assert len(definitions) == 1
     assert definitions[0]["function"]["name"] == "execute_javascript"
+    assert registry.supports_batch("execute_javascript")
@@ -14,6 +14,7 @@ from simple_agent_poc.adapters.tools.ask_user import (
     execute as ask_user_execute,
 )
 from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
+from simple_agent_poc.application.tool_context import current_tool_calls
 from simple_agent_poc.application.use_cases import RunAgentUseCase
 from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
 from simple_agent_poc.core.types import LLMStreamChunk, Message
@@ -161,6 +162,92 @@ class TestStreamAPI:
         assert any(e["event"] == "done" for e in events)
 
 
+class ToolThenAnswerLLMClient:
+    """Calls ``run_script`` in the first round, then answers."""
+
+    def __init__(self) -> None:
+        self.rounds = 0
+
+    def complete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools=None,
+    ) -> Iterator[LLMStreamChunk]:
+        self.rounds += 1
+        if self.rounds > 1:
+            yield {"content_delta": "Done"}
+            return
+        yield {
+            "content_delta": None,
+            "tool_call_delta": {
+                "index": 0,
+                "id": "call_001",
+                "type": "function",
+                "function": {"name": "run_script", "arguments": "{}"},
+            },
+        }
+
+
+def run_script(arguments: dict) -> str:
+    context = current_tool_calls()[0]
+    context.output("stdout", "working...\n")
+    return "finished"
+
+
+class TestToolProgressStreamAPI:
+    """Tests for partial tool output in the SSE stream."""
+
+    def test_chat_stream_sends_tool_progress_before_result(self) -> None:
+        tool_executor = BuiltinToolRegistry()
+        tool_executor.register(
+            {
+                "type": "function",
+                "function": {
+                    "name": "run_script",
+                    "description": "Run a script",
+                    "parameters": {"type": "object", "properties": {}},
+                },
+            },
+            run_script,
+        )
+        agent_definitions = AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "default-model",
+                        "system_prompt": "System prompt",
+                        "tools": ["run_script"],
+                    },
+                }
+            }
+        )
+        app = create_app(
+            use_case_factory=lambda: RunAgentUseCase(
+                llm_client_factory=lambda _agent_definition: ToolThenAnswerLLMClient(),
+                session_store=InMemorySessionStore(),
+                agent_definitions=agent_definitions,
+                tool_executor=tool_executor,
+                is_api_context=True,
+            )
+        )
+
+        response = TestClient(app).post("/api/chat", json={"message": "Go"})
+
+        events = parse_sse_events(response.text)
+        assert [e["event"] for e in events[:3]] == [
+            "tool_call",
+            "tool_progress",
+            "tool_result",
+        ]
+        assert json.loads(events[1]["data"]) == {
+            "call_id": "call_001",
+            "name": "run_script",
+            "stream": "stdout",
+            "data": "working...\n",
+        }
+
+
 def build_registry_with_ask_user() -> AgentDefinitionRegistry:
     return AgentDefinitionRegistry.from_mapping(
         {
@@ -1,9 +1,15 @@
 """Tests for application ports."""
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from typing import get_type_hints
 
-from simple_agent_poc.application.ports import LLMClient, SessionStore
+from simple_agent_poc.application.ports import (
+    AsyncLLMClient,
+    AsyncSessionStore,
+    AsyncToolExecutor,
+    LLMClient,
+    SessionStore,
+)
 from simple_agent_poc.core.session import ConversationSession
 from simple_agent_poc.core.types import LLMStreamChunk
 
@@ -29,8 +35,25 @@ class TestSessionStore:
     def test_protocol_has_required_methods(self) -> None:
         assert hasattr(SessionStore, "get")
         assert hasattr(SessionStore, "save")
+        assert hasattr(SessionStore, "save_changes")
 
     def test_get_signature(self) -> None:
         hints = get_type_hints(SessionStore.get)
 
         assert hints.get("return") == ConversationSession | None
+
+
+class TestAsyncPorts:
+    """Tests for the async application ports."""
+
+    def test_async_protocols_have_required_methods(self) -> None:
+        assert hasattr(AsyncLLMClient, "acomplete_stream")
+        assert hasattr(AsyncToolExecutor, "aexecute")
+        assert hasattr(AsyncSessionStore, "aget")
+        assert hasattr(AsyncSessionStore, "asave")
+        assert hasattr(AsyncSessionStore, "asave_changes")
+
+    def test_acomplete_stream_signature(self) -> None:
+        hints = get_type_hints(AsyncLLMClient.acomplete_stream)
+
+        assert hints.get("return") == AsyncIterator[LLMStreamChunk]
@@ -1,11 +1,17 @@
 """Tests for LiteLLM client adapter."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from litellm.exceptions import (
     AuthenticationError as LiteLLMAuthError,
 )
+from litellm.exceptions import (
+    InternalServerError as LiteLLMInternalServerError,
+)
 from litellm.exceptions import (
     RateLimitError as LiteLLMRateLimitError,
 )
@@ -15,13 +21,16 @@ from simple_agent_poc.adapters.llm.litellm_client import (
     LiteLLMCompletionClient,
     LiteLLMResponsesClient,
 )
+from simple_agent_poc.adapters.llm.retry import RetryPolicy, retry_after_seconds
 from simple_agent_poc.core.agent_definition import AgentDefinition
 from simple_agent_poc.core.types import (
     AuthenticationError,
     LLMError,
     Message,
     RateLimitError,
+    ToolDefinition,
 )
+from simple_agent_poc.entrypoints.bootstrap import resolve_llm_retry_policy
 
 
 class TestLiteLLMClientFactory:
@@ -89,6 +98,50 @@ class TestLiteLLMClientFactory:
         assert client.model == "gpt-5.4-nano"
         assert client.temperature is None
 
+    def test_factory_passes_prompt_caching(self) -> None:
+        factory = LiteLLMClientFactory()
+        agent_definition = AgentDefinition(
+            agent_id="default",
+            model="gpt-4",
+            system_prompt="Prompt",
+            prompt_caching=True,
+        )
+
+        client = factory(agent_definition)
+
+        assert isinstance(client, LiteLLMCompletionClient)
+        assert client.prompt_caching is True
+
+    def test_factory_reuses_client_per_agent_definition(self) -> None:
+        factory = LiteLLMClientFactory()
+        agent_definition = AgentDefinition(
+            agent_id="default",
+            model="gpt-4",
+            system_prompt="Prompt",
+            tools=["concat"],
+        )
+
+        first = factory(agent_definition)
+        second = factory(
+            AgentDefinition(
+                agent_id="default",
+                model="gpt-4",
+                system_prompt="Prompt",
+                tools=["concat"],
+            )
+        )
+        other = factory(
+            AgentDefinition(
+                agent_id="default",
+                model="gpt-4",
+                system_prompt="Prompt",
+                temperature=0.5,
+            )
+        )
+
+        assert first is second
+        assert other is not first
+
 
 class TestLiteLLMCompletionClientStream:
     """Tests for complete_stream method of LiteLLMCompletionClient."""
@@ -482,3 +535,545 @@ class TestLiteLLMResponsesClientStream:
         assert len(result) == 2
         assert result[0]["tool_call_delta"] is not None
         assert result[1]["content_delta"] == "Hello"
+
+
+async def _async_iter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(stream) -> list:
+    return [chunk async for chunk in stream]
+
+
+_TOOLS: list[ToolDefinition] = [
+    {
+        "type": "function",
+        "function": {"name": "first", "description": "First", "parameters": {}},
+    },
+    {
+        "type": "function",
+        "function": {"name": "second", "description": "Second", "parameters": {}},
+    },
+]
+
+
+def _usage_chunk(usage: MagicMock) -> MagicMock:
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = ""
+    chunk.usage = usage
+    return chunk
+
+
+class TestPromptCaching:
+    """Tests for opt-in prompt caching."""
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.completion")
+    def test_completion_marks_system_tools_and_history_prefix(
+        self,
+        mock_completion: MagicMock,
+    ) -> None:
+        mock_completion.return_value = []
+        messages: list[Message] = [
+            {"role": "system", "content": "System"},
+            {"role": "user", "content": "Question"},
+            {"role": "assistant", "content": "", "tool_calls": []},
+            {"role": "tool", "content": "Result", "tool_call_id": "call_1"},
+        ]
+        client = LiteLLMCompletionClient(model="claude-sonnet", prompt_caching=True)
+
+        list(client.complete_stream(messages, tools=_TOOLS))
+
+        params = mock_completion.call_args.kwargs
+        sent = params["messages"]
+        cache_control = {"type": "ephemeral"}
+        assert sent[0]["content"] == [
+            {"type": "text", "text": "System", "cache_control": cache_control}
+        ]
+        assert sent[1]["content"] == [
+            {"type": "text", "text": "Question", "cache_control": cache_control}
+        ]
+        assert sent[2] == messages[2]
+        assert sent[3]["content"] == [
+            {"type": "text", "text": "Result", "cache_control": cache_control}
+        ]
+        assert params["tools"][0] == _TOOLS[0]
+        assert params["tools"][1]["cache_control"] == cache_control
+        assert messages[0]["content"] == "System"
+        assert "cache_control" not in _TOOLS[1]
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.responses")
+    def test_responses_sends_stable_prompt_cache_key(
+        self,
+        mock_responses: MagicMock,
+    ) -> None:
+        mock_responses.return_value = []
+        client = LiteLLMResponsesClient(model="gpt-5.4-nano", prompt_caching=True)
+        system: Message = {"role": "system", "content": "System"}
+
+        list(client.complete_stream([system, {"role": "user", "content": "A"}]))
+        list(client.complete_stream([system, {"role": "user", "content": "B"}]))
+        list(client.complete_stream([{"role": "system", "content": "Other"}]))
+
+        keys = [call.kwargs["prompt_cache_key"] for call in mock_responses.mock_calls]
+        assert keys[0] == keys[1]
+        assert keys[0] != keys[2]
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.log_event")
+    @patch("simple_agent_poc.adapters.llm.litellm_client.completion")
+    def test_completion_reports_cached_tokens(
+        self,
+        mock_completion: MagicMock,
+        mock_log_event: MagicMock,
+    ) -> None:
+        usage_mock = MagicMock()
+        usage_mock.prompt_tokens = 200
+        usage_mock.completion_tokens = 5
+        usage_mock.total_tokens = 205
+        usage_mock.prompt_tokens_details.cached_tokens = 150
+        mock_completion.return_value = [_usage_chunk(usage_mock)]
+
+        client = LiteLLMCompletionClient(model="gpt-4", prompt_caching=True)
+        result = list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert result[-1]["usage"] == {
+            "prompt_tokens": 200,
+            "completion_tokens": 5,
+            "total_tokens": 205,
+            "cached_tokens": 150,
+        }
+        end_fields = next(
+            call.kwargs
+            for call in mock_log_event.call_args_list
+            if call.args[0] == "llm.stream.end"
+        )
+        assert end_fields["cached_tokens"] == 150
+        assert end_fields["cache_hit_ratio"] == 0.75
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.completion")
+    def test_completion_reads_anthropic_cache_read_tokens(
+        self,
+        mock_completion: MagicMock,
+    ) -> None:
+        usage_mock = MagicMock()
+        usage_mock.prompt_tokens = 100
+        usage_mock.completion_tokens = 5
+        usage_mock.total_tokens = 105
+        usage_mock.prompt_tokens_details = None
+        usage_mock.cache_read_input_tokens = 80
+        mock_completion.return_value = [_usage_chunk(usage_mock)]
+
+        client = LiteLLMCompletionClient(model="claude-sonnet")
+        result = list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert result[-1]["usage"]["cached_tokens"] == 80
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.responses")
+    def test_responses_reports_cached_tokens(
+        self,
+        mock_responses: MagicMock,
+    ) -> None:
+        usage_mock = MagicMock()
+        usage_mock.input_tokens = 100
+        usage_mock.output_tokens = 5
+        usage_mock.total_tokens = 105
+        usage_mock.input_tokens_details.cached_tokens = 64
+        usage_event = MagicMock()
+        del usage_event.delta
+        usage_event.response.usage = usage_mock
+        mock_responses.return_value = [usage_event]
+
+        client = LiteLLMResponsesClient(model="gpt-5.4-nano")
+        result = list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert result[-1]["usage"]["cached_tokens"] == 64
+
+
+def _content_chunk(content: str) -> MagicMock:
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = content
+    chunk.usage = None
+    return chunk
+
+
+def _rate_limit_error(retry_after: str | None = None) -> LiteLLMRateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    return LiteLLMRateLimitError(
+        "Rate limit exceeded",
+        llm_provider="openai",
+        model="gpt-4",
+        response=httpx.Response(
+            429,
+            headers=headers,
+            request=httpx.Request("POST", "https://llm.invalid"),
+        ),
+    )
+
+
+class _FakeCompletion:
+    """Stand-in for ``litellm.completion`` that fails per model as scripted."""
+
+    def __init__(self, failures: dict[str, list[Exception]]) -> None:
+        self._failures = failures
+        self.models: list[str] = []
+
+    def __call__(self, **params: object) -> list[MagicMock]:
+        model = str(params["model"])
+        self.models.append(model)
+        failures = self._failures.get(model, [])
+        if failures:
+            raise failures.pop(0)
+        return [_content_chunk(f"from {model}")]
+
+
+_NO_DELAY = RetryPolicy(max_attempts=3, base_delay_seconds=0.0)
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy delays and Retry-After parsing."""
+
+    def test_backoff_is_exponential_with_jitter_and_capped(self) -> None:
+        policy = RetryPolicy(
+            max_attempts=10, base_delay_seconds=1.0, max_delay_seconds=5.0
+        )
+        rng = random.Random(0)
+
+        for attempt, cap in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0)):
+            delay = policy.delay_seconds(attempt, rng=rng)
+            assert delay is not None
+            assert 0 <= delay <= cap
+
+    def test_stops_after_max_attempts(self) -> None:
+        assert RetryPolicy(max_attempts=2).delay_seconds(2) is None
+
+    def test_retry_after_replaces_backoff_unless_too_long(self) -> None:
+        policy = RetryPolicy(max_delay_seconds=8.0)
+
+        assert policy.delay_seconds(1, retry_after=3.0) == 3.0
+        assert policy.delay_seconds(1, retry_after=30.0) is None
+
+    def test_reads_retry_after_headers(self) -> None:
+        assert retry_after_seconds(_rate_limit_error("2")) == 2.0
+        assert retry_after_seconds(_rate_limit_error()) is None
+        assert retry_after_seconds(ValueError("boom")) is None
+
+    def test_bootstrap_reads_policy_from_env(self) -> None:
+        assert resolve_llm_retry_policy({}) == RetryPolicy()
+
+        policy = resolve_llm_retry_policy(
+            {
+                "LLM_RETRY_MAX_ATTEMPTS": "5",
+                "LLM_RETRY_BASE_DELAY_SECONDS": "0.25",
+                "LLM_RETRY_MAX_DELAY_SECONDS": "4",
+            }
+        )
+
+        assert policy == RetryPolicy(
+            max_attempts=5, base_delay_seconds=0.25, max_delay_seconds=4.0
+        )
+
+    def test_bootstrap_rejects_invalid_policy(self) -> None:
+        with pytest.raises(ValueError, match="LLM_RETRY_MAX_ATTEMPTS must be positive"):
+            resolve_llm_retry_policy({"LLM_RETRY_MAX_ATTEMPTS": "0"})
+
+
+class TestRetryAndFallback:
+    """Tests for retries and fallback models before the first chunk."""
+
+    def test_retries_transient_error_then_streams(self) -> None:
+        fake = _FakeCompletion({"gpt-4": [_rate_limit_error()]})
+        client = LiteLLMCompletionClient(model="gpt-4", retry_policy=_NO_DELAY)
+
+        with (
+            patch("simple_agent_poc.adapters.llm.litellm_client.completion", fake),
+            patch("simple_agent_poc.adapters.llm.litellm_client.log_event") as log,
+        ):
+            result = list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert result == [{"content_delta": "from gpt-4"}]
+        assert fake.models == ["gpt-4", "gpt-4"]
+        attempts = [
+            call.kwargs for call in log.call_args_list if call.args[0] == "llm.attempt"
+        ]
+        assert [(a["attempt"], a["outcome"]) for a in attempts] == [
+            (1, "retry"),
+            (2, "ok"),
+        ]
+        assert attempts[0]["error_type"] == "RateLimitError"
+
+    def test_waits_for_retry_after(self) -> None:
+        fake = _FakeCompletion({"gpt-4": [_rate_limit_error("2")]})
+        client = LiteLLMCompletionClient(model="gpt-4", retry_policy=_NO_DELAY)
+
+        with (
+            patch("simple_agent_poc.adapters.llm.litellm_client.completion", fake),
+            patch("simple_agent_poc.adapters.llm.litellm_client.time.sleep") as sleep,
+        ):
+            list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        sleep.assert_called_once_with(2.0)
+
+    def test_falls_back_after_exhausting_retries(self) -> None:
+        fake = _FakeCompletion(
+            {"gpt-4": [_rate_limit_error(), _rate_limit_error(), _rate_limit_error()]}
+        )
+        client = LiteLLMCompletionClient(
+            model="gpt-4",
+            fallback_models=["gpt-4-mini"],
+            retry_policy=_NO_DELAY,
+        )
+
+        with (
+            patch("simple_agent_poc.adapters.llm.litellm_client.completion", fake),
+            patch("simple_agent_poc.adapters.llm.litellm_client.log_event") as log,
+        ):
+            result = list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert result == [{"content_delta": "from gpt-4-mini"}]
+        assert fake.models == ["gpt-4", "gpt-4", "gpt-4", "gpt-4-mini"]
+        end_fields = next(
+            call.kwargs
+            for call in log.call_args_list
+            if call.args[0] == "llm.stream.end"
+        )
+        assert end_fields["model"] == "gpt-4-mini"
+
+    def test_raises_domain_error_when_every_model_fails(self) -> None:
+        server_error = LiteLLMInternalServerError(
+            "Upstream failed", llm_provider="openai", model="gpt-4-mini"
+        )
+        fake = _FakeCompletion(
+            {"gpt-4": [_rate_limit_error()], "gpt-4-mini": [server_error]}
+        )
+        client = LiteLLMCompletionClient(
+            model="gpt-4",
+            fallback_models=["gpt-4-mini"],
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+
+        with (
+            patch("simple_agent_poc.adapters.llm.litellm_client.completion", fake),
+            pytest.raises(LLMError, match="Upstream failed"),
+        ):
+            list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert fake.models == ["gpt-4", "gpt-4-mini"]
+
+    def test_does_not_retry_or_fall_back_on_authentication_error(self) -> None:
+        auth_error = LiteLLMAuthError(
+            "Invalid API key", llm_provider="openai", model="gpt-4"
+        )
+        fake = _FakeCompletion({"gpt-4": [auth_error]})
+        client = LiteLLMCompletionClient(
+            model="gpt-4",
+            fallback_models=["gpt-4-mini"],
+            retry_policy=_NO_DELAY,
+        )
+
+        with (
+            patch("simple_agent_poc.adapters.llm.litellm_client.completion", fake),
+            pytest.raises(AuthenticationError),
+        ):
+            list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        assert fake.models == ["gpt-4"]
+
+    def test_does_not_retry_after_first_chunk(self) -> None:
+        def broken_stream():
+            yield _content_chunk("partial")
+            raise _rate_limit_error()
+
+        mock_completion = MagicMock(return_value=broken_stream())
+        client = LiteLLMCompletionClient(model="gpt-4", retry_policy=_NO_DELAY)
+        stream = client.complete_stream([{"role": "user", "content": "Hi"}])
+
+        with (
+            patch(
+                "simple_agent_poc.adapters.llm.litellm_client.completion",
+                mock_completion,
+            ),
+            pytest.raises(LiteLLMRateLimitError),
+        ):
+            assert next(stream) == {"content_delta": "partial"}
+            next(stream)
+
+        mock_completion.assert_called_once()
+
+    def test_async_stream_retries_and_falls_back(self) -> None:
+        calls: list[str] = []
+
+        async def fake_aresponses(**params: object):
+            calls.append(str(params["model"]))
+            if params["model"] == "gpt-5.4-mini":
+                raise _rate_limit_error()
+            event = MagicMock()
+            event.delta = "Hello"
+            del event.response
+            return _async_iter([event])
+
+        client = LiteLLMResponsesClient(
+            model="gpt-5.4-mini",
+            fallback_models=["gpt-5.4-nano"],
+            retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0.0),
+        )
+
+        with patch(
+            "simple_agent_poc.adapters.llm.litellm_client.aresponses",
+            fake_aresponses,
+        ):
+            result = asyncio.run(
+                _collect(client.acomplete_stream([{"role": "user", "content": "Hi"}]))
+            )
+
+        assert result == [{"content_delta": "Hello"}]
+        assert calls == ["gpt-5.4-mini", "gpt-5.4-mini", "gpt-5.4-nano"]
+
+    def test_factory_passes_fallback_models_and_retry_policy(self) -> None:
+        policy = RetryPolicy(max_attempts=5)
+        factory = LiteLLMClientFactory(retry_policy=policy)
+
+        client = factory(
+            AgentDefinition(
+                agent_id="default",
+                model="gpt-4",
+                system_prompt="Prompt",
+                fallback_models=["gpt-4-mini"],
+            )
+        )
+
+        assert isinstance(client, LiteLLMCompletionClient)
+        assert client.fallback_models == ("gpt-4-mini",)
+        assert client.retry_policy is policy
+
+
+class TestStreamTimings:
+    """Tests for the latency fields of llm.stream.end."""
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.log_event")
+    @patch("simple_agent_poc.adapters.llm.litellm_client.completion")
+    def test_reports_ttft_gaps_and_output_rate(
+        self,
+        mock_completion: MagicMock,
+        mock_log_event: MagicMock,
+    ) -> None:
+        usage_mock = MagicMock()
+        usage_mock.prompt_tokens = 10
+        usage_mock.completion_tokens = 5
+        usage_mock.total_tokens = 15
+        usage_mock.prompt_tokens_details = None
+        usage_mock.cache_read_input_tokens = None
+        mock_completion.return_value = [
+            _content_chunk("a"),
+            _content_chunk("b"),
+            _content_chunk("c"),
+            _usage_chunk(usage_mock),
+        ]
+        client = LiteLLMCompletionClient(model="gpt-4")
+
+        with patch(
+            "simple_agent_poc.adapters.llm.litellm_client.time.perf_counter",
+            side_effect=[0.0, 0.2, 0.25, 0.45, 1.0],
+        ):
+            list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+        end_fields = next(
+            call.kwargs
+            for call in mock_log_event.call_args_list
+            if call.args[0] == "llm.stream.end"
+        )
+        assert end_fields["elapsed_ms"] == 1000
+        assert end_fields["ttft_ms"] == 200
+        assert end_fields["chunk_count"] == 3
+        assert end_fields["max_gap_ms"] == 200
+        assert end_fields["p95_gap_ms"] == 200
+        assert end_fields["output_tokens_per_second"] == 20.0
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.log_event")
+    @patch("simple_agent_poc.adapters.llm.litellm_client.aresponses")
+    def test_stream_without_output_has_no_ttft(
+        self,
+        mock_aresponses: AsyncMock,
+        mock_log_event: MagicMock,
+    ) -> None:
+        mock_aresponses.return_value = _async_iter([])
+        client = LiteLLMResponsesClient(model="gpt-5.4-nano")
+
+        asyncio.run(_collect(client.acomplete_stream([])))
+
+        end_fields = next(
+            call.kwargs
+            for call in mock_log_event.call_args_list
+            if call.args[0] == "llm.stream.end"
+        )
+        assert end_fields["ttft_ms"] is None
+        assert end_fields["chunk_count"] == 0
+        assert end_fields["output_tokens_per_second"] is None
+
+
+class TestLiteLLMAsyncStream:
+    """Tests for acomplete_stream of the LiteLLM clients."""
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.acompletion")
+    def test_completion_acomplete_stream_yields_content_deltas(
+        self,
+        mock_acompletion: AsyncMock,
+    ) -> None:
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = "Hello"
+        chunk.usage = None
+        mock_acompletion.return_value = _async_iter([chunk])
+
+        client = LiteLLMCompletionClient(model="gpt-4", temperature=0.2)
+        messages: list[Message] = [{"role": "user", "content": "Hi"}]
+
+        result = asyncio.run(_collect(client.acomplete_stream(messages)))
+
+        assert result == [{"content_delta": "Hello"}]
+        mock_acompletion.assert_awaited_once_with(
+            model="gpt-4",
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            temperature=0.2,
+        )
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.acompletion")
+    def test_completion_acomplete_stream_rate_limit_error(
+        self,
+        mock_acompletion: AsyncMock,
+    ) -> None:
+        mock_acompletion.side_effect = LiteLLMRateLimitError(
+            "Rate limit exceeded",
+            llm_provider="openai",
+            model="gpt-4",
+        )
+
+        client = LiteLLMCompletionClient(model="gpt-4")
+
+        with pytest.raises(RateLimitError):
+            asyncio.run(_collect(client.acomplete_stream([])))
+
+    @patch("simple_agent_poc.adapters.llm.litellm_client.aresponses")
+    def test_responses_acomplete_stream_yields_content_deltas(
+        self,
+        mock_aresponses: AsyncMock,
+    ) -> None:
+        event = MagicMock()
+        event.delta = "Hello"
+        del event.response
+        mock_aresponses.return_value = _async_iter([event])
+
+        client = LiteLLMResponsesClient(model="gpt-5.4-nano")
+        messages: list[Message] = [{"role": "user", "content": "Hi"}]
+
+        result = asyncio.run(_collect(client.acomplete_stream(messages)))
+
+        assert result == [{"content_delta": "Hello"}]
+        mock_aresponses.assert_awaited_once_with(
+            input=messages,
+            model="gpt-5.4-nano",
+            stream=True,
+        )
@@ -0,0 +1,187 @@
+"""Tests for the shared keep-alive HTTP pool used by LiteLLM."""
+
+import asyncio
+from collections.abc import Iterator
+
+import httpx
+import litellm
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fake_openai_server import FakeOpenAIServer
+from simple_agent_poc.adapters.http.api import create_app
+from simple_agent_poc.adapters.llm import http_pool
+from simple_agent_poc.adapters.llm.http_pool import (
+    HTTPPoolLimits,
+    _DrainingStream,
+    aclose_shared_http_pool,
+    install_shared_http_pool,
+)
+from simple_agent_poc.adapters.llm.litellm_client import LiteLLMCompletionClient
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.entrypoints.bootstrap import resolve_llm_http_pool_limits
+
+
+def _unused_use_case_factory() -> RunAgentUseCase:
+    raise AssertionError("no chat request is sent")
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def no_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(litellm, "client_session", None)
+    monkeypatch.setattr(litellm, "aclient_session", None)
+    monkeypatch.setattr(http_pool, "_installed", None)
+    yield
+    asyncio.run(aclose_shared_http_pool())
+
+
+@pytest.fixture
+def fake_server(
+    no_pool: None, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[FakeOpenAIServer]:
+    with FakeOpenAIServer() as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        yield server
+
+
+def _collect(client: LiteLLMCompletionClient) -> list:
+    return list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+
+
+class TestDrainingStream:
+    """Tests for draining finished SSE bodies on close."""
+
+    def test_drains_remaining_bytes_after_done(self) -> None:
+        inner = _RecordingStream([b'data: {"x": 1}\n\n', b"data: [DONE]\n\n", b""])
+        stream = _DrainingStream(inner)
+
+        for chunk in stream:
+            if b"[DONE]" in chunk:
+                break
+        stream.close()
+
+        assert inner.read == 3
+        assert inner.closed is True
+
+    def test_does_not_drain_abandoned_stream(self) -> None:
+        inner = _RecordingStream([b'data: {"x": 1}\n\n', b'data: {"x": 2}\n\n'])
+        stream = _DrainingStream(inner)
+
+        for _chunk in stream:
+            break
+        stream.close()
+
+        assert inner.read == 1
+        assert inner.closed is True
+
+
+class TestSharedHTTPPool:
+    """Tests for connection reuse against a local fake server."""
+
+    def test_sequential_streams_reuse_one_connection(
+        self, fake_server: FakeOpenAIServer
+    ) -> None:
+        install_shared_http_pool()
+        client = LiteLLMCompletionClient(model="openai/gpt-4.1-mini")
+
+        results = [_collect(client) for _ in range(3)]
+
+        assert results[0][0] == {"content_delta": "Hello"}
+        assert fake_server.connections == 1
+
+    def test_async_streams_reuse_one_connection(
+        self, fake_server: FakeOpenAIServer
+    ) -> None:
+        install_shared_http_pool(HTTPPoolLimits(max_keepalive_connections=1))
+        client = LiteLLMCompletionClient(model="openai/gpt-4.1-mini")
+
+        async def run() -> None:
+            for _ in range(3):
+                async for _chunk in client.acomplete_stream(
+                    [{"role": "user", "content": "Hi"}]
+                ):
+                    pass
+            # The async pool's connections belong to this event loop.
+            await aclose_shared_http_pool()
+
+        asyncio.run(run())
+
+        assert fake_server.connections == 1
+
+
+@pytest.mark.usefixtures("no_pool")
+class TestSharedHTTPPoolLifecycle:
+    """Tests for installing the shared pool once and closing it."""
+
+    def test_install_keeps_the_installed_pool(self) -> None:
+        install_shared_http_pool()
+        client, aclient = litellm.client_session, litellm.aclient_session
+
+        install_shared_http_pool(HTTPPoolLimits(max_connections=1))
+
+        assert litellm.client_session is client
+        assert litellm.aclient_session is aclient
+
+    def test_close_closes_and_uninstalls_the_pool(self) -> None:
+        install_shared_http_pool()
+        client, aclient = litellm.client_session, litellm.aclient_session
+        assert client is not None and aclient is not None
+
+        asyncio.run(aclose_shared_http_pool())
+
+        assert client.is_closed and aclient.is_closed
+        assert litellm.client_session is None
+        assert litellm.aclient_session is None
+        install_shared_http_pool()
+        assert litellm.client_session is not None
+        assert litellm.client_session is not client
+
+    def test_api_shutdown_closes_the_pool(self) -> None:
+        install_shared_http_pool()
+        aclient = litellm.aclient_session
+        assert aclient is not None
+        app = create_app(use_case_factory=_unused_use_case_factory)
+
+        with TestClient(app):
+            assert not aclient.is_closed
+
+        assert aclient.is_closed
+        assert litellm.aclient_session is None
+
+
+class TestResolveHTTPPoolLimits:
+    """Tests for bootstrap configuration of the pool."""
+
+    def test_reads_limits_from_env(self) -> None:
+        assert resolve_llm_http_pool_limits({}) == HTTPPoolLimits()
+        assert resolve_llm_http_pool_limits(
+            {
+                "LLM_HTTP_MAX_CONNECTIONS": "10",
+                "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS": "5",
+                "LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS": "15",
+            }
+        ) == HTTPPoolLimits(
+            max_connections=10,
+            max_keepalive_connections=5,
+            keepalive_expiry_seconds=15.0,
+        )
+
+    def test_rejects_invalid_limits(self) -> None:
+        with pytest.raises(ValueError, match="LLM_HTTP_MAX_CONNECTIONS"):
+            resolve_llm_http_pool_limits({"LLM_HTTP_MAX_CONNECTIONS": "many"})
@@ -0,0 +1,262 @@
+"""Tests for the client-side LLM rate limiter."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import simple_agent_poc.adapters.llm.rate_limit as rate_limit_module
+from simple_agent_poc.adapters.llm.litellm_client import LiteLLMCompletionClient
+from simple_agent_poc.adapters.llm.rate_limit import RateLimiter, RateLimits
+from simple_agent_poc.core.types import RateLimitError
+from simple_agent_poc.entrypoints.bootstrap import resolve_llm_rate_limits
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    fake = _FakeClock()
+    monkeypatch.setattr(rate_limit_module.time, "sleep", fake.sleep)
+    return fake
+
+
+@pytest.fixture
+def logged_events(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        rate_limit_module,
+        "log_event",
+        lambda event, **fields: events.append((event, fields)),
+    )
+    return events
+
+
+class TestRequestAndTokenBudgets:
+    """Tests for the requests-per-minute and tokens-per-minute buckets."""
+
+    def test_disabled_limiter_never_waits(self, clock: _FakeClock) -> None:
+        limiter = RateLimiter(clock=clock)
+
+        for _ in range(100):
+            limiter.acquire("gpt-4").release()
+
+        assert clock.sleeps == []
+
+    def test_requests_beyond_burst_queue_in_arrival_order(
+        self, clock: _FakeClock
+    ) -> None:
+        limiter = RateLimiter(RateLimits(requests_per_minute=2), clock=clock)
+
+        for _ in range(4):
+            limiter.acquire("gpt-4").release()
+
+        assert clock.sleeps == [30.0, 30.0]
+
+    def test_limits_are_tracked_per_model(self, clock: _FakeClock) -> None:
+        limiter = RateLimiter(RateLimits(requests_per_minute=1), clock=clock)
+
+        limiter.acquire("gpt-4").release()
+        limiter.acquire("gpt-4-mini").release()
+
+        assert clock.sleeps == []
+
+    def test_token_budget_is_corrected_with_actual_usage(
+        self, clock: _FakeClock
+    ) -> None:
+        limiter = RateLimiter(RateLimits(tokens_per_minute=600), clock=clock)
+
+        limiter.acquire("gpt-4", tokens=100).release(used_tokens=700)
+        limiter.acquire("gpt-4", tokens=100).release()
+
+        assert clock.sleeps == [pytest.approx(20.0)]
+
+    def test_rejects_when_wait_exceeds_bound(
+        self, clock: _FakeClock, logged_events: list[tuple[str, dict]]
+    ) -> None:
+        limiter = RateLimiter(
+            RateLimits(requests_per_minute=1, max_wait_seconds=10.0), clock=clock
+        )
+        limiter.acquire("gpt-4").release()
+
+        with pytest.raises(RateLimitError, match="could not be met"):
+            limiter.acquire("gpt-4")
+
+        rejected = [f for e, f in logged_events if e == "llm.rate_limit.rejected"]
+        assert rejected == [
+            {
+                "model": "gpt-4",
+                "reason": "rate",
+                "queue_depth": 0,
+                "max_wait_seconds": 10.0,
+            }
+        ]
+
+
+class TestConcurrencyGovernor:
+    """Tests for max_concurrent_streams."""
+
+    def test_waiting_thread_gets_slot_when_stream_ends(
+        self, logged_events: list[tuple[str, dict]]
+    ) -> None:
+        limiter = RateLimiter(RateLimits(max_concurrent_streams=1))
+        first = limiter.acquire("gpt-4")
+        acquired = threading.Event()
+
+        def second() -> None:
+            limiter.acquire("gpt-4").release()
+            acquired.set()
+
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not acquired.wait(0.05)
+        first.release()
+        thread.join(timeout=5)
+
+        assert acquired.is_set()
+        waits = [f for e, f in logged_events if e == "llm.rate_limit.acquired"]
+        assert waits[1]["wait_ms"] >= 40
+
+    def test_rejects_after_bounded_wait(self) -> None:
+        limiter = RateLimiter(
+            RateLimits(max_concurrent_streams=1, max_wait_seconds=0.01)
+        )
+        permit = limiter.acquire("gpt-4")
+
+        with pytest.raises(RateLimitError, match="max_concurrent_streams"):
+            limiter.acquire("gpt-4")
+
+        permit.release()
+        limiter.acquire("gpt-4").release()
+
+    def test_async_waiters_are_served_in_arrival_order(
+        self, logged_events: list[tuple[str, dict]]
+    ) -> None:
+        limiter = RateLimiter(RateLimits(max_concurrent_streams=1))
+        order: list[int] = []
+
+        async def use(idx: int) -> None:
+            permit = await limiter.aacquire("gpt-4")
+            order.append(idx)
+            await asyncio.sleep(0.001)
+            permit.release()
+
+        async def main() -> None:
+            await asyncio.gather(*(use(idx) for idx in range(5)))
+
+        asyncio.run(main())
+
+        assert order == [0, 1, 2, 3, 4]
+        depths = [
+            f["queue_depth"] for e, f in logged_events if e == "llm.rate_limit.acquired"
+        ]
+        assert depths == [0, 0, 1, 2, 3]
+
+    def test_client_holds_slot_until_stream_ends(self) -> None:
+        limiter = RateLimiter(
+            RateLimits(max_concurrent_streams=1, max_wait_seconds=0.01)
+        )
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = "Hello"
+        chunk.usage = None
+        client = LiteLLMCompletionClient(model="gpt-4", rate_limiter=limiter)
+
+        with patch(
+            "simple_agent_poc.adapters.llm.litellm_client.completion",
+            side_effect=lambda **_params: iter([chunk, chunk]),
+        ):
+            stream = client.complete_stream([{"role": "user", "content": "Hi"}])
+            assert next(stream) == {"content_delta": "Hello"}
+            with pytest.raises(RateLimitError):
+                list(client.complete_stream([{"role": "user", "content": "Hi"}]))
+            assert list(stream) == [{"content_delta": "Hello"}]
+
+            assert list(
+                client.complete_stream([{"role": "user", "content": "Hi"}])
+            ) == [{"content_delta": "Hello"}, {"content_delta": "Hello"}]
+
+    def test_cancelled_request_frees_its_slot(self) -> None:
+        limiter = RateLimiter(
+            RateLimits(max_concurrent_streams=1, max_wait_seconds=0.01)
+        )
+        client = LiteLLMCompletionClient(model="gpt-4", rate_limiter=limiter)
+        requested = asyncio.Event()
+        closed: list[bool] = []
+
+        class _Response:
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                requested.set()
+                await asyncio.Event().wait()
+
+            async def aclose(self) -> None:
+                closed.append(True)
+
+        async def acompletion(**_params):
+            return _Response()
+
+        async def consume() -> None:
+            async for _ in client.acomplete_stream([{"role": "user", "content": "Hi"}]):
+                pass
+
+        async def main() -> None:
+            task = asyncio.create_task(consume())
+            await requested.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            (await limiter.aacquire("gpt-4")).release()
+
+        with patch(
+            "simple_agent_poc.adapters.llm.litellm_client.acompletion",
+            side_effect=acompletion,
+        ):
+            asyncio.run(main())
+
+        assert closed == [True]
+
+
+class TestResolveRateLimits:
+    """Tests for bootstrap configuration of the limiter."""
+
+    def test_defaults_to_no_limits(self) -> None:
+        limits = resolve_llm_rate_limits({})
+
+        assert limits == RateLimits()
+        assert limits.enabled is False
+
+    def test_reads_limits_from_env(self) -> None:
+        limits = resolve_llm_rate_limits(
+            {
+                "LLM_RATE_LIMIT_RPM": "500",
+                "LLM_RATE_LIMIT_TPM": "200000",
+                "LLM_MAX_CONCURRENT_STREAMS": "8",
+                "LLM_RATE_LIMIT_MAX_WAIT_SECONDS": "5",
+            }
+        )
+
+        assert limits == RateLimits(
+            requests_per_minute=500,
+            tokens_per_minute=200000,
+            max_concurrent_streams=8,
+            max_wait_seconds=5.0,
+        )
+
+    def test_rejects_invalid_limits(self) -> None:
+        with pytest.raises(ValueError, match="LLM_RATE_LIMIT_RPM must be positive"):
+            resolve_llm_rate_limits({"LLM_RATE_LIMIT_RPM": "0"})
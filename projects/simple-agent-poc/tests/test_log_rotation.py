@@ -0,0 +1,172 @@
+"""Tests for JSONL log rotation and the rotated-log reader."""
+
+import gzip
+import json
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+import simple_agent_poc.observability as obs
+from simple_agent_poc.observability import rotation
+from simple_agent_poc.observability.reader import iter_events, log_files, main
+from simple_agent_poc.observability.rotation import (
+    RotatingFile,
+    RotationPolicy,
+    rotated_files,
+)
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _line(idx: int, event: str = "test.event", run_id: str = "r1") -> str:
+    return json.dumps({"event": event, "idx": idx, "run_id": run_id}) + "\n"
+
+
+class TestRotatingFile:
+    """Tests for size- and time-based rotation."""
+
+    def test_rotates_by_size_and_keeps_backup_count(self, tmp_path: Path) -> None:
+        path = tmp_path / "agent-debug.jsonl"
+        log = RotatingFile(
+            path,
+            RotationPolicy(max_bytes=100, daily=False, backup_count=2),
+        )
+
+        for idx in range(10):
+            log.write(_line(idx))
+        log.close()
+
+        rotated = rotated_files(path)
+        assert len(rotated) == 2
+        assert all(p.name.endswith(".jsonl.gz") for p in rotated)
+        assert not list(tmp_path.glob("*.tmp"))
+        assert path.stat().st_size <= 100
+        indexes = [cast(int, e["idx"]) for e in iter_events(path)]
+        assert indexes == sorted(indexes)
+        assert indexes[-1] == 9
+
+    def test_rotates_at_utc_midnight(self, tmp_path: Path) -> None:
+        path = tmp_path / "agent-debug.jsonl"
+        clock = _Clock(1_779_148_800.0 - 10)  # 2026-05-18T23:59:50Z
+        log = RotatingFile(
+            path,
+            RotationPolicy(max_bytes=0, compression="none"),
+            clock=clock,
+        )
+
+        log.write(_line(0))
+        clock.now += 5
+        log.write(_line(1))
+        clock.now += 10
+        log.write(_line(2))
+        log.close()
+
+        rotated = rotated_files(path)
+        assert [p.name for p in rotated] == ["agent-debug.20260519T000005000000.jsonl"]
+        assert [e["idx"] for e in iter_events(rotated[0])] == [0, 1]
+        assert [e["idx"] for e in iter_events(path)] == [0, 1, 2]
+
+    def test_compresses_with_zstd(self, tmp_path: Path) -> None:
+        pytest.importorskip("compression.zstd")
+        path = tmp_path / "agent-debug.jsonl"
+        log = RotatingFile(
+            path, RotationPolicy(max_bytes=10, daily=False, compression="zstd")
+        )
+
+        log.write(_line(0))
+        log.write(_line(1))
+        log.close()
+
+        assert [p.suffix for p in rotated_files(path)] == [".zst"]
+        assert [e["idx"] for e in iter_events(path)] == [0, 1]
+
+    def test_rejects_unknown_compression(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unknown log compression"):
+            RotatingFile(tmp_path / "a.jsonl", RotationPolicy(compression="lz4"))
+
+
+class TestReader:
+    """Tests for reading events across rotated files."""
+
+    def test_streams_plain_and_compressed_files_in_order(self, tmp_path: Path) -> None:
+        path = tmp_path / "agent-debug.jsonl"
+        with gzip.open(
+            tmp_path / "agent-debug.20260517T000000000000.jsonl.gz", "wt"
+        ) as f:
+            f.write(_line(0) + _line(1, event="llm.stream.end"))
+        (tmp_path / "agent-debug.20260518T000000000000.jsonl").write_text(
+            _line(2, run_id="r2") + '{"event": "trunc'
+        )
+        path.write_text(_line(3, event="llm.stream.start") + "\n")
+
+        assert [p.name for p in log_files(path)] == [
+            "agent-debug.20260517T000000000000.jsonl.gz",
+            "agent-debug.20260518T000000000000.jsonl",
+            "agent-debug.jsonl",
+        ]
+        assert [e["idx"] for e in iter_events(path)] == [0, 1, 2, 3]
+        assert [e["idx"] for e in iter_events(path, events=["llm."])] == [1, 3]
+        assert [e["idx"] for e in iter_events(path, run_id="r2")] == [2]
+
+    def test_prefers_plain_file_while_compression_finishes(
+        self, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "agent-debug.jsonl"
+        rotated = tmp_path / "agent-debug.20260518T000000000000.jsonl"
+        rotated.write_text(_line(0))
+        with gzip.open(rotated.with_name(rotated.name + ".gz"), "wt") as f:
+            f.write(_line(0))
+
+        assert rotated_files(path) == [rotated]
+        assert [e["idx"] for e in iter_events(path)] == [0]
+
+    def test_main_prints_filtered_events(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        path = tmp_path / "agent-debug.jsonl"
+        path.write_text(_line(0) + _line(1, event="tool.call.end"))
+
+        main([str(path), "--event", "tool.call"])
+
+        assert [
+            json.loads(line)["idx"] for line in capsys.readouterr().out.splitlines()
+        ] == [1]
+
+
+def test_rotation_policy_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_MAX_BYTES", "1000")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ROTATE_DAILY", "false")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_BACKUP_COUNT", "3")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_COMPRESSION", "none")
+
+    assert obs._rotation_policy_from_env() == RotationPolicy(
+        max_bytes=1000, daily=False, backup_count=3, compression="none"
+    )
+
+
+def test_failed_compression_is_logged_and_leaves_no_partial_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, jsonl_log: Path
+) -> None:
+    source = tmp_path / "rotated" / "agent-debug.20260518T000000000000.jsonl"
+    source.parent.mkdir()
+    source.write_text(_line(0))
+
+    def broken_copy(src: object, dst: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(rotation.shutil, "copyfileobj", broken_copy)
+    rotation._compress(source, "gzip")
+    obs.shutdown_logging()
+
+    assert [p.name for p in source.parent.iterdir()] == [source.name]
+    (event,) = iter_events(jsonl_log, events=["log.compress"])
+    assert event["event"] == "log.compress.error"
+    assert event["file"] == source.name
+    assert "disk full" in json.dumps(event["error"])
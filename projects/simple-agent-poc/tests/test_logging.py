@@ -1,8 +1,12 @@
 """Tests for structured JSONL debug logging."""
 
+import hashlib
 import json
 import logging
+import queue
 import tempfile
+import threading
+import zlib
 from collections.abc import Generator
 from pathlib import Path
 from typing import cast
@@ -25,6 +29,7 @@ from simple_agent_poc.core.types import (
     ToolDefinition,
     Usage,
 )
+from simple_agent_poc.observability.writer import BackgroundWriter, QueueingHandler
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -32,9 +37,15 @@ from simple_agent_poc.core.types import (
 
 
 def _reset_observability_state() -> None:
+    obs.shutdown_logging()
     obs._enabled = True
     obs._payload_policy = "summary"
     obs._max_field_chars = 500
+    obs._hash_mode = "sha256"
+    obs._sample_rate = 1.0
+    obs._level_overrides = ()
+    obs._event_levels.clear()
+    obs._max_event_level = logging.INFO
     obs._initialized = False
     obs._logger.handlers.clear()
     obs._logger.setLevel(logging.NOTSET)
@@ -45,6 +56,7 @@ def _reset_observability_state() -> None:
 
 
 def _read_jsonl(path: Path) -> list[dict]:
+    obs.flush_logging()
     events: list[dict] = []
     with open(path, encoding="utf-8") as f:
         for line in f:
@@ -72,7 +84,7 @@ def test_summarize_payload_none():
 
 def test_summarize_payload_summary_str(monkeypatch, temp_log_path):
     _reset_observability_state()
-    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "false")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
     monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
     monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOADS", "summary")
     monkeypatch.setenv("SIMPLE_AGENT_LOG_MAX_FIELD_CHARS", "500")
@@ -89,7 +101,7 @@ def test_summarize_payload_summary_str(monkeypatch, temp_log_path):
 
 def test_summarize_payload_metadata_str(monkeypatch, temp_log_path):
     _reset_observability_state()
-    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "false")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
     monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
     monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOADS", "metadata")
     obs.configure_logging()
@@ -105,7 +117,7 @@ def test_summarize_payload_metadata_str(monkeypatch, temp_log_path):
 
 def test_summarize_payload_full_str(monkeypatch, temp_log_path):
     _reset_observability_state()
-    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "false")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
     monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
     monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOADS", "full")
     obs.configure_logging()
@@ -119,7 +131,7 @@ def test_summarize_payload_full_str(monkeypatch, temp_log_path):
 
 def test_summarize_payload_summary_dict(monkeypatch, temp_log_path):
     _reset_observability_state()
-    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "false")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
     monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
     monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOADS", "summary")
     monkeypatch.setenv("SIMPLE_AGENT_LOG_MAX_FIELD_CHARS", "10")
@@ -133,6 +145,140 @@ def test_summarize_payload_summary_dict(monkeypatch, temp_log_path):
     assert len(cast(str, result["preview"])) == 10
 
 
+def test_summarize_payload_skipped_when_logging_disabled(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "false")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    obs.configure_logging()
+
+    assert obs.summarize_payload("x" * 10_000) == {"type": "str"}
+    assert obs.summarize_payload({"a": 1}) == {"type": "dict"}
+
+
+def test_summarize_payload_skipped_below_logger_level(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_LEVEL", "WARNING")
+    obs.configure_logging()
+
+    assert obs.summarize_payload([1, 2, 3]) == {"type": "list"}
+
+
+@pytest.mark.parametrize(
+    ("mode", "field", "expected"),
+    [
+        ("sha256", "sha256", hashlib.sha256(b"hello").hexdigest()),
+        ("fast", "crc32", f"{zlib.crc32(b'hello'):08x}"),
+        ("sampled", "sha256_sampled", hashlib.sha256(b"hello").hexdigest()),
+    ],
+)
+def test_summarize_payload_hash_modes(
+    monkeypatch, temp_log_path, mode, field, expected
+):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOAD_HASH", mode)
+    obs.configure_logging()
+
+    obs.log_event("test.payload", payload=obs.summarize_payload("hello"))
+
+    (event,) = _read_jsonl(temp_log_path)
+    assert event["payload"][field] == expected
+    assert "sha256" not in event["payload"] or field == "sha256"
+
+
+def test_summarize_payload_sampled_hash_sees_head_and_tail(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOAD_HASH", "sampled")
+    obs.configure_logging()
+
+    base = "a" * 1_000_000
+
+    def digest(text: str) -> str:
+        return str(obs.summarize_payload(text)["sha256_sampled"])
+
+    assert digest(base) == digest("a" * 1_000_000)
+    assert digest(base) != digest("b" + base[1:])
+    assert digest(base) != digest(base[:-1] + "b")
+    assert digest(base) != digest(base + "a")
+
+
+def test_summarize_payload_none_mode_stops_at_preview(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOAD_HASH", "none")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_MAX_FIELD_CHARS", "20")
+    obs.configure_logging()
+
+    data = [{"id": idx, "name": f"item {idx}"} for idx in range(1000)]
+    result = obs.summarize_payload(data)
+    assert result == {
+        "type": "list",
+        "truncated": True,
+        "items": 1000,
+        "preview": json.dumps(data, ensure_ascii=False)[:20],
+    }
+
+    small = obs.summarize_payload({"a": 1})
+    assert small == {"type": "dict", "length": 8, "preview": '{"a": 1}'}
+
+
+def test_summarize_payload_hash_is_computed_when_formatted(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    obs.configure_logging()
+    hashed: list[str] = []
+    monkeypatch.setitem(
+        obs._HASHERS, "sha256", lambda raw: hashed.append(raw) or "deadbeef"
+    )
+
+    result = obs.summarize_payload("hello")
+    assert hashed == []
+
+    obs.log_event("test.payload", payload=result)
+    (event,) = _read_jsonl(temp_log_path)
+    assert event["payload"]["sha256"] == "deadbeef"
+    assert hashed == ["hello"]
+
+
+def test_summarize_payload_none_hash_serialises_only_the_preview(
+    monkeypatch, temp_log_path
+):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_PAYLOAD_HASH", "none")
+    obs.configure_logging()
+
+    class Unreachable:
+        def __str__(self) -> str:
+            raise AssertionError("serialised past the preview")
+
+    def no_dumps(*args, **kwargs):
+        raise AssertionError("json.dumps called on the full payload")
+
+    def no_hash(raw):
+        raise AssertionError("hashed the full payload")
+
+    monkeypatch.setattr(obs.json, "dumps", no_dumps)
+    for mode in obs._HASHERS:
+        monkeypatch.setitem(obs._HASHERS, mode, no_hash)
+    rows = [{"id": idx, "body": "x" * 50} for idx in range(5000)]
+
+    result = obs.summarize_payload({"rows": [*rows, Unreachable()]})
+
+    assert result["truncated"] is True
+    assert result["items"] == 1
+    assert "length" not in result
+    assert "sha256" not in result
+
+
 # ---------------------------------------------------------------------------
 # configure_logging
 # ---------------------------------------------------------------------------
@@ -247,6 +393,107 @@ def test_bind_log_context_partial_update(monkeypatch, temp_log_path):
     assert events[1]["session_id"] == "s1"
 
 
+# ---------------------------------------------------------------------------
+# Background writer
+# ---------------------------------------------------------------------------
+
+
+def _record(level: int, event: str = "test.event") -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, event, None, None)
+
+
+def test_queueing_handler_drops_debug_before_other_levels():
+    records: queue.Queue[object] = queue.Queue(maxsize=10)
+    handler = QueueingHandler(records)
+
+    for _ in range(8):
+        handler.emit(_record(logging.INFO))
+    handler.emit(_record(logging.DEBUG))
+    handler.emit(_record(logging.INFO))
+    handler.emit(_record(logging.INFO))
+    handler.emit(_record(logging.WARNING))
+
+    assert records.qsize() == 10
+    assert handler.take_dropped() == {"DEBUG": 1, "WARNING": 1}
+    assert handler.take_dropped() == {}
+
+
+def test_log_event_does_not_wait_for_slow_writes(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_QUEUE_SIZE", "5")
+    release = threading.Event()
+    writing = threading.Event()
+    finished_writes: list[int] = []
+    original_write = BackgroundWriter._write
+
+    def slow_write(self, batch):
+        writing.set()
+        release.wait(5)
+        original_write(self, batch)
+        finished_writes.append(len(batch))
+
+    monkeypatch.setattr(BackgroundWriter, "_write", slow_write)
+    obs.configure_logging()
+
+    try:
+        for idx in range(20):
+            obs.log_event("test.event", idx=idx)
+        # Every call returned while the writer was still held in its first write.
+        assert writing.wait(5)
+        assert finished_writes == []
+    finally:
+        release.set()
+    obs.shutdown_logging()
+
+    events = _read_jsonl(temp_log_path)
+    written = [e for e in events if e["event"] == "test.event"]
+    dropped = next(e for e in events if e["event"] == "log.dropped")
+    assert 5 <= len(written) < 20
+    assert dropped["level"] == "WARNING"
+    assert dropped["dropped_total"] == 20 - len(written)
+
+
+def test_failed_write_is_reported_through_handle_error(monkeypatch, temp_log_path):
+    failed: list[logging.LogRecord] = []
+    writer = BackgroundWriter(
+        temp_log_path,
+        queue_size=5,
+        format_record=lambda record: f"{record.getMessage()}\n",
+        format_dropped=lambda dropped: "",
+    )
+    monkeypatch.setattr(writer.handler, "handleError", failed.append)
+
+    def broken_write(text: str) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(writer._file, "write", broken_write)
+    record = logging.LogRecord(
+        "test", logging.INFO, __file__, 0, "test.event", None, None
+    )
+    writer.handler.handle(record)
+    writer.flush()
+    writer.stop()
+
+    assert failed == [record]
+
+
+def test_shutdown_writes_queued_events(monkeypatch, temp_log_path):
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    obs.configure_logging()
+
+    for idx in range(500):
+        obs.log_event("test.event", idx=idx)
+    obs.shutdown_logging()
+    obs.log_event("test.after_shutdown")
+
+    events = _read_jsonl(temp_log_path)
+    assert [e["idx"] for e in events] == list(range(500))
+
+
 # ---------------------------------------------------------------------------
 # Payload policy env var
 # ---------------------------------------------------------------------------
@@ -272,6 +519,102 @@ def test_max_field_chars_from_env(monkeypatch, temp_log_path):
     assert obs._max_field_chars == 200
 
 
+# ---------------------------------------------------------------------------
+# Event levels and sampling
+# ---------------------------------------------------------------------------
+
+
+def _configure_sampling(monkeypatch, temp_log_path, **env: str) -> None:
+    _reset_observability_state()
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_ENABLED", "true")
+    monkeypatch.setenv("SIMPLE_AGENT_LOG_FILE", str(temp_log_path))
+    for name, value in env.items():
+        monkeypatch.setenv(f"SIMPLE_AGENT_LOG_{name}", value)
+    obs.configure_logging()
+
+
+def test_event_level_overrides(monkeypatch, temp_log_path):
+    _configure_sampling(
+        monkeypatch,
+        temp_log_path,
+        EVENT_LEVELS="react.round.start=DEBUG, llm.stream.*=debug,bad,x=NOPE,"
+        "session.saved=WARNING,tool.call.error=DEBUG",
+    )
+
+    obs.log_event("react.round.start", round=0)
+    obs.log_event("llm.stream.start")
+    obs.log_event("llm.stream.end")
+    obs.log_event("session.saved")
+    obs.log_event("tool.call.error")
+    obs.log_event("tool.call.start")
+
+    events = _read_jsonl(temp_log_path)
+    assert [(e["event"], e["level"]) for e in events] == [
+        ("session.saved", "WARNING"),
+        ("tool.call.error", "INFO"),
+        ("tool.call.start", "INFO"),
+    ]
+
+
+def test_event_level_override_kept_at_debug(monkeypatch, temp_log_path):
+    _configure_sampling(
+        monkeypatch, temp_log_path, LEVEL="DEBUG", EVENT_LEVELS="react.*=DEBUG"
+    )
+
+    obs.log_event("react.round.start", round=0)
+
+    (event,) = _read_jsonl(temp_log_path)
+    assert event["level"] == "DEBUG"
+
+
+def test_payload_summarised_for_events_raised_above_logger_level(
+    monkeypatch, temp_log_path
+):
+    _configure_sampling(
+        monkeypatch, temp_log_path, LEVEL="WARNING", EVENT_LEVELS="x.*=WARNING"
+    )
+
+    assert "preview" in obs.summarize_payload("hello")
+
+
+def test_sampling_keeps_all_or_none_of_a_run(monkeypatch, temp_log_path):
+    _configure_sampling(monkeypatch, temp_log_path, SAMPLE_RATE="0.5")
+
+    run_ids = [f"{idx:032x}" for idx in range(200)]
+    for run_id in run_ids:
+        obs.bind_log_context(run_id=run_id)
+        obs.log_event("agent.run.start")
+        obs.log_event("react.round.start", round=0)
+        obs.log_event("agent.run.end", run_id=run_id)
+
+    events = _read_jsonl(temp_log_path)
+    per_run: dict[str, list[str]] = {}
+    for event in events:
+        per_run.setdefault(event["run_id"], []).append(event["event"])
+    assert 50 < len(per_run) < 150
+    assert all(
+        names == ["agent.run.start", "react.round.start", "agent.run.end"]
+        for names in per_run.values()
+    )
+    assert all(obs._run_sampled(run_id) for run_id in per_run)
+
+
+def test_sampled_out_run_keeps_errors_and_metrics(monkeypatch, temp_log_path):
+    _configure_sampling(monkeypatch, temp_log_path, SAMPLE_RATE="0")
+    recorded: list[str] = []
+    monkeypatch.setattr(obs, "record_event", lambda event, _f: recorded.append(event))
+
+    obs.bind_log_context(run_id="r1")
+    obs.log_event("agent.run.start")
+    obs.log_event("agent.run.error", error_type="LLMError")
+    obs._run_id.set("")
+    obs.log_event("http.request.start")
+
+    events = _read_jsonl(temp_log_path)
+    assert [e["event"] for e in events] == ["agent.run.error", "http.request.start"]
+    assert recorded == ["agent.run.start", "agent.run.error", "http.request.start"]
+
+
 # ---------------------------------------------------------------------------
 # Integration: RunAgentUseCase emits events (stream)
 # ---------------------------------------------------------------------------
@@ -419,6 +762,45 @@ def test_stream_run_with_tool_calls(logging_use_case, temp_log_path, default_age
     assert "payload" in tool_end
 
 
+def test_stream_run_reports_llm_and_tool_time_per_round(
+    logging_use_case, temp_log_path, default_agent_def
+):
+    """agent.run.end splits each round's time into LLM and tool time."""
+    tool_response = _make_response_dict(
+        content="Processing...",
+        tool_calls=[
+            ToolCall(
+                id="call_t1",
+                type="function",
+                function={"name": "concat", "arguments": '{"a":"x","b":"y"}'},
+            )
+        ],
+    )
+    llm_client = _RecordingLLMClient(
+        [tool_response, _make_response_dict(content="Result: xy")]
+    )
+    use_case = logging_use_case(llm_client)
+
+    list(
+        use_case.execute_stream(
+            RunAgentRequest(message="concat x y", agent_id="default")
+        )
+    )
+
+    events = _read_jsonl(temp_log_path)
+    round_ends = [e for e in events if e["event"] == "react.round.end"]
+    run_end = next(e for e in events if e["event"] == "agent.run.end")
+
+    assert [("llm_ms" in e, "tool_ms" in e) for e in round_ends] == [
+        (True, True),
+        (True, True),
+    ]
+    assert [r["round"] for r in run_end["rounds"]] == [0, 1]
+    assert run_end["llm_ms"] == sum(r["llm_ms"] for r in run_end["rounds"])
+    assert run_end["tool_ms"] == sum(r["tool_ms"] for r in run_end["rounds"])
+    assert run_end["rounds"][1]["tool_ms"] == 0
+
+
 # ---------------------------------------------------------------------------
 # Error events
 # ---------------------------------------------------------------------------
@@ -448,6 +830,7 @@ def test_agent_run_error_event(logging_use_case, temp_log_path, default_agent_de
     assert "agent.run.error" in event_names
     error_event = next(e for e in events if e["event"] == "agent.run.error")
     assert "error" in error_event
+    assert [r["round"] for r in error_event["rounds"]] == [0]
 
 
 def test_react_max_rounds_exceeded(logging_use_case, temp_log_path, default_agent_def):
@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from simple_agent_poc.entrypoints.main_cli import build_cli_adapter, main
 
 
@@ -27,6 +29,7 @@ class TestBuildCLIAdapter:
             mock_create_registry.assert_called_once_with()
             mock_create_run_agent_use_case.assert_called_once_with(
                 agent_definitions=mock_create_registry.return_value,
+                tool_executor=None,
             )
             mock_cli_adapter.assert_called_once_with(
                 mock_create_run_agent_use_case.return_value,
@@ -55,22 +58,57 @@ class TestBuildCLIAdapter:
 class TestMain:
     """Tests for the CLI entry point."""
 
+    @patch(
+        "simple_agent_poc.entrypoints.main_cli.bootstrap.create_default_tool_executor"
+    )
     @patch("simple_agent_poc.entrypoints.main_cli.build_cli_adapter")
-    def test_main_runs_built_adapter(self, mock_build_cli_adapter: MagicMock) -> None:
+    def test_main_runs_built_adapter(
+        self,
+        mock_build_cli_adapter: MagicMock,
+        mock_create_tool_executor: MagicMock,
+    ) -> None:
         adapter = mock_build_cli_adapter.return_value
+        tool_executor = mock_create_tool_executor.return_value
 
         main([])
 
-        mock_build_cli_adapter.assert_called_once_with(agent_id="default")
+        mock_build_cli_adapter.assert_called_once_with(
+            agent_id="default", tool_executor=tool_executor
+        )
         adapter.run.assert_called_once_with()
+        tool_executor.close.assert_called_once_with()
 
+    @patch(
+        "simple_agent_poc.entrypoints.main_cli.bootstrap.create_default_tool_executor"
+    )
     @patch("simple_agent_poc.entrypoints.main_cli.build_cli_adapter")
     def test_main_accepts_agent_argument(
-        self, mock_build_cli_adapter: MagicMock
+        self,
+        mock_build_cli_adapter: MagicMock,
+        mock_create_tool_executor: MagicMock,
     ) -> None:
         adapter = mock_build_cli_adapter.return_value
 
         main(["--agent", "researcher"])
 
-        mock_build_cli_adapter.assert_called_once_with(agent_id="researcher")
+        mock_build_cli_adapter.assert_called_once_with(
+            agent_id="researcher",
+            tool_executor=mock_create_tool_executor.return_value,
+        )
         adapter.run.assert_called_once_with()
+
+    @patch(
+        "simple_agent_poc.entrypoints.main_cli.bootstrap.create_default_tool_executor"
+    )
+    @patch("simple_agent_poc.entrypoints.main_cli.build_cli_adapter")
+    def test_main_closes_tool_executor_when_run_fails(
+        self,
+        mock_build_cli_adapter: MagicMock,
+        mock_create_tool_executor: MagicMock,
+    ) -> None:
+        mock_build_cli_adapter.return_value.run.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            main([])
+
+        mock_create_tool_executor.return_value.close.assert_called_once_with()
@@ -0,0 +1,127 @@
+"""Tests for the in-process metrics fed by log events."""
+
+from simple_agent_poc.observability import log_event
+from simple_agent_poc.observability import metrics as metrics_module
+from simple_agent_poc.observability.metrics import EventMetrics
+
+
+def _sample(text: str, name: str) -> float | None:
+    for line in text.splitlines():
+        if line.startswith(f"{name} "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestEventMetrics:
+    """Tests for mapping log events onto metrics."""
+
+    def test_counts_runs_rounds_and_errors(self) -> None:
+        metrics = EventMetrics()
+
+        metrics.record("react.round.end", {"round": 0})
+        metrics.record("react.round.end", {"round": 1})
+        metrics.record("agent.run.end", {"elapsed_ms": 10})
+        metrics.record("agent.run.error", {"error_type": "RateLimitError"})
+        metrics.record("agent.run.error", {"error_type": "KeyError"})
+
+        text = metrics.render()
+        assert _sample(text, "agent_rounds_total") == 2
+        assert _sample(text, 'agent_runs_total{outcome="completed"}') == 1
+        assert _sample(text, 'agent_runs_total{outcome="error"}') == 2
+        assert _sample(text, 'agent_errors_total{category="rate_limit"}') == 1
+        assert _sample(text, 'agent_errors_total{category="internal"}') == 1
+
+    def test_tool_calls_are_counted_and_timed_per_tool(self) -> None:
+        metrics = EventMetrics()
+
+        metrics.record("tool.call.end", {"tool_name": "concat", "elapsed_ms": 20})
+        metrics.record("tool.call.error", {"tool_name": "concat", "elapsed_ms": 3000})
+
+        text = metrics.render()
+        assert _sample(text, 'agent_tool_calls_total{tool="concat",outcome="ok"}') == 1
+        assert (
+            _sample(text, 'agent_tool_calls_total{tool="concat",outcome="error"}') == 1
+        )
+        assert (
+            _sample(
+                text,
+                'agent_tool_call_duration_seconds_bucket{tool="concat",le="0.025"}',
+            )
+            == 1
+        )
+        assert (
+            _sample(
+                text, 'agent_tool_call_duration_seconds_bucket{tool="concat",le="+Inf"}'
+            )
+            == 2
+        )
+        assert (
+            _sample(text, 'agent_tool_call_duration_seconds_sum{tool="concat"}') == 3.02
+        )
+
+    def test_tool_cache_lookups_are_counted_from_tool_end(self) -> None:
+        metrics = EventMetrics()
+
+        metrics.record("tool.call.end", {"tool_name": "js", "cache": "hit"})
+        metrics.record("tool.call.end", {"tool_name": "js", "cache": "miss"})
+        metrics.record("tool.call.end", {"tool_name": "js"})
+
+        text = metrics.render()
+        assert (
+            _sample(text, 'agent_tool_cache_lookups_total{tool="js",result="hit"}') == 1
+        )
+        assert (
+            _sample(text, 'agent_tool_cache_lookups_total{tool="js",result="miss"}')
+            == 1
+        )
+
+    def test_llm_latency_and_ttft_histograms(self) -> None:
+        metrics = EventMetrics()
+
+        metrics.record(
+            "llm.stream.end", {"model": "gpt-4", "elapsed_ms": 1500, "ttft_ms": 300}
+        )
+        metrics.record(
+            "llm.stream.end", {"model": "gpt-4", "elapsed_ms": 800, "ttft_ms": None}
+        )
+
+        assert metrics.llm_latency.count("gpt-4") == 2
+        assert metrics.ttft.count("gpt-4") == 1
+
+    def test_gauges_track_active_streams_and_paused_sessions(self) -> None:
+        metrics = EventMetrics()
+
+        metrics.record("http.stream.start", {"endpoint": "/api/chat"})
+        metrics.record("http.stream.start", {"endpoint": "/api/chat"})
+        metrics.record(
+            "http.stream.end",
+            {"endpoint": "/api/chat", "outcome": "paused", "elapsed_ms": 900},
+        )
+        metrics.record("ask_user.pause", {"tool_call_id": "c1"})
+        metrics.record("ask_user.pause", {"tool_call_id": "c2"})
+        metrics.record("ask_user.resume", {"tool_call_id": "c1"})
+        metrics.record("session_store.evicted", {"paused": True})
+        metrics.record("session_store.evicted", {"paused": False})
+
+        assert metrics.active_streams.value() == 1
+        assert metrics.paused_sessions.value() == 0
+        assert metrics.runs.value("paused") == 2
+        assert metrics.stream_duration.count("/api/chat", "paused") == 1
+
+    def test_render_escapes_label_values_and_lists_every_family(self) -> None:
+        metrics = EventMetrics()
+        metrics.record("tool.call.end", {"tool_name": 'a"b', "elapsed_ms": 1})
+
+        text = metrics.render()
+
+        assert 'tool="a\\"b"' in text
+        assert text.count("# TYPE ") == len(metrics.families)
+        assert text.endswith("\n")
+
+    def test_log_event_feeds_process_metrics(self, monkeypatch) -> None:
+        metrics = EventMetrics()
+        monkeypatch.setattr(metrics_module, "_metrics", metrics)
+
+        log_event("react.round.end", round=0)
+
+        assert metrics.rounds.value() == 1
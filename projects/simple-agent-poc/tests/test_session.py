@@ -1,8 +1,16 @@
 """Tests for session entities and stores."""
 
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
 from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.session_store.sqlite import SQLiteSessionStore
 from simple_agent_poc.core.session import ConversationSession
-from simple_agent_poc.core.types import ToolCall
+from simple_agent_poc.core.types import SessionNotFoundError, ToolCall
+from simple_agent_poc.entrypoints.bootstrap import create_session_store
 
 
 class TestConversationSession:
@@ -43,6 +51,128 @@ class TestConversationSession:
         ]
 
 
+class TestSessionChanges:
+    """Tests for session change tracking."""
+
+    def test_new_session_reports_all_messages_and_state(self) -> None:
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+
+        changes = session.changes()
+
+        assert changes.saved_message_count == 0
+        assert changes.new_messages == [{"role": "system", "content": "System prompt"}]
+        assert changes.state_changed is True
+        assert changes.is_empty is False
+
+    def test_mark_saved_clears_changes(self) -> None:
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+
+        session.mark_saved()
+
+        assert session.changes().is_empty is True
+
+    def test_reports_only_messages_appended_since_save(self) -> None:
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        session.append_user_message("Hello")
+        session.mark_saved()
+
+        session.append_assistant_message("Hi")
+        changes = session.changes()
+
+        assert changes.saved_message_count == 2
+        assert changes.new_messages == [{"role": "assistant", "content": "Hi"}]
+        assert changes.updated_messages == {}
+        assert changes.state_changed is False
+        assert changes.message_count == 3
+
+    def test_tracks_replaced_tool_messages_and_pause_state(self) -> None:
+        tc = _ask_user_call("call_1")
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        session.append_assistant_message("", tool_calls=[tc])
+        session.append_tool_message("", tool_call_id="call_1")
+        session.pause_for_ask_user(tc, round_idx=1)
+        session.mark_saved()
+
+        session.replace_tool_message("answer", tool_call_id="call_1")
+        session.resume_with_answer()
+        changes = session.changes()
+
+        assert changes.new_messages == []
+        assert changes.updated_messages == {
+            2: {"role": "tool", "content": "answer", "tool_call_id": "call_1"}
+        }
+        assert changes.state_changed is True
+        assert changes.is_paused is False
+
+
+class TestAskUserResults:
+    """Tests for the incremental ask_user result index."""
+
+    def test_returns_answered_ask_user_results_in_order(self) -> None:
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        concat_call: ToolCall = {
+            "id": "call_concat",
+            "type": "function",
+            "function": {"name": "concat", "arguments": "{}"},
+        }
+        session.append_assistant_message(
+            "",
+            tool_calls=[
+                _ask_user_call("call_1"),
+                concat_call,
+                _ask_user_call("call_2"),
+            ],
+        )
+        session.append_tool_message("", tool_call_id="call_1")
+        session.append_tool_message("ab", tool_call_id="call_concat")
+        session.append_tool_message("", tool_call_id="call_2")
+
+        assert session.ask_user_results() == []
+
+        session.replace_tool_message("first", tool_call_id="call_1")
+        session.replace_tool_message("second", tool_call_id="call_2")
+
+        assert session.ask_user_results() == ["first", "second"]
+
+    def test_indexes_messages_appended_after_previous_lookup(self) -> None:
+        session = ConversationSession(session_id="session-1")
+        assert session.ask_user_results() == []
+
+        session.messages.append(
+            {"role": "assistant", "content": "", "tool_calls": [_ask_user_call("c")]}
+        )
+        session.messages.append(
+            {"role": "tool", "content": "answer", "tool_call_id": "c"}
+        )
+
+        assert session.ask_user_results() == ["answer"]
+
+    def test_reindexes_when_messages_shrink(self) -> None:
+        session = ConversationSession(session_id="session-1")
+        session.append_assistant_message("", tool_calls=[_ask_user_call("c")])
+        session.append_tool_message("answer", tool_call_id="c")
+        assert session.ask_user_results() == ["answer"]
+
+        del session.messages[1:]
+
+        assert session.ask_user_results() == []
+
+
 class TestInMemorySessionStore:
     """Tests for the in-memory session store."""
 
@@ -62,6 +192,379 @@ class TestInMemorySessionStore:
 
         assert store.get("missing") is None
 
+    def test_save_changes_applies_delta(self) -> None:
+        store = InMemorySessionStore()
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        store.save_changes(session.changes())
+        session.mark_saved()
+
+        session.append_user_message("Hello")
+        session.pause_for_ask_user(_ask_user_call("call_1"), round_idx=3)
+        store.save_changes(session.changes())
+        stored = store.get("session-1")
+
+        assert stored is not None
+        assert stored == session
+        assert stored.changes().is_empty is True
+
+    def test_evicts_least_recently_used_session_over_max_sessions(self) -> None:
+        store = InMemorySessionStore(max_sessions=2)
+        for session_id in ("a", "b"):
+            store.save(_session(session_id))
+        store.get("a")
+
+        store.save(_session("c"))
+
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.get("c") is not None
+        assert store.stats().evictions == 1
+
+    def test_evicts_over_byte_budget(self) -> None:
+        store = InMemorySessionStore(max_bytes=25)
+        store.save(_session("a", prompt="x" * 10))
+        store.save(_session("b", prompt="y" * 10))
+
+        store.save(_session("c", prompt="z" * 10))
+
+        assert store.get("a") is None
+        assert store.stats().approx_bytes == 20
+
+    def test_tracks_bytes_incrementally_on_save_changes(self) -> None:
+        store = InMemorySessionStore()
+        session = _session("a", prompt="x" * 10)
+        store.save_changes(session.changes())
+        session.mark_saved()
+
+        session.append_user_message("y" * 5)
+        store.save_changes(session.changes())
+
+        assert store.stats().approx_bytes == 15
+
+    def test_tracks_bytes_of_a_session_changed_in_place(self) -> None:
+        store = InMemorySessionStore()
+        store.save(_session("a", prompt="x" * 10))
+        session = store.get("a")
+        assert session is not None
+
+        session.append_assistant_message("", tool_calls=[_ask_user_call("call_1")])
+        session.append_tool_message("r" * 4, tool_call_id="call_1")
+        store.save_changes(session.changes())
+        session.mark_saved()
+        session.replace_tool_message("answer", tool_call_id="call_1")
+        store.save_changes(session.changes())
+
+        tool_call_size = len("ask_user") + len('{"questions": []}')
+        assert store.stats().approx_bytes == 10 + tool_call_size + len("answer")
+
+    def test_paused_sessions_are_not_evicted_for_space(self) -> None:
+        store = InMemorySessionStore(max_sessions=1)
+        paused = _session("paused")
+        paused.pause_for_ask_user(_ask_user_call("call_1"), round_idx=1)
+        store.save(paused)
+
+        store.save(_session("b"))
+
+        assert store.get("paused") is paused
+        assert store.get("b") is not None
+
+    def test_expires_idle_and_paused_sessions_after_their_ttl(self) -> None:
+        now = [0.0]
+        store = InMemorySessionStore(
+            idle_ttl_seconds=10, paused_ttl_seconds=100, clock=lambda: now[0]
+        )
+        paused = _session("paused")
+        paused.pause_for_ask_user(_ask_user_call("call_1"), round_idx=1)
+        store.save(paused)
+        store.save(_session("idle"))
+
+        now[0] = 50.0
+        assert store.get("idle") is None
+        assert store.get("paused") is paused
+
+        now[0] = 150.0
+        assert store.get("paused") is None
+        assert store.stats().expirations == 2
+
+    def test_stats_count_hits_and_misses(self) -> None:
+        store = InMemorySessionStore()
+        store.save(_session("a"))
+
+        store.get("a")
+        store.get("missing")
+
+        stats = store.stats()
+        assert (stats.hits, stats.misses, stats.sessions) == (1, 1, 1)
+
+    def test_save_changes_rejects_partial_delta_for_unknown_session(self) -> None:
+        store = InMemorySessionStore()
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        session.mark_saved()
+        session.append_user_message("Hello")
+
+        with pytest.raises(SessionNotFoundError, match="unknown session"):
+            store.save_changes(session.changes())
+
+
+def _ask_user_call(call_id: str) -> ToolCall:
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": "ask_user", "arguments": '{"questions": []}'},
+    }
+
+
+def _session(session_id: str, *, prompt: str = "System prompt") -> ConversationSession:
+    return ConversationSession.start(session_id=session_id, system_prompt=prompt)
+
+
+class TestSQLiteSessionStore:
+    """Tests for the SQLite session store."""
+
+    def test_save_and_get_round_trips_session(self, tmp_path: Path) -> None:
+        store = SQLiteSessionStore(tmp_path / "sessions.sqlite3")
+        session = ConversationSession.start(
+            session_id="session-1",
+            agent_id="researcher",
+            system_prompt="System prompt",
+        )
+        session.append_user_message("こんにちは")
+        session.append_assistant_message("", tool_calls=[_ask_user_call("call_1")])
+        session.append_tool_message("", tool_call_id="call_1")
+        session.pause_for_ask_user(_ask_user_call("call_1"), round_idx=2)
+
+        store.save(session)
+        loaded = store.get("session-1")
+
+        assert loaded is not None
+        assert loaded is not session
+        assert loaded == session
+
+    def test_get_returns_none_for_unknown_session(self, tmp_path: Path) -> None:
+        store = SQLiteSessionStore(tmp_path / "sessions.sqlite3")
+
+        assert store.get("missing") is None
+
+    def test_uses_wal_journal_mode(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.sqlite3"
+        SQLiteSessionStore(path)
+
+        with sqlite3.connect(path) as connection:
+            (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+
+        assert mode == "wal"
+
+    def test_save_changes_only_writes_new_messages(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.sqlite3"
+        store = SQLiteSessionStore(path)
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        session.append_user_message("Hello")
+        store.save_changes(session.changes())
+        session.mark_saved()
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "UPDATE session_messages SET message = ? WHERE seq = 0",
+                ('{"role":"system","content":"untouched"}',),
+            )
+
+        session.append_assistant_message("Hi")
+        store.save_changes(session.changes())
+        loaded = store.get("session-1")
+
+        assert loaded is not None
+        assert loaded.messages == [
+            {"role": "system", "content": "untouched"},
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi"},
+        ]
+
+    def test_save_changes_rejects_partial_delta_for_deleted_session(
+        self, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "sessions.sqlite3"
+        store = SQLiteSessionStore(path)
+        session = _session("session-1")
+        store.save(session)
+        session.mark_saved()
+        with sqlite3.connect(path) as connection:
+            connection.execute("DELETE FROM sessions")
+            connection.execute("DELETE FROM session_messages")
+        session.append_user_message("Hello")
+
+        with pytest.raises(SessionNotFoundError, match="unknown session"):
+            store.save_changes(session.changes())
+        assert store.get("session-1") is None
+
+    def test_save_changes_patches_replaced_ask_user_placeholder(
+        self, tmp_path: Path
+    ) -> None:
+        store = SQLiteSessionStore(tmp_path / "sessions.sqlite3")
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        session.append_user_message("Ask me")
+        session.append_assistant_message("", tool_calls=[_ask_user_call("call_1")])
+        session.append_tool_message("", tool_call_id="call_1")
+        session.pause_for_ask_user(_ask_user_call("call_1"), round_idx=1)
+        store.save_changes(session.changes())
+
+        resumed = store.get("session-1")
+        assert resumed is not None
+        resumed.replace_tool_message("answer", tool_call_id="call_1")
+        resumed.resume_with_answer()
+        resumed.append_assistant_message("Thanks")
+        store.save_changes(resumed.changes())
+        loaded = store.get("session-1")
+
+        assert loaded is not None
+        assert loaded.is_paused is False
+        assert loaded.pending_tool_call is None
+        assert loaded.messages[3] == {
+            "role": "tool",
+            "content": "answer",
+            "tool_call_id": "call_1",
+        }
+        assert loaded.messages[-1] == {"role": "assistant", "content": "Thanks"}
+
+    def test_save_replaces_stored_snapshot(self, tmp_path: Path) -> None:
+        store = SQLiteSessionStore(tmp_path / "sessions.sqlite3")
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+        session.append_user_message("Hello")
+        store.save(session)
+
+        store.save(
+            ConversationSession(
+                session_id="session-1",
+                messages=[{"role": "system", "content": "Other"}],
+            )
+        )
+        loaded = store.get("session-1")
+
+        assert loaded is not None
+        assert loaded.messages == [{"role": "system", "content": "Other"}]
+
+    def test_sessions_are_shared_between_store_instances(self, tmp_path: Path) -> None:
+        path = tmp_path / "sessions.sqlite3"
+        writer = SQLiteSessionStore(path)
+        reader = SQLiteSessionStore(path)
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+
+        writer.save(session)
+
+        assert reader.get("session-1") == session
+
+    def test_async_methods_delegate_to_sync_methods(self, tmp_path: Path) -> None:
+        store = SQLiteSessionStore(tmp_path / "sessions.sqlite3", pool_size=1)
+        session = ConversationSession.start(
+            session_id="session-1",
+            system_prompt="System prompt",
+        )
+
+        async def run() -> ConversationSession | None:
+            await store.asave(session)
+            return await store.aget("session-1")
+
+        assert asyncio.run(run()) == session
+
+    def test_busy_pool_times_out_with_timeout_error(self, tmp_path: Path) -> None:
+        store = SQLiteSessionStore(
+            tmp_path / "sessions.sqlite3", pool_size=1, timeout_seconds=0.05
+        )
+
+        with (
+            store._connection(),
+            pytest.raises(TimeoutError, match="connection became free"),
+        ):
+            store.get("session-1")
+
+    def test_rejects_non_positive_pool_size(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="pool_size must be positive"):
+            SQLiteSessionStore(tmp_path / "sessions.sqlite3", pool_size=0)
+
+
+class TestCreateSessionStore:
+    """Tests for session store selection in bootstrap."""
+
+    def test_defaults_to_in_memory_store(self) -> None:
+        store = create_session_store({"SESSION_STORE": "memory"})
+
+        assert isinstance(store, InMemorySessionStore)
+
+    def test_creates_sqlite_store(self, tmp_path: Path) -> None:
+        path = tmp_path / "data" / "sessions.sqlite3"
+
+        store = create_session_store(
+            {
+                "SESSION_STORE": "sqlite",
+                "SESSION_STORE_SQLITE_PATH": str(path),
+                "SESSION_STORE_SQLITE_POOL_SIZE": "2",
+            }
+        )
+
+        assert isinstance(store, SQLiteSessionStore)
+        assert path.exists()
+
+    def test_rejects_unknown_backend(self) -> None:
+        with pytest.raises(ValueError, match="SESSION_STORE must be one of"):
+            create_session_store({"SESSION_STORE": "redis"})
+
+    def test_configures_in_memory_limits(self) -> None:
+        store = create_session_store(
+            {"SESSION_STORE": "memory", "SESSION_STORE_MAX_SESSIONS": "1"}
+        )
+        assert isinstance(store, InMemorySessionStore)
+
+        store.save(_session("a"))
+        store.save(_session("b"))
+
+        assert store.get("a") is None
+
+    @pytest.mark.parametrize(
+        ("name", "value", "message"),
+        [
+            ("SESSION_STORE_MAX_BYTES", "lots", "must be an integer"),
+            ("SESSION_STORE_IDLE_TTL_SECONDS", "soon", "must be a number"),
+            ("SESSION_STORE_PAUSED_TTL_SECONDS", "0", "must be positive"),
+        ],
+    )
+    def test_rejects_invalid_in_memory_limits(
+        self, name: str, value: str, message: str
+    ) -> None:
+        with pytest.raises(ValueError, match=f"{name} {message}"):
+            create_session_store({"SESSION_STORE": "memory", name: value})
+
+    @pytest.mark.parametrize(
+        ("pool_size", "message"),
+        [("many", "must be an integer"), ("0", "must be positive")],
+    )
+    def test_rejects_invalid_pool_size(
+        self, tmp_path: Path, pool_size: str, message: str
+    ) -> None:
+        with pytest.raises(ValueError, match=message):
+            create_session_store(
+                {
+                    "SESSION_STORE": "sqlite",
+                    "SESSION_STORE_SQLITE_PATH": str(tmp_path / "s.sqlite3"),
+                    "SESSION_STORE_SQLITE_POOL_SIZE": pool_size,
+                }
+            )
+
 
 class TestSessionPause:
     """Tests for pause/resume functionality."""
@@ -0,0 +1,322 @@
+"""Tests for tool output caps and the blob store that keeps full outputs."""
+
+import asyncio
+
+import pytest
+
+from simple_agent_poc.adapters.blob_store.filesystem import FileBlobStore
+from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
+from simple_agent_poc.application import use_cases as use_cases_module
+from simple_agent_poc.application.dto import (
+    RunAgentRequest,
+    StreamComplete,
+    ToolResultEvent,
+)
+from simple_agent_poc.application.tool_output import ToolOutputLimits, output_preview
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
+from simple_agent_poc.core.types import LLMStreamChunk
+from simple_agent_poc.entrypoints.bootstrap import (
+    DEFAULT_TOOL_OUTPUT_MAX_CHARS,
+    create_blob_store,
+    resolve_tool_output_limits,
+)
+from simple_agent_poc.observability import metrics
+
+LARGE_OUTPUT = "".join(f"line {index}\n" for index in range(1000))
+
+
+class TestFileBlobStore:
+    def test_round_trips_content_by_reference(self, tmp_path) -> None:
+        store = FileBlobStore(tmp_path)
+
+        ref = store.put(b"hello")
+
+        assert ref.startswith("sha256:")
+        assert store.get(ref) == b"hello"
+        digest = ref.removeprefix("sha256:")
+        assert (tmp_path / digest[:2] / digest).read_bytes() == b"hello"
+
+    def test_same_content_is_stored_once(self, tmp_path) -> None:
+        store = FileBlobStore(tmp_path)
+
+        first = store.put(b"same")
+        second = store.put(b"same")
+
+        assert first == second
+        assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [
+            first.removeprefix("sha256:")
+        ]
+
+    @pytest.mark.parametrize(
+        "ref",
+        [
+            "sha256:" + "0" * 64,
+            "sha256:../../etc/passwd",
+            "md5:" + "0" * 32,
+            "not-a-ref",
+        ],
+    )
+    def test_unknown_or_invalid_refs_return_none(self, tmp_path, ref) -> None:
+        assert FileBlobStore(tmp_path).get(ref) is None
+
+
+class TestOutputPreview:
+    def test_keeps_head_and_tail_and_names_the_ref(self) -> None:
+        content = "a" * 100 + "b" * 100 + "c" * 100
+
+        preview = output_preview(content, 30, ref="sha256:abc")
+
+        assert preview.startswith("a" * 20 + "\n\n[... 270 characters omitted;")
+        assert "full output stored as sha256:abc" in preview
+        assert preview.endswith("...]\n\n" + "c" * 10)
+
+    def test_without_ref_only_counts_omitted_characters(self) -> None:
+        preview = output_preview("x" * 50, 10)
+
+        assert "[... 40 characters omitted ...]" in preview
+        assert "stored" not in preview
+
+    def test_keeps_content_the_marker_would_not_shorten(self) -> None:
+        content = "x" * 40
+
+        assert output_preview(content, 5) == content
+        assert output_preview(content, 5, ref="sha256:abc") == content
+
+    def test_per_tool_limit_overrides_default(self) -> None:
+        limits = ToolOutputLimits(max_chars=100, per_tool={"concat": 10})
+
+        assert limits.for_tool("concat") == 10
+        assert limits.for_tool("other") == 100
+        assert ToolOutputLimits().for_tool("concat") is None
+
+
+def _large_output(args: dict) -> str:
+    return LARGE_OUTPUT
+
+
+class _DumpLLMClient:
+    """Asks for one ``dump`` call, then answers."""
+
+    def __init__(self) -> None:
+        self.requests: list[list[dict]] = []
+
+    def complete_stream(self, messages, *, tools=None):
+        self.requests.append(list(messages))
+        if len(self.requests) == 1:
+            yield LLMStreamChunk(
+                content_delta=None,
+                tool_call_delta={
+                    "index": 0,
+                    "id": "call_dump",
+                    "type": "function",
+                    "function": {"name": "dump", "arguments": "{}"},
+                },
+            )
+        else:
+            yield LLMStreamChunk(content_delta="Done.")
+
+
+class _FailingBlobStore:
+    def put(self, data: bytes, /) -> str:
+        raise OSError("disk full")
+
+    def get(self, ref: str, /) -> bytes | None:
+        return None
+
+
+@pytest.fixture
+def logged_events(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        use_cases_module,
+        "log_event",
+        lambda event, **fields: events.append((event, fields)),
+    )
+    return events
+
+
+def _use_case(
+    llm: _DumpLLMClient,
+    store: InMemorySessionStore,
+    *,
+    limits: ToolOutputLimits | None = None,
+    blob_store=None,
+) -> RunAgentUseCase:
+    registry = BuiltinToolRegistry()
+    registry.register(
+        {
+            "type": "function",
+            "function": {
+                "name": "dump",
+                "description": "Return a large output.",
+                "parameters": {"type": "object", "properties": {}},
+            },
+        },
+        _large_output,
+    )
+    return RunAgentUseCase(
+        llm_client_factory=lambda _: llm,
+        session_store=store,
+        agent_definitions=AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "test-model",
+                        "system_prompt": "Prompt",
+                        "tools": ["dump"],
+                    }
+                }
+            }
+        ),
+        tool_executor=registry,
+        tool_output_limits=limits,
+        blob_store=blob_store,
+    )
+
+
+def _tool_message(store: InMemorySessionStore, events: list) -> str:
+    complete = events[-1]
+    assert isinstance(complete, StreamComplete)
+    session = store.get(complete.session_id)
+    assert session is not None
+    return [m for m in session.messages if m["role"] == "tool"][-1]["content"]
+
+
+def test_large_output_is_stored_and_replaced_by_preview(tmp_path, logged_events):
+    llm = _DumpLLMClient()
+    store = InMemorySessionStore()
+    blobs = FileBlobStore(tmp_path)
+    use_case = _use_case(
+        llm, store, limits=ToolOutputLimits(max_chars=300), blob_store=blobs
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    content = _tool_message(store, events)
+    end = next(fields for name, fields in logged_events if name == "tool.call.end")
+    assert end["output_chars"] == len(LARGE_OUTPUT)
+    assert content.startswith(LARGE_OUTPUT[:200])
+    assert content.endswith(LARGE_OUTPUT[-100:])
+    assert f"full output stored as {end['output_ref']}" in content
+    assert blobs.get(end["output_ref"]) == LARGE_OUTPUT.encode()
+    tool_event = next(e for e in events if isinstance(e, ToolResultEvent))
+    assert tool_event.result == content
+    assert llm.requests[1][-1]["content"] == content
+
+
+def test_output_under_the_cap_is_kept_whole(tmp_path, logged_events):
+    store = InMemorySessionStore()
+    use_case = _use_case(
+        _DumpLLMClient(),
+        store,
+        limits=ToolOutputLimits(max_chars=100, per_tool={"dump": len(LARGE_OUTPUT)}),
+        blob_store=FileBlobStore(tmp_path),
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert _tool_message(store, events) == LARGE_OUTPUT
+    end = next(fields for name, fields in logged_events if name == "tool.call.end")
+    assert "output_ref" not in end
+    assert not any(tmp_path.iterdir())
+
+
+def test_outputs_are_not_capped_by_default():
+    store = InMemorySessionStore()
+    use_case = _use_case(_DumpLLMClient(), store)
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert _tool_message(store, events) == LARGE_OUTPUT
+
+
+def test_output_is_capped_without_a_blob_store(logged_events):
+    store = InMemorySessionStore()
+    use_case = _use_case(
+        _DumpLLMClient(), store, limits=ToolOutputLimits(max_chars=300)
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    content = _tool_message(store, events)
+    assert len(content) < len(LARGE_OUTPUT)
+    assert "characters omitted ...]" in content
+    end = next(fields for name, fields in logged_events if name == "tool.call.end")
+    assert end["output_ref"] is None
+
+
+def test_failed_spill_still_caps_the_output(logged_events):
+    store = InMemorySessionStore()
+    use_case = _use_case(
+        _DumpLLMClient(),
+        store,
+        limits=ToolOutputLimits(max_chars=300),
+        blob_store=_FailingBlobStore(),
+    )
+
+    async def run() -> list:
+        return [
+            event
+            async for event in use_case.aexecute_stream(RunAgentRequest(message="go"))
+        ]
+
+    content = _tool_message(store, asyncio.run(run()))
+
+    assert len(content) < len(LARGE_OUTPUT)
+    assert "stored as" not in content
+    error = next(f for name, f in logged_events if name == "tool.output.spill.error")
+    assert error["tool_name"] == "dump"
+    end = next(fields for name, fields in logged_events if name == "tool.call.end")
+    assert end["output_ref"] is None
+
+
+def test_capped_outputs_are_counted(monkeypatch, tmp_path):
+    recorded = metrics.EventMetrics()
+    monkeypatch.setattr(metrics, "_metrics", recorded)
+    use_case = _use_case(
+        _DumpLLMClient(),
+        InMemorySessionStore(),
+        limits=ToolOutputLimits(max_chars=300),
+        blob_store=FileBlobStore(tmp_path),
+    )
+
+    list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert recorded.tool_outputs_capped.value("dump", "true") == 1
+
+
+def test_resolve_tool_output_limits_from_env():
+    default = resolve_tool_output_limits({"UNRELATED": "1"})
+    assert default.max_chars is None
+    assert default.per_tool == {}
+    spilled = resolve_tool_output_limits({"TOOL_OUTPUT_BLOB_DIR": "tool-outputs"})
+    assert spilled.max_chars == DEFAULT_TOOL_OUTPUT_MAX_CHARS
+
+    limits = resolve_tool_output_limits(
+        {
+            "TOOL_OUTPUT_MAX_CHARS": "5000",
+            "TOOL_OUTPUT_LIMITS": "execute_javascript=2000, concat=100",
+        }
+    )
+
+    assert limits.max_chars == 5000
+    assert limits.per_tool == {"execute_javascript": 2000, "concat": 100}
+    with pytest.raises(ValueError, match="TOOL_OUTPUT_LIMITS"):
+        resolve_tool_output_limits({"TOOL_OUTPUT_LIMITS": "concat"})
+    with pytest.raises(ValueError, match="TOOL_OUTPUT_LIMITS"):
+        resolve_tool_output_limits({"TOOL_OUTPUT_LIMITS": "concat=0"})
+    with pytest.raises(ValueError, match="TOOL_OUTPUT_MAX_CHARS must be at least"):
+        resolve_tool_output_limits({"TOOL_OUTPUT_MAX_CHARS": "20"})
+    with pytest.raises(ValueError, match="TOOL_OUTPUT_LIMITS must be at least"):
+        resolve_tool_output_limits({"TOOL_OUTPUT_LIMITS": "concat=99"})
+
+
+def test_create_blob_store_only_when_a_directory_is_configured(tmp_path):
+    assert create_blob_store({"UNRELATED": "1"}) is None
+    assert create_blob_store({"TOOL_OUTPUT_BLOB_DIR": " "}) is None
+    store = create_blob_store({"TOOL_OUTPUT_BLOB_DIR": str(tmp_path)})
+
+    assert isinstance(store, FileBlobStore)
+    assert store.root == tmp_path
@@ -0,0 +1,436 @@
+"""Tests for lazily loaded tool plugins, async executors and per-tool limits."""
+
+import asyncio
+import json
+import sys
+import threading
+from collections.abc import Iterator
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.tools import plugins as plugins_module
+from simple_agent_poc.adapters.tools import registry as registry_module
+from simple_agent_poc.adapters.tools.concat import TOOL_DEFINITION as CONCAT_TOOL_DEF
+from simple_agent_poc.adapters.tools.concat import execute as concat_execute
+from simple_agent_poc.adapters.tools.plugins import (
+    ENTRY_POINT_GROUP,
+    register_tool_plugins,
+)
+from simple_agent_poc.adapters.tools.registry import (
+    BuiltinToolRegistry,
+    ToolLimits,
+)
+from simple_agent_poc.application.dto import RunAgentRequest, StreamComplete
+from simple_agent_poc.application.tool_context import ToolCallContext, use_tool_calls
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
+from simple_agent_poc.core.types import (
+    LLMError,
+    LLMStreamChunk,
+    ToolCall,
+    ToolDefinition,
+)
+from simple_agent_poc.entrypoints.bootstrap import resolve_tool_limits
+
+WEATHER_PLUGIN = """
+import asyncio
+
+TOOL_DEFINITION = {
+    "type": "function",
+    "function": {
+        "name": "get_weather",
+        "description": "Return the weather of a city.",
+        "parameters": {"type": "object", "properties": {"city": {"type": "string"}}},
+    },
+}
+TIMEOUT_SECONDS = 5
+
+
+async def execute(arguments):
+    await asyncio.sleep(0)
+    return '{"city": "%s", "weather": "sunny"}' % arguments["city"]
+"""
+
+
+def _definition(name: str) -> ToolDefinition:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": name,
+            "parameters": {"type": "object", "properties": {}},
+        },
+    }
+
+
+def _call(name: str, arguments: dict | None = None) -> ToolCall:
+    return ToolCall(
+        id=f"call_{name}",
+        type="function",
+        function={"name": name, "arguments": json.dumps(arguments or {})},
+    )
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch) -> Iterator[EntryPoint]:
+    (tmp_path / "weather_plugin.py").write_text(WEATHER_PLUGIN)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "weather_plugin", raising=False)
+    yield EntryPoint(
+        name="get_weather", value="weather_plugin", group=ENTRY_POINT_GROUP
+    )
+    sys.modules.pop("weather_plugin", None)
+
+
+@pytest.fixture
+def logged_events(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    for module in (registry_module, plugins_module):
+        monkeypatch.setattr(
+            module,
+            "log_event",
+            lambda event, **fields: events.append((event, fields)),
+        )
+    return events
+
+
+class TestPlugins:
+    def test_plugin_is_imported_on_first_use(self, plugin_module, logged_events):
+        registry = BuiltinToolRegistry()
+
+        assert register_tool_plugins(registry, plugins=[plugin_module]) == [
+            "get_weather"
+        ]
+        assert "weather_plugin" not in sys.modules
+        assert registry.has_tool("get_weather")
+
+        definitions = registry.get_definitions(["get_weather"])
+
+        assert "weather_plugin" in sys.modules
+        assert definitions[0]["function"]["name"] == "get_weather"
+        result = registry.execute(_call("get_weather", {"city": "Tokyo"}))
+        assert json.loads(result) == {"city": "Tokyo", "weather": "sunny"}
+        assert [name for name, _ in logged_events] == ["tool.plugin.load"]
+
+    def test_plugin_cannot_replace_a_builtin_tool(self, logged_events):
+        registry = BuiltinToolRegistry()
+        registry.register(CONCAT_TOOL_DEF, concat_execute)
+        plugin = EntryPoint(name="concat", value="missing_module", group="x")
+
+        assert register_tool_plugins(registry, plugins=[plugin]) == []
+        assert registry.get_definitions(["concat"]) == [CONCAT_TOOL_DEF]
+        assert logged_events[0][0] == "tool.plugin.skipped"
+
+    def test_broken_plugin_fails_with_llm_error(self, logged_events):
+        registry = BuiltinToolRegistry()
+        register_tool_plugins(
+            registry,
+            plugins=[EntryPoint(name="broken", value="no_such_module", group="x")],
+        )
+
+        with pytest.raises(LLMError, match="Failed to load tool plugin broken"):
+            registry.get_definitions(["broken"])
+        assert logged_events[0][0] == "tool.plugin.error"
+
+    def test_plugin_must_define_the_tool_it_is_named_after(self, plugin_module):
+        registry = BuiltinToolRegistry()
+        renamed = EntryPoint(
+            name="other_name", value=plugin_module.value, group=ENTRY_POINT_GROUP
+        )
+        register_tool_plugins(registry, plugins=[renamed])
+
+        with pytest.raises(LLMError, match="get_weather"):
+            registry.execute(_call("other_name"))
+
+
+class TestAsyncExecutors:
+    def test_async_executor_runs_on_the_callers_loop(self) -> None:
+        loops: list[asyncio.AbstractEventLoop] = []
+
+        async def execute(arguments: dict) -> str:
+            loops.append(asyncio.get_running_loop())
+            return "ok"
+
+        registry = BuiltinToolRegistry()
+        registry.register(_definition("async_tool"), execute)
+
+        async def run() -> tuple[str, asyncio.AbstractEventLoop]:
+            return (
+                await registry.aexecute(_call("async_tool")),
+                asyncio.get_running_loop(),
+            )
+
+        result, loop = asyncio.run(run())
+
+        assert result == "ok"
+        assert loops == [loop]
+
+    def test_async_executor_can_be_called_synchronously_inside_a_loop(self) -> None:
+        async def execute(arguments: dict) -> str:
+            return "ok"
+
+        registry = BuiltinToolRegistry()
+        registry.register(_definition("async_tool"), execute)
+
+        async def run() -> str:
+            # The blocking use case path calls execute() on its private loop.
+            return registry.execute(_call("async_tool"))
+
+        assert asyncio.run(run()) == "ok"
+        assert registry.execute(_call("async_tool")) == "ok"
+
+    def test_synchronous_calls_share_one_event_loop(self) -> None:
+        loops: list[asyncio.AbstractEventLoop] = []
+
+        async def execute(arguments: dict) -> str:
+            loops.append(asyncio.get_running_loop())
+            return "ok"
+
+        registry = BuiltinToolRegistry()
+        registry.register(_definition("async_tool"), execute)
+
+        registry.execute(_call("async_tool"))
+        registry.execute(_call("async_tool"))
+
+        assert len(loops) == 2
+        assert loops[0] is loops[1]
+        registry.close()
+
+
+class TestLimits:
+    def test_slow_sync_call_times_out_with_an_error_result(self) -> None:
+        release = threading.Event()
+        registry = BuiltinToolRegistry()
+        registry.register(
+            _definition("slow"),
+            lambda arguments: "late" if release.wait(5) else "",
+            limits=ToolLimits(timeout_seconds=0.05),
+        )
+        context = ToolCallContext("default")
+
+        try:
+            with use_tool_calls([context]):
+                result = json.loads(registry.execute(_call("slow")))
+        finally:
+            release.set()
+
+        assert result["status"] == "error"
+        assert result["error"]["category"] == "timeout"
+        assert context.fields == {"timed_out": True}
+
+    def test_slow_async_call_is_cancelled_at_its_timeout(self) -> None:
+        cancelled = []
+
+        async def execute(arguments: dict) -> str:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "late"
+
+        registry = BuiltinToolRegistry()
+        registry.register(
+            _definition("slow"), execute, limits=ToolLimits(timeout_seconds=0.05)
+        )
+
+        result = json.loads(asyncio.run(registry.aexecute(_call("slow"))))
+
+        assert result["error"]["category"] == "timeout"
+        assert cancelled == [True]
+
+    def test_executor_errors_are_not_reported_as_timeouts(self) -> None:
+        def execute(arguments: dict) -> str:
+            raise TimeoutError("socket timed out")
+
+        registry = BuiltinToolRegistry()
+        registry.register(
+            _definition("flaky"), execute, limits=ToolLimits(timeout_seconds=5)
+        )
+
+        with pytest.raises(TimeoutError, match="socket"):
+            asyncio.run(registry.aexecute(_call("flaky")))
+
+    def test_max_concurrency_is_shared_by_sync_and_async_callers(self) -> None:
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+
+        def execute(arguments: dict) -> str:
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+            return "ok"
+
+        registry = BuiltinToolRegistry()
+        registry.register(
+            _definition("narrow"), execute, limits=ToolLimits(max_concurrency=1)
+        )
+
+        async def run_async() -> list[str]:
+            return await asyncio.gather(
+                *(registry.aexecute(_call("narrow")) for _ in range(3))
+            )
+
+        threads = [
+            threading.Thread(target=registry.execute, args=(_call("narrow"),))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        results = asyncio.run(run_async())
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["ok", "ok", "ok"]
+        assert active[1] == 1
+
+    def test_timed_out_sync_call_keeps_its_slot_until_it_returns(self) -> None:
+        started, release = threading.Event(), threading.Event()
+
+        def execute(arguments: dict) -> str:
+            started.set()
+            release.wait(5)
+            return "late"
+
+        registry = BuiltinToolRegistry()
+        registry.register(
+            _definition("narrow"),
+            execute,
+            limits=ToolLimits(timeout_seconds=0.1, max_concurrency=1),
+        )
+        first = registry.execute(_call("narrow"))
+        assert started.wait(5)
+
+        try:
+            # The first call still runs, so this one times out waiting.
+            second = registry.execute(_call("narrow"))
+        finally:
+            release.set()
+
+        assert json.loads(first)["error"]["category"] == "timeout"
+        assert json.loads(second)["error"]["category"] == "timeout"
+
+    def test_limited_calls_run_on_a_bounded_thread_pool(self) -> None:
+        threads: set[str] = set()
+
+        def execute(arguments: dict) -> str:
+            threads.add(threading.current_thread().name)
+            return "ok"
+
+        registry = BuiltinToolRegistry(max_threads=2)
+        registry.register(
+            _definition("limited"), execute, limits=ToolLimits(timeout_seconds=5)
+        )
+
+        results = [registry.execute(_call("limited")) for _ in range(10)]
+
+        assert results == ["ok"] * 10
+        assert threads <= {"tool_0", "tool_1"}
+        registry.close()
+
+    def test_registry_limits_override_the_declared_ones(self) -> None:
+        registry = BuiltinToolRegistry(
+            limits={"slow": ToolLimits(timeout_seconds=0.05)}
+        )
+        release = threading.Event()
+        registry.register(
+            _definition("slow"),
+            lambda arguments: "late" if release.wait(5) else "",
+            limits=ToolLimits(timeout_seconds=10, max_concurrency=2),
+        )
+
+        try:
+            result = json.loads(registry.execute(_call("slow")))
+        finally:
+            release.set()
+
+        assert result["error"]["message"] == "slow did not finish within 0.05s"
+
+
+def test_resolve_tool_limits_from_env():
+    limits = resolve_tool_limits(
+        {
+            "TOOL_TIMEOUTS": "get_weather=2.5, execute_javascript=30",
+            "TOOL_MAX_CONCURRENCY": "get_weather=4",
+        }
+    )
+
+    assert limits == {
+        "get_weather": ToolLimits(timeout_seconds=2.5, max_concurrency=4),
+        "execute_javascript": ToolLimits(timeout_seconds=30.0),
+    }
+    assert resolve_tool_limits({"UNRELATED": "1"}) == {}
+    with pytest.raises(ValueError, match="TOOL_MAX_CONCURRENCY"):
+        resolve_tool_limits({"TOOL_MAX_CONCURRENCY": "get_weather=0"})
+    with pytest.raises(ValueError, match="TOOL_TIMEOUTS"):
+        resolve_tool_limits({"TOOL_TIMEOUTS": "get_weather"})
+
+
+class _WeatherLLMClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete_stream(self, messages, *, tools=None):
+        self.calls += 1
+        if self.calls == 1:
+            assert tools is not None
+            assert [tool["function"]["name"] for tool in tools] == ["get_weather"]
+            yield LLMStreamChunk(
+                content_delta=None,
+                tool_call_delta={
+                    "index": 0,
+                    "id": "call_weather",
+                    "type": "function",
+                    "function": {
+                        "name": "get_weather",
+                        "arguments": '{"city": "Osaka"}',
+                    },
+                },
+            )
+        else:
+            yield LLMStreamChunk(content_delta="Sunny.")
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_agent_runs_a_lazily_loaded_async_plugin(plugin_module, use_async):
+    registry = BuiltinToolRegistry()
+    register_tool_plugins(registry, plugins=[plugin_module])
+    store = InMemorySessionStore()
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _: _WeatherLLMClient(),
+        session_store=store,
+        agent_definitions=AgentDefinitionRegistry.from_mapping(
+            {
+                "agents": {
+                    "default": {
+                        "model": "test-model",
+                        "system_prompt": "Prompt",
+                        "tools": ["get_weather"],
+                    }
+                }
+            }
+        ),
+        tool_executor=registry,
+    )
+    request = RunAgentRequest(message="weather?")
+
+    if use_async:
+
+        async def run() -> list:
+            return [event async for event in use_case.aexecute_stream(request)]
+
+        events = asyncio.run(run())
+    else:
+        events = list(use_case.execute_stream(request))
+
+    complete = events[-1]
+    assert isinstance(complete, StreamComplete)
+    session = store.get(complete.session_id)
+    assert session is not None
+    tool_message = [m for m in session.messages if m["role"] == "tool"][-1]
+    assert json.loads(tool_message["content"])["city"] == "Osaka"
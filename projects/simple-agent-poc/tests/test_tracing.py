@@ -0,0 +1,266 @@
+"""Tests for tracing spans and trace context propagation."""
+
+import json
+import threading
+from collections.abc import Generator, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.request import Request
+
+import pytest
+
+import simple_agent_poc.observability as obs
+from simple_agent_poc.adapters.execution_worker.client import (
+    ExecutionWorkerClient,
+    ExecutionWorkerConfig,
+)
+from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
+from simple_agent_poc.application.dto import RunAgentRequest, StreamComplete
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.core.types import LLMStreamChunk, Message, ToolDefinition
+from simple_agent_poc.observability import tracing
+from simple_agent_poc.observability.reader import iter_events
+
+RUN_JS_TOOL: ToolDefinition = {
+    "type": "function",
+    "function": {
+        "name": "run_js",
+        "description": "Run JavaScript.",
+        "parameters": {"type": "object", "properties": {}},
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def _reset_tracing() -> Generator[None]:
+    yield
+    tracing.shutdown_tracing()
+
+
+def _read_spans(path: Path) -> list[dict]:
+    tracing.flush_tracing()
+    spans: list[dict] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        request = json.loads(line)
+        for resource in request["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return spans
+
+
+def _attributes(span: dict) -> dict[str, object]:
+    return {
+        attr["key"]: next(iter(attr["value"].values())) for attr in span["attributes"]
+    }
+
+
+class _FakeResponse:
+    status = 200
+
+    def read(self) -> bytes:
+        return json.dumps({"status": "success", "stdout": "", "result": 2}).encode()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+
+class _ToolCallingLLMClient:
+    """Asks for one run_js call, then answers."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools: list[ToolDefinition] | None = None,
+    ):
+        self.calls += 1
+        if self.calls == 1:
+            yield LLMStreamChunk(
+                content_delta=None,
+                tool_call_delta={
+                    "index": 0,
+                    "id": "call_js",
+                    "type": "function",
+                    "function": {"name": "run_js", "arguments": "{}"},
+                },
+            )
+        else:
+            yield LLMStreamChunk(content_delta="Done.")
+        yield LLMStreamChunk(
+            content_delta=None,
+            usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        )
+
+
+def _run_with_worker(default_agent_def) -> tuple[list[dict[str, str]], list]:
+    headers: list[dict[str, str]] = []
+
+    def opener(request: Request, *, timeout: float):
+        headers.append(dict(request.header_items()))
+        return _FakeResponse()
+
+    client = ExecutionWorkerClient(
+        ExecutionWorkerConfig(base_url="http://worker.local"), opener=opener
+    )
+    registry = BuiltinToolRegistry()
+    registry.register(
+        RUN_JS_TOOL,
+        lambda _args: json.dumps(client.execute_javascript(code="1 + 1").result),
+    )
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _: _ToolCallingLLMClient(),
+        session_store=InMemorySessionStore(),
+        agent_definitions=default_agent_def,
+        tool_executor=registry,
+    )
+    events = list(
+        use_case.execute_stream(RunAgentRequest(message="hi", agent_id="default"))
+    )
+    return headers, events
+
+
+def test_run_exports_nested_spans_to_file(tmp_path, default_agent_def):
+    trace_file = tmp_path / "traces.jsonl"
+    tracing.configure_tracing(tracing.FileSpanExporter(trace_file))
+
+    headers, events = _run_with_worker(default_agent_def)
+
+    assert isinstance(events[-1], StreamComplete)
+    spans = _read_spans(trace_file)
+    by_name: dict[str, list[dict]] = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+    (run,) = by_name["agent.run"]
+    rounds = by_name["react.round"]
+    llm_calls = by_name["llm.stream"]
+    (tool,) = by_name["tool.call"]
+
+    run_attributes = _attributes(run)
+    assert run["traceId"] == run_attributes["run_id"]
+    assert run_attributes["outcome"] == "completed"
+    assert "parentSpanId" not in run
+    assert {span["traceId"] for span in spans} == {run["traceId"]}
+    assert [_attributes(r)["round"] for r in rounds] == ["0", "1"]
+    assert all(r["parentSpanId"] == run["spanId"] for r in rounds)
+    assert [c["parentSpanId"] for c in llm_calls] == [r["spanId"] for r in rounds]
+    assert _attributes(llm_calls[0])["completion_tokens"] == "5"
+    assert tool["parentSpanId"] == rounds[0]["spanId"]
+    assert _attributes(tool)["tool_name"] == "run_js"
+    assert int(run["startTimeUnixNano"]) <= int(tool["startTimeUnixNano"])
+    assert int(tool["endTimeUnixNano"]) <= int(run["endTimeUnixNano"])
+
+    (sent,) = headers
+    assert sent["Traceparent"] == f"00-{run['traceId']}-{tool['spanId']}-01"
+
+
+def test_tracing_disabled_sends_no_traceparent(default_agent_def):
+    headers, _events = _run_with_worker(default_agent_def)
+
+    assert headers
+    assert "Traceparent" not in headers[0]
+
+
+def test_failed_span_records_exception(tmp_path):
+    trace_file = tmp_path / "traces.jsonl"
+    tracing.configure_tracing(tracing.FileSpanExporter(trace_file))
+
+    span = tracing.start_span("tool.call", tool_name="x")
+    with pytest.raises(ValueError, match="boom"), tracing.use_span(span):
+        raise ValueError("boom")
+
+    (exported,) = _read_spans(trace_file)
+    assert exported["status"] == {"code": 2, "message": "boom"}
+    (event,) = exported["events"]
+    assert event["name"] == "exception"
+    assert _attributes(event)["exception.type"] == "ValueError"
+    assert tracing.current_traceparent() is None
+
+
+def test_otlp_http_exporter_posts_to_collector():
+    received: list[dict] = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            length = int(self.headers["content-length"])
+            received.append(
+                {
+                    "path": self.path,
+                    "content_type": self.headers["content-type"],
+                    "body": json.loads(self.rfile.read(length)),
+                }
+            )
+            self.send_response(200)
+            self.send_header("content-length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format: str, *args: object) -> None:
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Collector)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        endpoint = f"http://127.0.0.1:{server.server_port}/v1/traces"
+        tracing.configure_tracing(tracing.OTLPHTTPSpanExporter(endpoint))
+        parent = tracing.start_span("agent.run", trace_id="a" * 32)
+        tracing.start_span("react.round", parent=parent, round=0).end()
+        parent.end()
+        tracing.flush_tracing()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    spans = [
+        span
+        for request in received
+        for span in request["body"]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+    assert {r["path"] for r in received} == {"/v1/traces"}
+    assert {r["content_type"] for r in received} == {"application/json"}
+    assert [s["name"] for s in spans] == ["react.round", "agent.run"]
+    assert {s["traceId"] for s in spans} == {"a" * 32}
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+    resource = received[0]["body"]["resourceSpans"][0]["resource"]
+    assert _attributes(resource)["service.name"] == "simple-agent-poc"
+
+
+def test_export_failure_is_logged_with_its_error(jsonl_log):
+    class BrokenExporter:
+        def export(self, spans: Sequence[tracing.Span]) -> None:
+            raise OSError("collector unreachable")
+
+    tracing.configure_tracing(BrokenExporter())
+    tracing.start_span("agent.run").end()
+    tracing.flush_tracing()
+    obs.shutdown_logging()
+
+    (event,) = iter_events(jsonl_log, events=["trace.export"])
+    assert event["event"] == "trace.export.error"
+    assert "collector unreachable" in json.dumps(event["error"])
+
+
+def test_configure_tracing_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("SIMPLE_AGENT_TRACE_EXPORTER", "file")
+    monkeypatch.setenv("SIMPLE_AGENT_TRACE_FILE", str(tmp_path / "t.jsonl"))
+    tracing.configure_tracing()
+
+    tracing.start_span("agent.run").end()
+
+    (span,) = _read_spans(tmp_path / "t.jsonl")
+    assert len(span["traceId"]) == 32
+    assert len(span["spanId"]) == 16
+
+
+def test_start_span_without_exporter_is_not_recording():
+    span = tracing.start_span("agent.run")
+    with tracing.use_span(span):
+        assert tracing.current_traceparent() is None
+    assert span.recording is False
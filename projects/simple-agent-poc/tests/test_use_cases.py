@@ -1,5 +1,8 @@
 """Tests for RunAgentUseCase with streaming tool calling (ReAct loop)."""
 
+import asyncio
+import threading
+import time
 from collections.abc import Iterator
 
 from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
@@ -10,11 +13,13 @@ from simple_agent_poc.application.dto import (
     SessionPaused,
     StreamComplete,
     ToolCallEvent,
+    ToolProgressEvent,
     ToolResultEvent,
 )
+from simple_agent_poc.application.tool_context import current_tool_calls
 from simple_agent_poc.application.use_cases import RunAgentUseCase
 from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
-from simple_agent_poc.core.session import ConversationSession
+from simple_agent_poc.core.session import ConversationSession, SessionChanges
 from simple_agent_poc.core.types import (
     LLMError,
     LLMStreamChunk,
@@ -986,3 +991,412 @@ def test_execute_stream_empty_questions_raises_error():
         assert False, "Expected ValidationError"
     except ValidationError:
         pass
+
+
+# ---------------------------------------------------------------------------
+# Parallel tool calls within one round
+# ---------------------------------------------------------------------------
+
+
+class _MultiToolCallLLMClient:
+    """Requests several tool calls in the first round, then answers."""
+
+    def __init__(self, tool_calls: list[ToolCall]) -> None:
+        self._tool_calls = tool_calls
+        self.calls: list[list[Message]] = []
+
+    def complete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools: list[ToolDefinition] | None = None,
+    ) -> Iterator[LLMStreamChunk]:
+        self.calls.append(list(messages))
+        if len(self.calls) > 1:
+            yield LLMStreamChunk(content_delta="Done.")
+            return
+        for idx, tc in enumerate(self._tool_calls):
+            yield LLMStreamChunk(
+                content_delta=None,
+                tool_call_delta={
+                    "index": idx,
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tc["function"]["name"],
+                        "arguments": tc["function"]["arguments"],
+                    },
+                },
+            )
+
+
+class _SlowToolExecutor:
+    """Tool executor that records how many calls overlap."""
+
+    def __init__(self, *, delays: dict[str, float]) -> None:
+        self._delays = delays
+        self._lock = threading.Lock()
+        self._running = 0
+        self.max_running = 0
+
+    def execute(self, tool_call: ToolCall, /) -> str:
+        with self._lock:
+            self._running += 1
+            self.max_running = max(self.max_running, self._running)
+        time.sleep(self._delays[tool_call["id"]])
+        with self._lock:
+            self._running -= 1
+        return f"result-{tool_call['id']}"
+
+    def get_definitions(self, tool_names: list[str], /) -> list[ToolDefinition]:
+        return []
+
+
+def _concat_calls(count: int) -> list[ToolCall]:
+    return [
+        {
+            "id": f"call_{idx}",
+            "type": "function",
+            "function": {"name": "concat", "arguments": '{"a": "a", "b": "b"}'},
+        }
+        for idx in range(count)
+    ]
+
+
+def _agent_definitions_with_parallel_limit(limit: int) -> AgentDefinitionRegistry:
+    return AgentDefinitionRegistry.from_mapping(
+        {
+            "agents": {
+                "default": {
+                    "model": "test-model",
+                    "system_prompt": "You are a helpful assistant.",
+                    "tools": ["concat"],
+                    "max_parallel_tool_calls": limit,
+                }
+            }
+        }
+    )
+
+
+def test_execute_stream_runs_round_tool_calls_concurrently_in_call_order():
+    tool_executor = _SlowToolExecutor(
+        delays={"call_0": 0.15, "call_1": 0.05, "call_2": 0.1}
+    )
+    fake_llm = _MultiToolCallLLMClient(_concat_calls(3))
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: fake_llm,
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(3),
+        tool_executor=tool_executor,
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert tool_executor.max_running == 3
+    results = [e for e in events if isinstance(e, ToolResultEvent)]
+    assert [e.call_id for e in results] == ["call_0", "call_1", "call_2"]
+    tool_messages = [m for m in fake_llm.calls[1] if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_messages] == [
+        "call_0",
+        "call_1",
+        "call_2",
+    ]
+    assert tool_messages[0]["content"] == "result-call_0"
+
+
+def test_execute_stream_bounds_parallel_tool_calls_by_agent_limit():
+    tool_executor = _SlowToolExecutor(delays={f"call_{i}": 0.02 for i in range(4)})
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: _MultiToolCallLLMClient(
+            _concat_calls(4)
+        ),
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(2),
+        tool_executor=tool_executor,
+    )
+
+    list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert tool_executor.max_running == 2
+
+
+def test_execute_stream_runs_tool_calls_sequentially_with_limit_one():
+    tool_executor = _SlowToolExecutor(delays={f"call_{i}": 0.01 for i in range(3)})
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: _MultiToolCallLLMClient(
+            _concat_calls(3)
+        ),
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(1),
+        tool_executor=tool_executor,
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert tool_executor.max_running == 1
+    assert isinstance(events[-1], StreamComplete)
+
+
+def test_execute_stream_starts_calls_after_ask_user_once_it_is_answered():
+    class _RecordingToolExecutor(_SlowToolExecutor):
+        def __init__(self) -> None:
+            super().__init__(delays={"call_0": 0.0, "call_1": 0.0})
+            self.executed: list[str] = []
+
+        def execute(self, tool_call: ToolCall, /) -> str:
+            self.executed.append(tool_call["id"])
+            return super().execute(tool_call)
+
+    tool_executor = _RecordingToolExecutor()
+    first, last = _concat_calls(2)
+    ask_user_tc: ToolCall = {
+        "id": "call_ask",
+        "type": "function",
+        "function": {"name": "ask_user", "arguments": _questions_args()},
+    }
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: _MultiToolCallLLMClient(
+            [first, ask_user_tc, last]
+        ),
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(4),
+        tool_executor=tool_executor,
+    )
+
+    stream = use_case.execute_stream(RunAgentRequest(message="go"))
+    event = next(stream)
+    while not (isinstance(event, ToolCallEvent) and event.name == "ask_user"):
+        event = next(stream)
+
+    assert tool_executor.executed == ["call_0"]
+    events = [stream.send({"What is your name?": "Alice"}), *stream]
+    assert tool_executor.executed == ["call_0", "call_1"]
+    assert isinstance(events[-1], StreamComplete)
+
+
+class _BatchingToolExecutor(_SlowToolExecutor):
+    """Tool executor that runs ``concat`` calls as batches."""
+
+    def __init__(self) -> None:
+        super().__init__(delays={f"call_{i}": 0.0 for i in range(5)})
+        self.batches: list[list[str]] = []
+
+    def supports_batch(self, tool_name: str, /) -> bool:
+        return tool_name == "concat"
+
+    def execute_batch(self, tool_calls: list[ToolCall], /) -> list[str]:
+        self.batches.append([tc["id"] for tc in tool_calls])
+        return [f"batched-{tc['id']}" for tc in tool_calls]
+
+
+def test_execute_stream_batches_calls_of_batch_capable_tool():
+    tool_executor = _BatchingToolExecutor()
+    calls = _concat_calls(4)
+    calls.append(
+        {
+            "id": "call_4",
+            "type": "function",
+            "function": {"name": "get_current_time", "arguments": "{}"},
+        }
+    )
+    fake_llm = _MultiToolCallLLMClient(calls)
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: fake_llm,
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(3),
+        tool_executor=tool_executor,
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert tool_executor.batches == [["call_0", "call_1", "call_2"]]
+    results = {e.call_id: e.result for e in events if isinstance(e, ToolResultEvent)}
+    assert results == {
+        "call_0": "batched-call_0",
+        "call_1": "batched-call_1",
+        "call_2": "batched-call_2",
+        "call_3": "result-call_3",
+        "call_4": "result-call_4",
+    }
+    tool_messages = [m for m in fake_llm.calls[1] if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_messages] == list(results)
+
+
+def test_execute_stream_does_not_batch_with_limit_one():
+    tool_executor = _BatchingToolExecutor()
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: _MultiToolCallLLMClient(
+            _concat_calls(3)
+        ),
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(1),
+        tool_executor=tool_executor,
+    )
+
+    list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert tool_executor.batches == []
+
+
+class _ReportingToolExecutor(_SlowToolExecutor):
+    """Tool executor that reports output before and after its work."""
+
+    def __init__(self, *, delays: dict[str, float]) -> None:
+        super().__init__(delays=delays)
+        self.release = threading.Event()
+        self.release.set()
+        self.released: list[bool] = []
+
+    def execute(self, tool_call: ToolCall, /) -> str:
+        context = current_tool_calls()[0]
+        context.output("stdout", f"{tool_call['id']} started")
+        self.released.append(self.release.wait(5))
+        result = super().execute(tool_call)
+        context.output("stderr", f"{tool_call['id']} done")
+        return result
+
+
+def _tool_events(events) -> list[tuple[str, str, str]]:
+    described = []
+    for event in events:
+        if isinstance(event, ToolCallEvent):
+            described.append(("call", event.call_id, ""))
+        elif isinstance(event, ToolProgressEvent):
+            described.append((event.stream, event.call_id, event.data))
+        elif isinstance(event, ToolResultEvent):
+            described.append(("result", event.call_id, event.result))
+    return described
+
+
+def test_execute_stream_yields_tool_output_after_its_call_event():
+    tool_executor = _ReportingToolExecutor(delays={"call_0": 0.1, "call_1": 0.0})
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: _MultiToolCallLLMClient(
+            _concat_calls(2)
+        ),
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(2),
+        tool_executor=tool_executor,
+    )
+
+    events = list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert _tool_events(events) == [
+        ("call", "call_0", ""),
+        ("stdout", "call_0", "call_0 started"),
+        ("stderr", "call_0", "call_0 done"),
+        ("result", "call_0", "result-call_0"),
+        ("call", "call_1", ""),
+        ("stdout", "call_1", "call_1 started"),
+        ("stderr", "call_1", "call_1 done"),
+        ("result", "call_1", "result-call_1"),
+    ]
+
+
+def test_aexecute_stream_yields_tool_output_while_the_call_runs():
+    tool_executor = _ReportingToolExecutor(delays={"call_0": 0.0})
+    tool_executor.release.clear()
+    use_case = RunAgentUseCase(
+        llm_client_factory=lambda _agent_definition: _MultiToolCallLLMClient(
+            _concat_calls(1)
+        ),
+        session_store=InMemorySessionStore(),
+        agent_definitions=_agent_definitions_with_parallel_limit(1),
+        tool_executor=tool_executor,
+    )
+
+    async def run() -> list[object]:
+        events = []
+        async for event in use_case.aexecute_stream(RunAgentRequest(message="go")):
+            events.append(event)
+            if isinstance(event, ToolProgressEvent):
+                tool_executor.release.set()
+        return events
+
+    events = asyncio.run(run())
+
+    # The call stayed blocked until its first chunk reached the consumer.
+    assert tool_executor.released == [True]
+    assert [e for e in _tool_events(events) if e[0] != "call"] == [
+        ("stdout", "call_0", "call_0 started"),
+        ("stderr", "call_0", "call_0 done"),
+        ("result", "call_0", "result-call_0"),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Incremental session persistence
+# ---------------------------------------------------------------------------
+
+
+class _RecordingSessionStore(InMemorySessionStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.changes: list[SessionChanges] = []
+
+    def save_changes(self, changes: SessionChanges) -> None:
+        self.changes.append(changes)
+        super().save_changes(changes)
+
+
+def test_execute_stream_persists_only_new_messages_per_turn():
+    store = _RecordingSessionStore()
+    fake_llm = FakeLLMClient(
+        rounds=[
+            {"content": "First", "usage": _usage()},
+            {"content": "Second", "usage": _usage()},
+        ]
+    )
+    use_case = RunAgentUseCase(
+        llm_client_factory=FakeLLMClientFactory(fake_llm),
+        session_store=store,
+        agent_definitions=_agent_definitions_with_max_tool_rounds(5),
+    )
+
+    first = list(use_case.execute_stream(RunAgentRequest(message="one")))
+    assert isinstance(first[-1], StreamComplete)
+    session_id = first[-1].session_id
+    list(use_case.execute_stream(RunAgentRequest(message="two", session_id=session_id)))
+
+    assert [c.saved_message_count for c in store.changes] == [0, 3]
+    assert store.changes[1].new_messages == [
+        {"role": "user", "content": "two"},
+        {"role": "assistant", "content": "Second"},
+    ]
+    assert store.changes[1].state_changed is False
+    stored = store.get(session_id)
+    assert stored is not None
+    assert len(stored.messages) == 5
+
+
+def test_execute_stream_builds_llm_messages_once_per_round(
+    monkeypatch, default_agent_def, tool_registry
+):
+    import simple_agent_poc.application.use_cases as use_cases_module
+
+    calls: list[int] = []
+    original = use_cases_module._messages_for_llm
+
+    def counting_messages_for_llm(session, **kwargs):
+        calls.append(len(session.messages))
+        return original(session, **kwargs)
+
+    monkeypatch.setattr(
+        use_cases_module, "_messages_for_llm", counting_messages_for_llm
+    )
+    fake_llm = FakeLLMClient(
+        rounds=[
+            {"content": "", "tool_calls": _concat_tool_call(), "usage": _usage()},
+            {"content": "Done", "usage": _usage()},
+        ]
+    )
+    use_case = RunAgentUseCase(
+        llm_client_factory=FakeLLMClientFactory(fake_llm),
+        session_store=InMemorySessionStore(),
+        agent_definitions=default_agent_def,
+        tool_executor=tool_registry,
+    )
+
+    list(use_case.execute_stream(RunAgentRequest(message="go")))
+
+    assert len(calls) == 2
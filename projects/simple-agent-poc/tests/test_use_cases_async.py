@@ -0,0 +1,278 @@
+"""Tests for the async use case entry points."""
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+
+from simple_agent_poc.adapters.session_store.in_memory import InMemorySessionStore
+from simple_agent_poc.adapters.tools.ask_user import (
+    TOOL_DEFINITION as ASK_USER_TOOL_DEF,
+)
+from simple_agent_poc.adapters.tools.ask_user import (
+    execute as ask_user_execute,
+)
+from simple_agent_poc.adapters.tools.concat import TOOL_DEFINITION as CONCAT_TOOL_DEF
+from simple_agent_poc.adapters.tools.concat import execute as concat_execute
+from simple_agent_poc.adapters.tools.registry import BuiltinToolRegistry
+from simple_agent_poc.application.dto import (
+    ContentDelta,
+    ContinueRequest,
+    RunAgentRequest,
+    SessionPaused,
+    StreamComplete,
+    ToolCallEvent,
+    ToolResultEvent,
+)
+from simple_agent_poc.application.use_cases import RunAgentUseCase
+from simple_agent_poc.core.agent_definition import AgentDefinitionRegistry
+from simple_agent_poc.core.session import SessionChanges
+from simple_agent_poc.core.types import (
+    LLMStreamChunk,
+    Message,
+    SessionNotFoundError,
+    ValidationError,
+)
+from tests.helpers import _questions_args
+
+
+class AsyncStubLLMClient:
+    """Stub LLM client that only implements the async port."""
+
+    def __init__(self, rounds: list[list[LLMStreamChunk]]) -> None:
+        self.rounds = rounds
+        self.calls: list[list[Message]] = []
+
+    async def acomplete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools=None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        self.calls.append(list(messages))
+        for chunk in self.rounds[len(self.calls) - 1]:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class SyncStubLLMClient:
+    """Stub LLM client that only implements the sync port."""
+
+    def __init__(self, chunks: list[LLMStreamChunk]) -> None:
+        self.chunks = chunks
+        self.threads: set[int] = set()
+
+    def complete_stream(
+        self,
+        messages: list[Message],
+        *,
+        tools=None,
+    ) -> Iterator[LLMStreamChunk]:
+        for chunk in self.chunks:
+            self.threads.add(threading.get_ident())
+            yield chunk
+
+
+class RecordingAsyncSessionStore(InMemorySessionStore):
+    """In-memory store that records which port was used."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.async_saves = 0
+
+    async def asave_changes(self, changes: SessionChanges) -> None:
+        self.async_saves += 1
+        await super().asave_changes(changes)
+
+
+def build_registry(*, tools: list[str] | None = None) -> AgentDefinitionRegistry:
+    definition: dict[str, object] = {
+        "model": "default-model",
+        "system_prompt": "System prompt",
+    }
+    if tools:
+        definition["tools"] = tools
+    return AgentDefinitionRegistry.from_mapping({"agents": {"default": definition}})
+
+
+def build_tool_executor() -> BuiltinToolRegistry:
+    registry = BuiltinToolRegistry()
+    registry.register(ASK_USER_TOOL_DEF, ask_user_execute)
+    registry.register(CONCAT_TOOL_DEF, concat_execute)
+    return registry
+
+
+async def _collect(stream) -> list:
+    return [event async for event in stream]
+
+
+def _tool_call_chunk(call_id: str, name: str, arguments: str) -> LLMStreamChunk:
+    return {
+        "content_delta": None,
+        "tool_call_delta": {
+            "index": 0,
+            "id": call_id,
+            "type": "function",
+            "function": {"name": name, "arguments": arguments},
+        },
+    }
+
+
+class TestAsyncExecuteStream:
+    """Tests for aexecute_stream."""
+
+    def test_uses_async_llm_client_and_async_session_store(self) -> None:
+        llm_client = AsyncStubLLMClient(
+            rounds=[[{"content_delta": "Hello"}, {"content_delta": " world"}]]
+        )
+        store = RecordingAsyncSessionStore()
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=store,
+            agent_definitions=build_registry(),
+        )
+
+        events = asyncio.run(
+            _collect(use_case.aexecute_stream(RunAgentRequest(message="Hi")))
+        )
+
+        assert [e.delta for e in events if isinstance(e, ContentDelta)] == [
+            "Hello",
+            " world",
+        ]
+        complete = events[-1]
+        assert isinstance(complete, StreamComplete)
+        assert store.async_saves == 1
+        session = store.get(complete.session_id)
+        assert session is not None
+        assert session.messages[-1] == {"role": "assistant", "content": "Hello world"}
+
+    def test_sync_llm_client_runs_off_the_event_loop_thread(self) -> None:
+        llm_client = SyncStubLLMClient(chunks=[{"content_delta": "Hello"}])
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=InMemorySessionStore(),
+            agent_definitions=build_registry(),
+        )
+
+        async def run() -> tuple[list, int]:
+            events = await _collect(
+                use_case.aexecute_stream(RunAgentRequest(message="Hi"))
+            )
+            return events, threading.get_ident()
+
+        events, loop_thread = asyncio.run(run())
+
+        assert isinstance(events[-1], StreamComplete)
+        assert loop_thread not in llm_client.threads
+
+    def test_blocking_stream_uses_async_only_llm_client(self) -> None:
+        llm_client = AsyncStubLLMClient(rounds=[[{"content_delta": "Hello"}]])
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=InMemorySessionStore(),
+            agent_definitions=build_registry(),
+        )
+
+        events = list(use_case.execute_stream(RunAgentRequest(message="Hi")))
+
+        assert [e.delta for e in events if isinstance(e, ContentDelta)] == ["Hello"]
+        assert isinstance(events[-1], StreamComplete)
+
+    def test_executes_tools_and_continues(self) -> None:
+        llm_client = AsyncStubLLMClient(
+            rounds=[
+                [_tool_call_chunk("call_1", "concat", '{"a": "x", "b": "y"}')],
+                [{"content_delta": "xy"}],
+            ]
+        )
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=InMemorySessionStore(),
+            agent_definitions=build_registry(tools=["concat"]),
+            tool_executor=build_tool_executor(),
+        )
+
+        events = asyncio.run(
+            _collect(use_case.aexecute_stream(RunAgentRequest(message="concat")))
+        )
+
+        assert isinstance(events[0], ToolCallEvent)
+        assert isinstance(events[1], ToolResultEvent)
+        assert events[1].result == '{"result": "xy"}'
+        assert isinstance(events[-1], StreamComplete)
+        assert llm_client.calls[1][-1]["role"] == "tool"
+
+    def test_blank_message_raises_on_first_iteration(self) -> None:
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: AsyncStubLLMClient([]),
+            session_store=InMemorySessionStore(),
+            agent_definitions=build_registry(),
+        )
+
+        with pytest.raises(ValidationError):
+            asyncio.run(
+                _collect(use_case.aexecute_stream(RunAgentRequest(message=" ")))
+            )
+
+
+class TestAsyncContinueStream:
+    """Tests for acontinue_stream."""
+
+    def test_pause_and_resume(self) -> None:
+        store = InMemorySessionStore()
+        llm_client = AsyncStubLLMClient(
+            rounds=[
+                [_tool_call_chunk("call_ask", "ask_user", _questions_args())],
+                [{"content_delta": "Hi Alice"}],
+            ]
+        )
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: llm_client,
+            session_store=store,
+            agent_definitions=build_registry(tools=["ask_user"]),
+            tool_executor=build_tool_executor(),
+            is_api_context=True,
+        )
+
+        first = asyncio.run(
+            _collect(use_case.aexecute_stream(RunAgentRequest(message="Hello")))
+        )
+        paused = first[-1]
+        assert isinstance(paused, SessionPaused)
+
+        second = asyncio.run(
+            _collect(
+                use_case.acontinue_stream(
+                    ContinueRequest(
+                        session_id=paused.session_id,
+                        answers={"What is your name?": "Alice"},
+                    )
+                )
+            )
+        )
+
+        assert isinstance(second[0], ToolResultEvent)
+        assert "Alice" in second[0].result
+        assert isinstance(second[-1], StreamComplete)
+        session = store.get(paused.session_id)
+        assert session is not None
+        assert session.is_paused is False
+
+    def test_unknown_session_raises_error(self) -> None:
+        use_case = RunAgentUseCase(
+            llm_client_factory=lambda _agent_definition: AsyncStubLLMClient([]),
+            session_store=InMemorySessionStore(),
+            agent_definitions=build_registry(),
+            is_api_context=True,
+        )
+
+        with pytest.raises(SessionNotFoundError):
+            asyncio.run(
+                _collect(
+                    use_case.acontinue_stream(
+                        ContinueRequest(session_id="missing", answers={"q": "a"})
+                    )
+                )
+            )
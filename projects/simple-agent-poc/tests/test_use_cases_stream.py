@@ -121,6 +121,41 @@ class TestExecuteStream:
             "content": "Hello, world!",
         }
 
+    def test_session_evicted_during_a_run_is_saved_whole(self) -> None:
+        store = InMemorySessionStore(max_sessions=1)
+        use_case = RunAgentUseCase(
+            llm_client_factory=MagicMock(
+                return_value=StreamingStubLLMClient(
+                    chunks=[{"content_delta": "Hi"}, {"content_delta": "!"}]
+                )
+            ),
+            session_store=store,
+            agent_definitions=build_registry(),
+        )
+        first = list(use_case.execute_stream(RunAgentRequest(message="One")))[-1]
+        assert isinstance(first, StreamComplete)
+
+        # The second turn of the session is running when another session's
+        # save evicts it.
+        second_turn = use_case.execute_stream(
+            RunAgentRequest(message="Two", session_id=first.session_id)
+        )
+        assert next(second_turn) == ContentDelta(delta="Hi")
+        list(use_case.execute_stream(RunAgentRequest(message="Other")))
+        assert store.get(first.session_id) is None
+
+        complete = list(second_turn)[-1]
+
+        assert isinstance(complete, StreamComplete)
+        session = store.get(first.session_id)
+        assert session is not None
+        assert [m["content"] for m in session.messages[1:]] == [
+            "One",
+            "Hi!",
+            "Two",
+            "Hi!",
+        ]
+
     def test_execute_stream_saves_partial_text_on_error(self) -> None:
         chunks: list[LLMStreamChunk] = [
             {"content_delta": "Hello"},